@@ -1,12 +1,24 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { MongoClient } from 'mongodb';
+import { MongoClient, MongoBulkWriteError } from 'mongodb';
 import bcrypt from 'bcryptjs';
 import jwt from 'jsonwebtoken';
 import { v4 as uuidv4 } from 'uuid';
-
-const client = new MongoClient(process.env.MONGO_URL);
+import { instrumentClient, trackRequest, routeKey, getQueryStats, resetQueryStats } from '@/lib/query-monitor';
+import { AUTH_LIMITS, checkRateLimits, clientIp } from '@/lib/rate-limit';
+import { streamJsonArray } from '@/lib/json-response';
+import { parseFields, pickFields } from '@/lib/fields';
+import { ensureTextIndex, searchTerms, highlightTest } from '@/lib/search';
+import { journalRequest } from '@/lib/request-journal';
+import { withIdempotency } from '@/lib/idempotency';
+import { storeQuestions, hydrateQuestions } from '@/lib/question-bank';
+import { publishVersion, snapshotVersion, currentVersion, getVersion, versionPage, versionQuestions, gradeAnswers } from '@/lib/test-versions';
+import { ROSTER_FORMATS, RosterImportError, importRoster, getRosterImport } from '@/lib/roster-import';
+import { ensureUserIndexes } from '@/lib/user-indexes';
+
+const client = instrumentClient(new MongoClient(process.env.MONGO_URL, { monitorCommands: true }));
 const dbName = process.env.DB_NAME || 'test_series_db';
 const JWT_SECRET = process.env.JWT_SECRET || 'your-secret-key-change-in-production';
+const DUPLICATE_KEY = 11000;
 
 // Temporary email domains to block
 const TEMP_EMAIL_DOMAINS = [
@@ -21,7 +33,11 @@ const TEMP_EMAIL_DOMAINS = [
 async function connectDB() {
   try {
     await client.connect();
-    return client.db(dbName);
+    const db = client.db(dbName);
+    // Created once per process; a failure (duplicate users stored before the indexes existed) is
+    // logged and retried on the next request instead of failing this one
+    await ensureUserIndexes(db).catch(error => console.error('Unique user indexes not created:', error));
+    return db;
   } catch (error) {
     console.error('Database connection error:', error);
     throw error;
@@ -53,11 +69,222 @@ function getUserFromRequest(request) {
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-  'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+  'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key',
 };
 
+// Admission control for bcrypt-backed auth routes; returns a 429 response when throttled.
+// Without a known client address (see TRUST_PROXY) there is no per-IP bucket: a shared one
+// would let a single client lock everyone out.
+async function throttleAuth(request, action, username) {
+  const ip = clientIp(request);
+  const retryAfter = await checkRateLimits([
+    ...(ip ? [[`auth:${action}:ip:${ip}`, AUTH_LIMITS.ip]] : []),
+    ...(username ? [[`auth:${action}:user:${String(username).toLowerCase()}`, AUTH_LIMITS.username]] : []),
+    ['auth:global', AUTH_LIMITS.global]
+  ]);
+  if (retryAfter === null) return null;
+
+  return NextResponse.json(
+    { error: 'Too many requests, please try again later' },
+    { status: 429, headers: { ...corsHeaders, 'Retry-After': String(retryAfter) } }
+  );
+}
+
+const CREATOR_FIELDS = ['createdByName', 'createdByPhoto', 'createdByRating', 'createdByExperience'];
+const ATTEMPT_STATS_FIELDS = ['totalAttempts', 'averageScore', 'averagePercentage'];
+
+// True when no sparse fieldset was requested or it names any of the given fields
+function wantsAny(include, fields) {
+  return !include || fields.some(field => include.has(field));
+}
+
+// 400 response for an invalid ?fields= parameter
+function fieldsError(fields) {
+  return NextResponse.json({ error: fields.error }, { status: 400, headers: corsHeaders });
+}
+
+// Add creator details, attempt statistics and question bank entries to a batch of test series
+// (one query each per batch). Lookups for fields outside the requested sparse fieldset are skipped.
+async function enrichTestSeries(db, tests, include = null) {
+  const needCreators = wantsAny(include, CREATOR_FIELDS);
+  const needStats = wantsAny(include, ATTEMPT_STATS_FIELDS);
+  const needQuestions = wantsAny(include, ['questions']);
+  const creatorIds = [...new Set(tests.map(test => test.createdBy))];
+  const testIds = tests.map(test => test.testSeriesId);
+
+  const [creators, attemptStats] = await Promise.all([
+    !needCreators ? [] : db.collection('users').find(
+      { userId: { $in: creatorIds } },
+      { projection: { userId: 1, name: 1, photo: 1, rating: 1, experience: 1 } }
+    ).toArray(),
+    // Attempt statistics for Udemy-style display
+    !needStats ? [] : db.collection('testAttempts').aggregate([
+      { $match: { testSeriesId: { $in: testIds }, status: 'completed' } },
+      {
+        $group: {
+          _id: '$testSeriesId',
+          totalAttempts: { $sum: 1 },
+          averageScore: { $avg: '$score' },
+          averagePercentage: { $avg: { $multiply: [{ $divide: ['$score', '$totalQuestions'] }, 100] } }
+        }
+      }
+    ]).toArray(),
+    needQuestions && hydrateQuestions(db, tests)
+  ]);
+
+  const creatorsById = new Map(creators.map(creator => [creator.userId, creator]));
+  const statsByTest = new Map(attemptStats.map(stats => [stats._id, stats]));
+
+  for (const test of tests) {
+    if (needCreators) {
+      const creator = creatorsById.get(test.createdBy);
+      test.createdByName = creator?.name || 'Unknown';
+      test.createdByPhoto = creator?.photo || null;
+      test.createdByRating = creator?.rating || 0;
+      test.createdByExperience = creator?.experience || '';
+    }
+
+    if (needStats) {
+      const stats = statsByTest.get(test.testSeriesId);
+      test.totalAttempts = stats?.totalAttempts || 0;
+      test.averageScore = stats?.averageScore || 0;
+      test.averagePercentage = stats?.averagePercentage || 0;
+    }
+  }
+  return include ? tests.map(test => pickFields(test, include)) : tests;
+}
+
+// Add test titles and (for teachers/admins) student details to a batch of attempts
+async function enrichAttempts(db, attempts, role, include = null) {
+  let titlesById = null;
+  if (wantsAny(include, ['testSeriesTitle'])) {
+    const testIds = [...new Set(attempts.map(attempt => attempt.testSeriesId))];
+    const testSeries = await db.collection('testSeries').find(
+      { testSeriesId: { $in: testIds } },
+      { projection: { testSeriesId: 1, title: 1 } }
+    ).toArray();
+    titlesById = new Map(testSeries.map(test => [test.testSeriesId, test.title]));
+  }
+
+  let studentsById = null;
+  if (role !== 'student' && wantsAny(include, ['studentDetails'])) {
+    const projection = role === 'teacher'
+      ? { userId: 1, name: 1 } // Teachers only see student names
+      : { userId: 1, name: 1, email: 1, phone: 1 }; // Admins see full details
+    const studentIds = [...new Set(attempts.map(attempt => attempt.studentId))];
+    const students = await db.collection('users').find(
+      { userId: { $in: studentIds } },
+      { projection }
+    ).toArray();
+    studentsById = new Map(students.map(({ userId, ...student }) => [userId, student]));
+  }
+
+  // Results of versioned attempts are rebuilt from their test version; older ones stored a copy
+  let questionsByVersion = null;
+  if (wantsAny(include, ['detailedResults'])) {
+    const versionIds = attempts
+      .filter(attempt => attempt.status === 'completed' && !attempt.detailedResults && attempt.versionId)
+      .map(attempt => attempt.versionId);
+    if (versionIds.length) questionsByVersion = await versionQuestions(db, versionIds);
+  }
+
+  for (const attempt of attempts) {
+    if (titlesById) {
+      attempt.testSeriesTitle = titlesById.get(attempt.testSeriesId) || 'Unknown';
+    }
+    if (studentsById) {
+      attempt.studentDetails = studentsById.get(attempt.studentId) || null;
+    }
+    const questions = questionsByVersion?.get(attempt.versionId);
+    if (questions && attempt.status === 'completed' && !attempt.detailedResults) {
+      attempt.detailedResults = gradeAnswers(questions, attempt.answers).detailedResults;
+    }
+  }
+  return include ? attempts.map(attempt => pickFields(attempt, include)) : attempts;
+}
+
+// Status each bulk action leaves a test series in (null for delete)
+const BULK_ACTIONS = { publish: 'published', unpublish: 'draft', delete: null };
+const MAX_BULK_IDS = 1000;
+
+// Apply one action to many test series with a single unordered bulkWrite. Teachers can only
+// touch their own tests, as with PUT/DELETE /api/test-series/:id. Returns a result per id:
+// updated, deleted, unchanged (already in that state), not_found, forbidden or error.
+async function bulkTestSeries(db, user, action, ids) {
+  const targetStatus = BULK_ACTIONS[action];
+  const existing = await db.collection('testSeries').find(
+    { testSeriesId: { $in: ids } },
+    { projection: { testSeriesId: 1, createdBy: 1, status: 1 } }
+  ).toArray();
+  const byId = new Map(existing.map(test => [test.testSeriesId, test]));
+
+  const results = new Map();
+  const operations = [];
+  const operationIds = [];
+  for (const testSeriesId of ids) {
+    const test = byId.get(testSeriesId);
+    if (!test) {
+      results.set(testSeriesId, 'not_found');
+    } else if (user.role === 'teacher' && test.createdBy !== user.userId) {
+      results.set(testSeriesId, 'forbidden');
+    } else if (action !== 'delete' && test.status === targetStatus) {
+      results.set(testSeriesId, 'unchanged');
+    } else {
+      // Keep the ownership filter on the write itself in case the test changed hands since the read
+      const filter = user.role === 'teacher' ? { testSeriesId, createdBy: user.userId } : { testSeriesId };
+      operations.push(action === 'delete'
+        ? { deleteOne: { filter } }
+        : { updateOne: { filter, update: { $set: { status: targetStatus, updatedAt: new Date() } } } });
+      operationIds.push(testSeriesId);
+      results.set(testSeriesId, action === 'delete' ? 'deleted' : 'updated');
+    }
+  }
+
+  if (operations.length) {
+    try {
+      await db.collection('testSeries').bulkWrite(operations, { ordered: false });
+    } catch (error) {
+      if (!(error instanceof MongoBulkWriteError)) throw error;
+      // Unordered writes carry on past failures; only the failed operations are reported
+      for (const writeError of [].concat(error.writeErrors || [])) {
+        results.set(operationIds[writeError.index], 'error');
+      }
+    }
+  }
+
+  const summary = {};
+  for (const result of results.values()) {
+    summary[result] = (summary[result] || 0) + 1;
+  }
+  return {
+    action,
+    results: ids.map(testSeriesId => ({ testSeriesId, result: results.get(testSeriesId) })),
+    summary
+  };
+}
+
+// Upload feedback for questions the bank did not store as given (see storeQuestions)
+function questionReport({ duplicates, conflicts }) {
+  return {
+    ...(duplicates.length && { duplicateQuestions: duplicates }),
+    ...(conflicts.length && { explanationConflicts: conflicts })
+  };
+}
+
+// Questions an attempt is scored against: its test version or, for attempts started before
+// versions existed, the test series as it is now
+async function attemptQuestions(db, attempt) {
+  if (attempt.versionId) {
+    const questions = (await versionQuestions(db, [attempt.versionId])).get(attempt.versionId);
+    if (questions) return questions;
+  }
+  const testSeries = await db.collection('testSeries').findOne({ testSeriesId: attempt.testSeriesId });
+  await hydrateQuestions(db, [testSeries]);
+  return testSeries.questions;
+}
+
 // Main handler function
-async function handler(request) {
+async function handleRequest(request) {
   const { method } = request;
   const url = new URL(request.url);
   const path = url.pathname.split('/').filter(Boolean).slice(1); // Remove 'api' from path
@@ -74,6 +301,9 @@ async function handler(request) {
     if (path[0] === 'auth') {
       if (path[1] === 'login' && method === 'POST') {
         const { username, password } = await request.json();
+
+        const throttled = await throttleAuth(request, 'login', username);
+        if (throttled) return throttled;
         
         const user = await db.collection('users').findOne({ username });
         if (!user || !await bcrypt.compare(password, user.password)) {
@@ -92,6 +322,9 @@ async function handler(request) {
       if (path[1] === 'register' && method === 'POST') {
         const { username, password, name, role, email, phone, selectedCategory, selectedTeacher } = await request.json();
 
+        const throttled = await throttleAuth(request, 'register', username);
+        if (throttled) return throttled;
+
         // Check if user exists
         const existingUser = await db.collection('users').findOne({ 
           $or: [{ username }, { email }] 
@@ -125,7 +358,13 @@ async function handler(request) {
           createdAt: new Date()
         };
 
-        await db.collection('users').insertOne(newUser);
+        try {
+          await db.collection('users').insertOne(newUser);
+        } catch (error) {
+          // The same username or email registered since the check above
+          if (error.code !== DUPLICATE_KEY) throw error;
+          return NextResponse.json({ error: 'User already exists' }, { status: 400, headers: corsHeaders });
+        }
 
         const token = jwt.sign(
           { userId, username, role: newUser.role },
@@ -327,12 +566,14 @@ async function handler(request) {
     // Teachers by category route
     if (path[0] === 'teachers' && method === 'GET') {
       const { category } = Object.fromEntries(url.searchParams);
+      const fields = parseFields(url.searchParams, 'teachers', getUserFromRequest(request)?.role);
+      if (fields?.error) return fieldsError(fields);
       
       // Always return all teachers - students can choose any teacher
       // Category filtering will be applied when viewing test series
       const teachers = await db.collection('users').find(
         { role: 'teacher' },
-        { projection: { password: 0, resetToken: 0, resetTokenExpiry: 0 } }
+        { projection: fields?.projection || { password: 0, resetToken: 0, resetTokenExpiry: 0 } }
       ).toArray();
 
       return NextResponse.json(teachers, { headers: corsHeaders });
@@ -436,20 +677,26 @@ async function handler(request) {
           return NextResponse.json({ error: 'No valid questions found in CSV' }, { status: 400, headers: corsHeaders });
         }
 
-        // Update test series with new questions
-        await db.collection('testSeries').updateOne(
+        // Update test series with new questions, stored once in the owner's bank
+        const stored = await storeQuestions(db, questions, user.userId);
+        const updated = await db.collection('testSeries').findOneAndUpdate(
           { testSeriesId, createdBy: user.userId },
           { 
             $set: { 
-              questions,
+              questions: stored.stubs,
               updatedAt: new Date()
             } 
-          }
+          },
+          { returnDocument: 'after' }
         );
+        if (updated) {
+          await publishVersion(db, updated);
+        }
 
         return NextResponse.json({ 
           message: `Successfully uploaded ${questions.length} questions`,
-          questionsCount: questions.length 
+          questionsCount: questions.length,
+          ...questionReport(stored)
         }, { headers: corsHeaders });
 
       } catch (error) {
@@ -458,13 +705,142 @@ async function handler(request) {
       }
     }
 
+    // Question bank: an explanation edited here shows in every test series of its owner using it
+    if (path[0] === 'questions' && path[1] && method === 'PUT') {
+      const user = getUserFromRequest(request);
+      if (!user || !hasPermission(user.role, ['teacher', 'admin'])) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 403, headers: corsHeaders });
+      }
+
+      // Text, options and answer identify the question; changing them means a new question
+      const { explanation } = await request.json();
+      if (typeof explanation !== 'string') {
+        return NextResponse.json({ error: 'explanation is required' }, { status: 400, headers: corsHeaders });
+      }
+
+      let query = { questionId: path[1] };
+      if (user.role === 'teacher') {
+        query.createdBy = user.userId;
+      }
+
+      const result = await db.collection('questions').updateOne(query, { $set: { explanation, updatedAt: new Date() } });
+      if (result.matchedCount === 0) {
+        return NextResponse.json({ error: 'Question not found or unauthorized' }, { status: 404, headers: corsHeaders });
+      }
+
+      return NextResponse.json({ message: 'Question updated successfully' }, { headers: corsHeaders });
+    }
+
     // Test Series routes
     if (path[0] === 'test-series') {
       const user = getUserFromRequest(request);
 
+      if (method === 'GET' && path[1] === 'search') {
+        const { q = '', category, teacher, page, limit } = Object.fromEntries(url.searchParams);
+        if (!q.trim()) {
+          return NextResponse.json({ error: 'Search query (q) is required' }, { status: 400, headers: corsHeaders });
+        }
+
+        const pageNumber = Math.max(1, parseInt(page) || 1);
+        const pageSize = Math.min(100, Math.max(1, parseInt(limit) || 20));
+
+        await ensureTextIndex(db);
+
+        const query = { $text: { $search: q } };
+        if (user?.role === 'teacher') {
+          query.createdBy = user.userId;
+        } else {
+          if (user?.role !== 'admin') query.status = { $ne: 'draft' };
+          if (teacher) query.createdBy = teacher;
+        }
+        if (category) query.category = category;
+
+        const [total, results] = await Promise.all([
+          db.collection('testSeries').countDocuments(query),
+          db.collection('testSeries').find(query, {
+            projection: {
+              testSeriesId: 1, title: 1, description: 1, category: 1, duration: 1, status: 1,
+              createdBy: 1, createdAt: 1, updatedAt: 1, 'questions.question': 1,
+              relevance: { $meta: 'textScore' }
+            }
+          })
+            .sort({ relevance: { $meta: 'textScore' } })
+            .skip((pageNumber - 1) * pageSize)
+            .limit(pageSize)
+            .toArray()
+        ]);
+
+        // Highlights need the question text; the question bank itself is not returned
+        const terms = searchTerms(q);
+        for (const test of results) {
+          test.highlights = highlightTest(test, terms);
+          test.questionCount = test.questions?.length || 0;
+          delete test.questions;
+        }
+        await enrichTestSeries(db, results);
+
+        return NextResponse.json({
+          results,
+          total,
+          page: pageNumber,
+          limit: pageSize,
+          pages: Math.ceil(total / pageSize)
+        }, { headers: corsHeaders });
+      }
+
+      // One page of a test's questions, read from the version's chunks: students get the version
+      // their attempt started on, without answers; the owning teacher or an admin the current one
+      if (method === 'GET' && path[1] && path[2] === 'questions') {
+        if (!user) {
+          return NextResponse.json({ error: 'Unauthorized' }, { status: 401, headers: corsHeaders });
+        }
+        const { page, limit } = Object.fromEntries(url.searchParams);
+        const pageNumber = Math.max(1, parseInt(page) || 1);
+        const pageSize = Math.min(100, Math.max(1, parseInt(limit) || 20));
+        const testSeriesId = path[1];
+
+        let version = null;
+        if (user.role === 'student') {
+          const attempt = await db.collection('testAttempts').findOne(
+            { testSeriesId, studentId: user.userId },
+            { sort: { createdAt: -1 }, projection: { versionId: 1 } }
+          );
+          if (!attempt) {
+            return NextResponse.json({ error: 'Start the test to see its questions' }, { status: 403, headers: corsHeaders });
+          }
+          if (attempt.versionId) version = await getVersion(db, attempt.versionId);
+        }
+        if (!version) {
+          const query = { testSeriesId };
+          if (user.role === 'teacher') query.createdBy = user.userId;
+          const testSeries = await db.collection('testSeries').findOne(query);
+          if (!testSeries) {
+            return NextResponse.json({ error: 'Test series not found or unauthorized' }, { status: 404, headers: corsHeaders });
+          }
+          version = await currentVersion(db, testSeries);
+        }
+
+        let questions = await versionPage(db, version, (pageNumber - 1) * pageSize, pageSize);
+        if (user.role === 'student') {
+          questions = questions.map(({ questionId, question, options }) => ({ questionId, question, options }));
+        }
+
+        return NextResponse.json({
+          testSeriesId,
+          versionId: version.versionId,
+          questions,
+          total: version.questionCount,
+          page: pageNumber,
+          limit: pageSize,
+          pages: Math.ceil(version.questionCount / pageSize)
+        }, { headers: corsHeaders });
+      }
+
       if (method === 'GET') {
         let query = {};
         const { category, teacher, includeUnpublished, preview } = Object.fromEntries(url.searchParams);
+        const fields = parseFields(url.searchParams, 'test-series', user?.role);
+        if (fields?.error) return fieldsError(fields);
         
         if (user?.role === 'student') {
           // Students see ALL published test series from ALL teachers
@@ -487,38 +863,34 @@ async function handler(request) {
         }
         // Admin sees all
 
-        const testSeries = await db.collection('testSeries').find(query).toArray();
-        
-        // Add creator names and enhanced metadata
-        for (const test of testSeries) {
-          const creator = await db.collection('users').findOne(
-            { userId: test.createdBy },
-            { projection: { name: 1, photo: 1, rating: 1, experience: 1 } }
-          );
-          test.createdByName = creator?.name || 'Unknown';
-          test.createdByPhoto = creator?.photo || null;
-          test.createdByRating = creator?.rating || 0;
-          test.createdByExperience = creator?.experience || '';
-          
-          // Add attempt statistics for Udemy-style display
-          const attemptStats = await db.collection('testAttempts').aggregate([
-            { $match: { testSeriesId: test.testSeriesId, status: 'completed' } },
-            { 
-              $group: { 
-                _id: null, 
-                totalAttempts: { $sum: 1 },
-                averageScore: { $avg: '$score' },
-                averagePercentage: { $avg: { $multiply: [{ $divide: ['$score', '$totalQuestions'] }, 100] } }
-              } 
-            }
-          ]).toArray();
-          
-          test.totalAttempts = attemptStats[0]?.totalAttempts || 0;
-          test.averageScore = attemptStats[0]?.averageScore || 0;
-          test.averagePercentage = attemptStats[0]?.averagePercentage || 0;
+        // Stream results, adding creator names and enhanced metadata a batch at a time
+        const cursor = db.collection('testSeries').find(query, fields ? { projection: fields.projection } : {});
+        return await streamJsonArray(request, cursor, {
+          headers: corsHeaders,
+          transformBatch: (tests) => enrichTestSeries(db, tests, fields?.include)
+        });
+      }
+
+      if (method === 'POST' && path[1] === 'bulk') {
+        if (!user || !hasPermission(user.role, ['teacher', 'admin'])) {
+          return NextResponse.json({ error: 'Unauthorized' }, { status: 403, headers: corsHeaders });
         }
 
-        return NextResponse.json(testSeries, { headers: corsHeaders });
+        const { action, ids } = await request.json();
+        if (!Object.hasOwn(BULK_ACTIONS, action)) {
+          return NextResponse.json({
+            error: `action must be one of: ${Object.keys(BULK_ACTIONS).join(', ')}`
+          }, { status: 400, headers: corsHeaders });
+        }
+        if (!Array.isArray(ids) || !ids.length || !ids.every(id => typeof id === 'string')) {
+          return NextResponse.json({ error: 'ids must be a non-empty array of test series ids' }, { status: 400, headers: corsHeaders });
+        }
+        const uniqueIds = [...new Set(ids)];
+        if (uniqueIds.length > MAX_BULK_IDS) {
+          return NextResponse.json({ error: `At most ${MAX_BULK_IDS} ids per request` }, { status: 400, headers: corsHeaders });
+        }
+
+        return NextResponse.json(await bulkTestSeries(db, user, action, uniqueIds), { headers: corsHeaders });
       }
 
       if (method === 'POST') {
@@ -529,13 +901,14 @@ async function handler(request) {
         const { title, description, category, duration, questions } = await request.json();
 
         const testSeriesId = uuidv4();
+        const stored = await storeQuestions(db, questions, user.userId);
         const testSeries = {
           testSeriesId,
           title,
           description,
           category,
           duration: parseInt(duration),
-          questions: questions || [],
+          questions: stored.stubs,
           status: 'published', // New test series are published by default so teachers can see them immediately
           createdBy: user.userId,
           createdAt: new Date(),
@@ -544,8 +917,10 @@ async function handler(request) {
 
         console.log('Creating test series with status:', testSeries.status, 'for user:', user.userId);
 
+        testSeries.currentVersionId = await snapshotVersion(db, testSeries);
         await db.collection('testSeries').insertOne(testSeries);
-        return NextResponse.json(testSeries, { headers: corsHeaders });
+        const [created] = await hydrateQuestions(db, [{ ...testSeries }]);
+        return NextResponse.json({ ...created, ...questionReport(stored) }, { headers: corsHeaders });
       }
 
       if (method === 'PUT' && path[1]) {
@@ -556,19 +931,40 @@ async function handler(request) {
         const testSeriesId = path[1];
         const updates = await request.json();
         updates.updatedAt = new Date();
+        delete updates.currentVersionId; // maintained by publishVersion
 
         let query = { testSeriesId };
         if (user.role === 'teacher') {
           query.createdBy = user.userId;
         }
 
-        const result = await db.collection('testSeries').updateOne(query, { $set: updates });
+        let stored = null;
+        if (Array.isArray(updates.questions)) {
+          // Questions belong to the test's owner, also when an admin edits them
+          const owner = await db.collection('testSeries').findOne(query, { projection: { createdBy: 1 } });
+          if (!owner) {
+            return NextResponse.json({ error: 'Test series not found or unauthorized' }, { status: 404, headers: corsHeaders });
+          }
+          stored = await storeQuestions(db, updates.questions, owner.createdBy);
+          updates.questions = stored.stubs;
+        }
+
+        const updated = await db.collection('testSeries').findOneAndUpdate(query, { $set: updates }, { returnDocument: 'after' });
         
-        if (result.matchedCount === 0) {
+        if (!updated) {
           return NextResponse.json({ error: 'Test series not found or unauthorized' }, { status: 404, headers: corsHeaders });
         }
 
-        return NextResponse.json({ message: 'Test series updated successfully' }, { headers: corsHeaders });
+        // New questions become a new current version; attempts already running keep the version
+        // they started on
+        if (updates.questions) {
+          await publishVersion(db, updated);
+        }
+
+        return NextResponse.json({
+          message: 'Test series updated successfully',
+          ...(stored && questionReport(stored))
+        }, { headers: corsHeaders });
       }
 
       if (method === 'DELETE' && path[1]) {
@@ -600,6 +996,9 @@ async function handler(request) {
       }
 
       if (method === 'GET') {
+        const fields = parseFields(url.searchParams, 'test-attempts', user.role);
+        if (fields?.error) return fieldsError(fields);
+
         let query = {};
         if (user.role === 'student') {
           query.studentId = user.userId;
@@ -611,27 +1010,12 @@ async function handler(request) {
         }
         // Admin sees all
 
-        const attempts = await db.collection('testAttempts').find(query).toArray();
-        
-        // Add test series names and student details
-        for (const attempt of attempts) {
-          const testSeries = await db.collection('testSeries').findOne({ testSeriesId: attempt.testSeriesId });
-          attempt.testSeriesTitle = testSeries?.title || 'Unknown';
-          
-          if (user.role !== 'student') {
-            const projection = user.role === 'teacher' 
-              ? { name: 1 } // Teachers only see student names
-              : { name: 1, email: 1, phone: 1 }; // Admins see full details
-            
-            const student = await db.collection('users').findOne(
-              { userId: attempt.studentId },
-              { projection }
-            );
-            attempt.studentDetails = student;
-          }
-        }
-
-        return NextResponse.json(attempts, { headers: corsHeaders });
+        // Stream results, adding test series names and student details a batch at a time
+        const cursor = db.collection('testAttempts').find(query, fields ? { projection: fields.projection } : {});
+        return await streamJsonArray(request, cursor, {
+          headers: corsHeaders,
+          transformBatch: (attempts) => enrichAttempts(db, attempts, user.role, fields?.include)
+        });
       }
 
       if (method === 'POST' && user.role === 'student') {
@@ -660,16 +1044,21 @@ async function handler(request) {
           return NextResponse.json({ 
             attemptId: inProgressAttempt.attemptId, 
             endTime: inProgressAttempt.endTime,
+            versionId: inProgressAttempt.versionId,
             totalQuestions: inProgressAttempt.totalQuestions,
             existing: true
           }, { headers: corsHeaders });
         }
         
+        // Only the question stubs are stored on the test series; the attempt reads full questions
+        // from its version a page at a time
         const testSeries = await db.collection('testSeries').findOne({ testSeriesId });
         if (!testSeries) {
           return NextResponse.json({ error: 'Test series not found' }, { status: 404, headers: corsHeaders });
         }
         
+        // Pin the attempt to the current version of the questions
+        const { versionId, questionCount } = await currentVersion(db, testSeries);
         const attemptId = uuidv4();
         const startTime = new Date();
         const endTime = new Date(startTime.getTime() + (testSeries.duration * 60 * 1000));
@@ -677,6 +1066,7 @@ async function handler(request) {
         const attempt = {
           attemptId,
           testSeriesId,
+          versionId,
           studentId: user.userId,
           studentName: user.name,
           startTime,
@@ -684,7 +1074,7 @@ async function handler(request) {
           status: 'in_progress',
           answers: {},
           score: 0,
-          totalQuestions: testSeries.questions.length,
+          totalQuestions: questionCount,
           createdAt: new Date()
         };
         
@@ -693,7 +1083,8 @@ async function handler(request) {
         return NextResponse.json({ 
           attemptId, 
           endTime: endTime.toISOString(),
-          totalQuestions: testSeries.questions.length
+          versionId,
+          totalQuestions: questionCount
         }, { headers: corsHeaders });
       }
 
@@ -719,14 +1110,8 @@ async function handler(request) {
         // Check if test time has expired
         if (new Date() > new Date(attempt.endTime)) {
           // Auto-submit the test
-          const testSeries = await db.collection('testSeries').findOne({ testSeriesId: attempt.testSeriesId });
-          let score = 0;
-          
-          for (const question of testSeries.questions) {
-            if (attempt.answers[question.questionId] === question.correctAnswer) {
-              score++;
-            }
-          }
+          const questions = await attemptQuestions(db, attempt);
+          const { score } = gradeAnswers(questions, attempt.answers);
           
           await db.collection('testAttempts').updateOne(
             { attemptId },
@@ -742,7 +1127,7 @@ async function handler(request) {
           return NextResponse.json({ 
             message: 'Test time expired and auto-submitted',
             score,
-            totalQuestions: testSeries.questions.length,
+            totalQuestions: questions.length,
             timeExpired: true
           }, { headers: corsHeaders });
         }
@@ -758,49 +1143,22 @@ async function handler(request) {
         }
         
         if (action === 'complete_test') {
-          // Complete the test and calculate score
-          const testSeries = await db.collection('testSeries').findOne({ testSeriesId: attempt.testSeriesId });
-          let score = 0;
-          
-          // Get the latest answers from the attempt
+          // Complete the test and calculate score from the latest answers
           const currentAttempt = await db.collection('testAttempts').findOne({ attemptId });
-          
-          // Create detailed results with solutions
-          const detailedResults = [];
-          for (const question of testSeries.questions) {
-            const studentAnswer = currentAttempt.answers[question.questionId];
-            const isCorrect = studentAnswer === question.correctAnswer;
-            if (isCorrect) {
-              score++;
-            }
-            
-            detailedResults.push({
-              questionId: question.questionId,
-              question: question.question,
-              options: question.options,
-              studentAnswer: studentAnswer,
-              correctAnswer: question.correctAnswer,
-              isCorrect: isCorrect,
-              explanation: question.explanation || 'No explanation provided'
-            });
+          const questions = await attemptQuestions(db, currentAttempt);
+          const { score, detailedResults } = gradeAnswers(questions, currentAttempt.answers);
+
+          const completion = { status: 'completed', score, completedAt: new Date() };
+          // Versioned attempts rebuild their results from the version when listed
+          if (!currentAttempt.versionId) {
+            completion.detailedResults = detailedResults;
           }
-          
-          await db.collection('testAttempts').updateOne(
-            { attemptId },
-            { 
-              $set: { 
-                status: 'completed', 
-                score,
-                detailedResults,
-                completedAt: new Date()
-              } 
-            }
-          );
+          await db.collection('testAttempts').updateOne({ attemptId }, { $set: completion });
           
           return NextResponse.json({ 
             score,
-            totalQuestions: testSeries.questions.length,
-            percentage: Math.round((score / testSeries.questions.length) * 100),
+            totalQuestions: questions.length,
+            percentage: Math.round((score / questions.length) * 100),
             detailedResults,
             message: 'Test completed successfully'
           }, { headers: corsHeaders });
@@ -815,12 +1173,44 @@ async function handler(request) {
         return NextResponse.json({ error: 'Unauthorized' }, { status: 403, headers: corsHeaders });
       }
 
+      // Student roster import: POST a CSV or NDJSON roster, then poll GET /api/users/import/:id
+      if (path[1] === 'import') {
+        if (method === 'POST' && !path[2]) {
+          const format = ROSTER_FORMATS[(request.headers.get('content-type') || '').split(';')[0].trim()];
+          if (!format) {
+            return NextResponse.json({ error: 'Send the roster as text/csv or application/x-ndjson' }, { status: 415, headers: corsHeaders });
+          }
+          if (!request.body) {
+            return NextResponse.json({ error: 'Roster is empty' }, { status: 400, headers: corsHeaders });
+          }
+
+          try {
+            const job = await importRoster(db, request.body, format, user);
+            return NextResponse.json(job, { status: 202, headers: corsHeaders });
+          } catch (error) {
+            if (!(error instanceof RosterImportError)) throw error;
+            return NextResponse.json({ error: error.message }, { status: 400, headers: corsHeaders });
+          }
+        }
+
+        if (method === 'GET' && path[2]) {
+          const job = await getRosterImport(db, path[2]);
+          if (!job) {
+            return NextResponse.json({ error: 'Import not found' }, { status: 404, headers: corsHeaders });
+          }
+          return NextResponse.json(job, { headers: corsHeaders });
+        }
+      }
+
       if (method === 'GET') {
-        const users = await db.collection('users').find(
+        const fields = parseFields(url.searchParams, 'users', user.role);
+        if (fields?.error) return fieldsError(fields);
+
+        const users = db.collection('users').find(
           {},
-          { projection: { password: 0, resetToken: 0, resetTokenExpiry: 0 } }
-        ).toArray();
-        return NextResponse.json(users, { headers: corsHeaders });
+          { projection: fields?.projection || { password: 0, resetToken: 0, resetTokenExpiry: 0 } }
+        );
+        return await streamJsonArray(request, users, { headers: corsHeaders });
       }
 
       if (method === 'POST') {
@@ -847,7 +1237,13 @@ async function handler(request) {
           createdAt: new Date()
         };
 
-        await db.collection('users').insertOne(newUser);
+        try {
+          await db.collection('users').insertOne(newUser);
+        } catch (error) {
+          // The same username or email created since the check above
+          if (error.code !== DUPLICATE_KEY) throw error;
+          return NextResponse.json({ error: 'User already exists' }, { status: 400, headers: corsHeaders });
+        }
         
         const { password: _, ...userWithoutPassword } = newUser;
         return NextResponse.json(userWithoutPassword, { headers: corsHeaders });
@@ -905,6 +1301,24 @@ async function handler(request) {
       }
     }
 
+    // Query monitoring routes (Admin only)
+    if (path[0] === 'metrics' && path[1] === 'queries') {
+      const user = getUserFromRequest(request);
+      if (!user || !hasPermission(user.role, ['admin'])) {
+        return NextResponse.json({ error: 'Unauthorized' }, { status: 403, headers: corsHeaders });
+      }
+
+      if (method === 'GET') {
+        const { limit } = Object.fromEntries(url.searchParams);
+        return NextResponse.json(getQueryStats(parseInt(limit) || 20), { headers: corsHeaders });
+      }
+
+      if (method === 'DELETE') {
+        resetQueryStats();
+        return NextResponse.json({ message: 'Query stats reset' }, { headers: corsHeaders });
+      }
+    }
+
     return NextResponse.json({ error: 'Route not found' }, { status: 404, headers: corsHeaders });
 
   } catch (error) {
@@ -913,4 +1327,18 @@ async function handler(request) {
   }
 }
 
+// Writes that clients retry; a repeated Idempotency-Key replays the first response
+const IDEMPOTENT_ROUTES = new Set(['POST /api/test-attempts', 'PUT /api/test-attempts/:id']);
+
+// Count the Mongo commands each request issues (see lib/query-monitor.js)
+async function handler(request) {
+  const { pathname } = new URL(request.url);
+  const route = routeKey(request.method, pathname);
+  const user = IDEMPOTENT_ROUTES.has(route) ? getUserFromRequest(request) : null;
+  const handle = user
+    ? () => withIdempotency(request, `${user.userId} ${request.method} ${pathname}`, corsHeaders, () => handleRequest(request))
+    : () => handleRequest(request);
+  return journalRequest(request, route, getUserFromRequest, () => trackRequest(route, handle));
+}
+
 export { handler as GET, handler as POST, handler as PUT, handler as DELETE, handler as OPTIONS };
\ No newline at end of file
@@ -1,22 +1,37 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
+import dynamic from 'next/dynamic';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
-import { Textarea } from '@/components/ui/textarea';
 import { Badge } from '@/components/ui/badge';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
-import { AlertDialog, AlertDialogAction, AlertDialogCancel, AlertDialogContent, AlertDialogDescription, AlertDialogFooter, AlertDialogHeader, AlertDialogTitle, AlertDialogTrigger } from '@/components/ui/alert-dialog';
-import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, DialogTrigger } from '@/components/ui/dialog';
-import { RadioGroup, RadioGroupItem } from '@/components/ui/radio-group';
-import { Progress } from '@/components/ui/progress';
-import { BookOpen, Users, BarChart3, Plus, Edit, Trash2, Play, Clock, CheckCircle, X, ChevronLeft, ChevronRight, Upload, FileText, User, Building, Phone, GraduationCap, Camera, Download, Mail, Lock, Eye, EyeOff } from 'lucide-react';
+import { Users, X, ChevronLeft, Upload, User, Phone, Camera } from 'lucide-react';
 import { toast } from 'sonner';
 
 const API_BASE = '/api';
+const QUESTION_PAGE_SIZE = 20; // questions fetched at a time while taking a test
+// Test series fields the catalogue cards show
+const CATALOGUE_FIELDS = [
+  'testSeriesId', 'title', 'description', 'category', 'duration', 'status', 'createdBy', 'questionCount',
+  'createdByName', 'createdByPhoto', 'createdByRating', 'totalAttempts', 'averagePercentage'
+].join(',');
+
+// Tabs and the exam screen are separate chunks, fetched the first time they render. Students only
+// ever render the dashboard, catalogue and exam, so they never download the teacher and admin code.
+function TabLoading() {
+  return <div className="py-12 text-center text-gray-600">Loading...</div>;
+}
+const DashboardContent = dynamic(() => import('@/components/views/dashboard-content'), { loading: TabLoading });
+const TestSeriesContent = dynamic(() => import('@/components/views/test-series-content'), { loading: TabLoading });
+const ResultsContent = dynamic(() => import('@/components/views/results-content'), { loading: TabLoading });
+const AnalyticsContent = dynamic(() => import('@/components/views/analytics-content'), { loading: TabLoading });
+const CategoriesContent = dynamic(() => import('@/components/views/categories-content'), { loading: TabLoading });
+const UsersContent = dynamic(() => import('@/components/views/users-content'), { loading: TabLoading });
+const ExamView = dynamic(() => import('@/components/views/exam-view'), { loading: TabLoading });
 
 export default function TestSeriesApp() {
   const [user, setUser] = useState(null);
@@ -31,6 +46,7 @@ export default function TestSeriesApp() {
   const [currentTest, setCurrentTest] = useState(null);
   const [currentAttempt, setCurrentAttempt] = useState(null);
   const [currentQuestion, setCurrentQuestion] = useState(0);
+  const requestedPages = useRef(new Set()); // question pages of currentTest fetched or in flight
   const [answers, setAnswers] = useState({});
   const [timeLeft, setTimeLeft] = useState(0);
   const [testCompleted, setTestCompleted] = useState(false);
@@ -49,6 +65,9 @@ export default function TestSeriesApp() {
   const [detailedResults, setDetailedResults] = useState(null);
   const [showPreview, setShowPreview] = useState(false);
   const [previewTest, setPreviewTest] = useState(null);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null); // null when not searching
+  const [rosterImport, setRosterImport] = useState(null); // latest roster import status (admin)
 
   // Authentication functions
   const login = async (credentials) => {
@@ -178,10 +197,12 @@ export default function TestSeriesApp() {
   };
 
   // Load data functions
+  // Questions are paged in once an attempt starts and previews load their own copy, so the
+  // catalogue never downloads them
   const loadTestSeries = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE}/test-series`, {
+      const response = await fetch(`${API_BASE}/test-series?fields=${CATALOGUE_FIELDS}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       const data = await response.json();
@@ -200,6 +221,30 @@ export default function TestSeriesApp() {
     }
   };
 
+  const searchTestSeries = async (q) => {
+    setSearchQuery(q);
+    if (!q.trim()) {
+      setSearchResults(null);
+      return;
+    }
+
+    try {
+      const token = localStorage.getItem('token');
+      const params = new URLSearchParams({ q, limit: '50' });
+      const response = await fetch(`${API_BASE}/test-series/search?${params}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      const data = await response.json();
+      if (response.ok) {
+        setSearchResults(data.results);
+      } else {
+        toast.error(data.error || 'Search failed');
+      }
+    } catch (error) {
+      console.error('Error searching test series:', error);
+    }
+  };
+
   const loadAttempts = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -229,7 +274,8 @@ export default function TestSeriesApp() {
   const loadUsers = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`${API_BASE}/users`, {
+      // Only the columns UsersContent renders
+      const response = await fetch(`${API_BASE}/users?fields=userId,name,username,role,email,photo,createdAt`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
       const data = await response.json();
@@ -239,6 +285,44 @@ export default function TestSeriesApp() {
     }
   };
 
+  // Upload a CSV/NDJSON student roster, then poll its status until the import finishes
+  const importRoster = async (file) => {
+    const token = localStorage.getItem('token');
+    const contentType = /\.(ndjson|jsonl)$/i.test(file.name) ? 'application/x-ndjson' : 'text/csv';
+    try {
+      const response = await fetch(`${API_BASE}/users/import`, {
+        method: 'POST',
+        headers: { 'Content-Type': contentType, 'Authorization': `Bearer ${token}` },
+        body: file
+      });
+      let job = await response.json();
+      if (!response.ok) {
+        toast.error(job.error || 'Failed to import roster');
+        return;
+      }
+      setRosterImport(job);
+      while (job.status === 'receiving' || job.status === 'processing') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const status = await fetch(`${API_BASE}/users/import/${job.importId}`, {
+          headers: { 'Authorization': `Bearer ${token}` }
+        });
+        job = await status.json();
+        setRosterImport(job);
+      }
+      if (job.status === 'completed') {
+        toast.success(`Imported ${job.counts.inserted} students`);
+        loadUsers();
+      } else if (job.status === 'partial') {
+        toast.warning(`Imported ${job.counts.inserted} students. ${job.error}`);
+        loadUsers();
+      } else {
+        toast.error(job.error || 'Roster import failed');
+      }
+    } catch (error) {
+      toast.error('Network error. Please try again.');
+    }
+  };
+
   const loadProfile = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -326,8 +410,38 @@ export default function TestSeriesApp() {
     }
   };
 
+  // Publish, unpublish or delete many test series in one request
+  const bulkTestSeriesAction = async (action, testSeriesIds) => {
+    if (!testSeriesIds.length) return;
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(`${API_BASE}/test-series/bulk`, {
+        method: 'POST',
+        headers: { 
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${token}` 
+        },
+        body: JSON.stringify({ action, ids: testSeriesIds })
+      });
+      
+      const data = await response.json();
+      if (response.ok) {
+        const changed = (data.summary.updated || 0) + (data.summary.deleted || 0);
+        const failed = testSeriesIds.length - changed - (data.summary.unchanged || 0);
+        toast.success(`${changed} test${changed === 1 ? '' : 's'} ${action === 'delete' ? 'deleted' : `${action}ed`}`);
+        if (failed) toast.error(`${failed} test${failed === 1 ? '' : 's'} could not be changed`);
+        loadTestSeries();
+      } else {
+        toast.error(data.error || 'Failed to update tests');
+      }
+    } catch (error) {
+      toast.error('Network error. Please try again.');
+    }
+  };
+
   // Test taking functions
   const startTest = async (testSeriesId) => {
+    import('@/components/views/exam-view'); // fetch the exam chunk while the attempt starts
     try {
       const token = localStorage.getItem('token');
       const response = await fetch(`${API_BASE}/test-attempts`, {
@@ -344,13 +458,16 @@ export default function TestSeriesApp() {
       if (response.ok) {
         setCurrentAttempt(data);
         
-        // Load test details
-        const testResponse = await fetch(`${API_BASE}/test-series`, {
-          headers: { 'Authorization': `Bearer ${token}` }
+        // Test details come from the list already loaded; questions are fetched a page at a time
+        // as the student moves through them
+        const test = [...(searchResults ?? []), ...testSeries].find(t => t.testSeriesId === testSeriesId);
+        requestedPages.current = new Set();
+        setCurrentTest({
+          ...test,
+          testSeriesId,
+          questions: Array(data.totalQuestions).fill(null),
+          totalQuestions: data.totalQuestions
         });
-        const tests = await testResponse.json();
-        const test = tests.find(t => t.testSeriesId === testSeriesId);
-        setCurrentTest(test);
         
         // Set up timer
         const endTime = new Date(data.endTime);
@@ -367,6 +484,30 @@ export default function TestSeriesApp() {
     }
   };
 
+  const loadQuestionPage = async (testSeriesId, page) => {
+    if (requestedPages.current.has(page)) return;
+    requestedPages.current.add(page);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(
+        `${API_BASE}/test-series/${testSeriesId}/questions?page=${page}&limit=${QUESTION_PAGE_SIZE}`,
+        { headers: { 'Authorization': `Bearer ${token}` } }
+      );
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || 'Failed to load questions');
+
+      setCurrentTest(prev => {
+        if (prev?.testSeriesId !== testSeriesId) return prev;
+        const questions = [...prev.questions];
+        questions.splice((page - 1) * QUESTION_PAGE_SIZE, data.questions.length, ...data.questions);
+        return { ...prev, questions };
+      });
+    } catch (error) {
+      requestedPages.current.delete(page); // retried when the student navigates again
+      toast.error(error.message || 'Failed to load questions');
+    }
+  };
+
   const submitAnswer = async (questionId, answer) => {
     if (!currentAttempt) return;
     
@@ -400,7 +541,9 @@ export default function TestSeriesApp() {
         method: 'PUT',
         headers: { 
           'Content-Type': 'application/json',
-          'Authorization': `Bearer ${token}` 
+          'Authorization': `Bearer ${token}`,
+          // A retried submission (double click, flaky network) replays the first result
+          'Idempotency-Key': `complete:${currentAttempt.attemptId}`
         },
         body: JSON.stringify({ action: 'complete_test' })
       });
@@ -464,6 +607,12 @@ export default function TestSeriesApp() {
       
       if (response.ok) {
         toast.success(data.message);
+        if (data.duplicateQuestions) {
+          toast.warning(`${data.duplicateQuestions.length} repeated question(s) were kept once`);
+        }
+        if (data.explanationConflicts) {
+          toast.warning(`${data.explanationConflicts.length} question(s) already in your bank kept their existing explanation`);
+        }
         loadTestSeries();
       } else {
         toast.error(data.error || 'Failed to upload CSV');
@@ -554,6 +703,16 @@ export default function TestSeriesApp() {
     }
   }, [timeLeft, currentTest, testCompleted]);
 
+  // Fetch the page holding the current question, and the next one ahead of time
+  useEffect(() => {
+    if (!currentTest || testCompleted) return;
+    const page = Math.floor(currentQuestion / QUESTION_PAGE_SIZE) + 1;
+    loadQuestionPage(currentTest.testSeriesId, page);
+    if (page * QUESTION_PAGE_SIZE < currentTest.totalQuestions) {
+      loadQuestionPage(currentTest.testSeriesId, page + 1);
+    }
+  }, [currentQuestion, currentTest?.testSeriesId, testCompleted]);
+
   // Initial load
   useEffect(() => {
     const token = localStorage.getItem('token');
@@ -625,106 +784,19 @@ export default function TestSeriesApp() {
 
   // Test Taking Interface
   if (currentTest && !testCompleted) {
-    const question = currentTest.questions[currentQuestion];
-    const hours = Math.floor(timeLeft / 3600);
-    const minutes = Math.floor((timeLeft % 3600) / 60);
-    const seconds = timeLeft % 60;
-
     return (
-      <div className="min-h-screen bg-gray-50">
-        <div className="bg-white shadow-sm border-b">
-          <div className="max-w-4xl mx-auto px-4 py-4 flex justify-between items-center">
-            <div>
-              <h1 className="text-xl font-bold">{currentTest.title}</h1>
-              <p className="text-sm text-gray-600">
-                Question {currentQuestion + 1} of {currentTest.questions.length}
-              </p>
-            </div>
-            <div className="flex items-center space-x-4">
-              <div className="flex items-center space-x-2">
-                <Clock className="h-4 w-4 text-orange-500" />
-                <span className="font-mono text-lg">
-                  {String(hours).padStart(2, '0')}:{String(minutes).padStart(2, '0')}:{String(seconds).padStart(2, '0')}
-                </span>
-              </div>
-              <Button 
-                onClick={() => setShowSubmitDialog(true)}
-                variant="destructive"
-              >
-                Submit Test
-              </Button>
-            </div>
-          </div>
-        </div>
-
-        <div className="max-w-4xl mx-auto p-6">
-          <Card>
-            <CardHeader>
-              <CardTitle>Question {currentQuestion + 1}</CardTitle>
-              <CardDescription>{question?.question}</CardDescription>
-            </CardHeader>
-            <CardContent className="space-y-4">
-              <RadioGroup 
-                value={answers[question?.questionId]?.toString() || ''} 
-                onValueChange={(value) => {
-                  const answerIndex = parseInt(value);
-                  setAnswers(prev => ({ ...prev, [question?.questionId]: answerIndex }));
-                  submitAnswer(question?.questionId, answerIndex);
-                }}
-              >
-                {question?.options.map((option, index) => (
-                  <div key={`${question?.questionId}-${index}`} className="flex items-center space-x-2">
-                    <RadioGroupItem 
-                      value={index.toString()} 
-                      id={`question-${question?.questionId}-option-${index}`} 
-                    />
-                    <Label 
-                      htmlFor={`question-${question?.questionId}-option-${index}`} 
-                      className="text-sm cursor-pointer"
-                    >
-                      {option}
-                    </Label>
-                  </div>
-                ))}
-              </RadioGroup>
-              
-              <div className="flex justify-between pt-6">
-                <Button 
-                  variant="outline" 
-                  onClick={() => setCurrentQuestion(Math.max(0, currentQuestion - 1))}
-                  disabled={currentQuestion === 0}
-                >
-                  <ChevronLeft className="mr-2 h-4 w-4" /> Previous
-                </Button>
-                <Button 
-                  onClick={() => setCurrentQuestion(Math.min(currentTest.questions.length - 1, currentQuestion + 1))}
-                  disabled={currentQuestion === currentTest.questions.length - 1}
-                >
-                  Next <ChevronRight className="ml-2 h-4 w-4" />
-                </Button>
-              </div>
-            </CardContent>
-          </Card>
-        </div>
-
-        {/* Fixed Submit Dialog */}
-        <AlertDialog open={showSubmitDialog} onOpenChange={setShowSubmitDialog}>
-          <AlertDialogContent>
-            <AlertDialogHeader>
-              <AlertDialogTitle>Submit Test</AlertDialogTitle>
-              <AlertDialogDescription>
-                Are you sure you want to submit your test? You won't be able to make any changes after submission.
-              </AlertDialogDescription>
-            </AlertDialogHeader>
-            <AlertDialogFooter>
-              <AlertDialogCancel>Cancel</AlertDialogCancel>
-              <AlertDialogAction onClick={completeTest}>
-                Submit Test
-              </AlertDialogAction>
-            </AlertDialogFooter>
-          </AlertDialogContent>
-        </AlertDialog>
-      </div>
+      <ExamView
+        currentTest={currentTest}
+        currentQuestion={currentQuestion}
+        setCurrentQuestion={setCurrentQuestion}
+        timeLeft={timeLeft}
+        answers={answers}
+        setAnswers={setAnswers}
+        submitAnswer={submitAnswer}
+        showSubmitDialog={showSubmitDialog}
+        setShowSubmitDialog={setShowSubmitDialog}
+        completeTest={completeTest}
+      />
     );
   }
 
@@ -1054,12 +1126,38 @@ export default function TestSeriesApp() {
 
           {/* Dashboard Tab */}
           <TabsContent value="dashboard" className="mt-6">
-            <DashboardContent />
+            <DashboardContent
+              user={user}
+              testSeries={testSeries}
+              attempts={attempts}
+              categories={categories}
+              teachers={teachers}
+              analytics={analytics}
+              users={users}
+            />
           </TabsContent>
 
           {/* Test Series Tab */}
           <TabsContent value="tests" className="mt-6">
-            <TestSeriesContent />
+            <TestSeriesContent
+              user={user}
+              testSeries={testSeries}
+              searchResults={searchResults}
+              searchQuery={searchQuery}
+              activeCategory={activeCategory}
+              selectedTeacher={selectedTeacher}
+              categoryTeachers={categoryTeachers}
+              attempts={attempts}
+              categories={categories}
+              searchTestSeries={searchTestSeries}
+              startTest={startTest}
+              previewTestSeries={previewTestSeries}
+              toggleTestStatus={toggleTestStatus}
+              deleteTestSeries={deleteTestSeries}
+              bulkTestSeriesAction={bulkTestSeriesAction}
+              createTestSeries={createTestSeries}
+              uploadCSV={uploadCSV}
+            />
           </TabsContent>
 
           {/* Profile Tab */}
@@ -1070,28 +1168,28 @@ export default function TestSeriesApp() {
           {/* Results Tab */}
           {(user?.role === 'teacher' || user?.role === 'admin') && (
             <TabsContent value="results" className="mt-6">
-              <ResultsContent />
+              <ResultsContent user={user} attempts={attempts} />
             </TabsContent>
           )}
 
           {/* Analytics Tab */}
           {(user?.role === 'teacher' || user?.role === 'admin') && (
             <TabsContent value="analytics" className="mt-6">
-              <AnalyticsContent />
+              <AnalyticsContent analytics={analytics} />
             </TabsContent>
           )}
 
           {/* Categories Tab */}
           {user?.role === 'admin' && (
             <TabsContent value="categories" className="mt-6">
-              <CategoriesContent />
+              <CategoriesContent categories={categories} createCategory={createCategory} />
             </TabsContent>
           )}
 
           {/* Users Tab */}
           {user?.role === 'admin' && (
             <TabsContent value="users" className="mt-6">
-              <UsersContent />
+              <UsersContent users={users} rosterImport={rosterImport} importRoster={importRoster} />
             </TabsContent>
           )}
         </Tabs>
@@ -1308,436 +1406,6 @@ export default function TestSeriesApp() {
     );
   }
 
-  function DashboardContent() {
-    return (
-      <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-        {user?.role === 'student' && (
-          <>
-            <Card>
-              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                <CardTitle className="text-sm font-medium">Available Tests</CardTitle>
-                <BookOpen className="h-4 w-4 text-muted-foreground" />
-              </CardHeader>
-              <CardContent>
-                <div className="text-2xl font-bold">{testSeries.length}</div>
-                <p className="text-xs text-muted-foreground">
-                  Test series available to take
-                </p>
-              </CardContent>
-            </Card>
-            <Card>
-              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                <CardTitle className="text-sm font-medium">Tests Completed</CardTitle>
-                <CheckCircle className="h-4 w-4 text-muted-foreground" />
-              </CardHeader>
-              <CardContent>
-                <div className="text-2xl font-bold">{attempts.filter(a => a.status === 'completed').length}</div>
-                <p className="text-xs text-muted-foreground">
-                  Tests you have completed
-                </p>
-              </CardContent>
-            </Card>
-            {user.selectedCategory && user.selectedTeacher && (
-              <Card>
-                <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                  <CardTitle className="text-sm font-medium">Your Selection</CardTitle>
-                  <GraduationCap className="h-4 w-4 text-muted-foreground" />
-                </CardHeader>
-                <CardContent>
-                  <div className="text-sm">
-                    <div>Category: <span className="font-medium">{categories.find(c => c.categoryId === user.selectedCategory)?.name || 'Selected'}</span></div>
-                    <div>Teacher: <span className="font-medium">{teachers.find(t => t.userId === user.selectedTeacher)?.name || 'Selected'}</span></div>
-                  </div>
-                </CardContent>
-              </Card>
-            )}
-          </>
-        )}
-        
-        {(user?.role === 'teacher' || user?.role === 'admin') && analytics && (
-          <>
-            <Card>
-              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                <CardTitle className="text-sm font-medium">Test Series</CardTitle>
-                <BookOpen className="h-4 w-4 text-muted-foreground" />
-              </CardHeader>
-              <CardContent>
-                <div className="text-2xl font-bold">{analytics.totalTestSeries}</div>
-                <p className="text-xs text-muted-foreground">
-                  {user?.role === 'teacher' ? 'Your test series' : 'Total test series'}
-                </p>
-              </CardContent>
-            </Card>
-            <Card>
-              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                <CardTitle className="text-sm font-medium">Total Attempts</CardTitle>
-                <Users className="h-4 w-4 text-muted-foreground" />
-              </CardHeader>
-              <CardContent>
-                <div className="text-2xl font-bold">{analytics.totalAttempts}</div>
-                <p className="text-xs text-muted-foreground">
-                  Test attempts made
-                </p>
-              </CardContent>
-            </Card>
-            {user?.role === 'admin' && (
-              <Card>
-                <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
-                  <CardTitle className="text-sm font-medium">Total Users</CardTitle>
-                  <Users className="h-4 w-4 text-muted-foreground" />
-                </CardHeader>
-                <CardContent>
-                  <div className="text-2xl font-bold">{analytics.totalUsers || users.length}</div>
-                  <p className="text-xs text-muted-foreground">
-                    Registered users
-                  </p>
-                </CardContent>
-              </Card>
-            )}
-          </>
-        )}
-      </div>
-    );
-  }
-
-  function TestSeriesContent() {
-    const [showCreateDialog, setShowCreateDialog] = useState(false);
-    const [showCSVDialog, setShowCSVDialog] = useState(false);
-    const [selectedTestForCSV, setSelectedTestForCSV] = useState('');
-
-    // Filter tests based on active category and selected teacher
-    const filteredTests = testSeries.filter(test => {
-      if (user?.role === 'student') {
-        if (activeCategory !== 'all' && test.category !== activeCategory) return false;
-        if (selectedTeacher && test.createdBy !== selectedTeacher) return false;
-      }
-      return true;
-    });
-
-    return (
-      <div className="space-y-6">
-        <div className="flex justify-between items-center">
-          <div>
-            <h2 className="text-2xl font-bold">Test Series</h2>
-            {user?.role === 'student' && activeCategory !== 'all' && (
-              <p className="text-sm text-gray-600">
-                Showing tests for {activeCategory}
-                {selectedTeacher && categoryTeachers.find(t => t.userId === selectedTeacher) && 
-                  ` by ${categoryTeachers.find(t => t.userId === selectedTeacher).name}`}
-              </p>
-            )}
-          </div>
-          {(user?.role === 'teacher' || user?.role === 'admin') && (
-            <div className="flex space-x-2">
-              <Button onClick={() => setShowCSVDialog(true)}>
-                <Upload className="mr-2 h-4 w-4" /> Upload CSV
-              </Button>
-              <Button onClick={() => setShowCreateDialog(true)}>
-                <Plus className="mr-2 h-4 w-4" /> Create Test
-              </Button>
-            </div>
-          )}
-        </div>
-
-        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredTests.map((test) => (
-            <Card key={test.testSeriesId} className="hover:shadow-lg transition-shadow">
-              {/* Udemy-style header with teacher info */}
-              <div className="p-4 border-b bg-gradient-to-r from-blue-50 to-purple-50">
-                <div className="flex items-center space-x-3">
-                  <div className="w-12 h-12 bg-gray-100 rounded-full flex items-center justify-center overflow-hidden">
-                    {test.createdByPhoto ? (
-                      <img src={test.createdByPhoto} alt={test.createdByName} className="w-full h-full object-cover" />
-                    ) : (
-                      <User className="h-6 w-6 text-gray-400" />
-                    )}
-                  </div>
-                  <div className="flex-1">
-                    <h3 className="font-medium text-gray-900">{test.createdByName}</h3>
-                    <div className="flex items-center space-x-2 text-sm">
-                      <div className="flex text-yellow-400">
-                        {[...Array(5)].map((_, i) => (
-                          <span key={i} className={i < (test.createdByRating || 4) ? 'text-yellow-400' : 'text-gray-300'}>★</span>
-                        ))}
-                      </div>
-                      <span className="text-gray-600">({test.totalAttempts || 0} students)</span>
-                    </div>
-                  </div>
-                  {(user?.role === 'teacher' || user?.role === 'admin') && 
-                   (user?.role === 'admin' || test.createdBy === user?.userId) && (
-                    <div className="flex space-x-1">
-                      <Button size="sm" variant="ghost" onClick={() => previewTestSeries(test.testSeriesId)}>
-                        <Play className="h-4 w-4 text-blue-500" />
-                      </Button>
-                      <Button 
-                        size="sm" 
-                        variant="ghost" 
-                        onClick={() => toggleTestStatus(test.testSeriesId, test.status)}
-                        title={test.status === 'draft' ? 'Publish test' : 'Unpublish test'}
-                      >
-                        <CheckCircle className={`h-4 w-4 ${test.status === 'draft' ? 'text-gray-400' : 'text-green-500'}`} />
-                      </Button>
-                      <Button size="sm" variant="ghost">
-                        <Edit className="h-4 w-4 text-gray-500" />
-                      </Button>
-                      <Button size="sm" variant="ghost" onClick={() => deleteTestSeries(test.testSeriesId)}>
-                        <Trash2 className="h-4 w-4 text-red-500" />
-                      </Button>
-                    </div>
-                  )}
-                </div>
-              </div>
-
-              <CardHeader>
-                <div className="space-y-2">
-                  <CardTitle className="text-lg line-clamp-2">{test.title}</CardTitle>
-                  <CardDescription className="line-clamp-2">{test.description}</CardDescription>
-                  <div className="flex items-center space-x-2">
-                    <Badge variant="secondary">{test.category}</Badge>
-                    {(user?.role === 'teacher' || user?.role === 'admin') && (
-                      <Badge variant={test.status === 'draft' ? 'destructive' : 'default'}>
-                        {test.status === 'draft' ? 'Draft' : 'Published'}
-                      </Badge>
-                    )}
-                    {test.averagePercentage > 0 && (
-                      <Badge variant="outline" className="text-green-600">
-                        {Math.round(test.averagePercentage)}% avg score
-                      </Badge>
-                    )}
-                  </div>
-                </div>
-              </CardHeader>
-              
-              <CardContent>
-                <div className="space-y-3">
-                  <div className="grid grid-cols-2 gap-4 text-sm text-gray-600">
-                    <div className="flex items-center space-x-2">
-                      <Clock className="h-4 w-4" />
-                      <span>{test.duration} min</span>
-                    </div>
-                    <div className="flex items-center space-x-2">
-                      <BookOpen className="h-4 w-4" />
-                      <span>{test.questions?.length || 0} questions</span>
-                    </div>
-                    <div className="flex items-center space-x-2">
-                      <Users className="h-4 w-4" />
-                      <span>{test.totalAttempts || 0} attempts</span>
-                    </div>
-                    <div className="flex items-center space-x-2">
-                      <BarChart3 className="h-4 w-4" />
-                      <span>{test.averagePercentage ? `${Math.round(test.averagePercentage)}% avg` : 'New'}</span>
-                    </div>
-                  </div>
-                  
-                  {user?.role === 'student' && (
-                    <Button 
-                      className="w-full mt-4" 
-                      onClick={() => startTest(test.testSeriesId)}
-                      disabled={attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'completed')}
-                    >
-                      {attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'completed') ? (
-                        <>
-                          <CheckCircle className="mr-2 h-4 w-4" />
-                          Completed
-                        </>
-                      ) : attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'in_progress') ? (
-                        <>
-                          <Play className="mr-2 h-4 w-4" />
-                          Resume Test
-                        </>
-                      ) : (
-                        <>
-                          <Play className="mr-2 h-4 w-4" />
-                          Start Test
-                        </>
-                      )}
-                    </Button>
-                  )}
-
-                  {/* Teacher/Admin Action Buttons */}
-                  {(user?.role === 'teacher' || user?.role === 'admin') && (
-                    <div className="grid grid-cols-3 gap-2 mt-4">
-                      <Button 
-                        variant="outline" 
-                        size="sm" 
-                        onClick={() => previewTestSeries(test.testSeriesId)}
-                        className="text-blue-600 hover:text-blue-700"
-                      >
-                        <Eye className="mr-1 h-3 w-3" />
-                        Preview
-                      </Button>
-                      <Button 
-                        variant="outline" 
-                        size="sm" 
-                        onClick={() => toggleTestStatus(test.testSeriesId, test.status)}
-                        className={test.status === 'published' ? 'text-orange-600 hover:text-orange-700' : 'text-green-600 hover:text-green-700'}
-                      >
-                        {test.status === 'published' ? (
-                          <>
-                            <EyeOff className="mr-1 h-3 w-3" />
-                            Unpublish
-                          </>
-                        ) : (
-                          <>
-                            <Eye className="mr-1 h-3 w-3" />
-                            Publish
-                          </>
-                        )}
-                      </Button>
-                      <Button 
-                        variant="outline" 
-                        size="sm" 
-                        onClick={() => deleteTestSeries(test.testSeriesId)}
-                        className="text-red-600 hover:text-red-700"
-                      >
-                        <Trash2 className="mr-1 h-3 w-3" />
-                        Delete
-                      </Button>
-                    </div>
-                  )}
-                </div>
-              </CardContent>
-            </Card>
-          ))}
-        </div>
-
-        {/* Create Test Dialog */}
-        <Dialog open={showCreateDialog} onOpenChange={setShowCreateDialog}>
-          <DialogContent className="max-w-md">
-            <DialogHeader>
-              <DialogTitle>Create Test Series</DialogTitle>
-              <DialogDescription>Create a new test series for your students</DialogDescription>
-            </DialogHeader>
-            <CreateTestForm onSuccess={() => setShowCreateDialog(false)} />
-          </DialogContent>
-        </Dialog>
-
-        {/* CSV Upload Dialog */}
-        <Dialog open={showCSVDialog} onOpenChange={setShowCSVDialog}>
-          <DialogContent className="max-w-md">
-            <DialogHeader>
-              <DialogTitle>Upload Questions via CSV</DialogTitle>
-              <DialogDescription>Upload questions in CSV format: Question, Option A, Option B, Option C, Option D, Correct Answer, Explanation</DialogDescription>
-            </DialogHeader>
-            <CSVUploadForm 
-              testSeries={testSeries.filter(t => t.createdBy === user?.userId)}
-              onSuccess={() => setShowCSVDialog(false)} 
-            />
-          </DialogContent>
-        </Dialog>
-      </div>
-    );
-  }
-
-  function CreateTestForm({ onSuccess }) {
-    const [formData, setFormData] = useState({
-      title: '', description: '', category: '', duration: 60
-    });
-
-    return (
-      <form onSubmit={(e) => {
-        e.preventDefault();
-        createTestSeries(formData).then(() => {
-          setFormData({ title: '', description: '', category: '', duration: 60 });
-          onSuccess();
-        });
-      }} className="space-y-4">
-        <div>
-          <Label htmlFor="title">Title</Label>
-          <Input 
-            id="title"
-            value={formData.title}
-            onChange={(e) => setFormData({...formData, title: e.target.value})}
-            required
-          />
-        </div>
-        <div>
-          <Label htmlFor="description">Description</Label>
-          <Textarea 
-            id="description"
-            value={formData.description}
-            onChange={(e) => setFormData({...formData, description: e.target.value})}
-            rows={3}
-          />
-        </div>
-        <div>
-          <Label htmlFor="category">Category</Label>
-          <Select value={formData.category} onValueChange={(value) => setFormData({...formData, category: value})}>
-            <SelectTrigger>
-              <SelectValue placeholder="Select category" />
-            </SelectTrigger>
-            <SelectContent>
-              {categories.map(category => (
-                <SelectItem key={category.categoryId} value={category.name}>
-                  {category.name}
-                </SelectItem>
-              ))}
-            </SelectContent>
-          </Select>
-        </div>
-        <div>
-          <Label htmlFor="duration">Duration (minutes)</Label>
-          <Input 
-            id="duration"
-            type="number"
-            value={formData.duration}
-            onChange={(e) => setFormData({...formData, duration: parseInt(e.target.value)})}
-            min="1"
-            required
-          />
-        </div>
-        <Button type="submit" className="w-full">Create Test Series</Button>
-      </form>
-    );
-  }
-
-  function CSVUploadForm({ testSeries, onSuccess }) {
-    const [selectedTest, setSelectedTest] = useState('');
-    const [file, setFile] = useState(null);
-
-    return (
-      <form onSubmit={(e) => {
-        e.preventDefault();
-        if (file && selectedTest) {
-          uploadCSV(file, selectedTest).then(() => {
-            setFile(null);
-            setSelectedTest('');
-            onSuccess();
-          });
-        }
-      }} className="space-y-4">
-        <div>
-          <Label htmlFor="testSeries">Select Test Series</Label>
-          <Select value={selectedTest} onValueChange={setSelectedTest}>
-            <SelectTrigger>
-              <SelectValue placeholder="Choose test series" />
-            </SelectTrigger>
-            <SelectContent>
-              {testSeries.map(test => (
-                <SelectItem key={test.testSeriesId} value={test.testSeriesId}>
-                  {test.title}
-                </SelectItem>
-              ))}
-            </SelectContent>
-          </Select>
-        </div>
-        <div>
-          <Label htmlFor="csvFile">CSV File</Label>
-          <Input 
-            id="csvFile"
-            type="file"
-            accept=".csv"
-            onChange={(e) => setFile(e.target.files[0])}
-            required
-          />
-        </div>
-        <Button type="submit" className="w-full" disabled={!file || !selectedTest}>
-          Upload Questions
-        </Button>
-      </form>
-    );
-  }
-
   function ProfileContent() {
     const [photoFile, setPhotoFile] = useState(null);
 
@@ -1819,213 +1487,4 @@ export default function TestSeriesApp() {
       </div>
     );
   }
-
-  function ResultsContent() {
-    return (
-      <div className="space-y-6">
-        <h2 className="text-2xl font-bold">Test Results</h2>
-        <div className="grid gap-4">
-          {attempts.map((attempt) => (
-            <Card key={attempt.attemptId}>
-              <CardContent className="pt-6">
-                <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
-                  <div>
-                    <Label>Test</Label>
-                    <p className="font-medium">{attempt.testSeriesTitle}</p>
-                  </div>
-                  <div>
-                    <Label>Student</Label>
-                    <p className="font-medium">{attempt.studentName}</p>
-                    {/* Teachers see only names, Admins see full details */}
-                    {attempt.studentDetails && user?.role === 'admin' && (
-                      <div className="text-sm text-gray-600 mt-1">
-                        <div>{attempt.studentDetails.email}</div>
-                        <div>{attempt.studentDetails.phone}</div>
-                      </div>
-                    )}
-                  </div>
-                  <div>
-                    <Label>Score</Label>
-                    <p className="font-medium">{attempt.score}/{attempt.totalQuestions}</p>
-                    <p className="text-sm text-gray-600">{Math.round((attempt.score / attempt.totalQuestions) * 100)}%</p>
-                  </div>
-                  <div>
-                    <Label>Status</Label>
-                    <Badge variant={attempt.status === 'completed' ? 'default' : 'secondary'}>
-                      {attempt.status}
-                    </Badge>
-                    {attempt.completedAt && (
-                      <p className="text-sm text-gray-600 mt-1">
-                        {new Date(attempt.completedAt).toLocaleDateString()}
-                      </p>
-                    )}
-                  </div>
-                </div>
-              </CardContent>
-            </Card>
-          ))}
-        </div>
-      </div>
-    );
-  }
-
-  function AnalyticsContent() {
-    return (
-      <div className="space-y-6">
-        <h2 className="text-2xl font-bold">Analytics</h2>
-        {analytics && (
-          <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
-            <Card>
-              <CardHeader>
-                <CardTitle>Test Series</CardTitle>
-              </CardHeader>
-              <CardContent>
-                <div className="text-3xl font-bold">{analytics.totalTestSeries}</div>
-                <p className="text-sm text-gray-600">Total created</p>
-              </CardContent>
-            </Card>
-            <Card>
-              <CardHeader>
-                <CardTitle>Total Attempts</CardTitle>
-              </CardHeader>
-              <CardContent>
-                <div className="text-3xl font-bold">{analytics.totalAttempts}</div>
-                <p className="text-sm text-gray-600">By all students</p>
-              </CardContent>
-            </Card>
-            {analytics.averageScore && (
-              <Card>
-                <CardHeader>
-                  <CardTitle>Average Score</CardTitle>
-                </CardHeader>
-                <CardContent>
-                  <div className="text-3xl font-bold">{analytics.averageScore[0]?.avgScore?.toFixed(1) || 0}</div>
-                  <p className="text-sm text-gray-600">Out of total questions</p>
-                </CardContent>
-              </Card>
-            )}
-          </div>
-        )}
-      </div>
-    );
-  }
-
-  function CategoriesContent() {
-    const [showCreateDialog, setShowCreateDialog] = useState(false);
-
-    return (
-      <div className="space-y-6">
-        <div className="flex justify-between items-center">
-          <h2 className="text-2xl font-bold">Categories</h2>
-          <Button onClick={() => setShowCreateDialog(true)}>
-            <Plus className="mr-2 h-4 w-4" /> Add Category
-          </Button>
-        </div>
-
-        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-          {categories.map((category) => (
-            <Card key={category.categoryId}>
-              <CardHeader>
-                <CardTitle>{category.name}</CardTitle>
-                <CardDescription>{category.description}</CardDescription>
-              </CardHeader>
-              <CardContent>
-                <p className="text-sm text-gray-600">
-                  Created: {new Date(category.createdAt).toLocaleDateString()}
-                </p>
-              </CardContent>
-            </Card>
-          ))}
-        </div>
-
-        <Dialog open={showCreateDialog} onOpenChange={setShowCreateDialog}>
-          <DialogContent className="max-w-md">
-            <DialogHeader>
-              <DialogTitle>Create Category</DialogTitle>
-              <DialogDescription>Add a new test category</DialogDescription>
-            </DialogHeader>
-            <CreateCategoryForm onSuccess={() => setShowCreateDialog(false)} />
-          </DialogContent>
-        </Dialog>
-      </div>
-    );
-  }
-
-  function CreateCategoryForm({ onSuccess }) {
-    const [formData, setFormData] = useState({ name: '', description: '' });
-
-    return (
-      <form onSubmit={(e) => {
-        e.preventDefault();
-        createCategory(formData).then(() => {
-          setFormData({ name: '', description: '' });
-          onSuccess();
-        });
-      }} className="space-y-4">
-        <div>
-          <Label htmlFor="name">Category Name</Label>
-          <Input 
-            id="name"
-            value={formData.name}
-            onChange={(e) => setFormData({...formData, name: e.target.value})}
-            required
-          />
-        </div>
-        <div>
-          <Label htmlFor="description">Description</Label>
-          <Textarea 
-            id="description"
-            value={formData.description}
-            onChange={(e) => setFormData({...formData, description: e.target.value})}
-            rows={3}
-          />
-        </div>
-        <Button type="submit" className="w-full">Create Category</Button>
-      </form>
-    );
-  }
-
-  function UsersContent() {
-    return (
-      <div className="space-y-6">
-        <h2 className="text-2xl font-bold">Users</h2>
-        <div className="grid gap-4">
-          {users.map((user) => (
-            <Card key={user.userId}>
-              <CardContent className="pt-6">
-                <div className="flex items-center space-x-4">
-                  <div className="w-12 h-12 bg-gray-100 rounded-full flex items-center justify-center overflow-hidden">
-                    {user.photo ? (
-                      <img src={user.photo} alt={user.name} className="w-full h-full object-cover" />
-                    ) : (
-                      <User className="h-6 w-6 text-gray-400" />
-                    )}
-                  </div>
-                  <div className="flex-1 grid grid-cols-1 md:grid-cols-4 gap-4">
-                    <div>
-                      <Label>Name</Label>
-                      <p className="font-medium">{user.name}</p>
-                      <p className="text-sm text-gray-600">@{user.username}</p>
-                    </div>
-                    <div>
-                      <Label>Role</Label>
-                      <Badge>{user.role.toUpperCase()}</Badge>
-                    </div>
-                    <div>
-                      <Label>Email</Label>
-                      <p className="text-sm">{user.email || 'Not provided'}</p>
-                    </div>
-                    <div>
-                      <Label>Joined</Label>
-                      <p className="text-sm">{new Date(user.createdAt).toLocaleDateString()}</p>
-                    </div>
-                  </div>
-                </div>
-              </CardContent>
-            </Card>
-          ))}
-        </div>
-      </div>
-    );
-  }
 }
\ No newline at end of file
@@ -4,49 +4,23 @@ Backend Test Suite for Teacher Test Series Visibility Issue
 Testing specific user report about draft status and visibility problems
 """
 
-import requests
 import json
 import time
 from datetime import datetime
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "http://localhost:3000/api"
+api = ApiClient(BASE_URL)
 HEADERS = {"Content-Type": "application/json"}
 
-class TestResults:
-    def __init__(self):
-        self.passed = 0
-        self.failed = 0
-        self.results = []
-    
-    def add_result(self, test_name, passed, message):
-        self.results.append({
-            'test': test_name,
-            'status': 'PASS' if passed else 'FAIL',
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        })
-        if passed:
-            self.passed += 1
-        else:
-            self.failed += 1
-        print(f"{'✅' if passed else '❌'} {test_name}: {message}")
-    
-    def summary(self):
-        total = self.passed + self.failed
-        success_rate = (self.passed / total * 100) if total > 0 else 0
-        print(f"\n📊 TEST SUMMARY:")
-        print(f"Total Tests: {total}")
-        print(f"Passed: {self.passed}")
-        print(f"Failed: {self.failed}")
-        print(f"Success Rate: {success_rate:.1f}%")
-        return success_rate
-
 def test_teacher_login(results):
     """Test login with specific teacher mentioned by user"""
     try:
         # Try login with teacher1 (from previous tests)
-        response = requests.post(f"{BASE_URL}/auth/login", 
+        response = api.post(f"{BASE_URL}/auth/login", 
                                json={"username": "teacher1", "password": "teacher123"}, 
                                headers=HEADERS)
         
@@ -54,12 +28,12 @@ def test_teacher_login(results):
             data = response.json()
             token = data.get('token')
             user_info = data.get('user', {})
-            results.add_result("Teacher Login (teacher1)", True, 
+            results.record("Teacher Login (teacher1)", True, 
                              f"Login successful, userId: {user_info.get('userId')}, role: {user_info.get('role')}")
             return token, user_info.get('userId')
         else:
             # Try to register teacher1 if not exists
-            reg_response = requests.post(f"{BASE_URL}/auth/register", 
+            reg_response = api.post(f"{BASE_URL}/auth/register", 
                                        json={
                                            "username": "teacher1", 
                                            "password": "teacher123",
@@ -72,28 +46,28 @@ def test_teacher_login(results):
             
             if reg_response.status_code == 201:
                 # Now login
-                login_response = requests.post(f"{BASE_URL}/auth/login", 
+                login_response = api.post(f"{BASE_URL}/auth/login", 
                                              json={"username": "teacher1", "password": "teacher123"}, 
                                              headers=HEADERS)
                 if login_response.status_code == 200:
                     data = login_response.json()
                     token = data.get('token')
                     user_info = data.get('user', {})
-                    results.add_result("Teacher Registration & Login", True, 
+                    results.record("Teacher Registration & Login", True, 
                                      f"Created and logged in teacher, userId: {user_info.get('userId')}")
                     return token, user_info.get('userId')
             
-            results.add_result("Teacher Login", False, f"Failed to login or register teacher: {response.status_code}")
+            results.record("Teacher Login", False, f"Failed to login or register teacher: {response.status_code}")
             return None, None
             
     except Exception as e:
-        results.add_result("Teacher Login", False, f"Exception: {str(e)}")
+        results.record("Teacher Login", False, f"Exception: {str(e)}")
         return None, None
 
 def test_create_test_series_status(results, token, teacher_id):
     """Test that new test series are created with 'published' status by default"""
     if not token:
-        results.add_result("Create Test Series Status", False, "No valid token")
+        results.record("Create Test Series Status", False, "No valid token")
         return None
     
     try:
@@ -114,7 +88,7 @@ def test_create_test_series_status(results, token, teacher_id):
             ]
         }
         
-        response = requests.post(f"{BASE_URL}/test-series", 
+        response = api.post(f"{BASE_URL}/test-series", 
                                json=test_data, 
                                headers=auth_headers)
         
@@ -124,64 +98,64 @@ def test_create_test_series_status(results, token, teacher_id):
             status = created_test.get('status')
             
             if status == 'published':
-                results.add_result("Default Status Check", True, 
+                results.record("Default Status Check", True, 
                                  f"Test created with 'published' status (testId: {test_id})")
                 return test_id
             else:
-                results.add_result("Default Status Check", False, 
+                results.record("Default Status Check", False, 
                                  f"Test created with '{status}' status instead of 'published' (testId: {test_id})")
                 return test_id
         else:
-            results.add_result("Create Test Series Status", False, 
+            results.record("Create Test Series Status", False, 
                              f"Failed to create test series: {response.status_code} - {response.text}")
             return None
             
     except Exception as e:
-        results.add_result("Create Test Series Status", False, f"Exception: {str(e)}")
+        results.record("Create Test Series Status", False, f"Exception: {str(e)}")
         return None
 
 def test_teacher_can_see_own_tests(results, token, teacher_id):
     """Test that teacher can see their own test series immediately after creation"""
     if not token:
-        results.add_result("Teacher Test Visibility", False, "No valid token")
+        results.record("Teacher Test Visibility", False, "No valid token")
         return
     
     try:
         auth_headers = {**HEADERS, "Authorization": f"Bearer {token}"}
         
         # Get teacher's test series
-        response = requests.get(f"{BASE_URL}/test-series", headers=auth_headers)
+        response = api.get(f"{BASE_URL}/test-series", headers=auth_headers)
         
         if response.status_code == 200:
             test_series = response.json()
             teacher_tests = [test for test in test_series if test.get('createdBy') == teacher_id]
             
-            results.add_result("Teacher Test List Access", True, 
+            results.record("Teacher Test List Access", True, 
                              f"Retrieved {len(test_series)} total tests, {len(teacher_tests)} created by teacher")
             
             # Check if teacher can see both published and draft tests
             published_tests = [test for test in teacher_tests if test.get('status') == 'published']
             draft_tests = [test for test in teacher_tests if test.get('status') == 'draft']
             
-            results.add_result("Teacher Published Tests Visibility", True, 
+            results.record("Teacher Published Tests Visibility", True, 
                              f"Teacher can see {len(published_tests)} published tests")
-            results.add_result("Teacher Draft Tests Visibility", True, 
+            results.record("Teacher Draft Tests Visibility", True, 
                              f"Teacher can see {len(draft_tests)} draft tests")
             
             return test_series
         else:
-            results.add_result("Teacher Test Visibility", False, 
+            results.record("Teacher Test Visibility", False, 
                              f"Failed to get test series: {response.status_code} - {response.text}")
             return []
             
     except Exception as e:
-        results.add_result("Teacher Test Visibility", False, f"Exception: {str(e)}")
+        results.record("Teacher Test Visibility", False, f"Exception: {str(e)}")
         return []
 
 def test_create_draft_test_manually(results, token, teacher_id):
     """Test creating a test with draft status manually and verify teacher can see it"""
     if not token:
-        results.add_result("Manual Draft Test Creation", False, "No valid token")
+        results.record("Manual Draft Test Creation", False, "No valid token")
         return None
     
     try:
@@ -203,7 +177,7 @@ def test_create_draft_test_manually(results, token, teacher_id):
             ]
         }
         
-        create_response = requests.post(f"{BASE_URL}/test-series", 
+        create_response = api.post(f"{BASE_URL}/test-series", 
                                       json=test_data, 
                                       headers=auth_headers)
         
@@ -212,39 +186,39 @@ def test_create_draft_test_manually(results, token, teacher_id):
             test_id = created_test.get('testSeriesId')
             
             # Now update it to draft status
-            update_response = requests.put(f"{BASE_URL}/test-series/{test_id}", 
+            update_response = api.put(f"{BASE_URL}/test-series/{test_id}", 
                                          json={"status": "draft"}, 
                                          headers=auth_headers)
             
             if update_response.status_code == 200:
-                results.add_result("Manual Draft Creation", True, 
+                results.record("Manual Draft Creation", True, 
                                  f"Successfully created and updated test to draft status (testId: {test_id})")
                 
                 # Verify teacher can still see it
-                list_response = requests.get(f"{BASE_URL}/test-series", headers=auth_headers)
+                list_response = api.get(f"{BASE_URL}/test-series", headers=auth_headers)
                 if list_response.status_code == 200:
                     test_series = list_response.json()
                     draft_test = next((test for test in test_series if test.get('testSeriesId') == test_id), None)
                     
                     if draft_test and draft_test.get('status') == 'draft':
-                        results.add_result("Draft Test Visibility", True, 
+                        results.record("Draft Test Visibility", True, 
                                          f"Teacher can see draft test in their list (status: {draft_test.get('status')})")
                     else:
-                        results.add_result("Draft Test Visibility", False, 
+                        results.record("Draft Test Visibility", False, 
                                          f"Draft test not found in teacher's list or wrong status")
                 
                 return test_id
             else:
-                results.add_result("Manual Draft Creation", False, 
+                results.record("Manual Draft Creation", False, 
                                  f"Failed to update test to draft: {update_response.status_code}")
                 return test_id
         else:
-            results.add_result("Manual Draft Test Creation", False, 
+            results.record("Manual Draft Test Creation", False, 
                              f"Failed to create test: {create_response.status_code}")
             return None
             
     except Exception as e:
-        results.add_result("Manual Draft Test Creation", False, f"Exception: {str(e)}")
+        results.record("Manual Draft Test Creation", False, f"Exception: {str(e)}")
         return None
 
 def test_specific_user_scenario(results):
@@ -252,7 +226,7 @@ def test_specific_user_scenario(results):
     try:
         # Try to find the specific test series mentioned by user
         # First need admin access to check all tests
-        admin_response = requests.post(f"{BASE_URL}/auth/login", 
+        admin_response = api.post(f"{BASE_URL}/auth/login", 
                                      json={"username": "admin", "password": "admin123"}, 
                                      headers=HEADERS)
         
@@ -262,7 +236,7 @@ def test_specific_user_scenario(results):
             admin_headers = {**HEADERS, "Authorization": f"Bearer {admin_token}"}
             
             # Get all test series as admin
-            all_tests_response = requests.get(f"{BASE_URL}/test-series", headers=admin_headers)
+            all_tests_response = api.get(f"{BASE_URL}/test-series", headers=admin_headers)
             
             if all_tests_response.status_code == 200:
                 all_tests = all_tests_response.json()
@@ -270,31 +244,31 @@ def test_specific_user_scenario(results):
                                     if test.get('testSeriesId') == '4991d975-72ef-42df-80e2-ec8a806a33ab'), None)
                 
                 if specific_test:
-                    results.add_result("Specific Test Found", True, 
+                    results.record("Specific Test Found", True, 
                                      f"Found test {specific_test.get('testSeriesId')} with status: {specific_test.get('status')}")
                     
                     # Check if the teacher who created this test can see it
                     teacher_id = specific_test.get('createdBy')
                     if teacher_id:
-                        results.add_result("Specific Test Analysis", True, 
+                        results.record("Specific Test Analysis", True, 
                                          f"Test created by teacher: {teacher_id}, status: {specific_test.get('status')}")
                 else:
-                    results.add_result("Specific Test Found", False, 
+                    results.record("Specific Test Found", False, 
                                      "Test with ID 4991d975-72ef-42df-80e2-ec8a806a33ab not found in database")
             else:
-                results.add_result("Admin Test List", False, 
+                results.record("Admin Test List", False, 
                                  f"Failed to get all tests as admin: {all_tests_response.status_code}")
         else:
-            results.add_result("Admin Login for Specific Test Check", False, 
+            results.record("Admin Login for Specific Test Check", False, 
                              f"Failed to login as admin: {admin_response.status_code}")
             
     except Exception as e:
-        results.add_result("Specific User Scenario", False, f"Exception: {str(e)}")
+        results.record("Specific User Scenario", False, f"Exception: {str(e)}")
 
 def test_teacher_filtering_parameters(results, token, teacher_id):
     """Test various URL parameters that might affect test visibility"""
     if not token:
-        results.add_result("Teacher Filtering Parameters", False, "No valid token")
+        results.record("Teacher Filtering Parameters", False, "No valid token")
         return
     
     try:
@@ -310,24 +284,24 @@ def test_teacher_filtering_parameters(results, token, teacher_id):
         ]
         
         for params, description in test_params:
-            response = requests.get(f"{BASE_URL}/test-series{params}", headers=auth_headers)
+            response = api.get(f"{BASE_URL}/test-series{params}", headers=auth_headers)
             
             if response.status_code == 200:
                 test_series = response.json()
                 teacher_tests = [test for test in test_series if test.get('createdBy') == teacher_id]
-                results.add_result(f"Parameter Test: {description}", True, 
+                results.record(f"Parameter Test: {description}", True, 
                                  f"Retrieved {len(teacher_tests)} teacher tests with params: {params}")
             else:
-                results.add_result(f"Parameter Test: {description}", False, 
+                results.record(f"Parameter Test: {description}", False, 
                                  f"Failed with params {params}: {response.status_code}")
                 
     except Exception as e:
-        results.add_result("Teacher Filtering Parameters", False, f"Exception: {str(e)}")
+        results.record("Teacher Filtering Parameters", False, f"Exception: {str(e)}")
 
 def test_rapid_test_creation_visibility(results, token, teacher_id):
     """Test creating multiple tests rapidly and checking immediate visibility"""
     if not token:
-        results.add_result("Rapid Test Creation", False, "No valid token")
+        results.record("Rapid Test Creation", False, "No valid token")
         return
     
     try:
@@ -351,7 +325,7 @@ def test_rapid_test_creation_visibility(results, token, teacher_id):
                 ]
             }
             
-            create_response = requests.post(f"{BASE_URL}/test-series", 
+            create_response = api.post(f"{BASE_URL}/test-series", 
                                           json=test_data, 
                                           headers=auth_headers)
             
@@ -361,28 +335,28 @@ def test_rapid_test_creation_visibility(results, token, teacher_id):
                 created_test_ids.append(test_id)
                 
                 # Immediately check if it's visible
-                list_response = requests.get(f"{BASE_URL}/test-series", headers=auth_headers)
+                list_response = api.get(f"{BASE_URL}/test-series", headers=auth_headers)
                 if list_response.status_code == 200:
                     test_series = list_response.json()
                     found_test = next((test for test in test_series if test.get('testSeriesId') == test_id), None)
                     
                     if found_test:
-                        results.add_result(f"Rapid Test {i+1} Immediate Visibility", True, 
+                        results.record(f"Rapid Test {i+1} Immediate Visibility", True, 
                                          f"Test {test_id} immediately visible after creation")
                     else:
-                        results.add_result(f"Rapid Test {i+1} Immediate Visibility", False, 
+                        results.record(f"Rapid Test {i+1} Immediate Visibility", False, 
                                          f"Test {test_id} NOT immediately visible after creation")
             else:
-                results.add_result(f"Rapid Test {i+1} Creation", False, 
+                results.record(f"Rapid Test {i+1} Creation", False, 
                                  f"Failed to create test {i+1}: {create_response.status_code}")
             
             time.sleep(0.5)  # Small delay between creations
         
-        results.add_result("Rapid Test Creation Summary", True, 
+        results.record("Rapid Test Creation Summary", True, 
                          f"Created {len(created_test_ids)} tests rapidly: {created_test_ids}")
         
     except Exception as e:
-        results.add_result("Rapid Test Creation", False, f"Exception: {str(e)}")
+        results.record("Rapid Test Creation", False, f"Exception: {str(e)}")
 
 def main():
     print("🧪 BACKEND TESTING: Teacher Test Series Visibility Issue")
@@ -392,7 +366,7 @@ def main():
     print("User reported teacher userId: 97717e61-b920-4faa-9d2a-7a70961474f1")
     print()
     
-    results = TestResults()
+    results = ResultRecorder("backend_test", api, task="Teacher Test Visibility After Creation")
     
     # Test 1: Teacher Login
     print("🔐 Testing Teacher Authentication...")
@@ -439,7 +413,9 @@ def main():
     return results
 
 if __name__ == "__main__":
-    main()
+    results = main()
+    api.print_summary()
+    results.finish()
                 self.log("Teacher already exists, attempting login...")
                 return self.test_teacher_login()
             else:
@@ -460,7 +436,7 @@ if __name__ == "__main__":
                 "password": "teacher123"
             }
             
-            response = requests.post(f"{API_BASE}/auth/login", json=login_data)
+            response = api.post(f"{API_BASE}/auth/login", json=login_data)
             
             if response.status_code == 200:
                 data = response.json()
@@ -482,7 +458,7 @@ if __name__ == "__main__":
             self.log("Getting initial test series list...")
             
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.get(f"{API_BASE}/test-series", headers=headers)
+            response = api.get(f"{API_BASE}/test-series", headers=headers)
             
             if response.status_code == 200:
                 initial_tests = response.json()
@@ -527,7 +503,7 @@ if __name__ == "__main__":
             }
             
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.post(f"{API_BASE}/test-series", json=test_data, headers=headers)
+            response = api.post(f"{API_BASE}/test-series", json=test_data, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -553,7 +529,7 @@ if __name__ == "__main__":
             self.log("Testing immediate visibility of newly created test...")
             
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.get(f"{API_BASE}/test-series", headers=headers)
+            response = api.get(f"{API_BASE}/test-series", headers=headers)
             
             if response.status_code == 200:
                 tests = response.json()
@@ -594,7 +570,7 @@ if __name__ == "__main__":
             time.sleep(2)
             
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.get(f"{API_BASE}/test-series", headers=headers)
+            response = api.get(f"{API_BASE}/test-series", headers=headers)
             
             if response.status_code == 200:
                 tests = response.json()
@@ -629,7 +605,7 @@ if __name__ == "__main__":
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
             
             # Test with includeUnpublished=true
-            response1 = requests.get(f"{API_BASE}/test-series?includeUnpublished=true", headers=headers)
+            response1 = api.get(f"{API_BASE}/test-series?includeUnpublished=true", headers=headers)
             if response1.status_code == 200:
                 tests1 = response1.json()
                 self.log(f"✅ With includeUnpublished=true: {len(tests1)} tests")
@@ -637,7 +613,7 @@ if __name__ == "__main__":
                 self.log(f"   - New test found: {found1}")
             
             # Test with includeUnpublished=false
-            response2 = requests.get(f"{API_BASE}/test-series?includeUnpublished=false", headers=headers)
+            response2 = api.get(f"{API_BASE}/test-series?includeUnpublished=false", headers=headers)
             if response2.status_code == 200:
                 tests2 = response2.json()
                 self.log(f"✅ With includeUnpublished=false: {len(tests2)} tests")
@@ -645,7 +621,7 @@ if __name__ == "__main__":
                 self.log(f"   - New test found: {found2}")
             
             # Test without parameters (default)
-            response3 = requests.get(f"{API_BASE}/test-series", headers=headers)
+            response3 = api.get(f"{API_BASE}/test-series", headers=headers)
             if response3.status_code == 200:
                 tests3 = response3.json()
                 self.log(f"✅ Without parameters (default): {len(tests3)} tests")
@@ -685,14 +661,14 @@ if __name__ == "__main__":
             }
             
             headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.post(f"{API_BASE}/test-series", json=draft_test_data, headers=headers)
+            response = api.post(f"{API_BASE}/test-series", json=draft_test_data, headers=headers)
             
             if response.status_code == 200:
                 draft_test_id = response.json().get('testSeriesId')
                 self.log(f"✅ Draft test created: {draft_test_id}")
                 
                 # Check if draft test appears in list
-                list_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+                list_response = api.get(f"{API_BASE}/test-series", headers=headers)
                 if list_response.status_code == 200:
                     tests = list_response.json()
                     draft_found = any(test.get('testSeriesId') == draft_test_id for test in tests)
@@ -718,7 +694,7 @@ if __name__ == "__main__":
                     ]
                 }
                 
-                response = requests.post(f"{API_BASE}/test-series", json=rapid_data, headers=headers)
+                response = api.post(f"{API_BASE}/test-series", json=rapid_data, headers=headers)
                 if response.status_code == 200:
                     test_id = response.json().get('testSeriesId')
                     rapid_test_ids.append(test_id)
@@ -728,7 +704,7 @@ if __name__ == "__main__":
                 time.sleep(0.1)
             
             # Check if all rapid tests are visible
-            list_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+            list_response = api.get(f"{API_BASE}/test-series", headers=headers)
             if list_response.status_code == 200:
                 tests = list_response.json()
                 for i, test_id in enumerate(rapid_test_ids):
@@ -746,9 +722,9 @@ if __name__ == "__main__":
             }
             
             # Register or login teacher2
-            response = requests.post(f"{API_BASE}/auth/register", json=teacher2_data)
+            response = api.post(f"{API_BASE}/auth/register", json=teacher2_data)
             if response.status_code == 400:  # Already exists
-                response = requests.post(f"{API_BASE}/auth/login", json={
+                response = api.post(f"{API_BASE}/auth/login", json={
                     "username": "teacher2", "password": "teacher123"
                 })
             
@@ -775,21 +751,21 @@ if __name__ == "__main__":
                 }
                 
                 headers2 = {"Authorization": f"Bearer {teacher2_token}"}
-                response = requests.post(f"{API_BASE}/test-series", json=teacher2_test_data, headers=headers2)
+                response = api.post(f"{API_BASE}/test-series", json=teacher2_test_data, headers=headers2)
                 
                 if response.status_code == 200:
                     teacher2_test_id = response.json().get('testSeriesId')
                     self.log(f"   - Teacher2 test created: {teacher2_test_id}")
                     
                     # Check if teacher2 can see their test
-                    list_response = requests.get(f"{API_BASE}/test-series", headers=headers2)
+                    list_response = api.get(f"{API_BASE}/test-series", headers=headers2)
                     if list_response.status_code == 200:
                         tests = list_response.json()
                         found = any(test.get('testSeriesId') == teacher2_test_id for test in tests)
                         self.log(f"   - Teacher2 can see their test: {found}")
                         
                         # Check if teacher1 cannot see teacher2's test
-                        list_response1 = requests.get(f"{API_BASE}/test-series", headers=headers)
+                        list_response1 = api.get(f"{API_BASE}/test-series", headers=headers)
                         if list_response1.status_code == 200:
                             tests1 = list_response1.json()
                             found1 = any(test.get('testSeriesId') == teacher2_test_id for test in tests1)
@@ -7,14 +7,24 @@ Testing only the 3 specific bug fixes implemented:
 3. Test Status Publish/Unpublish Functionality
 """
 
-import requests
 import json
 import sys
 import os
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
 API_BASE = f"{BASE_URL}/api"
+api = ApiClient(API_BASE)
+
+# test_result.md task covered by each section of run_all_tests
+BUG_FIX_TASKS = {
+    "teacher_visibility": "Teacher Test Visibility After Creation",
+    "admin_permissions": "Admin Edit/Delete Permissions for Teacher Tests",
+    "publish_unpublish": "Test Status Publish/Unpublish Functionality",
+}
 
 class TestRunner:
     def __init__(self):
@@ -23,22 +33,16 @@ class TestRunner:
         self.teacher_user_id = None
         self.admin_user_id = None
         self.test_series_id = None
-        self.results = []
+        self.recorder = ResultRecorder("backend_test_bugfixes", api, tasks=BUG_FIX_TASKS)
         
     def log_result(self, test_name, success, message):
         """Log test result"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        self.results.append({
-            'test': test_name,
-            'success': success,
-            'message': message
-        })
+        self.recorder.record(test_name, success, message)
         
     def login_admin(self):
         """Login as admin"""
         try:
-            response = requests.post(f"{API_BASE}/auth/login", json={
+            response = api.post(f"{API_BASE}/auth/login", json={
                 "username": "admin",
                 "password": "admin123"
             })
@@ -65,7 +69,7 @@ class TestRunner:
                 return False
                 
             headers = {"Authorization": f"Bearer {self.admin_token}"}
-            response = requests.get(f"{API_BASE}/users", headers=headers)
+            response = api.get(f"{API_BASE}/users", headers=headers)
             
             if response.status_code == 200:
                 users = response.json()
@@ -74,7 +78,7 @@ class TestRunner:
                 if teachers:
                     teacher = teachers[0]
                     # Try to login with this teacher (assuming password is same as username for test data)
-                    login_response = requests.post(f"{API_BASE}/auth/login", json={
+                    login_response = api.post(f"{API_BASE}/auth/login", json={
                         "username": teacher['username'],
                         "password": teacher['username']  # Common test pattern
                     })
@@ -100,7 +104,7 @@ class TestRunner:
     def create_test_teacher(self):
         """Create a test teacher account"""
         try:
-            response = requests.post(f"{API_BASE}/auth/register", json={
+            response = api.post(f"{API_BASE}/auth/register", json={
                 "username": "testteacher_bugfix",
                 "password": "testteacher_bugfix",
                 "name": "Test Teacher for Bug Fixes",
@@ -111,7 +115,7 @@ class TestRunner:
             
             if response.status_code == 200:
                 # Now login
-                login_response = requests.post(f"{API_BASE}/auth/login", json={
+                login_response = api.post(f"{API_BASE}/auth/login", json={
                     "username": "testteacher_bugfix",
                     "password": "testteacher_bugfix"
                 })
@@ -155,7 +159,7 @@ class TestRunner:
                 ]
             }
             
-            response = requests.post(f"{API_BASE}/test-series", json=test_data, headers=headers)
+            response = api.post(f"{API_BASE}/test-series", json=test_data, headers=headers)
             
             if response.status_code == 200:
                 created_test = response.json()
@@ -168,7 +172,7 @@ class TestRunner:
                     self.log_result("Teacher Test Creation - Default Status", False, f"Test created with status '{created_test.get('status')}' instead of 'published'")
                 
                 # Immediately check if teacher can see their own test
-                get_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+                get_response = api.get(f"{API_BASE}/test-series", headers=headers)
                 
                 if get_response.status_code == 200:
                     teacher_tests = get_response.json()
@@ -202,7 +206,7 @@ class TestRunner:
             headers = {"Authorization": f"Bearer {self.admin_token}"}
             
             # Test 1: Admin can view teacher-created test
-            get_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+            get_response = api.get(f"{API_BASE}/test-series", headers=headers)
             
             if get_response.status_code == 200:
                 admin_tests = get_response.json()
@@ -223,14 +227,14 @@ class TestRunner:
                 "description": "This test was edited by admin to verify permissions"
             }
             
-            edit_response = requests.put(f"{API_BASE}/test-series/{self.test_series_id}", 
+            edit_response = api.put(f"{API_BASE}/test-series/{self.test_series_id}", 
                                        json=update_data, headers=headers)
             
             if edit_response.status_code == 200:
                 self.log_result("Admin Edit Teacher Test", True, "Admin successfully edited teacher-created test")
                 
                 # Verify the edit was applied
-                get_updated = requests.get(f"{API_BASE}/test-series", headers=headers)
+                get_updated = api.get(f"{API_BASE}/test-series", headers=headers)
                 if get_updated.status_code == 200:
                     updated_tests = get_updated.json()
                     updated_test = next((t for t in updated_tests if t['testSeriesId'] == self.test_series_id), None)
@@ -262,14 +266,14 @@ class TestRunner:
             # Test 1: Change status to draft (unpublish)
             unpublish_data = {"status": "draft"}
             
-            unpublish_response = requests.put(f"{API_BASE}/test-series/{self.test_series_id}", 
+            unpublish_response = api.put(f"{API_BASE}/test-series/{self.test_series_id}", 
                                             json=unpublish_data, headers=headers)
             
             if unpublish_response.status_code == 200:
                 self.log_result("Unpublish Test", True, "Successfully changed test status to 'draft'")
                 
                 # Verify status change in database
-                get_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+                get_response = api.get(f"{API_BASE}/test-series", headers=headers)
                 if get_response.status_code == 200:
                     tests = get_response.json()
                     updated_test = next((t for t in tests if t['testSeriesId'] == self.test_series_id), None)
@@ -286,14 +290,14 @@ class TestRunner:
             # Test 2: Change status back to published
             publish_data = {"status": "published"}
             
-            publish_response = requests.put(f"{API_BASE}/test-series/{self.test_series_id}", 
+            publish_response = api.put(f"{API_BASE}/test-series/{self.test_series_id}", 
                                           json=publish_data, headers=headers)
             
             if publish_response.status_code == 200:
                 self.log_result("Publish Test", True, "Successfully changed test status to 'published'")
                 
                 # Verify status change in database
-                get_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+                get_response = api.get(f"{API_BASE}/test-series", headers=headers)
                 if get_response.status_code == 200:
                     tests = get_response.json()
                     updated_test = next((t for t in tests if t['testSeriesId'] == self.test_series_id), None)
@@ -323,13 +327,13 @@ class TestRunner:
             headers = {"Authorization": f"Bearer {self.admin_token}"}
             
             # Admin deletes teacher-created test
-            delete_response = requests.delete(f"{API_BASE}/test-series/{self.test_series_id}", headers=headers)
+            delete_response = api.delete(f"{API_BASE}/test-series/{self.test_series_id}", headers=headers)
             
             if delete_response.status_code == 200:
                 self.log_result("Admin Delete Teacher Test", True, "Admin successfully deleted teacher-created test")
                 
                 # Verify test is deleted
-                get_response = requests.get(f"{API_BASE}/test-series", headers=headers)
+                get_response = api.get(f"{API_BASE}/test-series", headers=headers)
                 if get_response.status_code == 200:
                     tests = get_response.json()
                     deleted_test = next((t for t in tests if t['testSeriesId'] == self.test_series_id), None)
@@ -370,39 +374,30 @@ class TestRunner:
         
         # Run bug fix tests
         print("\n--- BUG FIX #2: Teacher Test Visibility After Creation ---")
+        self.recorder.category = "teacher_visibility"
         self.test_teacher_creates_test_series()
         
         print("\n--- BUG FIX #1: Admin Edit Permissions for Teacher Tests ---")
+        self.recorder.category = "admin_permissions"
         self.test_admin_edit_permissions_for_teacher_tests()
         
         print("\n--- BUG FIX #3: Test Status Publish/Unpublish Functionality ---")
+        self.recorder.category = "publish_unpublish"
         self.test_publish_unpublish_functionality()
         
         print("\n--- BUG FIX #1: Admin Delete Permissions for Teacher Tests ---")
+        self.recorder.category = "admin_permissions"
         self.test_admin_delete_teacher_test()
         
         # Summary
         print("\n" + "=" * 80)
-        print("TEST SUMMARY")
-        print("=" * 80)
-        
-        passed = sum(1 for r in self.results if r['success'])
-        total = len(self.results)
-        
-        print(f"Total Tests: {total}")
-        print(f"Passed: {passed}")
-        print(f"Failed: {total - passed}")
-        print(f"Success Rate: {(passed/total)*100:.1f}%")
-        
-        if total - passed > 0:
-            print("\nFAILED TESTS:")
-            for r in self.results:
-                if not r['success']:
-                    print(f"❌ {r['test']}: {r['message']}")
+        self.recorder.summary()
         
-        return passed == total
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     runner = TestRunner()
     success = runner.run_all_tests()
+    api.print_summary()
+    runner.recorder.finish()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,44 @@
+'use client';
+
+import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
+
+export default function AnalyticsContent({ analytics }) {
+  return (
+    <div className="space-y-6">
+      <h2 className="text-2xl font-bold">Analytics</h2>
+      {analytics && (
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
+          <Card>
+            <CardHeader>
+              <CardTitle>Test Series</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <div className="text-3xl font-bold">{analytics.totalTestSeries}</div>
+              <p className="text-sm text-gray-600">Total created</p>
+            </CardContent>
+          </Card>
+          <Card>
+            <CardHeader>
+              <CardTitle>Total Attempts</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <div className="text-3xl font-bold">{analytics.totalAttempts}</div>
+              <p className="text-sm text-gray-600">By all students</p>
+            </CardContent>
+          </Card>
+          {analytics.averageScore && (
+            <Card>
+              <CardHeader>
+                <CardTitle>Average Score</CardTitle>
+              </CardHeader>
+              <CardContent>
+                <div className="text-3xl font-bold">{analytics.averageScore[0]?.avgScore?.toFixed(1) || 0}</div>
+                <p className="text-sm text-gray-600">Out of total questions</p>
+              </CardContent>
+            </Card>
+          )}
+        </div>
+      )}
+    </div>
+  );
+}
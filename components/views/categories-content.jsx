@@ -0,0 +1,86 @@
+'use client';
+
+import { useState } from 'react';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Textarea } from '@/components/ui/textarea';
+import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle } from '@/components/ui/dialog';
+import { Plus } from 'lucide-react';
+
+// Admin category management
+export default function CategoriesContent({ categories, createCategory }) {
+  const [showCreateDialog, setShowCreateDialog] = useState(false);
+
+  return (
+    <div className="space-y-6">
+      <div className="flex justify-between items-center">
+        <h2 className="text-2xl font-bold">Categories</h2>
+        <Button onClick={() => setShowCreateDialog(true)}>
+          <Plus className="mr-2 h-4 w-4" /> Add Category
+        </Button>
+      </div>
+
+      <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+        {categories.map((category) => (
+          <Card key={category.categoryId}>
+            <CardHeader>
+              <CardTitle>{category.name}</CardTitle>
+              <CardDescription>{category.description}</CardDescription>
+            </CardHeader>
+            <CardContent>
+              <p className="text-sm text-gray-600">
+                Created: {new Date(category.createdAt).toLocaleDateString()}
+              </p>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+
+      <Dialog open={showCreateDialog} onOpenChange={setShowCreateDialog}>
+        <DialogContent className="max-w-md">
+          <DialogHeader>
+            <DialogTitle>Create Category</DialogTitle>
+            <DialogDescription>Add a new test category</DialogDescription>
+          </DialogHeader>
+          <CreateCategoryForm createCategory={createCategory} onSuccess={() => setShowCreateDialog(false)} />
+        </DialogContent>
+      </Dialog>
+    </div>
+  );
+}
+
+function CreateCategoryForm({ createCategory, onSuccess }) {
+  const [formData, setFormData] = useState({ name: '', description: '' });
+
+  return (
+    <form onSubmit={(e) => {
+      e.preventDefault();
+      createCategory(formData).then(() => {
+        setFormData({ name: '', description: '' });
+        onSuccess();
+      });
+    }} className="space-y-4">
+      <div>
+        <Label htmlFor="name">Category Name</Label>
+        <Input 
+          id="name"
+          value={formData.name}
+          onChange={(e) => setFormData({...formData, name: e.target.value})}
+          required
+        />
+      </div>
+      <div>
+        <Label htmlFor="description">Description</Label>
+        <Textarea 
+          id="description"
+          value={formData.description}
+          onChange={(e) => setFormData({...formData, description: e.target.value})}
+          rows={3}
+        />
+      </div>
+      <Button type="submit" className="w-full">Create Category</Button>
+    </form>
+  );
+}
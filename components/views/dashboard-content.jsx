@@ -0,0 +1,97 @@
+'use client';
+
+import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
+import { BookOpen, Users, CheckCircle, GraduationCap } from 'lucide-react';
+
+// Summary cards at the top of every role's dashboard
+export default function DashboardContent({ user, testSeries, attempts, categories, teachers, analytics, users }) {
+  return (
+    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+      {user?.role === 'student' && (
+        <>
+          <Card>
+            <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+              <CardTitle className="text-sm font-medium">Available Tests</CardTitle>
+              <BookOpen className="h-4 w-4 text-muted-foreground" />
+            </CardHeader>
+            <CardContent>
+              <div className="text-2xl font-bold">{testSeries.length}</div>
+              <p className="text-xs text-muted-foreground">
+                Test series available to take
+              </p>
+            </CardContent>
+          </Card>
+          <Card>
+            <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+              <CardTitle className="text-sm font-medium">Tests Completed</CardTitle>
+              <CheckCircle className="h-4 w-4 text-muted-foreground" />
+            </CardHeader>
+            <CardContent>
+              <div className="text-2xl font-bold">{attempts.filter(a => a.status === 'completed').length}</div>
+              <p className="text-xs text-muted-foreground">
+                Tests you have completed
+              </p>
+            </CardContent>
+          </Card>
+          {user.selectedCategory && user.selectedTeacher && (
+            <Card>
+              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+                <CardTitle className="text-sm font-medium">Your Selection</CardTitle>
+                <GraduationCap className="h-4 w-4 text-muted-foreground" />
+              </CardHeader>
+              <CardContent>
+                <div className="text-sm">
+                  <div>Category: <span className="font-medium">{categories.find(c => c.categoryId === user.selectedCategory)?.name || 'Selected'}</span></div>
+                  <div>Teacher: <span className="font-medium">{teachers.find(t => t.userId === user.selectedTeacher)?.name || 'Selected'}</span></div>
+                </div>
+              </CardContent>
+            </Card>
+          )}
+        </>
+      )}
+      
+      {(user?.role === 'teacher' || user?.role === 'admin') && analytics && (
+        <>
+          <Card>
+            <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+              <CardTitle className="text-sm font-medium">Test Series</CardTitle>
+              <BookOpen className="h-4 w-4 text-muted-foreground" />
+            </CardHeader>
+            <CardContent>
+              <div className="text-2xl font-bold">{analytics.totalTestSeries}</div>
+              <p className="text-xs text-muted-foreground">
+                {user?.role === 'teacher' ? 'Your test series' : 'Total test series'}
+              </p>
+            </CardContent>
+          </Card>
+          <Card>
+            <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+              <CardTitle className="text-sm font-medium">Total Attempts</CardTitle>
+              <Users className="h-4 w-4 text-muted-foreground" />
+            </CardHeader>
+            <CardContent>
+              <div className="text-2xl font-bold">{analytics.totalAttempts}</div>
+              <p className="text-xs text-muted-foreground">
+                Test attempts made
+              </p>
+            </CardContent>
+          </Card>
+          {user?.role === 'admin' && (
+            <Card>
+              <CardHeader className="flex flex-row items-center justify-between space-y-0 pb-2">
+                <CardTitle className="text-sm font-medium">Total Users</CardTitle>
+                <Users className="h-4 w-4 text-muted-foreground" />
+              </CardHeader>
+              <CardContent>
+                <div className="text-2xl font-bold">{analytics.totalUsers || users.length}</div>
+                <p className="text-xs text-muted-foreground">
+                  Registered users
+                </p>
+              </CardContent>
+            </Card>
+          )}
+        </>
+      )}
+    </div>
+  );
+}
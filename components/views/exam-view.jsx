@@ -0,0 +1,116 @@
+'use client';
+
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Label } from '@/components/ui/label';
+import { AlertDialog, AlertDialogAction, AlertDialogCancel, AlertDialogContent, AlertDialogDescription, AlertDialogFooter, AlertDialogHeader, AlertDialogTitle } from '@/components/ui/alert-dialog';
+import { RadioGroup, RadioGroupItem } from '@/components/ui/radio-group';
+import { Clock, ChevronLeft, ChevronRight } from 'lucide-react';
+
+// The test-taking screen: one question at a time, the timer and the submit dialog
+export default function ExamView({
+  currentTest, currentQuestion, setCurrentQuestion, timeLeft, answers, setAnswers, submitAnswer,
+  showSubmitDialog, setShowSubmitDialog, completeTest
+}) {
+  const question = currentTest.questions[currentQuestion];
+  const hours = Math.floor(timeLeft / 3600);
+  const minutes = Math.floor((timeLeft % 3600) / 60);
+  const seconds = timeLeft % 60;
+
+  return (
+    <div className="min-h-screen bg-gray-50">
+      <div className="bg-white shadow-sm border-b">
+        <div className="max-w-4xl mx-auto px-4 py-4 flex justify-between items-center">
+          <div>
+            <h1 className="text-xl font-bold">{currentTest.title}</h1>
+            <p className="text-sm text-gray-600">
+              Question {currentQuestion + 1} of {currentTest.totalQuestions}
+            </p>
+          </div>
+          <div className="flex items-center space-x-4">
+            <div className="flex items-center space-x-2">
+              <Clock className="h-4 w-4 text-orange-500" />
+              <span className="font-mono text-lg">
+                {String(hours).padStart(2, '0')}:{String(minutes).padStart(2, '0')}:{String(seconds).padStart(2, '0')}
+              </span>
+            </div>
+            <Button 
+              onClick={() => setShowSubmitDialog(true)}
+              variant="destructive"
+            >
+              Submit Test
+            </Button>
+          </div>
+        </div>
+      </div>
+
+      <div className="max-w-4xl mx-auto p-6">
+        <Card>
+          <CardHeader>
+            <CardTitle>Question {currentQuestion + 1}</CardTitle>
+            <CardDescription>{question ? question.question : 'Loading question...'}</CardDescription>
+          </CardHeader>
+          <CardContent className="space-y-4">
+            <RadioGroup 
+              value={answers[question?.questionId]?.toString() || ''} 
+              onValueChange={(value) => {
+                const answerIndex = parseInt(value);
+                setAnswers(prev => ({ ...prev, [question?.questionId]: answerIndex }));
+                submitAnswer(question?.questionId, answerIndex);
+              }}
+            >
+              {question?.options.map((option, index) => (
+                <div key={`${question?.questionId}-${index}`} className="flex items-center space-x-2">
+                  <RadioGroupItem 
+                    value={index.toString()} 
+                    id={`question-${question?.questionId}-option-${index}`} 
+                  />
+                  <Label 
+                    htmlFor={`question-${question?.questionId}-option-${index}`} 
+                    className="text-sm cursor-pointer"
+                  >
+                    {option}
+                  </Label>
+                </div>
+              ))}
+            </RadioGroup>
+            
+            <div className="flex justify-between pt-6">
+              <Button 
+                variant="outline" 
+                onClick={() => setCurrentQuestion(Math.max(0, currentQuestion - 1))}
+                disabled={currentQuestion === 0}
+              >
+                <ChevronLeft className="mr-2 h-4 w-4" /> Previous
+              </Button>
+              <Button 
+                onClick={() => setCurrentQuestion(Math.min(currentTest.totalQuestions - 1, currentQuestion + 1))}
+                disabled={currentQuestion >= currentTest.totalQuestions - 1}
+              >
+                Next <ChevronRight className="ml-2 h-4 w-4" />
+              </Button>
+            </div>
+          </CardContent>
+        </Card>
+      </div>
+
+      {/* Fixed Submit Dialog */}
+      <AlertDialog open={showSubmitDialog} onOpenChange={setShowSubmitDialog}>
+        <AlertDialogContent>
+          <AlertDialogHeader>
+            <AlertDialogTitle>Submit Test</AlertDialogTitle>
+            <AlertDialogDescription>
+              Are you sure you want to submit your test? You won't be able to make any changes after submission.
+            </AlertDialogDescription>
+          </AlertDialogHeader>
+          <AlertDialogFooter>
+            <AlertDialogCancel>Cancel</AlertDialogCancel>
+            <AlertDialogAction onClick={completeTest}>
+              Submit Test
+            </AlertDialogAction>
+          </AlertDialogFooter>
+        </AlertDialogContent>
+      </AlertDialog>
+    </div>
+  );
+}
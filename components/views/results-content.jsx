@@ -0,0 +1,55 @@
+'use client';
+
+import { Card, CardContent } from '@/components/ui/card';
+import { Label } from '@/components/ui/label';
+import { Badge } from '@/components/ui/badge';
+
+// Attempts on the tests a teacher or admin can see
+export default function ResultsContent({ user, attempts }) {
+  return (
+    <div className="space-y-6">
+      <h2 className="text-2xl font-bold">Test Results</h2>
+      <div className="grid gap-4">
+        {attempts.map((attempt) => (
+          <Card key={attempt.attemptId}>
+            <CardContent className="pt-6">
+              <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
+                <div>
+                  <Label>Test</Label>
+                  <p className="font-medium">{attempt.testSeriesTitle}</p>
+                </div>
+                <div>
+                  <Label>Student</Label>
+                  <p className="font-medium">{attempt.studentName}</p>
+                  {/* Teachers see only names, Admins see full details */}
+                  {attempt.studentDetails && user?.role === 'admin' && (
+                    <div className="text-sm text-gray-600 mt-1">
+                      <div>{attempt.studentDetails.email}</div>
+                      <div>{attempt.studentDetails.phone}</div>
+                    </div>
+                  )}
+                </div>
+                <div>
+                  <Label>Score</Label>
+                  <p className="font-medium">{attempt.score}/{attempt.totalQuestions}</p>
+                  <p className="text-sm text-gray-600">{Math.round((attempt.score / attempt.totalQuestions) * 100)}%</p>
+                </div>
+                <div>
+                  <Label>Status</Label>
+                  <Badge variant={attempt.status === 'completed' ? 'default' : 'secondary'}>
+                    {attempt.status}
+                  </Badge>
+                  {attempt.completedAt && (
+                    <p className="text-sm text-gray-600 mt-1">
+                      {new Date(attempt.completedAt).toLocaleDateString()}
+                    </p>
+                  )}
+                </div>
+              </div>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+    </div>
+  );
+}
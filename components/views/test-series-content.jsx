@@ -0,0 +1,267 @@
+'use client';
+
+import { useState } from 'react';
+import dynamic from 'next/dynamic';
+import { Button } from '@/components/ui/button';
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Badge } from '@/components/ui/badge';
+import { BookOpen, Users, BarChart3, Plus, Edit, Trash2, Play, Clock, CheckCircle, X, Upload, User, Eye, EyeOff } from 'lucide-react';
+
+const TestSeriesDialogs = dynamic(() => import('@/components/views/test-series-dialogs'));
+
+// The catalogue: search, filters and a card per test series, with the management actions for
+// teachers and admins
+export default function TestSeriesContent({
+  user, testSeries, searchResults, searchQuery, activeCategory, selectedTeacher, categoryTeachers,
+  attempts, categories, searchTestSeries, startTest, previewTestSeries, toggleTestStatus,
+  deleteTestSeries, bulkTestSeriesAction, createTestSeries, uploadCSV
+}) {
+  const [showCreateDialog, setShowCreateDialog] = useState(false);
+  const [showCSVDialog, setShowCSVDialog] = useState(false);
+
+  // Filter tests (or search results) based on active category and selected teacher
+  const filteredTests = (searchResults ?? testSeries).filter(test => {
+    if (user?.role === 'student') {
+      if (activeCategory !== 'all' && test.category !== activeCategory) return false;
+      if (selectedTeacher && test.createdBy !== selectedTeacher) return false;
+    }
+    return true;
+  });
+  // Tests shown that the bulk actions apply to
+  const manageableIds = filteredTests
+    .filter(test => user?.role === 'admin' || (user?.role === 'teacher' && test.createdBy === user.userId))
+    .map(test => test.testSeriesId);
+
+  return (
+    <div className="space-y-6">
+      <div className="flex justify-between items-center">
+        <div>
+          <h2 className="text-2xl font-bold">Test Series</h2>
+          {user?.role === 'student' && activeCategory !== 'all' && (
+            <p className="text-sm text-gray-600">
+              Showing tests for {activeCategory}
+              {selectedTeacher && categoryTeachers.find(t => t.userId === selectedTeacher) && 
+                ` by ${categoryTeachers.find(t => t.userId === selectedTeacher).name}`}
+            </p>
+          )}
+        </div>
+        <form
+          className="flex space-x-2"
+          onSubmit={(e) => {
+            e.preventDefault();
+            searchTestSeries(new FormData(e.target).get('q') || '');
+          }}
+        >
+          <Input key={searchQuery} name="q" type="search" placeholder="Search tests and questions..." defaultValue={searchQuery} className="w-64" />
+          <Button type="submit" variant="outline">Search</Button>
+          {searchResults && (
+            <Button type="button" variant="ghost" onClick={() => searchTestSeries('')}>
+              <X className="h-4 w-4" />
+            </Button>
+          )}
+        </form>
+        {(user?.role === 'teacher' || user?.role === 'admin') && (
+          <div className="flex space-x-2">
+            {manageableIds.length > 1 && (
+              <>
+                <Button variant="outline" onClick={() => bulkTestSeriesAction('publish', manageableIds)}>
+                  <Eye className="mr-2 h-4 w-4" /> Publish all
+                </Button>
+                <Button variant="outline" onClick={() => bulkTestSeriesAction('unpublish', manageableIds)}>
+                  <EyeOff className="mr-2 h-4 w-4" /> Unpublish all
+                </Button>
+              </>
+            )}
+            <Button onClick={() => setShowCSVDialog(true)}>
+              <Upload className="mr-2 h-4 w-4" /> Upload CSV
+            </Button>
+            <Button onClick={() => setShowCreateDialog(true)}>
+              <Plus className="mr-2 h-4 w-4" /> Create Test
+            </Button>
+          </div>
+        )}
+      </div>
+
+      <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+        {filteredTests.map((test) => (
+          <Card key={test.testSeriesId} className="hover:shadow-lg transition-shadow">
+            {/* Udemy-style header with teacher info */}
+            <div className="p-4 border-b bg-gradient-to-r from-blue-50 to-purple-50">
+              <div className="flex items-center space-x-3">
+                <div className="w-12 h-12 bg-gray-100 rounded-full flex items-center justify-center overflow-hidden">
+                  {test.createdByPhoto ? (
+                    <img src={test.createdByPhoto} alt={test.createdByName} className="w-full h-full object-cover" />
+                  ) : (
+                    <User className="h-6 w-6 text-gray-400" />
+                  )}
+                </div>
+                <div className="flex-1">
+                  <h3 className="font-medium text-gray-900">{test.createdByName}</h3>
+                  <div className="flex items-center space-x-2 text-sm">
+                    <div className="flex text-yellow-400">
+                      {[...Array(5)].map((_, i) => (
+                        <span key={i} className={i < (test.createdByRating || 4) ? 'text-yellow-400' : 'text-gray-300'}>★</span>
+                      ))}
+                    </div>
+                    <span className="text-gray-600">({test.totalAttempts || 0} students)</span>
+                  </div>
+                </div>
+                {(user?.role === 'teacher' || user?.role === 'admin') && 
+                 (user?.role === 'admin' || test.createdBy === user?.userId) && (
+                  <div className="flex space-x-1">
+                    <Button size="sm" variant="ghost" onClick={() => previewTestSeries(test.testSeriesId)}>
+                      <Play className="h-4 w-4 text-blue-500" />
+                    </Button>
+                    <Button 
+                      size="sm" 
+                      variant="ghost" 
+                      onClick={() => toggleTestStatus(test.testSeriesId, test.status)}
+                      title={test.status === 'draft' ? 'Publish test' : 'Unpublish test'}
+                    >
+                      <CheckCircle className={`h-4 w-4 ${test.status === 'draft' ? 'text-gray-400' : 'text-green-500'}`} />
+                    </Button>
+                    <Button size="sm" variant="ghost">
+                      <Edit className="h-4 w-4 text-gray-500" />
+                    </Button>
+                    <Button size="sm" variant="ghost" onClick={() => deleteTestSeries(test.testSeriesId)}>
+                      <Trash2 className="h-4 w-4 text-red-500" />
+                    </Button>
+                  </div>
+                )}
+              </div>
+            </div>
+
+            <CardHeader>
+              <div className="space-y-2">
+                <CardTitle className="text-lg line-clamp-2">{test.title}</CardTitle>
+                <CardDescription className="line-clamp-2">{test.description}</CardDescription>
+                {test.highlights?.questions?.[0] && (
+                  // Server-side escaped snippet with <mark> around matched terms
+                  <p className="text-xs text-gray-500 line-clamp-2" dangerouslySetInnerHTML={{ __html: test.highlights.questions[0] }} />
+                )}
+                <div className="flex items-center space-x-2">
+                  <Badge variant="secondary">{test.category}</Badge>
+                  {(user?.role === 'teacher' || user?.role === 'admin') && (
+                    <Badge variant={test.status === 'draft' ? 'destructive' : 'default'}>
+                      {test.status === 'draft' ? 'Draft' : 'Published'}
+                    </Badge>
+                  )}
+                  {test.averagePercentage > 0 && (
+                    <Badge variant="outline" className="text-green-600">
+                      {Math.round(test.averagePercentage)}% avg score
+                    </Badge>
+                  )}
+                </div>
+              </div>
+            </CardHeader>
+            
+            <CardContent>
+              <div className="space-y-3">
+                <div className="grid grid-cols-2 gap-4 text-sm text-gray-600">
+                  <div className="flex items-center space-x-2">
+                    <Clock className="h-4 w-4" />
+                    <span>{test.duration} min</span>
+                  </div>
+                  <div className="flex items-center space-x-2">
+                    <BookOpen className="h-4 w-4" />
+                    <span>{test.questionCount ?? test.questions?.length ?? 0} questions</span>
+                  </div>
+                  <div className="flex items-center space-x-2">
+                    <Users className="h-4 w-4" />
+                    <span>{test.totalAttempts || 0} attempts</span>
+                  </div>
+                  <div className="flex items-center space-x-2">
+                    <BarChart3 className="h-4 w-4" />
+                    <span>{test.averagePercentage ? `${Math.round(test.averagePercentage)}% avg` : 'New'}</span>
+                  </div>
+                </div>
+                
+                {user?.role === 'student' && (
+                  <Button 
+                    className="w-full mt-4" 
+                    onClick={() => startTest(test.testSeriesId)}
+                    disabled={attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'completed')}
+                  >
+                    {attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'completed') ? (
+                      <>
+                        <CheckCircle className="mr-2 h-4 w-4" />
+                        Completed
+                      </>
+                    ) : attempts.some(a => a.testSeriesId === test.testSeriesId && a.status === 'in_progress') ? (
+                      <>
+                        <Play className="mr-2 h-4 w-4" />
+                        Resume Test
+                      </>
+                    ) : (
+                      <>
+                        <Play className="mr-2 h-4 w-4" />
+                        Start Test
+                      </>
+                    )}
+                  </Button>
+                )}
+
+                {/* Teacher/Admin Action Buttons */}
+                {(user?.role === 'teacher' || user?.role === 'admin') && (
+                  <div className="grid grid-cols-3 gap-2 mt-4">
+                    <Button 
+                      variant="outline" 
+                      size="sm" 
+                      onClick={() => previewTestSeries(test.testSeriesId)}
+                      className="text-blue-600 hover:text-blue-700"
+                    >
+                      <Eye className="mr-1 h-3 w-3" />
+                      Preview
+                    </Button>
+                    <Button 
+                      variant="outline" 
+                      size="sm" 
+                      onClick={() => toggleTestStatus(test.testSeriesId, test.status)}
+                      className={test.status === 'published' ? 'text-orange-600 hover:text-orange-700' : 'text-green-600 hover:text-green-700'}
+                    >
+                      {test.status === 'published' ? (
+                        <>
+                          <EyeOff className="mr-1 h-3 w-3" />
+                          Unpublish
+                        </>
+                      ) : (
+                        <>
+                          <Eye className="mr-1 h-3 w-3" />
+                          Publish
+                        </>
+                      )}
+                    </Button>
+                    <Button 
+                      variant="outline" 
+                      size="sm" 
+                      onClick={() => deleteTestSeries(test.testSeriesId)}
+                      className="text-red-600 hover:text-red-700"
+                    >
+                      <Trash2 className="mr-1 h-3 w-3" />
+                      Delete
+                    </Button>
+                  </div>
+                )}
+              </div>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+
+      {/* Create Test and CSV Upload dialogs, a separate chunk students never load */}
+      {(user?.role === 'teacher' || user?.role === 'admin') && (
+        <TestSeriesDialogs
+          showCreateDialog={showCreateDialog}
+          setShowCreateDialog={setShowCreateDialog}
+          showCSVDialog={showCSVDialog}
+          setShowCSVDialog={setShowCSVDialog}
+          categories={categories}
+          testSeries={testSeries.filter(test => test.createdBy === user?.userId)}
+          createTestSeries={createTestSeries}
+          uploadCSV={uploadCSV}
+        />
+      )}
+    </div>
+  );
+}
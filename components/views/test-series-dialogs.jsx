@@ -0,0 +1,154 @@
+'use client';
+
+import { useState } from 'react';
+import { Button } from '@/components/ui/button';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
+import { Textarea } from '@/components/ui/textarea';
+import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle } from '@/components/ui/dialog';
+
+// Teacher and admin dialogs of the catalogue: create a test series, upload questions as CSV
+export default function TestSeriesDialogs({
+  showCreateDialog, setShowCreateDialog, showCSVDialog, setShowCSVDialog,
+  categories, testSeries, createTestSeries, uploadCSV
+}) {
+  return (
+    <>
+      {/* Create Test Dialog */}
+      <Dialog open={showCreateDialog} onOpenChange={setShowCreateDialog}>
+        <DialogContent className="max-w-md">
+          <DialogHeader>
+            <DialogTitle>Create Test Series</DialogTitle>
+            <DialogDescription>Create a new test series for your students</DialogDescription>
+          </DialogHeader>
+          <CreateTestForm categories={categories} createTestSeries={createTestSeries} onSuccess={() => setShowCreateDialog(false)} />
+        </DialogContent>
+      </Dialog>
+
+      {/* CSV Upload Dialog */}
+      <Dialog open={showCSVDialog} onOpenChange={setShowCSVDialog}>
+        <DialogContent className="max-w-md">
+          <DialogHeader>
+            <DialogTitle>Upload Questions via CSV</DialogTitle>
+            <DialogDescription>Upload questions in CSV format: Question, Option A, Option B, Option C, Option D, Correct Answer, Explanation</DialogDescription>
+          </DialogHeader>
+          <CSVUploadForm 
+            testSeries={testSeries}
+            uploadCSV={uploadCSV}
+            onSuccess={() => setShowCSVDialog(false)} 
+          />
+        </DialogContent>
+      </Dialog>
+    </>
+  );
+}
+
+function CreateTestForm({ categories, createTestSeries, onSuccess }) {
+  const [formData, setFormData] = useState({
+    title: '', description: '', category: '', duration: 60
+  });
+
+  return (
+    <form onSubmit={(e) => {
+      e.preventDefault();
+      createTestSeries(formData).then(() => {
+        setFormData({ title: '', description: '', category: '', duration: 60 });
+        onSuccess();
+      });
+    }} className="space-y-4">
+      <div>
+        <Label htmlFor="title">Title</Label>
+        <Input 
+          id="title"
+          value={formData.title}
+          onChange={(e) => setFormData({...formData, title: e.target.value})}
+          required
+        />
+      </div>
+      <div>
+        <Label htmlFor="description">Description</Label>
+        <Textarea 
+          id="description"
+          value={formData.description}
+          onChange={(e) => setFormData({...formData, description: e.target.value})}
+          rows={3}
+        />
+      </div>
+      <div>
+        <Label htmlFor="category">Category</Label>
+        <Select value={formData.category} onValueChange={(value) => setFormData({...formData, category: value})}>
+          <SelectTrigger>
+            <SelectValue placeholder="Select category" />
+          </SelectTrigger>
+          <SelectContent>
+            {categories.map(category => (
+              <SelectItem key={category.categoryId} value={category.name}>
+                {category.name}
+              </SelectItem>
+            ))}
+          </SelectContent>
+        </Select>
+      </div>
+      <div>
+        <Label htmlFor="duration">Duration (minutes)</Label>
+        <Input 
+          id="duration"
+          type="number"
+          value={formData.duration}
+          onChange={(e) => setFormData({...formData, duration: parseInt(e.target.value)})}
+          min="1"
+          required
+        />
+      </div>
+      <Button type="submit" className="w-full">Create Test Series</Button>
+    </form>
+  );
+}
+
+function CSVUploadForm({ testSeries, uploadCSV, onSuccess }) {
+  const [selectedTest, setSelectedTest] = useState('');
+  const [file, setFile] = useState(null);
+
+  return (
+    <form onSubmit={(e) => {
+      e.preventDefault();
+      if (file && selectedTest) {
+        uploadCSV(file, selectedTest).then(() => {
+          setFile(null);
+          setSelectedTest('');
+          onSuccess();
+        });
+      }
+    }} className="space-y-4">
+      <div>
+        <Label htmlFor="testSeries">Select Test Series</Label>
+        <Select value={selectedTest} onValueChange={setSelectedTest}>
+          <SelectTrigger>
+            <SelectValue placeholder="Choose test series" />
+          </SelectTrigger>
+          <SelectContent>
+            {testSeries.map(test => (
+              <SelectItem key={test.testSeriesId} value={test.testSeriesId}>
+                {test.title}
+              </SelectItem>
+            ))}
+          </SelectContent>
+        </Select>
+      </div>
+      <div>
+        <Label htmlFor="csvFile">CSV File</Label>
+        <Input 
+          id="csvFile"
+          type="file"
+          accept=".csv"
+          onChange={(e) => setFile(e.target.files[0])}
+          required
+        />
+      </div>
+      <Button type="submit" className="w-full" disabled={!file || !selectedTest}>
+        Upload Questions
+      </Button>
+    </form>
+  );
+}
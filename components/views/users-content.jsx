@@ -0,0 +1,89 @@
+'use client';
+
+import { Card, CardContent } from '@/components/ui/card';
+import { Input } from '@/components/ui/input';
+import { Label } from '@/components/ui/label';
+import { Badge } from '@/components/ui/badge';
+import { Progress } from '@/components/ui/progress';
+import { Upload, User } from 'lucide-react';
+
+// Admin user list and student roster import
+export default function UsersContent({ users, rosterImport, importRoster }) {
+  const counts = rosterImport?.counts;
+  return (
+    <div className="space-y-6">
+      <div className="flex justify-between items-center">
+        <h2 className="text-2xl font-bold">Users</h2>
+        <Label className="cursor-pointer">
+          <Input
+            type="file"
+            accept=".csv,.ndjson,.jsonl"
+            className="hidden"
+            onChange={(e) => {
+              if (e.target.files[0]) importRoster(e.target.files[0]);
+              e.target.value = '';
+            }}
+          />
+          <span className="inline-flex items-center rounded-md bg-primary px-4 py-2 text-sm font-medium text-primary-foreground">
+            <Upload className="mr-2 h-4 w-4" /> Import Students
+          </span>
+        </Label>
+      </div>
+      {rosterImport && (
+        <Card>
+          <CardContent className="pt-6 space-y-2">
+            <div className="flex justify-between text-sm">
+              <span>Roster import: {rosterImport.status}</span>
+              <span>{counts.processed} / {counts.received} rows</span>
+            </div>
+            <Progress value={counts.received ? (counts.processed / counts.received) * 100 : 0} />
+            <p className="text-sm text-gray-600">
+              {counts.inserted} imported, {counts.exists} already registered, {counts.duplicate} duplicates, {counts.invalid + counts.failed} rejected
+            </p>
+            {rosterImport.errors.slice(0, 5).map((error) => (
+              <p key={error.line} className="text-xs text-red-600">
+                Line {error.line}{error.username ? ` (${error.username})` : ''}: {error.reason}
+              </p>
+            ))}
+          </CardContent>
+        </Card>
+      )}
+      <div className="grid gap-4">
+        {users.map((user) => (
+          <Card key={user.userId}>
+            <CardContent className="pt-6">
+              <div className="flex items-center space-x-4">
+                <div className="w-12 h-12 bg-gray-100 rounded-full flex items-center justify-center overflow-hidden">
+                  {user.photo ? (
+                    <img src={user.photo} alt={user.name} className="w-full h-full object-cover" />
+                  ) : (
+                    <User className="h-6 w-6 text-gray-400" />
+                  )}
+                </div>
+                <div className="flex-1 grid grid-cols-1 md:grid-cols-4 gap-4">
+                  <div>
+                    <Label>Name</Label>
+                    <p className="font-medium">{user.name}</p>
+                    <p className="text-sm text-gray-600">@{user.username}</p>
+                  </div>
+                  <div>
+                    <Label>Role</Label>
+                    <Badge>{user.role.toUpperCase()}</Badge>
+                  </div>
+                  <div>
+                    <Label>Email</Label>
+                    <p className="text-sm">{user.email || 'Not provided'}</p>
+                  </div>
+                  <div>
+                    <Label>Joined</Label>
+                    <p className="text-sm">{new Date(user.createdAt).toLocaleDateString()}</p>
+                  </div>
+                </div>
+              </div>
+            </CardContent>
+          </Card>
+        ))}
+      </div>
+    </div>
+  );
+}
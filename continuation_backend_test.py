@@ -5,36 +5,39 @@ Testing the new API enhancements for category navigation, teacher metadata,
 detailed results, and enhanced permissions.
 """
 
-import requests
 import json
 import time
 import sys
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "http://localhost:3000/api"
+api = ApiClient(BASE_URL)
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 TEACHER_CREDENTIALS = {"username": "teacher_jee", "password": "teacher123"}
 STUDENT_CREDENTIALS = {"username": "test_student", "password": "student123"}
 
+# test_result.md task covered by each section of run_all_tests (the teacher listing per category
+# has none, so its checks are reported but not synced)
+CONTINUATION_TASKS = {
+    "test_series": "Test Series CRUD Operations",
+    "detailed_results": "Test Attempts and Scoring System",
+    "results_privacy": "Test Attempts and Scoring System",
+    "edit_delete_permissions": "Test Series CRUD Operations",
+}
+
 class APITester:
     def __init__(self):
         self.admin_token = None
         self.teacher_token = None
         self.student_token = None
-        self.test_results = []
+        self.recorder = ResultRecorder("continuation_backend_test", api, tasks=CONTINUATION_TASKS)
         
     def log_result(self, test_name, success, message=""):
         """Log test result"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        result = f"{status}: {test_name}"
-        if message:
-            result += f" - {message}"
-        print(result)
-        self.test_results.append({
-            "test": test_name,
-            "success": success,
-            "message": message
-        })
+        self.recorder.record(test_name, success, message)
         
     def authenticate_users(self):
         """Authenticate all user types and get tokens"""
@@ -43,7 +46,7 @@ class APITester:
         
         # Admin authentication
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=ADMIN_CREDENTIALS)
+            response = api.post(f"{BASE_URL}/auth/login", json=ADMIN_CREDENTIALS)
             if response.status_code == 200:
                 data = response.json()
                 self.admin_token = data.get('token')
@@ -57,7 +60,7 @@ class APITester:
             
         # Teacher authentication
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=TEACHER_CREDENTIALS)
+            response = api.post(f"{BASE_URL}/auth/login", json=TEACHER_CREDENTIALS)
             if response.status_code == 200:
                 data = response.json()
                 self.teacher_token = data.get('token')
@@ -77,14 +80,14 @@ class APITester:
                 "role": "student",
                 "email": "student@test.com"
             }
-            response = requests.post(f"{BASE_URL}/auth/register", json=student_data)
+            response = api.post(f"{BASE_URL}/auth/register", json=student_data)
             if response.status_code == 200:
                 data = response.json()
                 self.student_token = data.get('token')
                 self.log_result("Student Registration & Authentication", True, f"Student created and authenticated")
             else:
                 # Try to login if already exists
-                response = requests.post(f"{BASE_URL}/auth/login", json=STUDENT_CREDENTIALS)
+                response = api.post(f"{BASE_URL}/auth/login", json=STUDENT_CREDENTIALS)
                 if response.status_code == 200:
                     data = response.json()
                     self.student_token = data.get('token')
@@ -103,7 +106,7 @@ class APITester:
         
         try:
             # Test categories with teachers aggregation
-            response = requests.get(f"{BASE_URL}/categories?withTeachers=true")
+            response = api.get(f"{BASE_URL}/categories?withTeachers=true")
             if response.status_code == 200:
                 categories = response.json()
                 if isinstance(categories, list) and len(categories) > 0:
@@ -133,7 +136,7 @@ class APITester:
             
         # Test regular categories endpoint
         try:
-            response = requests.get(f"{BASE_URL}/categories")
+            response = api.get(f"{BASE_URL}/categories")
             if response.status_code == 200:
                 categories = response.json()
                 self.log_result("Regular Categories API", True, f"Found {len(categories)} categories")
@@ -151,7 +154,7 @@ class APITester:
         
         try:
             # Test student sees ALL published test series
-            response = requests.get(f"{BASE_URL}/test-series", headers=headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=headers)
             if response.status_code == 200:
                 test_series = response.json()
                 if isinstance(test_series, list):
@@ -175,7 +178,7 @@ class APITester:
             
         # Test category filtering
         try:
-            response = requests.get(f"{BASE_URL}/test-series?category=JEE-Mains", headers=headers)
+            response = api.get(f"{BASE_URL}/test-series?category=JEE-Mains", headers=headers)
             if response.status_code == 200:
                 filtered_tests = response.json()
                 self.log_result("Category Filtering", True, 
@@ -189,13 +192,13 @@ class APITester:
         try:
             # Get a teacher ID first
             teacher_headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.get(f"{BASE_URL}/test-series", headers=teacher_headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=teacher_headers)
             if response.status_code == 200:
                 teacher_tests = response.json()
                 if len(teacher_tests) > 0:
                     teacher_id = teacher_tests[0]['createdBy']
                     # Test filtering by teacher
-                    response = requests.get(f"{BASE_URL}/test-series?teacher={teacher_id}", headers=headers)
+                    response = api.get(f"{BASE_URL}/test-series?teacher={teacher_id}", headers=headers)
                     if response.status_code == 200:
                         teacher_filtered = response.json()
                         self.log_result("Teacher Filtering", True, 
@@ -210,7 +213,7 @@ class APITester:
         # Test teacher preview functionality
         try:
             teacher_headers = {"Authorization": f"Bearer {self.teacher_token}"}
-            response = requests.get(f"{BASE_URL}/test-series?preview=true", headers=teacher_headers)
+            response = api.get(f"{BASE_URL}/test-series?preview=true", headers=teacher_headers)
             if response.status_code == 200:
                 preview_tests = response.json()
                 self.log_result("Teacher Preview Functionality", True, 
@@ -229,7 +232,7 @@ class APITester:
         
         try:
             # Get available test series
-            response = requests.get(f"{BASE_URL}/test-series", headers=headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=headers)
             if response.status_code != 200:
                 self.log_result("Get Test Series for Results Test", False, f"Status: {response.status_code}")
                 return
@@ -242,7 +245,7 @@ class APITester:
             test_id = test_series[0]['testSeriesId']
             
             # Start a test attempt
-            response = requests.post(f"{BASE_URL}/test-attempts", 
+            response = api.post(f"{BASE_URL}/test-attempts", 
                                    json={"testSeriesId": test_id}, headers=headers)
             if response.status_code == 200:
                 attempt_data = response.json()
@@ -254,14 +257,14 @@ class APITester:
                 if len(questions) > 0:
                     question_id = questions[0]['questionId']
                     # Submit an answer
-                    response = requests.put(f"{BASE_URL}/test-attempts/{attempt_id}",
+                    response = api.put(f"{BASE_URL}/test-attempts/{attempt_id}",
                                           json={"questionId": question_id, "answer": 0, "action": "submit_answer"},
                                           headers=headers)
                     if response.status_code == 200:
                         self.log_result("Submit Answer", True, "Answer submitted successfully")
                         
                         # Complete the test
-                        response = requests.put(f"{BASE_URL}/test-attempts/{attempt_id}",
+                        response = api.put(f"{BASE_URL}/test-attempts/{attempt_id}",
                                               json={"action": "complete_test"}, headers=headers)
                         if response.status_code == 200:
                             result_data = response.json()
@@ -303,7 +306,7 @@ class APITester:
         
         try:
             # Get test attempts as teacher
-            response = requests.get(f"{BASE_URL}/test-attempts", headers=teacher_headers)
+            response = api.get(f"{BASE_URL}/test-attempts", headers=teacher_headers)
             if response.status_code == 200:
                 teacher_attempts = response.json()
                 if len(teacher_attempts) > 0:
@@ -326,7 +329,7 @@ class APITester:
                 self.log_result("Teacher Results Access", False, f"Status: {response.status_code}")
                 
             # Get test attempts as admin
-            response = requests.get(f"{BASE_URL}/test-attempts", headers=admin_headers)
+            response = api.get(f"{BASE_URL}/test-attempts", headers=admin_headers)
             if response.status_code == 200:
                 admin_attempts = response.json()
                 if len(admin_attempts) > 0:
@@ -374,7 +377,7 @@ class APITester:
                 }]
             }
             
-            response = requests.post(f"{BASE_URL}/test-series", json=test_data, headers=teacher_headers)
+            response = api.post(f"{BASE_URL}/test-series", json=test_data, headers=teacher_headers)
             if response.status_code == 200:
                 created_test = response.json()
                 test_id = created_test['testSeriesId']
@@ -382,7 +385,7 @@ class APITester:
                 
                 # Test teacher can edit their own test
                 update_data = {"title": "Updated Test Title", "description": "Updated description"}
-                response = requests.put(f"{BASE_URL}/test-series/{test_id}", 
+                response = api.put(f"{BASE_URL}/test-series/{test_id}", 
                                       json=update_data, headers=teacher_headers)
                 if response.status_code == 200:
                     self.log_result("Teacher Edit Own Test", True, "Successfully updated test series")
@@ -390,7 +393,7 @@ class APITester:
                     self.log_result("Teacher Edit Own Test", False, f"Status: {response.status_code}")
                 
                 # Test teacher can delete their own test
-                response = requests.delete(f"{BASE_URL}/test-series/{test_id}", headers=teacher_headers)
+                response = api.delete(f"{BASE_URL}/test-series/{test_id}", headers=teacher_headers)
                 if response.status_code == 200:
                     self.log_result("Teacher Delete Own Test", True, "Successfully deleted test series")
                 else:
@@ -401,14 +404,14 @@ class APITester:
                 
             # Test teacher cannot edit/delete other teacher's tests
             # Get all test series and find one not created by current teacher
-            response = requests.get(f"{BASE_URL}/test-series", headers=teacher_headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=teacher_headers)
             if response.status_code == 200:
                 all_tests = response.json()
                 # Find a test not created by current teacher
                 other_test = None
                 for test in all_tests:
                     # Get teacher profile to compare
-                    profile_response = requests.get(f"{BASE_URL}/auth/profile", headers=teacher_headers)
+                    profile_response = api.get(f"{BASE_URL}/auth/profile", headers=teacher_headers)
                     if profile_response.status_code == 200:
                         teacher_profile = profile_response.json()
                         if test['createdBy'] != teacher_profile['userId']:
@@ -417,7 +420,7 @@ class APITester:
                 
                 if other_test:
                     # Try to edit other teacher's test
-                    response = requests.put(f"{BASE_URL}/test-series/{other_test['testSeriesId']}", 
+                    response = api.put(f"{BASE_URL}/test-series/{other_test['testSeriesId']}", 
                                           json={"title": "Unauthorized Edit"}, headers=teacher_headers)
                     if response.status_code == 404:  # Should be unauthorized
                         self.log_result("Teacher Cannot Edit Others' Tests", True, "Correctly blocked unauthorized edit")
@@ -426,7 +429,7 @@ class APITester:
                                       f"Should be blocked but got status: {response.status_code}")
                         
                     # Try to delete other teacher's test
-                    response = requests.delete(f"{BASE_URL}/test-series/{other_test['testSeriesId']}", 
+                    response = api.delete(f"{BASE_URL}/test-series/{other_test['testSeriesId']}", 
                                              headers=teacher_headers)
                     if response.status_code == 404:  # Should be unauthorized
                         self.log_result("Teacher Cannot Delete Others' Tests", True, "Correctly blocked unauthorized delete")
@@ -450,34 +453,28 @@ class APITester:
             return False
             
         # Run all test suites
+        self.recorder.category = "categories"
         self.test_categories_with_teachers()
+        self.recorder.category = "test_series"
         self.test_enhanced_test_series_api()
+        self.recorder.category = "detailed_results"
         self.test_detailed_results_storage()
+        self.recorder.category = "results_privacy"
         self.test_teacher_results_privacy()
+        self.recorder.category = "edit_delete_permissions"
         self.test_edit_delete_permissions()
         
         # Summary
         print("\n📋 TEST SUMMARY")
         print("=" * 50)
         
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
-        
-        print(f"Total Tests: {total_tests}")
-        print(f"Passed: {passed_tests} ✅")
-        print(f"Failed: {failed_tests} ❌")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        if failed_tests > 0:
-            print("\n❌ FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  - {result['test']}: {result['message']}")
+        self.recorder.summary()
                     
-        return failed_tests == 0
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     tester = APITester()
     success = tester.run_all_tests()
+    api.print_summary()
+    tester.recorder.finish()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -3,42 +3,19 @@
 Debug specific failing tests
 """
 
-import requests
 import json
 import uuid
 import io
 
+from tests.api_client import ApiClient
+
 BASE_URL = "https://test-display-issue.preview.emergentagent.com/api"
+api = ApiClient(BASE_URL)
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 
 def make_request(method, endpoint, data=None, token=None, files=None):
     """Make HTTP request with proper headers"""
-    url = f"{BASE_URL}/{endpoint}"
-    headers = {}
-    
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    if files is None and data is not None:
-        headers["Content-Type"] = "application/json"
-    
-    try:
-        if method == "GET":
-            response = requests.get(url, headers=headers, timeout=30)
-        elif method == "POST":
-            if files:
-                response = requests.post(url, data=data, files=files, headers=headers, timeout=30)
-            else:
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-        elif method == "PUT":
-            response = requests.put(url, json=data, headers=headers, timeout=30)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers, timeout=30)
-        
-        return response
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-        return None
+    return api.request(method, endpoint, data, token, files)
 
 def debug_tests():
     # Get admin token
@@ -134,4 +111,5 @@ def debug_tests():
         print("❌ Failed to create teacher")
 
 if __name__ == "__main__":
-    debug_tests()
\ No newline at end of file
+    debug_tests()
+    api.print_summary()
\ No newline at end of file
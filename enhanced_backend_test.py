@@ -9,20 +9,32 @@ Tests all new features including:
 5. Enhanced Test Series Creation with bulk imported questions
 """
 
-import requests
 import json
-import time
 import uuid
 from datetime import datetime, timedelta
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "https://test-display-issue.preview.emergentagent.com/api"
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 NEW_ADMIN_CREDENTIALS = {"username": "prakharshivam0@gmail.com", "password": "Admin!@Super@19892005"}
 
+# test_result.md task covered by each log_result category
+ENHANCED_TASKS = {
+    "new_admin_login": "User Authentication System with JWT",
+    "email_validation": "User Authentication System with JWT",
+    "profile_management": "User Authentication System with JWT",
+    "bulk_import": "Test Series CRUD Operations",
+    "enhanced_test_series": "Test Series CRUD Operations",
+    "backward_compatibility": "Test Series CRUD Operations",
+}
+
 class EnhancedTestSeriesAPITester:
     def __init__(self):
         self.base_url = BASE_URL
+        self.client = ApiClient(BASE_URL)
         self.admin_token = None
         self.new_admin_token = None
         self.teacher_token = None
@@ -30,55 +42,15 @@ class EnhancedTestSeriesAPITester:
         self.test_series_id = None
         self.attempt_id = None
         self.imported_questions = []
-        self.results = {
-            "new_admin_login": {"passed": 0, "failed": 0, "details": []},
-            "email_validation": {"passed": 0, "failed": 0, "details": []},
-            "profile_management": {"passed": 0, "failed": 0, "details": []},
-            "bulk_import": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_test_series": {"passed": 0, "failed": 0, "details": []},
-            "backward_compatibility": {"passed": 0, "failed": 0, "details": []}
-        }
+        self.recorder = ResultRecorder("enhanced_backend_test", self.client, tasks=ENHANCED_TASKS)
     
     def log_result(self, category, test_name, success, message, response_data=None):
         """Log test result"""
-        if success:
-            self.results[category]["passed"] += 1
-            status = "✅ PASS"
-        else:
-            self.results[category]["failed"] += 1
-            status = "❌ FAIL"
-        
-        detail = {
-            "test": test_name,
-            "status": status,
-            "message": message,
-            "response": response_data if not success else None
-        }
-        self.results[category]["details"].append(detail)
-        print(f"{status}: {test_name} - {message}")
+        self.recorder.record(test_name, success, message, category=category, response=response_data)
     
     def make_request(self, method, endpoint, data=None, token=None):
         """Make HTTP request with proper headers"""
-        url = f"{self.base_url}/{endpoint}"
-        headers = {"Content-Type": "application/json"}
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
-            return None
+        return self.client.request(method, endpoint, data, token)
     
     def test_new_admin_login(self):
         """Test new admin credentials"""
@@ -616,8 +588,6 @@ What year did World War II end?
         print(f"Base URL: {self.base_url}")
         print("Testing new features: Custom Admin Login, Email Validation, Profile Management, Bulk Import, Enhanced Test Series")
         
-        start_time = time.time()
-        
         # Run all test suites
         self.test_new_admin_login()
         self.test_email_validation()
@@ -626,43 +596,23 @@ What year did World War II end?
         self.test_enhanced_test_series_creation()
         self.test_backward_compatibility()
         
-        end_time = time.time()
-        
         # Print summary
         print("\n" + "="*70)
         print("📊 ENHANCED TEST RESULTS SUMMARY")
         print("="*70)
         
-        total_passed = 0
-        total_failed = 0
-        
-        for category, results in self.results.items():
-            passed = results["passed"]
-            failed = results["failed"]
-            total_passed += passed
-            total_failed += failed
-            
-            status_icon = "✅" if failed == 0 else "❌"
-            print(f"{status_icon} {category.upper().replace('_', ' ')}: {passed} passed, {failed} failed")
-            
-            # Show failed tests
-            if failed > 0:
-                for detail in results["details"]:
-                    if "❌" in detail["status"]:
-                        print(f"   - {detail['test']}: {detail['message']}")
-        
-        print("-" * 70)
-        print(f"🎯 OVERALL: {total_passed} passed, {total_failed} failed")
-        print(f"⏱️  Duration: {end_time - start_time:.2f} seconds")
+        self.recorder.summary()
         
-        if total_failed == 0:
+        if self.recorder.failed == 0:
             print("🎉 ALL ENHANCED TESTS PASSED! New features are working correctly.")
         else:
-            print(f"⚠️  {total_failed} tests failed. Please review the issues above.")
+            print(f"⚠️  {self.recorder.failed} tests failed. Please review the issues above.")
         
-        return total_failed == 0
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     tester = EnhancedTestSeriesAPITester()
     success = tester.run_all_tests()
+    tester.client.print_summary()
+    tester.recorder.finish()
     exit(0 if success else 1)
\ No newline at end of file
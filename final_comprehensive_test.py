@@ -4,83 +4,46 @@ Final Comprehensive Backend API Testing for ALL NEW Test Series Platform Feature
 This test ensures all new features are working correctly with proper test sequencing.
 """
 
-import requests
 import json
-import time
 import uuid
 import io
 import base64
 from datetime import datetime, timedelta
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "https://test-display-issue.preview.emergentagent.com/api"
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 
+# test_result.md task covered by each log_result category; categories, file uploads and the
+# teacher-category views have no task there, so their checks are reported but not synced
+NEW_FEATURE_TASKS = {
+    "enhanced_auth": "User Authentication System with JWT",
+    "enhanced_student_flow": "User Authentication System with JWT",
+    "enhanced_results": "Test Attempts and Scoring System",
+}
+
 class FinalComprehensiveAPITester:
     def __init__(self):
         self.base_url = BASE_URL
+        self.client = ApiClient(BASE_URL)
         self.admin_token = None
         self.teacher_token = None
         self.student_token = None
         self.category_id = None
         self.teacher_id = None
         self.test_series_id = None
-        self.results = {
-            "setup": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_auth": {"passed": 0, "failed": 0, "details": []},
-            "category_management": {"passed": 0, "failed": 0, "details": []},
-            "teacher_category_integration": {"passed": 0, "failed": 0, "details": []},
-            "file_upload": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_student_flow": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_results": {"passed": 0, "failed": 0, "details": []}
-        }
+        self.recorder = ResultRecorder("final_comprehensive_test", self.client, tasks=NEW_FEATURE_TASKS)
     
     def log_result(self, category, test_name, success, message, response_data=None):
         """Log test result"""
-        if success:
-            self.results[category]["passed"] += 1
-            status = "✅ PASS"
-        else:
-            self.results[category]["failed"] += 1
-            status = "❌ FAIL"
-        
-        detail = {
-            "test": test_name,
-            "status": status,
-            "message": message,
-            "response": response_data if not success else None
-        }
-        self.results[category]["details"].append(detail)
-        print(f"{status}: {test_name} - {message}")
+        self.recorder.record(test_name, success, message, category=category, response=response_data)
     
     def make_request(self, method, endpoint, data=None, token=None, files=None):
         """Make HTTP request with proper headers"""
-        url = f"{self.base_url}/{endpoint}"
-        headers = {}
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
-        if files is None and data is not None:
-            headers["Content-Type"] = "application/json"
-        
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                if files:
-                    response = requests.post(url, data=data, files=files, headers=headers, timeout=30)
-                else:
-                    response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
-            return None
+        return self.client.request(method, endpoint, data, token, files)
     
     def setup_tokens(self):
         """Setup all required tokens for testing"""
@@ -694,8 +657,6 @@ class FinalComprehensiveAPITester:
         print(f"Base URL: {self.base_url}")
         print("Testing ALL NEW FEATURES with proper test sequencing")
         
-        start_time = time.time()
-        
         # Setup tokens first
         if not self.setup_tokens():
             print("❌ Cannot proceed without proper token setup")
@@ -709,43 +670,23 @@ class FinalComprehensiveAPITester:
         self.test_enhanced_student_flow()
         self.test_enhanced_results_system()
         
-        end_time = time.time()
-        
         # Print summary
         print("\n" + "="*90)
         print("📊 FINAL COMPREHENSIVE TEST RESULTS SUMMARY")
         print("="*90)
         
-        total_passed = 0
-        total_failed = 0
-        
-        for category, results in self.results.items():
-            passed = results["passed"]
-            failed = results["failed"]
-            total_passed += passed
-            total_failed += failed
-            
-            status_icon = "✅" if failed == 0 else "❌"
-            print(f"{status_icon} {category.upper().replace('_', ' ')}: {passed} passed, {failed} failed")
-            
-            # Show failed tests
-            if failed > 0:
-                for detail in results["details"]:
-                    if "❌" in detail["status"]:
-                        print(f"   - {detail['test']}: {detail['message']}")
-        
-        print("-" * 90)
-        print(f"🎯 OVERALL: {total_passed} passed, {total_failed} failed")
-        print(f"⏱️  Duration: {end_time - start_time:.2f} seconds")
+        self.recorder.summary()
         
-        if total_failed == 0:
+        if self.recorder.failed == 0:
             print("🎉 ALL NEW FEATURES TESTS PASSED! All new functionality is working correctly.")
         else:
-            print(f"⚠️  {total_failed} tests failed. Please review the issues above.")
+            print(f"⚠️  {self.recorder.failed} tests failed. Please review the issues above.")
         
-        return total_failed == 0
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     tester = FinalComprehensiveAPITester()
     success = tester.run_all_tests()
+    tester.client.print_summary()
+    tester.recorder.finish()
     exit(0 if success else 1)
\ No newline at end of file
@@ -4,38 +4,41 @@ Final Backend API Testing for Test Series App - Continuation Enhancements
 Comprehensive testing of all new API enhancements with proper test data setup.
 """
 
-import requests
 import json
 import time
 import sys
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "http://localhost:3000/api"
+api = ApiClient(BASE_URL)
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 TEACHER_JEE_CREDENTIALS = {"username": "teacher_jee", "password": "teacher123"}
 TEACHER_NEET_CREDENTIALS = {"username": "teacher_neet", "password": "teacher123"}
 STUDENT_CREDENTIALS = {"username": "final_test_student", "password": "student123"}
 
+# test_result.md task covered by each section of run_comprehensive_tests (the teacher listing per
+# category has none, so its checks are reported but not synced)
+CONTINUATION_TASKS = {
+    "test_series": "Test Series CRUD Operations",
+    "detailed_results": "Test Attempts and Scoring System",
+    "results_privacy": "Test Attempts and Scoring System",
+    "edit_delete_permissions": "Test Series CRUD Operations",
+}
+
 class FinalAPITester:
     def __init__(self):
         self.admin_token = None
         self.teacher_jee_token = None
         self.teacher_neet_token = None
         self.student_token = None
-        self.test_results = []
+        self.recorder = ResultRecorder("final_continuation_test", api, tasks=CONTINUATION_TASKS)
         
     def log_result(self, test_name, success, message=""):
         """Log test result"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        result = f"{status}: {test_name}"
-        if message:
-            result += f" - {message}"
-        print(result)
-        self.test_results.append({
-            "test": test_name,
-            "success": success,
-            "message": message
-        })
+        self.recorder.record(test_name, success, message)
         
     def authenticate_users(self):
         """Authenticate all user types and get tokens"""
@@ -44,7 +47,7 @@ class FinalAPITester:
         
         # Admin authentication
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=ADMIN_CREDENTIALS)
+            response = api.post(f"{BASE_URL}/auth/login", json=ADMIN_CREDENTIALS)
             if response.status_code == 200:
                 data = response.json()
                 self.admin_token = data.get('token')
@@ -58,7 +61,7 @@ class FinalAPITester:
             
         # Teacher JEE authentication
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=TEACHER_JEE_CREDENTIALS)
+            response = api.post(f"{BASE_URL}/auth/login", json=TEACHER_JEE_CREDENTIALS)
             if response.status_code == 200:
                 data = response.json()
                 self.teacher_jee_token = data.get('token')
@@ -70,7 +73,7 @@ class FinalAPITester:
             
         # Teacher NEET authentication
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=TEACHER_NEET_CREDENTIALS)
+            response = api.post(f"{BASE_URL}/auth/login", json=TEACHER_NEET_CREDENTIALS)
             if response.status_code == 200:
                 data = response.json()
                 self.teacher_neet_token = data.get('token')
@@ -90,14 +93,14 @@ class FinalAPITester:
                 "role": "student",
                 "email": "finalstudent@test.com"
             }
-            response = requests.post(f"{BASE_URL}/auth/register", json=student_data)
+            response = api.post(f"{BASE_URL}/auth/register", json=student_data)
             if response.status_code == 200:
                 data = response.json()
                 self.student_token = data.get('token')
                 self.log_result("Student Registration & Authentication", True, f"Student created and authenticated")
             else:
                 # Try to login if already exists
-                response = requests.post(f"{BASE_URL}/auth/login", json=STUDENT_CREDENTIALS)
+                response = api.post(f"{BASE_URL}/auth/login", json=STUDENT_CREDENTIALS)
                 if response.status_code == 200:
                     data = response.json()
                     self.student_token = data.get('token')
@@ -116,7 +119,7 @@ class FinalAPITester:
         
         try:
             # Test categories with teachers aggregation
-            response = requests.get(f"{BASE_URL}/categories?withTeachers=true")
+            response = api.get(f"{BASE_URL}/categories?withTeachers=true")
             if response.status_code == 200:
                 categories = response.json()
                 if isinstance(categories, list) and len(categories) > 0:
@@ -161,7 +164,7 @@ class FinalAPITester:
         
         try:
             # Test student sees ALL published test series
-            response = requests.get(f"{BASE_URL}/test-series", headers=headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=headers)
             if response.status_code == 200:
                 test_series = response.json()
                 if isinstance(test_series, list):
@@ -192,13 +195,13 @@ class FinalAPITester:
         # Test category filtering
         try:
             # Get category ID for JEE-Mains
-            cat_response = requests.get(f"{BASE_URL}/categories")
+            cat_response = api.get(f"{BASE_URL}/categories")
             if cat_response.status_code == 200:
                 categories = cat_response.json()
                 jee_category = next((cat for cat in categories if cat['name'] == 'JEE-Mains'), None)
                 if jee_category:
                     category_id = jee_category['categoryId']
-                    response = requests.get(f"{BASE_URL}/test-series?category={category_id}", headers=headers)
+                    response = api.get(f"{BASE_URL}/test-series?category={category_id}", headers=headers)
                     if response.status_code == 200:
                         filtered_tests = response.json()
                         self.log_result("Category Filtering by ID", True, 
@@ -211,7 +214,7 @@ class FinalAPITester:
         # Test teacher preview functionality
         try:
             teacher_headers = {"Authorization": f"Bearer {self.teacher_jee_token}"}
-            response = requests.get(f"{BASE_URL}/test-series?preview=true", headers=teacher_headers)
+            response = api.get(f"{BASE_URL}/test-series?preview=true", headers=teacher_headers)
             if response.status_code == 200:
                 preview_tests = response.json()
                 self.log_result("Teacher Preview Mode", True, 
@@ -230,7 +233,7 @@ class FinalAPITester:
         
         try:
             # Get available test series
-            response = requests.get(f"{BASE_URL}/test-series", headers=headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=headers)
             if response.status_code != 200:
                 self.log_result("Get Test Series for Results Test", False, f"Status: {response.status_code}")
                 return
@@ -254,7 +257,7 @@ class FinalAPITester:
             test_id = test_with_questions['testSeriesId']
             
             # Start a test attempt
-            response = requests.post(f"{BASE_URL}/test-attempts", 
+            response = api.post(f"{BASE_URL}/test-attempts", 
                                    json={"testSeriesId": test_id}, headers=headers)
             if response.status_code == 200:
                 attempt_data = response.json()
@@ -267,7 +270,7 @@ class FinalAPITester:
                     question_id = question['questionId']
                     # Submit wrong answer intentionally to test detailed results
                     wrong_answer = (question['correctAnswer'] + 1) % len(question['options'])
-                    response = requests.put(f"{BASE_URL}/test-attempts/{attempt_id}",
+                    response = api.put(f"{BASE_URL}/test-attempts/{attempt_id}",
                                           json={"questionId": question_id, "answer": wrong_answer, "action": "submit_answer"},
                                           headers=headers)
                     if response.status_code == 200:
@@ -276,7 +279,7 @@ class FinalAPITester:
                         self.log_result(f"Submit Answer {i+1}", False, f"Status: {response.status_code}")
                         
                 # Complete the test
-                response = requests.put(f"{BASE_URL}/test-attempts/{attempt_id}",
+                response = api.put(f"{BASE_URL}/test-attempts/{attempt_id}",
                                       json={"action": "complete_test"}, headers=headers)
                 if response.status_code == 200:
                     result_data = response.json()
@@ -331,7 +334,7 @@ class FinalAPITester:
         # Test teacher results privacy
         try:
             # Get test attempts as JEE teacher
-            response = requests.get(f"{BASE_URL}/test-attempts", headers=teacher_jee_headers)
+            response = api.get(f"{BASE_URL}/test-attempts", headers=teacher_jee_headers)
             if response.status_code == 200:
                 teacher_attempts = response.json()
                 if len(teacher_attempts) > 0:
@@ -354,7 +357,7 @@ class FinalAPITester:
                 self.log_result("Teacher Results Access", False, f"Status: {response.status_code}")
                 
             # Get test attempts as admin
-            response = requests.get(f"{BASE_URL}/test-attempts", headers=admin_headers)
+            response = api.get(f"{BASE_URL}/test-attempts", headers=admin_headers)
             if response.status_code == 200:
                 admin_attempts = response.json()
                 if len(admin_attempts) > 0:
@@ -380,14 +383,15 @@ class FinalAPITester:
             self.log_result("Teacher Privacy Test", False, f"Error: {str(e)}")
             
         # Test cross-teacher edit/delete permissions
+        self.recorder.category = "edit_delete_permissions"
         try:
             # Get all test series to find tests from different teachers
-            response = requests.get(f"{BASE_URL}/test-series", headers=teacher_jee_headers)
+            response = api.get(f"{BASE_URL}/test-series", headers=teacher_jee_headers)
             if response.status_code == 200:
                 all_tests = response.json()
                 
                 # Get JEE teacher profile
-                profile_response = requests.get(f"{BASE_URL}/auth/profile", headers=teacher_jee_headers)
+                profile_response = api.get(f"{BASE_URL}/auth/profile", headers=teacher_jee_headers)
                 if profile_response.status_code == 200:
                     jee_teacher_profile = profile_response.json()
                     jee_teacher_id = jee_teacher_profile['userId']
@@ -401,7 +405,7 @@ class FinalAPITester:
                     
                     if other_teacher_test:
                         # Try to edit other teacher's test (should fail)
-                        response = requests.put(f"{BASE_URL}/test-series/{other_teacher_test['testSeriesId']}", 
+                        response = api.put(f"{BASE_URL}/test-series/{other_teacher_test['testSeriesId']}", 
                                               json={"title": "Unauthorized Edit Attempt"}, headers=teacher_jee_headers)
                         if response.status_code == 404:  # Should be unauthorized
                             self.log_result("Cross-Teacher Edit Protection", True, "JEE teacher cannot edit NEET teacher's test")
@@ -410,7 +414,7 @@ class FinalAPITester:
                                           f"Should be blocked but got status: {response.status_code}")
                             
                         # Try to delete other teacher's test (should fail)
-                        response = requests.delete(f"{BASE_URL}/test-series/{other_teacher_test['testSeriesId']}", 
+                        response = api.delete(f"{BASE_URL}/test-series/{other_teacher_test['testSeriesId']}", 
                                                  headers=teacher_jee_headers)
                         if response.status_code == 404:  # Should be unauthorized
                             self.log_result("Cross-Teacher Delete Protection", True, "JEE teacher cannot delete NEET teacher's test")
@@ -434,35 +438,28 @@ class FinalAPITester:
             return False
             
         # Run all test suites
+        self.recorder.category = "categories"
         self.test_categories_with_teachers_aggregation()
+        self.recorder.category = "test_series"
         self.test_enhanced_test_series_features()
+        self.recorder.category = "detailed_results"
         self.test_detailed_results_with_explanations()
+        self.recorder.category = "results_privacy"
         self.test_teacher_privacy_and_permissions()
         
         # Summary
         print("\n📋 COMPREHENSIVE TEST SUMMARY")
         print("=" * 60)
         
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
-        
-        print(f"Total Tests: {total_tests}")
-        print(f"Passed: {passed_tests} ✅")
-        print(f"Failed: {failed_tests} ❌")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        if failed_tests > 0:
-            print("\n❌ FAILED TESTS:")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  - {result['test']}: {result['message']}")
-        else:
+        self.recorder.summary()
+        if not self.recorder.failed:
             print("\n🎉 ALL TESTS PASSED! Backend API enhancements are working correctly.")
                     
-        return failed_tests == 0
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     tester = FinalAPITester()
     success = tester.run_comprehensive_tests()
+    api.print_summary()
+    tester.recorder.finish()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,105 @@
+// Sparse fieldsets (?fields=a,b,c) for listing endpoints.
+// Each resource lists the stored fields a role may request plus computed fields that the
+// route adds during enrichment, together with the stored fields those computations read.
+
+const USER_PUBLIC_FIELDS = ['userId', 'username', 'name', 'role', 'photo', 'rating', 'experience', 'createdAt'];
+const USER_ADMIN_FIELDS = [...USER_PUBLIC_FIELDS, 'email', 'phone', 'selectedCategory', 'selectedTeacher'];
+
+const TEST_SERIES_FIELDS = [
+  'testSeriesId', 'title', 'description', 'category', 'duration', 'questions', 'status',
+  'createdBy', 'createdAt', 'updatedAt', 'currentVersionId'
+];
+
+const ATTEMPT_FIELDS = [
+  'attemptId', 'testSeriesId', 'versionId', 'studentId', 'studentName', 'startTime', 'endTime', 'status',
+  'answers', 'score', 'totalQuestions', 'createdAt', 'completedAt'
+];
+
+const RESOURCES = {
+  users: {
+    stored: { admin: USER_ADMIN_FIELDS },
+    computed: {}
+  },
+  teachers: {
+    stored: { admin: USER_ADMIN_FIELDS, default: USER_PUBLIC_FIELDS },
+    computed: {}
+  },
+  'test-series': {
+    stored: { default: TEST_SERIES_FIELDS },
+    computed: {
+      createdByName: ['createdBy'],
+      createdByPhoto: ['createdBy'],
+      createdByRating: ['createdBy'],
+      createdByExperience: ['createdBy'],
+      totalAttempts: ['testSeriesId'],
+      averageScore: ['testSeriesId'],
+      averagePercentage: ['testSeriesId'],
+      // Evaluated by Mongo in the projection, so catalogues can skip the question bank
+      questionCount: { $size: { $ifNull: ['$questions', []] } }
+    }
+  },
+  'test-attempts': {
+    stored: { default: ATTEMPT_FIELDS },
+    computed: {
+      testSeriesTitle: ['testSeriesId'],
+      studentDetails: ['studentId'],
+      // Rebuilt from the attempt's test version; attempts from before versions stored a copy
+      detailedResults: ['detailedResults', 'versionId', 'answers', 'status']
+    },
+    hidden: { student: ['studentDetails'] }
+  }
+};
+
+function allowedFields(resource, role) {
+  const config = RESOURCES[resource];
+  const stored = config.stored[role] || config.stored.default || [];
+  const hidden = config.hidden?.[role] || [];
+  const computed = Object.keys(config.computed).filter(field => !hidden.includes(field));
+  return { stored: new Set(stored), computed: new Set(computed) };
+}
+
+// Parse ?fields= for a resource and role. Returns null when the parameter is absent,
+// { error } when it names unknown or forbidden fields, otherwise the Mongo projection
+// and the set of requested fields.
+export function parseFields(searchParams, resource, role) {
+  const raw = searchParams.get('fields');
+  if (raw === null) return null;
+
+  const requested = [...new Set(raw.split(',').map(field => field.trim()).filter(Boolean))];
+  if (requested.length === 0) {
+    return { error: 'fields must list at least one field' };
+  }
+
+  const allowed = allowedFields(resource, role || 'guest');
+  const rejected = requested.filter(field => !allowed.stored.has(field) && !allowed.computed.has(field));
+  if (rejected.length) {
+    return { error: `Unknown or forbidden fields: ${rejected.join(', ')}` };
+  }
+
+  const projection = { _id: 0 };
+  for (const field of requested) {
+    if (allowed.stored.has(field)) {
+      projection[field] = 1;
+      continue;
+    }
+    const source = RESOURCES[resource].computed[field];
+    if (Array.isArray(source)) {
+      // Enrichment inputs; stripped again by pickFields if not requested
+      source.forEach(dependency => { projection[dependency] = 1; });
+    } else {
+      projection[field] = source;
+    }
+  }
+
+  return { projection, include: new Set(requested) };
+}
+
+// Keep only the requested fields (drops enrichment inputs the client did not ask for)
+export function pickFields(doc, include) {
+  if (!include) return doc;
+  const picked = {};
+  for (const field of include) {
+    if (field in doc) picked[field] = doc[field];
+  }
+  return picked;
+}
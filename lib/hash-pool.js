@@ -0,0 +1,91 @@
+import { Worker } from 'node:worker_threads';
+import { createRequire } from 'node:module';
+import { availableParallelism } from 'node:os';
+import path from 'node:path';
+
+// bcrypt hashing on worker threads, so bulk imports neither block the event loop nor hash on a
+// single core. Workers start on first use and are unref'd while idle, so the pool does not keep
+// the process alive. bcryptjs is resolved from the app's node_modules (it is listed in
+// serverComponentsExternalPackages so standalone builds ship it).
+
+const POOL_SIZE = parseInt(process.env.HASH_WORKERS || String(Math.max(1, availableParallelism() - 1)));
+
+const WORKER_SOURCE = `
+const { parentPort, workerData } = require('node:worker_threads');
+const bcrypt = require(workerData.bcryptPath);
+parentPort.on('message', ({ id, password, rounds }) => {
+  try {
+    parentPort.postMessage({ id, hash: bcrypt.hashSync(password, rounds) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
+`;
+
+let workers = null;
+const idle = [];
+const queue = []; // { password, rounds, resolve, reject } waiting for a free worker
+const pending = new Map(); // task id -> { resolve, reject }
+let nextId = 0;
+
+function startWorkers() {
+  const bcryptPath = createRequire(path.join(process.cwd(), 'package.json')).resolve('bcryptjs');
+  const pool = Array.from({ length: POOL_SIZE }, () => {
+    const worker = new Worker(WORKER_SOURCE, { eval: true, workerData: { bcryptPath } });
+    worker.on('message', ({ id, hash, error }) => {
+      if (workers !== pool) return; // a reply from a torn-down pool, whose tasks were rejected
+      const task = pending.get(id);
+      pending.delete(id);
+      if (error) task.reject(new Error(error));
+      else task.resolve(hash);
+      release(worker);
+    });
+    worker.on('error', (error) => {
+      // Another worker of this pool failed first and it has already been replaced
+      if (workers !== pool) return;
+      // A crashed worker fails every outstanding task; the pool is rebuilt on the next call
+      for (const task of [...pending.values(), ...queue.splice(0)]) task.reject(error);
+      pending.clear();
+      pool.forEach(other => other.terminate());
+      workers = null;
+      idle.length = 0;
+    });
+    // After the listeners, which would otherwise ref the worker again
+    worker.unref();
+    return worker;
+  });
+  workers = pool;
+  idle.push(...pool);
+}
+
+function release(worker) {
+  const task = queue.shift();
+  if (task) {
+    dispatch(worker, task);
+  } else {
+    worker.unref();
+    idle.push(worker);
+  }
+}
+
+function dispatch(worker, { password, rounds, resolve, reject }) {
+  const id = nextId++;
+  pending.set(id, { resolve, reject });
+  worker.ref(); // busy workers keep the process alive, idle ones do not
+  worker.postMessage({ id, password, rounds });
+}
+
+// Hash one password on the pool; resolves to the bcrypt hash
+export function hashPassword(password, rounds) {
+  if (!workers) startWorkers();
+  return new Promise((resolve, reject) => {
+    const task = { password, rounds, resolve, reject };
+    const worker = idle.pop();
+    if (worker) dispatch(worker, task);
+    else queue.push(task);
+  });
+}
+
+export function hashPoolSize() {
+  return POOL_SIZE;
+}
@@ -0,0 +1,109 @@
+import { createHash } from 'node:crypto';
+import { NextResponse } from 'next/server';
+
+// Idempotency-Key support for retried writes. The first response to a key is kept for
+// IDEMPOTENCY_TTL_SECONDS and replayed to later requests with the same key and scope, so a
+// retried submission costs one store lookup instead of re-running the handler. Concurrent
+// duplicates in this process wait for the first request rather than racing it.
+// Like the rate limiter, the store is pluggable (setIdempotencyStore) for multi-instance setups.
+
+const TTL_MS = parseInt(process.env.IDEMPOTENCY_TTL_SECONDS || '3600') * 1000;
+const MAX_KEYS = parseInt(process.env.IDEMPOTENCY_MAX_KEYS || '10000');
+const MAX_KEY_LENGTH = 255;
+
+// In-memory store with a TTL per entry and a cap on entries. Any replacement must implement
+// the same async get(key) / set(key, value, ttlMs) contract and store JSON-serializable values.
+export class MemoryIdempotencyStore {
+  constructor(maxKeys = MAX_KEYS) {
+    this.entries = new Map();
+    this.maxKeys = maxKeys;
+  }
+
+  async get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+    return entry.value;
+  }
+
+  async set(key, value, ttlMs) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    // Maps iterate in insertion order, so the first key is the oldest
+    while (this.entries.size > this.maxKeys) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+}
+
+let store = new MemoryIdempotencyStore();
+const inflight = new Map(); // scoped key -> promise of the stored entry (null if none was stored)
+
+export function setIdempotencyStore(customStore) {
+  store = customStore;
+}
+
+function replay(entry, fingerprint, headers) {
+  if (entry.fingerprint !== fingerprint) {
+    return NextResponse.json(
+      { error: 'Idempotency-Key was already used for a different request' },
+      { status: 422, headers }
+    );
+  }
+  return new NextResponse(Buffer.from(entry.body, 'base64'), {
+    status: entry.status,
+    headers: { ...entry.headers, ...headers, 'Idempotent-Replayed': 'true' }
+  });
+}
+
+async function run(key, fingerprint, headers, fn) {
+  const pending = inflight.get(key);
+  if (pending) {
+    const entry = await pending;
+    // Nothing stored means the first request failed; try again as a new first request
+    return entry ? replay(entry, fingerprint, headers) : run(key, fingerprint, headers, fn);
+  }
+
+  let settle;
+  inflight.set(key, new Promise(resolve => { settle = resolve; }));
+  let entry = null;
+  try {
+    entry = await store.get(key);
+    if (entry) return replay(entry, fingerprint, headers);
+
+    const response = await fn();
+    // Server errors are transient; let the retry run the handler again
+    if (response.status < 500) {
+      entry = {
+        fingerprint,
+        status: response.status,
+        headers: Object.fromEntries(response.headers),
+        body: Buffer.from(await response.clone().arrayBuffer()).toString('base64')
+      };
+      await store.set(key, entry, TTL_MS);
+    }
+    return response;
+  } finally {
+    inflight.delete(key);
+    settle(entry);
+  }
+}
+
+// Run fn once per Idempotency-Key within scope (e.g. user and route) and replay its response to
+// repeats of the key. Requests without the header run fn directly.
+export async function withIdempotency(request, scope, headers, fn) {
+  const idempotencyKey = request.headers.get('idempotency-key');
+  if (!idempotencyKey) return fn();
+  if (idempotencyKey.length > MAX_KEY_LENGTH) {
+    return NextResponse.json(
+      { error: `Idempotency-Key must be at most ${MAX_KEY_LENGTH} characters` },
+      { status: 400, headers }
+    );
+  }
+
+  const fingerprint = createHash('sha256').update(await request.clone().text()).digest('hex');
+  return run(`${scope} ${idempotencyKey}`, fingerprint, headers, fn);
+}
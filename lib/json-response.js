@@ -0,0 +1,134 @@
+import { NextResponse } from 'next/server';
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { Readable, pipeline } from 'node:stream';
+import zlib from 'node:zlib';
+
+// JSON responses with negotiated br/gzip compression and streamed array serialization
+// for listing endpoints, so large result sets are never materialized as one string.
+
+const COMPRESSION_MIN_BYTES = parseInt(process.env.COMPRESSION_MIN_BYTES || '1024');
+const STREAM_BATCH_SIZE = 100;
+
+const streamEnds = new WeakMap(); // streamed response -> promise settled once its body is done
+
+// Brotli quality 4 / gzip level 6 keep compression cheap enough for per-request use
+const BROTLI_OPTIONS = { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } };
+const GZIP_OPTIONS = { level: 6 };
+
+// For a response from streamJsonArray that is still writing its body, a promise that resolves once
+// the body has been sent, failed or been cancelled; null for any other response
+export function streamFinished(response) {
+  return streamEnds.get(response) || null;
+}
+
+// Pick br or gzip from Accept-Encoding, honouring q=0 exclusions
+export function negotiateEncoding(request) {
+  const header = request.headers.get('accept-encoding') || '';
+  const accepted = new Map();
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (!name) continue;
+    const q = params.map(param => param.trim()).find(param => param.startsWith('q='));
+    accepted.set(name, q ? parseFloat(q.slice(2)) : 1);
+  }
+
+  for (const encoding of ['br', 'gzip']) {
+    const q = accepted.has(encoding) ? accepted.get(encoding) : accepted.get('*');
+    if (q > 0) return encoding;
+  }
+  return null;
+}
+
+function responseHeaders(init) {
+  const headers = new Headers(init.headers);
+  headers.set('Content-Type', 'application/json');
+  headers.append('Vary', 'Accept-Encoding');
+  return headers;
+}
+
+// Serialize a cursor as a JSON array, enriching documents a batch at a time
+async function* jsonArrayChunks(cursor, transformBatch, batchSize) {
+  let first = true;
+  let batch = [];
+
+  const serialize = async (docs) => {
+    const items = transformBatch ? await transformBatch(docs) : docs;
+    const chunk = items.map(item => JSON.stringify(item)).join(',');
+    const prefix = first ? '' : ',';
+    first = false;
+    return prefix + chunk;
+  };
+
+  yield '[';
+  for await (const doc of cursor) {
+    batch.push(doc);
+    if (batch.length >= batchSize) {
+      yield await serialize(batch);
+      batch = [];
+    }
+  }
+  if (batch.length) {
+    yield await serialize(batch);
+  }
+  yield ']';
+}
+
+// Stream a Mongo cursor (or any async iterable) to the client as a JSON array.
+// Output below the compression threshold is sent as a plain buffered body; anything
+// larger is streamed through a br/gzip encoder without building the full string.
+// The first batch is read and transformed before the status is sent, so an error there rejects
+// and is answered by the caller's error handling. A later error aborts the stream, and the
+// client sees a failed transfer instead of a truncated array.
+export async function streamJsonArray(request, cursor, init = {}) {
+  const { transformBatch, batchSize = STREAM_BATCH_SIZE } = init;
+  const iterator = jsonArrayChunks(cursor, transformBatch, batchSize);
+  // Keep later batches inside the request's async context (query monitoring)
+  const next = AsyncLocalStorage.bind(() => iterator.next());
+
+  const head = [];
+  let headBytes = 0;
+  // Always past the opening bracket, so the first batch has been fetched and transformed
+  while (head.length < 2 || headBytes < COMPRESSION_MIN_BYTES) {
+    const { value, done } = await next();
+    if (done) {
+      return new NextResponse(head.join(''), { status: init.status || 200, headers: responseHeaders(init) });
+    }
+    head.push(value);
+    headBytes += Buffer.byteLength(value);
+  }
+
+  async function* remaining() {
+    yield Buffer.from(head.join(''));
+    while (true) {
+      let chunk;
+      try {
+        chunk = await next();
+      } catch (error) {
+        // Rethrown to destroy the body stream, which aborts the response
+        console.error('Streamed response error:', error);
+        throw error;
+      }
+      if (chunk.done) return;
+      yield Buffer.from(chunk.value);
+    }
+  }
+
+  const headers = responseHeaders(init);
+  const encoding = negotiateEncoding(request);
+  const source = Readable.from(remaining());
+  const finished = new Promise(resolve => source.once('close', resolve));
+  let body = source;
+
+  if (encoding) {
+    const encoder = encoding === 'br'
+      ? zlib.createBrotliCompress(BROTLI_OPTIONS)
+      : zlib.createGzip(GZIP_OPTIONS);
+    // Errors are logged in remaining(); pipeline destroys the encoder with them
+    body = pipeline(body, encoder, () => {});
+    headers.set('Content-Encoding', encoding);
+  }
+
+  const response = new NextResponse(Readable.toWeb(body), { status: init.status || 200, headers });
+  streamEnds.set(response, finished);
+  return response;
+}
@@ -0,0 +1,252 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { streamFinished } from '@/lib/json-response';
+
+// Mongo command monitoring: per-request query counts, slow-query log and top offenders.
+// Enable by creating the MongoClient with { monitorCommands: true } and calling instrumentClient().
+// Streamed listings (lib/json-response.js) keep querying after their headers are sent, so their
+// X-Query-Count only covers the first batches and is flagged with X-Query-Count-Partial; the
+// route stats and queryTotals() take the final count once the body is done.
+
+const SLOW_QUERY_MS = parseInt(process.env.MONGO_SLOW_QUERY_MS || '100');
+const EXPLAIN_SAMPLE_RATE = parseFloat(process.env.MONGO_EXPLAIN_SAMPLE_RATE || '0.1');
+const N_PLUS_ONE_THRESHOLD = parseInt(process.env.MONGO_QUERIES_PER_REQUEST_WARN || '25');
+const MAX_TRACKED_SHAPES = 500;
+
+// Driver housekeeping commands that say nothing about application queries
+const IGNORED_COMMANDS = new Set([
+  'hello', 'ismaster', 'isMaster', 'ping', 'buildInfo', 'saslStart', 'saslContinue',
+  'endSessions', 'killCursors', 'explain'
+]);
+const EXPLAINABLE_COMMANDS = new Set(['find', 'aggregate', 'count', 'distinct']);
+
+const UUID_SEGMENT = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+const requestContext = new AsyncLocalStorage();
+const inflight = new Map(); // driver requestId -> started command info
+const shapeStats = new Map(); // shape key -> aggregated timings
+const routeStats = new Map(); // route key -> aggregated per-request query counts
+const responseTotals = new WeakMap(); // response -> promise of its final { queries, queryMs }
+
+// Replace literal values with '?' so queries differing only by ids group together
+function shapeOf(value) {
+  if (Array.isArray(value)) {
+    return value.length ? [shapeOf(value[0])] : [];
+  }
+  if (value && typeof value === 'object' && !(value instanceof Date) && !value._bsontype) {
+    return Object.fromEntries(Object.entries(value).map(([key, inner]) => [key, shapeOf(inner)]));
+  }
+  return '?';
+}
+
+function filterOf(commandName, command) {
+  switch (commandName) {
+    case 'find': return command.filter || {};
+    case 'aggregate': return command.pipeline || [];
+    case 'count':
+    case 'distinct':
+    case 'findAndModify': return command.query || {};
+    case 'update': return command.updates?.[0]?.q || {};
+    case 'delete': return command.deletes?.[0]?.q || {};
+    default: return null;
+  }
+}
+
+function collectionOf(commandName, command) {
+  if (commandName === 'getMore') return command.collection;
+  const target = command[commandName];
+  return typeof target === 'string' ? target : '';
+}
+
+// Collapse id segments so /api/test-attempts/<uuid> and friends share one bucket
+export function routeKey(method, pathname) {
+  const segments = pathname.split('/').filter(Boolean).map(segment =>
+    UUID_SEGMENT.test(segment) ? ':id' : segment
+  );
+  return `${method} /${segments.join('/')}`;
+}
+
+function summarizePlan(explain) {
+  const stages = [];
+  const walk = (node) => {
+    if (!node || typeof node !== 'object') return;
+    if (node.stage) {
+      stages.push(node.indexName ? `${node.stage}(${node.indexName})` : node.stage);
+    }
+    if (node.winningPlan) walk(node.winningPlan);
+    if (node.queryPlan) walk(node.queryPlan);
+    if (node.inputStage) walk(node.inputStage);
+    (node.inputStages || []).forEach(walk);
+    if (node.queryPlanner) walk(node.queryPlanner);
+    if (node.$cursor) walk(node.$cursor);
+    (node.stages || []).forEach(walk);
+  };
+  walk(explain);
+  return stages.join(' <- ') || 'unknown';
+}
+
+function explainCommand(client, started) {
+  // Strip session and cluster metadata; the driver adds these back for the explain itself
+  const { lsid, $db, $clusterTime, $readPreference, txnNumber, ...command } = started.command;
+
+  // Run outside the request context so the explain is not counted against the request
+  requestContext.exit(() => {
+    client.db(started.databaseName)
+      .command({ explain: command, verbosity: 'queryPlanner' })
+      .then(explain => {
+        const plan = summarizePlan(explain);
+        const stats = shapeStats.get(started.shapeKey);
+        if (stats) stats.plan = plan;
+        console.warn(`[mongo] explain ${started.shapeKey}: ${plan}`);
+      })
+      .catch(error => {
+        console.warn(`[mongo] explain failed for ${started.shapeKey}:`, error.message);
+      });
+  });
+}
+
+function recordShape(started, durationMs, failed) {
+  let stats = shapeStats.get(started.shapeKey);
+  if (!stats) {
+    if (shapeStats.size >= MAX_TRACKED_SHAPES) return null;
+    stats = {
+      collection: started.collection,
+      command: started.commandName,
+      shape: started.shape,
+      count: 0,
+      failures: 0,
+      totalMs: 0,
+      maxMs: 0,
+      slowCount: 0,
+      routes: {},
+      plan: null
+    };
+    shapeStats.set(started.shapeKey, stats);
+  }
+
+  stats.count++;
+  stats.totalMs += durationMs;
+  stats.maxMs = Math.max(stats.maxMs, durationMs);
+  if (failed) stats.failures++;
+  if (started.route) {
+    stats.routes[started.route] = (stats.routes[started.route] || 0) + 1;
+  }
+  return stats;
+}
+
+function onCommandFinished(client, event, failed) {
+  const started = inflight.get(event.requestId);
+  if (!started) return;
+  inflight.delete(event.requestId);
+
+  const durationMs = event.duration;
+  if (started.context) {
+    started.context.queries++;
+    started.context.queryMs += durationMs;
+  }
+
+  const stats = recordShape(started, durationMs, failed);
+
+  if (durationMs >= SLOW_QUERY_MS) {
+    console.warn(
+      `[mongo] slow ${started.commandName} on ${started.collection} took ${durationMs}ms` +
+      `${started.route ? ` (${started.route})` : ''} shape=${JSON.stringify(started.shape)}`
+    );
+    if (stats) stats.slowCount++;
+
+    if (EXPLAINABLE_COMMANDS.has(started.commandName) && Math.random() < EXPLAIN_SAMPLE_RATE) {
+      explainCommand(client, started);
+    }
+  }
+}
+
+// Subscribe to the driver's command monitoring events
+export function instrumentClient(client) {
+  client.on('commandStarted', (event) => {
+    if (IGNORED_COMMANDS.has(event.commandName)) return;
+
+    const context = requestContext.getStore();
+    const collection = collectionOf(event.commandName, event.command);
+    const filter = filterOf(event.commandName, event.command);
+    const shape = filter === null ? null : shapeOf(filter);
+
+    inflight.set(event.requestId, {
+      context,
+      route: context?.route || null,
+      commandName: event.commandName,
+      collection,
+      shape,
+      shapeKey: `${collection}.${event.commandName} ${JSON.stringify(shape)}`,
+      databaseName: event.databaseName,
+      command: event.command
+    });
+  });
+
+  client.on('commandSucceeded', (event) => onCommandFinished(client, event, false));
+  client.on('commandFailed', (event) => onCommandFinished(client, event, true));
+
+  return client;
+}
+
+function recordRoute(route, context) {
+  let stats = routeStats.get(route);
+  if (!stats) {
+    stats = { requests: 0, totalQueries: 0, maxQueries: 0, totalQueryMs: 0 };
+    routeStats.set(route, stats);
+  }
+  stats.requests++;
+  stats.totalQueries += context.queries;
+  stats.maxQueries = Math.max(stats.maxQueries, context.queries);
+  stats.totalQueryMs += context.queryMs;
+
+  if (context.queries >= N_PLUS_ONE_THRESHOLD) {
+    console.warn(`[mongo] ${route} issued ${context.queries} queries (${context.queryMs}ms) - possible N+1`);
+  }
+  return { queries: context.queries, queryMs: context.queryMs };
+}
+
+// Run an API request inside a query-counting context and tag the response with the totals
+export async function trackRequest(route, fn) {
+  const context = { route, queries: 0, queryMs: 0 };
+  const response = await requestContext.run(context, fn);
+  const streaming = response && streamFinished(response);
+
+  response?.headers?.set('X-Query-Count', String(context.queries));
+  response?.headers?.set('X-Query-Time', String(context.queryMs));
+  if (streaming) response.headers.set('X-Query-Count-Partial', '1');
+
+  const totals = streaming
+    ? streaming.then(() => recordRoute(route, context))
+    : Promise.resolve(recordRoute(route, context));
+  if (response) responseTotals.set(response, totals);
+  return response;
+}
+
+// Promise of the final { queries, queryMs } of a tracked response, including the batches of a
+// streamed body; null for responses trackRequest did not see
+export function queryTotals(response) {
+  return (response && responseTotals.get(response)) || null;
+}
+
+export function getQueryStats(limit = 20) {
+  const shapes = [...shapeStats.values()]
+    .map(stats => ({ ...stats, avgMs: stats.count ? stats.totalMs / stats.count : 0 }))
+    .sort((a, b) => b.totalMs - a.totalMs)
+    .slice(0, limit);
+
+  const routes = [...routeStats.entries()]
+    .map(([route, stats]) => ({
+      route,
+      ...stats,
+      avgQueries: stats.requests ? stats.totalQueries / stats.requests : 0,
+      avgQueryMs: stats.requests ? stats.totalQueryMs / stats.requests : 0
+    }))
+    .sort((a, b) => b.avgQueries - a.avgQueries)
+    .slice(0, limit);
+
+  return { slowQueryThresholdMs: SLOW_QUERY_MS, shapes, routes };
+}
+
+export function resetQueryStats() {
+  shapeStats.clear();
+  routeStats.clear();
+}
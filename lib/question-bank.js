@@ -0,0 +1,142 @@
+import { createHash } from 'node:crypto';
+import { MongoBulkWriteError } from 'mongodb';
+
+// Question bank. Each distinct question is stored once per owner in the questions collection,
+// keyed by a hash of the owner and the question's text, options and correct answer, and test
+// series keep an ordered list of { questionId, question } stubs pointing at it. The text stays on
+// the stub because the search index and highlights read it there; it is part of the hash, so it
+// never changes under an id. The explanation is not hashed: the owner edits it once on the bank
+// document and all of their test series pick it up. Other teachers uploading the same question
+// get their own copy, so their explanations are never replaced by someone else's.
+// Test series written before the bank embed full questions and are served as stored.
+
+const DUPLICATE_KEY = 11000;
+const QUESTION_PROJECTION = { _id: 0, questionId: 1, question: 1, options: 1, correctAnswer: 1, explanation: 1 };
+
+function normalize(text) {
+  return String(text ?? '').trim().replace(/\s+/g, ' ');
+}
+
+// Content hash identifying an owner's question across their test series
+export function questionHash(question, ownerId) {
+  const content = JSON.stringify([
+    ownerId,
+    normalize(question.question),
+    (question.options || []).map(normalize),
+    question.correctAnswer ?? null
+  ]);
+  return createHash('sha256').update(content).digest('hex').slice(0, 32);
+}
+
+// Created lazily on first write, once per process
+let indexReady = null;
+
+function ensureQuestionIndex(db) {
+  if (!indexReady) {
+    indexReady = db.collection('questions')
+      .createIndex({ questionId: 1 }, { unique: true, name: 'questions_questionId' })
+      .catch(error => {
+        indexReady = null;
+        throw error;
+      });
+  }
+  return indexReady;
+}
+
+// Add an owner's questions to the bank, leaving ones it already holds untouched. Returns the
+// ordered stubs for a test series, plus what was not stored as given: duplicates (indexes of
+// questions repeated earlier in the list, kept once) and conflicts ({ index, questionId,
+// explanation } for questions already in the bank with a different explanation, which is kept).
+export async function storeQuestions(db, questions, ownerId) {
+  await ensureQuestionIndex(db);
+  const stubs = [];
+  const operations = [];
+  const uploaded = []; // input index of each operation
+  const duplicates = [];
+  const seen = new Set();
+  const createdAt = new Date();
+
+  (questions || []).forEach((question, index) => {
+    const questionId = questionHash(question, ownerId);
+    if (seen.has(questionId)) {
+      duplicates.push(index);
+      return;
+    }
+    seen.add(questionId);
+
+    const text = normalize(question.question);
+    stubs.push({ questionId, question: text });
+    uploaded.push(index);
+    operations.push({
+      updateOne: {
+        filter: { questionId },
+        update: {
+          $setOnInsert: {
+            questionId,
+            question: text,
+            options: (question.options || []).map(normalize),
+            correctAnswer: question.correctAnswer ?? null,
+            explanation: question.explanation || '',
+            createdBy: ownerId,
+            createdAt
+          }
+        },
+        upsert: true
+      }
+    });
+  });
+
+  let inserted = {};
+  if (operations.length) {
+    try {
+      inserted = (await db.collection('questions').bulkWrite(operations, { ordered: false })).upsertedIds;
+    } catch (error) {
+      // Two uploads inserting the same new question race on the unique index; either copy will do
+      const writeErrors = error instanceof MongoBulkWriteError ? [].concat(error.writeErrors || []) : [];
+      if (!writeErrors.length || writeErrors.some(writeError => writeError.code !== DUPLICATE_KEY)) throw error;
+      inserted = error.result?.upsertedIds || {};
+    }
+  }
+
+  // Questions that were already in the bank keep its explanation; report the ones that differ
+  const existing = operations.map((_, i) => i).filter(i => !(i in inserted) && questions[uploaded[i]].explanation);
+  const conflicts = [];
+  if (existing.length) {
+    const stored = await db.collection('questions').find(
+      { questionId: { $in: existing.map(i => stubs[i].questionId) } },
+      { projection: { _id: 0, questionId: 1, explanation: 1 } }
+    ).toArray();
+    const explanations = new Map(stored.map(question => [question.questionId, question.explanation]));
+    for (const i of existing) {
+      const explanation = explanations.get(stubs[i].questionId);
+      if (explanation !== undefined && explanation !== questions[uploaded[i]].explanation) {
+        conflicts.push({ index: uploaded[i], questionId: stubs[i].questionId, explanation });
+      }
+    }
+  }
+  return { stubs, duplicates, conflicts };
+}
+
+// Replace question stubs with the full questions from the bank, for a batch of test series
+export async function hydrateQuestions(db, tests) {
+  const questionIds = new Set();
+  for (const test of tests) {
+    for (const question of test.questions || []) {
+      if (!('options' in question)) questionIds.add(question.questionId);
+    }
+  }
+  if (!questionIds.size) return tests;
+
+  const questions = await db.collection('questions').find(
+    { questionId: { $in: [...questionIds] } },
+    { projection: QUESTION_PROJECTION }
+  ).toArray();
+  const byId = new Map(questions.map(question => [question.questionId, question]));
+
+  for (const test of tests) {
+    if (test.questions) {
+      test.questions = test.questions.map(question => byId.get(question.questionId) || question);
+    }
+  }
+  return tests;
+}
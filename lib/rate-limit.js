@@ -0,0 +1,127 @@
+// Token-bucket admission control for expensive endpoints (bcrypt-backed auth routes).
+// Buckets live in a pluggable store: the default is in-process memory, and a shared store
+// (e.g. Redis) can be installed with setRateLimitStore() when running several instances.
+
+const SWEEP_EVERY = 1000;
+
+// In-memory bucket store. Any replacement must implement the same async peek() and take()
+// contract.
+export class MemoryStore {
+  constructor() {
+    this.buckets = new Map();
+    this.operations = 0;
+  }
+
+  // The bucket for `key` refilled up to now, created full if missing
+  refill(key, { capacity, refillPerSecond }, now) {
+    let bucket = this.buckets.get(key);
+    if (!bucket) {
+      bucket = { tokens: capacity, updatedAt: now, capacity, refillPerSecond };
+      this.buckets.set(key, bucket);
+    }
+
+    const elapsedSeconds = (now - bucket.updatedAt) / 1000;
+    bucket.tokens = Math.min(capacity, bucket.tokens + elapsedSeconds * refillPerSecond);
+    bucket.updatedAt = now;
+    return bucket;
+  }
+
+  // Whether `cost` tokens are available in bucket `key`, without consuming them;
+  // returns { allowed, remaining, retryAfterMs }
+  async peek(key, { capacity, refillPerSecond, cost = 1 }) {
+    const bucket = this.refill(key, { capacity, refillPerSecond }, Date.now());
+    if (bucket.tokens >= cost) {
+      return { allowed: true, remaining: Math.floor(bucket.tokens), retryAfterMs: 0 };
+    }
+    const retryAfterMs = Math.ceil(((cost - bucket.tokens) / refillPerSecond) * 1000);
+    return { allowed: false, remaining: 0, retryAfterMs };
+  }
+
+  // Consume `cost` tokens from bucket `key`; returns { allowed, remaining, retryAfterMs }
+  async take(key, { capacity, refillPerSecond, cost = 1 }) {
+    const now = Date.now();
+    // Sweep before loading the bucket, so the one being charged is never dropped from the map
+    if (++this.operations % SWEEP_EVERY === 0) {
+      this.sweep(now);
+    }
+
+    const bucket = this.refill(key, { capacity, refillPerSecond }, now);
+    if (bucket.tokens >= cost) {
+      bucket.tokens -= cost;
+      return { allowed: true, remaining: Math.floor(bucket.tokens), retryAfterMs: 0 };
+    }
+
+    const retryAfterMs = Math.ceil(((cost - bucket.tokens) / refillPerSecond) * 1000);
+    return { allowed: false, remaining: 0, retryAfterMs };
+  }
+
+  // Drop buckets that have refilled completely; they carry no state worth keeping
+  sweep(now = Date.now()) {
+    for (const [key, bucket] of this.buckets) {
+      const elapsedSeconds = (now - bucket.updatedAt) / 1000;
+      if (bucket.tokens + elapsedSeconds * bucket.refillPerSecond >= bucket.capacity) {
+        this.buckets.delete(key);
+      }
+    }
+  }
+}
+
+let store = new MemoryStore();
+
+export function setRateLimitStore(customStore) {
+  store = customStore;
+}
+
+function limitFromEnv(prefix, capacity, perMinute) {
+  return {
+    capacity: parseInt(process.env[`${prefix}_CAPACITY`] || String(capacity)),
+    refillPerSecond: parseFloat(process.env[`${prefix}_PER_MINUTE`] || String(perMinute)) / 60
+  };
+}
+
+// Defaults: a global ceiling protecting CPU for exam traffic, a generous per-IP allowance
+// (schools sit behind a single NAT) and a tight per-username allowance against stuffing.
+export const AUTH_LIMITS = {
+  global: limitFromEnv('AUTH_RATE_LIMIT_GLOBAL', 100, 3000),
+  ip: limitFromEnv('AUTH_RATE_LIMIT_IP', 60, 300),
+  username: limitFromEnv('AUTH_RATE_LIMIT_USERNAME', 5, 10)
+};
+
+// Reverse proxies in front of the app that append the address they saw to X-Forwarded-For
+// (TRUST_PROXY=1 behind one load balancer). Without any, the header is whatever the client sent.
+const TRUSTED_PROXIES = parseInt(process.env.TRUST_PROXY || '0') || 0;
+
+// The client address to rate limit on, or null when it is not known. Behind TRUST_PROXY proxies
+// it is the right-most X-Forwarded-For entry none of them added; entries further left came from
+// the client and are ignored. Otherwise it is the connection address, where the platform
+// reports one (request.ip).
+export function clientIp(request) {
+  if (TRUSTED_PROXIES > 0) {
+    const hops = (request.headers.get('x-forwarded-for') || '')
+      .split(',')
+      .map(hop => hop.trim())
+      .filter(Boolean);
+    if (hops.length >= TRUSTED_PROXIES) return hops[hops.length - TRUSTED_PROXIES];
+  }
+  return request.ip || null;
+}
+
+// Check every [key, limit] pair before consuming from any of them, so a request rejected by one
+// bucket does not use up tokens in the others. Returns null when admitted (one token is then
+// taken from each bucket), otherwise the number of seconds the caller should wait.
+export async function checkRateLimits(checks) {
+  for (const [key, limit] of checks) {
+    const result = await store.peek(key, limit);
+    if (!result.allowed) {
+      return Math.max(1, Math.ceil(result.retryAfterMs / 1000));
+    }
+  }
+  for (const [key, limit] of checks) {
+    const result = await store.take(key, limit);
+    // Another request took the last token in between
+    if (!result.allowed) {
+      return Math.max(1, Math.ceil(result.retryAfterMs / 1000));
+    }
+  }
+  return null;
+}
@@ -0,0 +1,99 @@
+import { createWriteStream } from 'node:fs';
+import { createHash, randomBytes } from 'node:crypto';
+import { queryTotals } from '@/lib/query-monitor';
+
+// Optional request journal for reproducing production load shapes (python -m tests.harness replay).
+// Set REQUEST_JOURNAL=/path/to/journal.ndjson to append one JSON line per API request. Entries are
+// sanitized: ids in the path are collapsed by routeKey(), users become salted pseudonyms and request
+// bodies and query strings are reduced to their shape, keeping only numbers, booleans and enum values.
+// durationMs is the time to the response headers; streamed bodies may still be in flight. queries
+// is the request's final count (lib/query-monitor.js), so an entry for a streamed listing is
+// written once its body is done.
+
+const JOURNAL_PATH = process.env.REQUEST_JOURNAL;
+// Fix the salt to keep pseudonyms stable across restarts; by default they only link requests within one
+const ACTOR_SALT = process.env.REQUEST_JOURNAL_SALT || randomBytes(16).toString('hex');
+const MAX_SHAPED_BODY_BYTES = 1024 * 1024;
+
+// Fields whose string values are enums or options rather than user data
+const KEPT_STRINGS = new Set(['action', 'role', 'status', 'fields', 'withTeachers', 'includeUnpublished', 'preview', 'page', 'limit']);
+
+let stream = null;
+
+// Replace user data with placeholders that preserve types and sizes
+export function shapeOf(value, key) {
+  if (Array.isArray(value)) {
+    return { $items: value.length, $of: value.length ? shapeOf(value[0]) : null };
+  }
+  if (value && typeof value === 'object') {
+    return Object.fromEntries(Object.entries(value).map(([field, inner]) => [field, shapeOf(inner, field)]));
+  }
+  if (typeof value === 'string') {
+    return KEPT_STRINGS.has(key) ? value : `<string:${value.length}>`;
+  }
+  return value;
+}
+
+function actorOf(user) {
+  if (!user?.userId) return null;
+  return createHash('sha256').update(ACTOR_SALT + user.userId).digest('hex').slice(0, 12);
+}
+
+// Shape of the JSON body, read from a clone so the handler can still consume it
+async function bodyShape(request) {
+  if (request.method === 'GET' || request.method === 'OPTIONS') return undefined;
+  const type = (request.headers.get('content-type') || '').split(';')[0];
+  const length = parseInt(request.headers.get('content-length') || '0');
+
+  if (type !== 'application/json' || length > MAX_SHAPED_BODY_BYTES) {
+    return length ? { $bytes: length, $type: type } : undefined;
+  }
+  try {
+    return shapeOf(JSON.parse(await request.clone().text()));
+  } catch (error) {
+    return { $invalid: true };
+  }
+}
+
+function write(entry) {
+  if (!stream) {
+    stream = createWriteStream(JOURNAL_PATH, { flags: 'a' });
+    stream.on('error', (error) => console.warn('[journal] write failed:', error.message));
+  }
+  stream.write(JSON.stringify(entry) + '\n');
+}
+
+// Run an API request and, when REQUEST_JOURNAL is set, append its sanitized journal entry
+export async function journalRequest(request, route, getUser, fn) {
+  if (!JOURNAL_PATH) return fn();
+
+  const ts = Date.now();
+  const started = performance.now();
+  const body = bodyShape(request);
+  const user = getUser(request);
+  const url = new URL(request.url);
+
+  let response;
+  try {
+    response = await fn();
+    return response;
+  } finally {
+    const entry = {
+      ts,
+      method: request.method,
+      route,
+      actor: actorOf(user),
+      role: user?.role || null,
+      status: response?.status ?? 500,
+      durationMs: Math.round((performance.now() - started) * 10) / 10,
+      queries: 0
+    };
+    if (url.search) entry.query = shapeOf(Object.fromEntries(url.searchParams));
+    Promise.all([body, queryTotals(response)])
+      .then(([shape, totals]) => {
+        entry.queries = totals?.queries ?? 0;
+        write(shape === undefined ? entry : { ...entry, body: shape });
+      })
+      .catch(error => console.warn('[journal] entry dropped:', error.message));
+  }
+}
@@ -0,0 +1,354 @@
+import { MongoBulkWriteError } from 'mongodb';
+import { v4 as uuidv4 } from 'uuid';
+import { hashPassword } from '@/lib/hash-pool';
+
+// Bulk student roster import (POST /api/users/import). The upload is parsed as it streams in and
+// cut into batches; each batch is checked against existing users with one $in query, hashed on
+// the worker pool (lib/hash-pool.js) and written with an unordered insertMany. Progress is kept
+// in the rosterImports collection for GET /api/users/import/:id. Uploads longer than
+// ROSTER_IMPORT_MAX_ROWS are cut off there: the rows before the limit are imported and the job
+// ends as 'partial'.
+//
+// Imported passwords are hashed with the cost used at registration (12) unless
+// ROSTER_BCRYPT_ROUNDS lowers it; 10 makes tens of thousands of rows finish in minutes rather
+// than hours. bcrypt hashes carry their cost, so login works the same for both.
+
+const BATCH_SIZE = parseInt(process.env.ROSTER_IMPORT_BATCH_SIZE || '1000');
+const MAX_ROWS = parseInt(process.env.ROSTER_IMPORT_MAX_ROWS || '100000');
+const BCRYPT_ROUNDS = parseInt(process.env.ROSTER_BCRYPT_ROUNDS || '12');
+const MAX_REPORTED_ERRORS = 100;
+const DUPLICATE_KEY = 11000;
+
+// Content-Type -> roster format
+export const ROSTER_FORMATS = {
+  'text/csv': 'csv',
+  'application/x-ndjson': 'ndjson',
+  'application/jsonl': 'ndjson'
+};
+const COLUMNS = ['username', 'password', 'name', 'email', 'phone', 'selectedCategory'];
+const REQUIRED_COLUMNS = ['username', 'password', 'name'];
+
+// A problem with the upload as a whole (bad header); reported as a 400
+export class RosterImportError extends Error {}
+
+// Split one CSV line into trimmed fields, honouring "quoted, fields" and "" escapes
+export function parseCsvLine(line) {
+  const fields = [];
+  let field = '';
+  let quoted = false;
+  for (let i = 0; i < line.length; i++) {
+    const char = line[i];
+    if (quoted) {
+      if (char === '"' && line[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else if (char === '"') {
+        quoted = false;
+      } else {
+        field += char;
+      }
+    } else if (char === '"') {
+      quoted = true;
+    } else if (char === ',') {
+      fields.push(field.trim());
+      field = '';
+    } else {
+      field += char;
+    }
+  }
+  fields.push(field.trim());
+  return fields;
+}
+
+// Text lines of a byte stream, decoded incrementally
+async function* streamLines(stream) {
+  const decoder = new TextDecoder();
+  let buffered = '';
+  for await (const chunk of stream) {
+    buffered += decoder.decode(chunk, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    yield* lines;
+  }
+  buffered += decoder.decode();
+  if (buffered) yield buffered;
+}
+
+// { line, row } or { line, error } for each non-empty line of the upload
+export async function* rosterRows(stream, format) {
+  let header = null;
+  let lineNumber = 0;
+  for await (const rawLine of streamLines(stream)) {
+    lineNumber++;
+    const line = rawLine.replace(/\r$/, '').replace(/^\uFEFF/, '');
+    if (!line.trim()) continue;
+
+    if (format === 'ndjson') {
+      try {
+        const row = JSON.parse(line);
+        yield row && typeof row === 'object' && !Array.isArray(row)
+          ? { line: lineNumber, row }
+          : { line: lineNumber, error: 'Expected a JSON object' };
+      } catch (error) {
+        yield { line: lineNumber, error: 'Invalid JSON' };
+      }
+      continue;
+    }
+
+    const fields = parseCsvLine(line);
+    if (!header) {
+      // Header names are matched case-insensitively; unknown columns are ignored
+      header = fields.map(name => COLUMNS.find(column => column.toLowerCase() === name.toLowerCase()) || null);
+      const missing = REQUIRED_COLUMNS.filter(column => !header.includes(column));
+      if (missing.length) {
+        throw new RosterImportError(`CSV header is missing required columns: ${missing.join(', ')}`);
+      }
+      continue;
+    }
+    const row = {};
+    header.forEach((column, i) => {
+      if (column && fields[i]) row[column] = fields[i];
+    });
+    yield { line: lineNumber, row };
+  }
+}
+
+// The reason a row cannot be imported, or null
+function invalidReason(row) {
+  for (const column of REQUIRED_COLUMNS) {
+    if (typeof row[column] !== 'string' || !row[column].trim()) return `${column} is required`;
+  }
+  if (row.password.length < 6) return 'password must be at least 6 characters';
+  for (const column of ['email', 'phone', 'selectedCategory']) {
+    if (row[column] != null && typeof row[column] !== 'string') return `${column} must be a string`;
+  }
+  if (row.email && !/^[^@\s]+@[^@\s]+$/.test(row.email)) return 'email is invalid';
+  return null;
+}
+
+// Batches handed from the upload reader to the importer
+class BatchQueue {
+  constructor() {
+    this.batches = [];
+    this.closed = false;
+    this.wake = null;
+  }
+
+  push(batch) {
+    this.batches.push(batch);
+    this.wake?.();
+  }
+
+  close() {
+    this.closed = true;
+    this.wake?.();
+  }
+
+  // The next batch, or null once the queue is closed and drained
+  async next() {
+    while (!this.batches.length && !this.closed) {
+      await new Promise(resolve => { this.wake = resolve; });
+      this.wake = null;
+    }
+    return this.batches.shift() || null;
+  }
+}
+
+class RosterImport {
+  constructor(db, format, admin) {
+    this.db = db;
+    this.job = {
+      importId: uuidv4(),
+      format,
+      status: 'receiving',
+      createdBy: admin.userId,
+      createdAt: new Date(),
+      updatedAt: new Date(),
+      finishedAt: null,
+      counts: { received: 0, processed: 0, inserted: 0, exists: 0, invalid: 0, duplicate: 0, failed: 0 },
+      errors: [],
+      errorsTruncated: false,
+      truncated: false,
+      error: null
+    };
+    this.queue = new BatchQueue();
+    this.saving = Promise.resolve();
+  }
+
+  reject(line, username, reason) {
+    if (this.job.errors.length < MAX_REPORTED_ERRORS) {
+      this.job.errors.push({ line, username: username ?? null, reason });
+    } else {
+      this.job.errorsTruncated = true;
+    }
+  }
+
+  // Saves run one at a time and write the job as it is when they run, so the last one wins
+  save() {
+    this.saving = this.saving.catch(() => {}).then(() => {
+      this.job.updatedAt = new Date();
+      const { importId, ...fields } = this.job;
+      return this.db.collection('rosterImports').updateOne({ importId }, { $set: fields });
+    });
+    return this.saving;
+  }
+
+  fail(error) {
+    if (this.job.status === 'failed') return;
+    this.job.status = 'failed';
+    this.job.error = error.message;
+    this.job.finishedAt = new Date();
+  }
+
+  // Read the upload into batches; rows rejected here never reach the database
+  async receive(stream) {
+    const seenUsernames = new Set();
+    const seenEmails = new Set();
+    let batch = [];
+    try {
+      for await (const { line, row, error } of rosterRows(stream, this.job.format)) {
+        if (this.job.status === 'failed') break;
+        if (this.job.counts.received >= MAX_ROWS) {
+          // Earlier batches may be imported already; keep them and stop reading
+          this.job.truncated = true;
+          this.job.error = `Rosters are limited to ${MAX_ROWS} rows; line ${line} and after were not imported`;
+          break;
+        }
+        this.job.counts.received++;
+
+        const reason = error || invalidReason(row);
+        if (reason) {
+          this.job.counts.invalid++;
+          this.job.counts.processed++;
+          this.reject(line, typeof row?.username === 'string' ? row.username : null, reason);
+          continue;
+        }
+        if (seenUsernames.has(row.username) || (row.email && seenEmails.has(row.email))) {
+          this.job.counts.duplicate++;
+          this.job.counts.processed++;
+          this.reject(line, row.username, 'Duplicate username or email earlier in the file');
+          continue;
+        }
+        seenUsernames.add(row.username);
+        if (row.email) seenEmails.add(row.email);
+
+        batch.push({ line, ...row });
+        if (batch.length >= BATCH_SIZE) {
+          this.queue.push(batch);
+          batch = [];
+        }
+      }
+      if (batch.length) this.queue.push(batch);
+      if (this.job.status === 'receiving') this.job.status = 'processing';
+    } catch (error) {
+      this.fail(error);
+      throw error;
+    } finally {
+      this.queue.close();
+    }
+  }
+
+  async insertBatch(batch) {
+    const users = this.db.collection('users');
+    const counts = this.job.counts;
+
+    const emails = batch.map(row => row.email).filter(Boolean);
+    const existing = await users.find(
+      { $or: [{ username: { $in: batch.map(row => row.username) } }, { email: { $in: emails } }] },
+      { projection: { _id: 0, username: 1, email: 1 } }
+    ).toArray();
+    const takenUsernames = new Set(existing.map(user => user.username));
+    const takenEmails = new Set(existing.map(user => user.email).filter(Boolean));
+
+    const rows = [];
+    for (const row of batch) {
+      if (takenUsernames.has(row.username) || (row.email && takenEmails.has(row.email))) {
+        counts.exists++;
+        this.reject(row.line, row.username, 'User already exists');
+      } else {
+        rows.push(row);
+      }
+    }
+
+    const hashes = await Promise.all(rows.map(row => hashPassword(row.password, BCRYPT_ROUNDS)));
+    const createdAt = new Date();
+    const documents = rows.map((row, i) => ({
+      userId: uuidv4(),
+      username: row.username,
+      password: hashes[i],
+      name: row.name,
+      role: 'student',
+      email: row.email || null,
+      phone: row.phone || null,
+      selectedCategory: row.selectedCategory || null,
+      selectedTeacher: null,
+      photo: null,
+      importId: this.job.importId,
+      createdAt
+    }));
+
+    if (documents.length) {
+      try {
+        const result = await users.insertMany(documents, { ordered: false });
+        counts.inserted += result.insertedCount;
+      } catch (error) {
+        if (!(error instanceof MongoBulkWriteError)) throw error;
+        // Unordered inserts carry on past failures; a duplicate key means the user arrived meanwhile
+        counts.inserted += error.insertedCount ?? error.result?.insertedCount ?? 0;
+        for (const writeError of [].concat(error.writeErrors || [])) {
+          const row = rows[writeError.index];
+          if (writeError.code === DUPLICATE_KEY) {
+            counts.exists++;
+            this.reject(row.line, row.username, 'User already exists');
+          } else {
+            counts.failed++;
+            this.reject(row.line, row.username, writeError.errmsg || 'Insert failed');
+          }
+        }
+      }
+    }
+    counts.processed += batch.length;
+  }
+
+  // Import queued batches until the upload is exhausted, saving progress after each one
+  async process() {
+    try {
+      let batch;
+      while ((batch = await this.queue.next())) {
+        if (this.job.status === 'failed') break;
+        await this.insertBatch(batch);
+        await this.save();
+      }
+      if (this.job.status !== 'failed') {
+        this.job.status = this.job.truncated ? 'partial' : 'completed';
+        this.job.finishedAt = new Date();
+      }
+    } catch (error) {
+      console.error('Roster import failed:', error);
+      this.fail(error);
+    }
+    await this.save().catch(error => console.error('Roster import status not saved:', error));
+  }
+}
+
+// Start importing a roster upload. Resolves once the whole upload has been read (importing
+// carries on in the background) with the job status; throws RosterImportError for a bad upload.
+export async function importRoster(db, stream, format, admin) {
+  const rosterImport = new RosterImport(db, format, admin);
+  await db.collection('rosterImports').insertOne({ ...rosterImport.job });
+
+  const processing = rosterImport.process();
+  try {
+    await rosterImport.receive(stream);
+  } catch (error) {
+    await processing;
+    throw error;
+  }
+  await rosterImport.save();
+  return { ...rosterImport.job };
+}
+
+// Status of an import without the Mongo _id
+export function getRosterImport(db, importId) {
+  return db.collection('rosterImports').findOne({ importId }, { projection: { _id: 0 } });
+}
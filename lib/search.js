@@ -0,0 +1,98 @@
+// Helpers for the test-series full-text search endpoint: the Mongo text index and
+// highlight snippets. Snippets are HTML-escaped with matches wrapped in <mark>.
+
+const SNIPPET_RADIUS = 60;
+const MAX_QUESTION_HIGHLIGHTS = 3;
+
+export const TEXT_INDEX = {
+  keys: { title: 'text', description: 'text', 'questions.question': 'text' },
+  options: {
+    name: 'testSeries_text',
+    weights: { title: 10, description: 4, 'questions.question': 1 },
+    default_language: 'english'
+  }
+};
+
+// Created lazily on first search, once per process
+let textIndexReady = null;
+
+export function ensureTextIndex(db) {
+  if (!textIndexReady) {
+    textIndexReady = db.collection('testSeries')
+      .createIndex(TEXT_INDEX.keys, TEXT_INDEX.options)
+      .catch(error => {
+        textIndexReady = null;
+        throw error;
+      });
+  }
+  return textIndexReady;
+}
+
+// Positive terms from a $text search string ("phrases" kept whole, -negations dropped)
+export function searchTerms(q) {
+  const terms = [];
+  const pattern = /(-?)"([^"]+)"|(-?)(\S+)/g;
+  let match;
+  while ((match = pattern.exec(q)) !== null) {
+    const negated = match[1] || match[3];
+    const term = (match[2] || match[4]).trim();
+    if (!negated && term) terms.push(term.toLowerCase());
+  }
+  return terms;
+}
+
+function escapeHtml(text) {
+  return text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+// Snippet of `text` around the first term match, or null when no term occurs.
+// Terms match as word prefixes so stemmed hits ("integral" -> "integrals") still highlight.
+export function highlight(text, terms) {
+  if (!text || terms.length === 0) return null;
+  const pattern = new RegExp(`\\b(?:${terms.map(escapeRegExp).join('|')})\\w*`, 'gi');
+
+  const first = pattern.exec(text);
+  if (!first) return null;
+
+  const start = Math.max(0, first.index - SNIPPET_RADIUS);
+  const end = Math.min(text.length, first.index + first[0].length + SNIPPET_RADIUS);
+  const excerpt = text.slice(start, end);
+
+  let snippet = '';
+  let cursor = 0;
+  pattern.lastIndex = 0;
+  let match;
+  while ((match = pattern.exec(excerpt)) !== null) {
+    snippet += escapeHtml(excerpt.slice(cursor, match.index)) + `<mark>${escapeHtml(match[0])}</mark>`;
+    cursor = match.index + match[0].length;
+  }
+  snippet += escapeHtml(excerpt.slice(cursor));
+
+  return `${start > 0 ? '…' : ''}${snippet}${end < text.length ? '…' : ''}`;
+}
+
+export function highlightTest(test, terms) {
+  const highlights = {};
+  const title = highlight(test.title, terms);
+  const description = highlight(test.description, terms);
+  if (title) highlights.title = title;
+  if (description) highlights.description = description;
+
+  const questions = [];
+  for (const question of test.questions || []) {
+    const snippet = highlight(question.question, terms);
+    if (snippet) questions.push(snippet);
+    if (questions.length >= MAX_QUESTION_HIGHLIGHTS) break;
+  }
+  if (questions.length) highlights.questions = questions;
+
+  return highlights;
+}
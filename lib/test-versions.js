@@ -0,0 +1,236 @@
+import { createHash } from 'node:crypto';
+import { hydrateQuestions } from '@/lib/question-bank';
+
+// Immutable snapshots of a test series' questions. Attempts record the versionId they started on
+// and are scored and rendered against it, so editing a live test cannot change running or
+// finished attempts and attempts no longer copy the questions they were asked.
+// Versions are content-addressed: saving unchanged questions again reuses the same version.
+//
+// A version is a small header in testVersions ({ versionId, testSeriesId, questionCount,
+// chunkSize }) plus its ordered question stubs in testVersionChunks, QUESTION_CHUNK_SIZE to a
+// document, so a page of a long test reads one or two chunks and no document grows with the
+// test. Being immutable, headers and chunks are cached in-process (TEST_VERSION_CACHE_SIZE
+// entries each); explanations still come from the question bank, where they can be edited.
+
+const CHUNK_SIZE = parseInt(process.env.QUESTION_CHUNK_SIZE || '100');
+const CACHE_SIZE = parseInt(process.env.TEST_VERSION_CACHE_SIZE || '2000');
+const DUPLICATE_KEY = 11000;
+
+const headers = new Map(); // versionId -> version header, least recently used first
+const chunks = new Map(); // "versionId:index" -> question stubs, least recently used first
+const publishing = new Map(); // versionId -> pending publish, shared by concurrent attempt starts
+let indexesReady = null;
+
+function ensureVersionIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all([
+      db.collection('testVersions')
+        .createIndex({ versionId: 1 }, { unique: true, name: 'testVersions_versionId' }),
+      db.collection('testVersionChunks')
+        .createIndex({ versionId: 1, index: 1 }, { unique: true, name: 'testVersionChunks_versionId_index' })
+    ]).catch(error => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+function remember(cache, key, value) {
+  cache.delete(key);
+  cache.set(key, value);
+  if (cache.size > CACHE_SIZE) cache.delete(cache.keys().next().value);
+  return value;
+}
+
+function chunkKey(versionId, index) {
+  return `${versionId}:${index}`;
+}
+
+// Another instance stored the same immutable document first; either copy will do
+function ignoreDuplicates(error) {
+  const writeErrors = error.writeErrors ? [].concat(error.writeErrors) : [error];
+  if (writeErrors.some(writeError => writeError.code !== DUPLICATE_KEY)) throw error;
+}
+
+function versionIdOf(test) {
+  return createHash('sha256')
+    .update(JSON.stringify([test.testSeriesId, test.questions || []]))
+    .digest('hex')
+    .slice(0, 32);
+}
+
+async function snapshot(db, test, versionId) {
+  await ensureVersionIndexes(db);
+  const questions = test.questions || [];
+  const versionChunks = [];
+  for (let index = 0; index * CHUNK_SIZE < questions.length; index++) {
+    versionChunks.push({ versionId, index, questions: questions.slice(index * CHUNK_SIZE, (index + 1) * CHUNK_SIZE) });
+  }
+
+  // Chunks first, so a header is only found once all of its questions are stored
+  if (versionChunks.length) {
+    await db.collection('testVersionChunks').bulkWrite(versionChunks.map(chunk => ({
+      updateOne: { filter: { versionId, index: chunk.index }, update: { $setOnInsert: chunk }, upsert: true }
+    })), { ordered: false }).catch(ignoreDuplicates);
+  }
+  const header = {
+    versionId,
+    testSeriesId: test.testSeriesId,
+    questionCount: questions.length,
+    chunkSize: CHUNK_SIZE,
+    createdAt: new Date()
+  };
+  await db.collection('testVersions')
+    .updateOne({ versionId }, { $setOnInsert: header }, { upsert: true })
+    .catch(ignoreDuplicates);
+
+  remember(headers, versionId, header);
+  versionChunks.forEach(chunk => remember(chunks, chunkKey(versionId, chunk.index), chunk.questions));
+}
+
+// Snapshot the test series' current questions unless that version exists already, and make it
+// the test's current version. Returns the versionId. Cheap when nothing changed since the last
+// save: the id is a hash of the questions and matches currentVersionId.
+export async function publishVersion(db, test) {
+  const versionId = versionIdOf(test);
+  if (test.currentVersionId === versionId) return versionId;
+
+  if (!publishing.has(versionId)) {
+    const publish = async () => {
+      await snapshot(db, test, versionId);
+      await db.collection('testSeries').updateOne(
+        { testSeriesId: test.testSeriesId, currentVersionId: { $ne: versionId } },
+        { $set: { currentVersionId: versionId } }
+      );
+    };
+    publishing.set(versionId, publish().finally(() => publishing.delete(versionId)));
+  }
+  await publishing.get(versionId);
+  test.currentVersionId = versionId;
+  return versionId;
+}
+
+// Snapshot a test series that is not stored yet and return the versionId to store it with
+export async function snapshotVersion(db, test) {
+  const versionId = versionIdOf(test);
+  await snapshot(db, test, versionId);
+  return versionId;
+}
+
+// versionId -> header for each known version, with one query for the uncached ones
+async function loadHeaders(db, versionIds) {
+  const found = new Map();
+  const missing = [];
+  for (const versionId of new Set(versionIds)) {
+    if (headers.has(versionId)) found.set(versionId, remember(headers, versionId, headers.get(versionId)));
+    else missing.push(versionId);
+  }
+  if (missing.length) {
+    const stored = await db.collection('testVersions').find(
+      { versionId: { $in: missing } },
+      { projection: { _id: 0 } }
+    ).toArray();
+    stored.forEach(header => found.set(header.versionId, remember(headers, header.versionId, header)));
+  }
+  return found;
+}
+
+// Header of a version ({ versionId, questionCount, chunkSize, ... }), or null
+export async function getVersion(db, versionId) {
+  return (await loadHeaders(db, [versionId])).get(versionId) || null;
+}
+
+// Header of the version new attempts on a test series start on. currentVersionId is only trusted
+// when it still matches the hash of the stored question stubs, so questions written without a
+// publish (tests stored before versions existed, an edit whose publish failed, a direct database
+// write) are snapshotted here instead of serving a stale version.
+export async function currentVersion(db, testSeries) {
+  const versionId = versionIdOf(testSeries);
+  const version = versionId === testSeries.currentVersionId && await getVersion(db, versionId);
+  if (version) return version;
+  return getVersion(db, await publishVersion(db, { ...testSeries, currentVersionId: null }));
+}
+
+// versionId -> ordered stubs of the wanted chunk indexes, with one query for the uncached chunks
+async function loadChunks(db, wanted) {
+  const found = new Map();
+  const missing = [];
+  for (const [versionId, indexes] of wanted) {
+    const absent = [];
+    for (const index of indexes) {
+      const key = chunkKey(versionId, index);
+      if (chunks.has(key)) found.set(key, remember(chunks, key, chunks.get(key)));
+      else absent.push(index);
+    }
+    if (absent.length) missing.push({ versionId, index: { $in: absent } });
+  }
+  if (missing.length) {
+    const stored = await db.collection('testVersionChunks').find(
+      { $or: missing },
+      { projection: { _id: 0 } }
+    ).toArray();
+    for (const chunk of stored) {
+      const key = chunkKey(chunk.versionId, chunk.index);
+      found.set(key, remember(chunks, key, chunk.questions));
+    }
+  }
+  return new Map([...wanted].map(([versionId, indexes]) => [
+    versionId,
+    indexes.flatMap(index => found.get(chunkKey(versionId, index)) || [])
+  ]));
+}
+
+// Indexes of the chunks holding questions offset .. offset + limit - 1 of a version
+function chunkIndexes(version, offset = 0, limit = version.questionCount) {
+  const end = Math.min(offset + limit, version.questionCount);
+  const indexes = [];
+  for (let index = Math.floor(offset / version.chunkSize); index * version.chunkSize < end; index++) {
+    indexes.push(index);
+  }
+  return indexes;
+}
+
+// Full questions offset .. offset + limit - 1 of a version, reading only the chunks they are in
+export async function versionPage(db, version, offset, limit) {
+  const indexes = chunkIndexes(version, offset, limit);
+  if (!indexes.length) return [];
+  const stubs = (await loadChunks(db, new Map([[version.versionId, indexes]]))).get(version.versionId);
+  const start = offset - indexes[0] * version.chunkSize;
+  const [page] = await hydrateQuestions(db, [{ questions: stubs.slice(start, start + limit) }]);
+  return page.questions;
+}
+
+// versionId -> full questions for each known version (one query each for uncached headers,
+// uncached chunks and the question bank)
+export async function versionQuestions(db, versionIds) {
+  const versions = await loadHeaders(db, versionIds);
+  const stubs = await loadChunks(db, new Map(
+    [...versions.values()].map(version => [version.versionId, chunkIndexes(version)])
+  ));
+
+  // Hydrate copies so the cached chunks keep their stubs
+  const views = [...stubs].map(([versionId, questions]) => ({ versionId, questions }));
+  await hydrateQuestions(db, views);
+  return new Map(views.map(view => [view.versionId, view.questions]));
+}
+
+// Score answers against a version's questions, with the per-question breakdown shown as results
+export function gradeAnswers(questions, answers = {}) {
+  let score = 0;
+  const detailedResults = questions.map(question => {
+    const studentAnswer = answers[question.questionId];
+    const isCorrect = studentAnswer === question.correctAnswer;
+    if (isCorrect) score++;
+    return {
+      questionId: question.questionId,
+      question: question.question,
+      options: question.options,
+      studentAnswer,
+      correctAnswer: question.correctAnswer,
+      isCorrect,
+      explanation: question.explanation || 'No explanation provided'
+    };
+  });
+  return { score, detailedResults };
+}
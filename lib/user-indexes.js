@@ -0,0 +1,27 @@
+// Unique indexes on the users collection. Registration and roster imports check for an existing
+// username or email before inserting, but only these indexes stop two concurrent requests for the
+// same name from both getting through; the losing insert fails with a duplicate key error instead.
+// Users without an email are stored with email: null, so the email index only covers strings.
+
+export const USER_INDEXES = [
+  { keys: { username: 1 }, options: { unique: true, name: 'users_username' } },
+  {
+    keys: { email: 1 },
+    options: { unique: true, name: 'users_email', partialFilterExpression: { email: { $type: 'string' } } }
+  }
+];
+
+// Created once per process, on the first connection
+let userIndexesReady = null;
+
+export function ensureUserIndexes(db) {
+  if (!userIndexesReady) {
+    userIndexesReady = Promise.all(
+      USER_INDEXES.map(({ keys, options }) => db.collection('users').createIndex(keys, options))
+    ).catch(error => {
+      userIndexesReady = null;
+      throw error;
+    });
+  }
+  return userIndexesReady;
+}
@@ -10,82 +10,46 @@ Tests all NEW functionality including:
 6. Enhanced Results System (student details, category filtering)
 """
 
-import requests
 import json
-import time
 import uuid
 import io
 import base64
 from datetime import datetime, timedelta
 
+from tests.api_client import ApiClient
+from tests.recorder import ResultRecorder
+
 # Configuration
 BASE_URL = "https://test-display-issue.preview.emergentagent.com/api"
 ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
 
+# test_result.md task covered by each log_result category; categories, file uploads and the
+# teacher-category views have no task there, so their checks are reported but not synced
+NEW_FEATURE_TASKS = {
+    "enhanced_auth": "User Authentication System with JWT",
+    "enhanced_student_flow": "User Authentication System with JWT",
+    "enhanced_results": "Test Attempts and Scoring System",
+}
+
 class NewFeaturesAPITester:
     def __init__(self):
         self.base_url = BASE_URL
+        self.client = ApiClient(BASE_URL)
         self.admin_token = None
         self.teacher_token = None
         self.student_token = None
         self.category_id = None
         self.teacher_id = None
         self.test_series_id = None
-        self.results = {
-            "enhanced_auth": {"passed": 0, "failed": 0, "details": []},
-            "category_management": {"passed": 0, "failed": 0, "details": []},
-            "teacher_category_integration": {"passed": 0, "failed": 0, "details": []},
-            "file_upload": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_student_flow": {"passed": 0, "failed": 0, "details": []},
-            "enhanced_results": {"passed": 0, "failed": 0, "details": []}
-        }
+        self.recorder = ResultRecorder("new_features_test", self.client, tasks=NEW_FEATURE_TASKS)
     
     def log_result(self, category, test_name, success, message, response_data=None):
         """Log test result"""
-        if success:
-            self.results[category]["passed"] += 1
-            status = "✅ PASS"
-        else:
-            self.results[category]["failed"] += 1
-            status = "❌ FAIL"
-        
-        detail = {
-            "test": test_name,
-            "status": status,
-            "message": message,
-            "response": response_data if not success else None
-        }
-        self.results[category]["details"].append(detail)
-        print(f"{status}: {test_name} - {message}")
+        self.recorder.record(test_name, success, message, category=category, response=response_data)
     
     def make_request(self, method, endpoint, data=None, token=None, files=None):
         """Make HTTP request with proper headers"""
-        url = f"{self.base_url}/{endpoint}"
-        headers = {}
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
-        if files is None and data is not None:
-            headers["Content-Type"] = "application/json"
-        
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                if files:
-                    response = requests.post(url, data=data, files=files, headers=headers, timeout=30)
-                else:
-                    response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
-            return None
+        return self.client.request(method, endpoint, data, token, files)
     
     def setup_admin_token(self):
         """Setup admin token for testing"""
@@ -651,8 +615,6 @@ class NewFeaturesAPITester:
         print(f"Base URL: {self.base_url}")
         print("Testing: Enhanced Auth, Category Management, Teacher-Category Integration, File Upload, Enhanced Student Flow, Enhanced Results")
         
-        start_time = time.time()
-        
         # Setup admin token first
         if not self.setup_admin_token():
             print("❌ Cannot proceed without admin token")
@@ -666,43 +628,23 @@ class NewFeaturesAPITester:
         self.test_enhanced_student_flow()
         self.test_enhanced_results_system()
         
-        end_time = time.time()
-        
         # Print summary
         print("\n" + "="*80)
         print("📊 NEW FEATURES TEST RESULTS SUMMARY")
         print("="*80)
         
-        total_passed = 0
-        total_failed = 0
-        
-        for category, results in self.results.items():
-            passed = results["passed"]
-            failed = results["failed"]
-            total_passed += passed
-            total_failed += failed
-            
-            status_icon = "✅" if failed == 0 else "❌"
-            print(f"{status_icon} {category.upper().replace('_', ' ')}: {passed} passed, {failed} failed")
-            
-            # Show failed tests
-            if failed > 0:
-                for detail in results["details"]:
-                    if "❌" in detail["status"]:
-                        print(f"   - {detail['test']}: {detail['message']}")
-        
-        print("-" * 80)
-        print(f"🎯 OVERALL: {total_passed} passed, {total_failed} failed")
-        print(f"⏱️  Duration: {end_time - start_time:.2f} seconds")
+        self.recorder.summary()
         
-        if total_failed == 0:
+        if self.recorder.failed == 0:
             print("🎉 ALL NEW FEATURES TESTS PASSED! New functionality is working correctly.")
         else:
-            print(f"⚠️  {total_failed} tests failed. Please review the issues above.")
+            print(f"⚠️  {self.recorder.failed} tests failed. Please review the issues above.")
         
-        return total_failed == 0
+        return self.recorder.failed == 0
 
 if __name__ == "__main__":
     tester = NewFeaturesAPITester()
     success = tester.run_all_tests()
+    tester.client.print_summary()
+    tester.recorder.finish()
     exit(0 if success else 1)
\ No newline at end of file
@@ -5,7 +5,8 @@ const nextConfig = {
   },
   experimental: {
     // Remove if not using Server Components
-    serverComponentsExternalPackages: ['mongodb'],
+    // bcryptjs stays external so lib/hash-pool.js workers can require it from node_modules
+    serverComponentsExternalPackages: ['mongodb', 'bcryptjs'],
   },
   webpack(config, { dev }) {
     if (dev) {
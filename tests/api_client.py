@@ -0,0 +1,177 @@
+"""
+Shared HTTP client for the backend test suites and benchmarks.
+
+Every suite used to call bare requests.get/post, opening a new TCP connection per
+call. ApiClient keeps one keep-alive Session with a connection pool, retries
+connection failures and 429/502/503/504 on idempotent methods with exponential
+backoff, and records the wall time and bytes of every call so runs are comparable.
+
+Set API_BASE_URL to point every suite at another server (e.g. a local instance).
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "http://localhost:3000/api"
+DEFAULT_TIMEOUT = 30
+
+
+@dataclass
+class CallRecord:
+    """Timing and size of one HTTP call"""
+    method: str
+    path: str
+    status: int  # 0 when the request raised
+    elapsed_ms: float
+    request_bytes: int
+    response_bytes: int
+    query_count: int = None  # X-Query-Count reported by the server, when present and final
+    query_count_partial: bool = False  # streamed body: the header only counted the first batches
+
+
+class ApiClient:
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, retries=3, backoff=0.3, pool_size=20):
+        # Suites build absolute URLs from their own BASE_URL; url() rebases those onto the override
+        self.suite_base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.base_url = (os.environ.get("API_BASE_URL") or self.suite_base_url).rstrip("/")
+        self.timeout = timeout
+        self.calls = []
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, endpoint):
+        """Absolute URL for an endpoint ("auth/login") or a URL that is already absolute"""
+        if endpoint.startswith(self.suite_base_url):
+            return self.base_url + endpoint[len(self.suite_base_url):]
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def send(self, method, endpoint, **kwargs):
+        """requests.request() over the pooled session, recording timing and bytes"""
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.url(endpoint)
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.calls.append(CallRecord(method, path, 0, (time.perf_counter() - start) * 1000, 0, 0))
+            raise
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        body = response.request.body
+        query_count = response.headers.get("X-Query-Count")
+        partial = "X-Query-Count-Partial" in response.headers
+        if partial:
+            query_count = None
+        self.calls.append(CallRecord(
+            method,
+            path,
+            response.status_code,
+            elapsed_ms,
+            len(body.encode() if isinstance(body, str) else body) if body else 0,
+            len(response.content),
+            int(query_count) if query_count is not None else None,
+            partial,
+        ))
+        return response
+
+    # requests-style helpers so suites can swap `requests.get(...)` for `api.get(...)`
+    def get(self, endpoint, **kwargs):
+        return self.send("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.send("POST", endpoint, **kwargs)
+
+    def put(self, endpoint, **kwargs):
+        return self.send("PUT", endpoint, **kwargs)
+
+    def delete(self, endpoint, **kwargs):
+        return self.send("DELETE", endpoint, **kwargs)
+
+    def request(self, method, endpoint, data=None, token=None, files=None, params=None):
+        """The suites' make_request(): JSON body unless files are given; None on failure"""
+        headers = {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        kwargs = {"headers": headers, "params": params}
+        if files:
+            kwargs.update(data=data, files=files)
+        elif data is not None and method in ("POST", "PUT"):
+            kwargs["json"] = data
+
+        try:
+            return self.send(method, endpoint, **kwargs)
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+
+    def login(self, username, password):
+        """Return a JWT for the given credentials, or None"""
+        response = self.request("POST", "auth/login", {"username": username, "password": password})
+        if response is not None and response.status_code == 200:
+            return response.json().get("token")
+        return None
+
+    def route_query_count(self, admin_token, endpoint, **kwargs):
+        """Queries one GET issued in total, streamed body included, read back from the server's
+        route stats. Resets those stats, so only use it against a server of your own."""
+        admin = {"Authorization": f"Bearer {admin_token}"}
+        self.delete("metrics/queries", headers=admin).raise_for_status()
+        self.get(endpoint, **kwargs).raise_for_status()
+        route = f"GET {urlsplit(self.url(endpoint)).path}"
+        # The server records a streamed request as its body closes, just after the client has it
+        for _ in range(20):
+            routes = self.get("metrics/queries", params={"limit": 1000}, headers=admin).json()["routes"]
+            stats = next((stats for stats in routes if stats["route"] == route), None)
+            if stats:
+                return stats["maxQueries"]
+            time.sleep(0.05)
+        return None
+
+    def summary(self):
+        """Aggregate call count, time and bytes, overall and per method+path"""
+        endpoints = {}
+        for call in self.calls:
+            key = f"{call.method} {call.path.split('?')[0]}"
+            entry = endpoints.setdefault(key, {"calls": 0, "total_ms": 0.0, "response_bytes": 0})
+            entry["calls"] += 1
+            entry["total_ms"] += call.elapsed_ms
+            entry["response_bytes"] += call.response_bytes
+
+        return {
+            "calls": len(self.calls),
+            "total_ms": round(sum(call.elapsed_ms for call in self.calls), 1),
+            "request_bytes": sum(call.request_bytes for call in self.calls),
+            "response_bytes": sum(call.response_bytes for call in self.calls),
+            "endpoints": endpoints,
+        }
+
+    def print_summary(self):
+        stats = self.summary()
+        print(f"\n🌐 HTTP: {stats['calls']} calls, {stats['total_ms'] / 1000:.2f}s, "
+              f"{stats['response_bytes'] / 1024:.1f} KiB received")
+        slowest = sorted(stats["endpoints"].items(), key=lambda item: item[1]["total_ms"], reverse=True)[:5]
+        for endpoint, entry in slowest:
+            print(f"   {endpoint}: {entry['calls']} calls, avg {entry['total_ms'] / entry['calls']:.0f}ms")
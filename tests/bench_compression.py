@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark bytes-on-wire and time-to-last-byte for the large listing endpoints
+(/api/test-series, /api/test-attempts, /api/users) per Accept-Encoding.
+
+"identity" is what every client received before compression was added, so the
+identity column is the "before" figure and br/gzip are the "after" figures.
+Pass --baseline-url to also measure an older build side by side.
+
+Usage:
+    python tests/bench_compression.py --runs 10 --json bench_compression.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+BASE_URL = "http://localhost:3000/api"
+ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
+ENDPOINTS = ["test-series", "test-attempts", "users"]
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def login(session, base_url, credentials):
+    response = session.post(f"{base_url}/auth/login", json=credentials, timeout=30)
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def measure(session, url, token, encoding):
+    """Fetch once without decoding; return (wire_bytes, ttfb_ms, ttlb_ms, content_encoding)"""
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": encoding}
+    start = time.perf_counter()
+    response = session.get(url, headers=headers, stream=True, timeout=120)
+    ttfb = time.perf_counter() - start
+
+    wire_bytes = 0
+    for chunk in response.raw.stream(64 * 1024, decode_content=False):
+        wire_bytes += len(chunk)
+    ttlb = time.perf_counter() - start
+
+    response.raise_for_status()
+    return wire_bytes, ttfb * 1000, ttlb * 1000, response.headers.get("Content-Encoding", "identity")
+
+
+def bench_server(label, base_url, runs):
+    session = requests.Session()
+    token = login(session, base_url, ADMIN_CREDENTIALS)
+    rows = []
+
+    for endpoint in ENDPOINTS:
+        for encoding in ENCODINGS:
+            samples = [measure(session, f"{base_url}/{endpoint}", token, encoding) for _ in range(runs)]
+            rows.append({
+                "server": label,
+                "endpoint": endpoint,
+                "accept_encoding": encoding,
+                "content_encoding": samples[-1][3],
+                "wire_bytes": int(statistics.median(s[0] for s in samples)),
+                "ttfb_ms": round(statistics.median(s[1] for s in samples), 1),
+                "ttlb_ms": round(statistics.median(s[2] for s in samples), 1),
+            })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'server':<10} {'endpoint':<15} {'accept':<9} {'sent':<9} {'bytes':>10} {'ttfb ms':>9} {'ttlb ms':>9} {'saved':>7}")
+    identity_bytes = {
+        (row["server"], row["endpoint"]): row["wire_bytes"]
+        for row in rows if row["accept_encoding"] == "identity"
+    }
+    for row in rows:
+        baseline = identity_bytes.get((row["server"], row["endpoint"])) or 0
+        saved = (1 - row["wire_bytes"] / baseline) * 100 if baseline else 0
+        print(f"{row['server']:<10} {row['endpoint']:<15} {row['accept_encoding']:<9} {row['content_encoding']:<9} "
+              f"{row['wire_bytes']:>10} {row['ttfb_ms']:>9} {row['ttlb_ms']:>9} {saved:>6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--baseline-url", help="API base URL of a build without compression, for comparison")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    rows = []
+    if args.baseline_url:
+        rows += bench_server("before", args.baseline_url, args.runs)
+    rows += bench_server("after" if args.baseline_url else "current", args.base_url, args.runs)
+
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
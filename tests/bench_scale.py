@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the catalogue and results endpoints.
+
+Bulk-inserts a production-sized dataset straight into Mongo (at --scale 1.0:
+10k test series, 1k teachers, 100k students, 1M attempts), then measures
+
+    GET /api/test-series                    as admin, heavy teacher and student
+    GET /api/test-attempts                  as the heavy teacher
+    GET /api/analytics                      as admin and heavy teacher
+    GET /api/categories?withTeachers=true
+
+and writes a JSON report with latency percentiles, response bytes and the
+server-reported query count per request. The "heavy teacher" and the student
+are registered through the API (so they can log in); every other document is
+inserted with insert_many and tagged with seedTag for cleanup.
+
+Requires pymongo and the same MONGO_URL / DB_NAME the server uses.
+
+Usage:
+    python -m tests.bench_scale --scale 0.1 --json bench_scale.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+from tests.api_client import ApiClient, DEFAULT_BASE_URL
+from tests.seed import insert_batches
+
+ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
+FULL_SCALE = {"categories": 20, "teachers": 1_000, "students": 100_000, "tests": 10_000, "attempts": 1_000_000}
+QUESTIONS_PER_TEST = 20
+HEAVY_TEACHER_SHARE = 0.02  # fraction of all tests owned by the measured teacher
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def register(api, role):
+    suffix = uuid.uuid4().hex[:8]
+    user = {
+        "username": f"bench_{role}_{suffix}",
+        "password": f"{role}123",
+        "name": f"Bench {role.title()} {suffix}",
+        "role": role,
+        "email": f"bench.{role}.{suffix}@example.com",
+    }
+    response = api.post("auth/register", json=user)
+    response.raise_for_status()
+    data = response.json()
+    return data["token"], data["user"]["userId"]
+
+
+def seed(db, counts, tag, heavy_teacher_id, rng):
+    """Bulk insert the synthetic dataset; returns seconds spent per collection"""
+    now = datetime.utcnow()
+    timings = {}
+
+    categories = [f"bench-cat-{tag}-{i}" for i in range(counts["categories"])]
+    teachers = [f"bench-t-{tag}-{i}" for i in range(counts["teachers"])]
+    students = [f"bench-s-{tag}-{i}" for i in range(counts["students"])]
+
+    start = time.perf_counter()
+    insert_batches(db.categories, (
+        {"categoryId": category, "name": f"Bench Category {i}", "description": "", "createdAt": now, "seedTag": tag}
+        for i, category in enumerate(categories)
+    ))
+    timings["categories"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    insert_batches(db.users, (
+        {
+            "userId": user_id, "username": user_id, "password": "!", "name": f"Bench User {i}", "role": role,
+            "email": f"{user_id}@example.com", "phone": None, "photo": None,
+            "rating": round(rng.uniform(3, 5), 1) if role == "teacher" else None,
+            "experience": f"{rng.randrange(1, 20)} years" if role == "teacher" else None,
+            "createdAt": now, "seedTag": tag,
+        }
+        for role, ids in (("teacher", teachers), ("student", students))
+        for i, user_id in enumerate(ids)
+    ))
+    timings["users"] = time.perf_counter() - start
+
+    heavy_tests = max(1, int(counts["tests"] * HEAVY_TEACHER_SHARE))
+    tests = []
+    start = time.perf_counter()
+
+    def test_documents():
+        for i in range(counts["tests"]):
+            test_id = f"bench-ts-{tag}-{i}"
+            tests.append(test_id)
+            yield {
+                "testSeriesId": test_id,
+                "title": f"Bench Test {i}",
+                "description": "Synthetic test series for the scale benchmark",
+                "category": rng.choice(categories),
+                "duration": 60,
+                "questions": [
+                    {"questionId": f"{test_id}-q{q}", "question": f"Question {q} of test {i}?",
+                     "options": ["A", "B", "C", "D"], "correctAnswer": q % 4, "explanation": ""}
+                    for q in range(QUESTIONS_PER_TEST)
+                ],
+                "status": "published" if rng.random() < 0.9 else "draft",
+                "createdBy": heavy_teacher_id if i < heavy_tests else rng.choice(teachers),
+                "createdAt": now, "updatedAt": now, "seedTag": tag,
+            }
+
+    insert_batches(db.testSeries, test_documents())
+    timings["testSeries"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    def attempt_documents():
+        for i in range(counts["attempts"]):
+            completed = rng.random() < 0.9
+            started = now - timedelta(minutes=rng.randrange(60 * 24 * 90))
+            yield {
+                "attemptId": f"bench-a-{tag}-{i}",
+                "testSeriesId": rng.choice(tests),
+                "studentId": rng.choice(students),
+                "studentName": None,
+                "startTime": started,
+                "endTime": started + timedelta(minutes=60),
+                "status": "completed" if completed else "in_progress",
+                "answers": {},
+                "score": rng.randrange(QUESTIONS_PER_TEST + 1) if completed else 0,
+                "totalQuestions": QUESTIONS_PER_TEST,
+                "createdAt": started, "seedTag": tag,
+            }
+
+    insert_batches(db.testAttempts, attempt_documents())
+    timings["testAttempts"] = time.perf_counter() - start
+    return {name: round(seconds, 1) for name, seconds in timings.items()}
+
+
+def cleanup(db, tag, user_ids):
+    for name in ("categories", "users", "testSeries", "testAttempts"):
+        db[name].delete_many({"seedTag": tag})
+    db.users.delete_many({"userId": {"$in": user_ids}})
+    db.testSeries.delete_many({"createdBy": {"$in": user_ids}})
+    db.testAttempts.delete_many({"studentId": {"$in": user_ids}})
+
+
+def measure(api, name, endpoint, token, runs, admin_token):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    first = len(api.calls)
+    for _ in range(runs):
+        api.get(endpoint, headers=headers, timeout=600).raise_for_status()
+    calls = api.calls[first:]
+    latencies = [call.elapsed_ms for call in calls]
+    query_counts = [call.query_count for call in calls if call.query_count is not None]
+    if calls[-1].query_count_partial:
+        # Streamed listing: the header only counted the first batches
+        query_counts = [api.route_query_count(admin_token, endpoint, headers=headers, timeout=600)]
+    return {
+        "scenario": name,
+        "endpoint": endpoint,
+        "runs": runs,
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "max_ms": round(max(latencies), 1),
+        "response_bytes": calls[-1].response_bytes,
+        "queries": query_counts[-1] if query_counts else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of the full-size dataset")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="leave seeded documents in place")
+    parser.add_argument("--json", default="bench_scale.json", help="report path")
+    args = parser.parse_args()
+
+    counts = {name: max(1, int(count * args.scale)) for name, count in FULL_SCALE.items()}
+    tag = uuid.uuid4().hex[:8]
+    rng = random.Random(args.seed)
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("DB_NAME", "test_series_db")]
+    api = ApiClient(args.base_url)
+
+    admin_token = api.login(**ADMIN_CREDENTIALS)
+    teacher_token, teacher_id = register(api, "teacher")
+    student_token, student_id = register(api, "student")
+
+    try:
+        print(f"Seeding {counts} (tag {tag})...")
+        seed_seconds = seed(db, counts, tag, teacher_id, rng)
+        print(f"Seeded in {seed_seconds}")
+
+        scenarios = [
+            ("test-series:admin", "test-series", admin_token),
+            ("test-series:teacher", "test-series", teacher_token),
+            ("test-series:student", "test-series", student_token),
+            ("test-attempts:teacher", "test-attempts", teacher_token),
+            ("analytics:admin", "analytics", admin_token),
+            ("analytics:teacher", "analytics", teacher_token),
+            ("categories:withTeachers", "categories?withTeachers=true", None),
+        ]
+        results = []
+        for name, endpoint, token in scenarios:
+            result = measure(api, name, endpoint, token, args.runs, admin_token)
+            results.append(result)
+            print(f"{name:<26} p50 {result['p50_ms']:>9}ms  p95 {result['p95_ms']:>9}ms  "
+                  f"{result['response_bytes']:>11} bytes  queries {result['queries']}")
+
+        report = {
+            "generatedAt": datetime.utcnow().isoformat() + "Z",
+            "scale": args.scale,
+            "counts": counts,
+            "seed_seconds": seed_seconds,
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+    finally:
+        if not args.keep:
+            cleanup(db, tag, [teacher_id, student_id])
+
+
+if __name__ == "__main__":
+    main()
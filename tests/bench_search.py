@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/test-series/search on a large catalogue.
+
+Seeds --tests synthetic test series (default 100k, 10 questions each) straight into
+Mongo with insert_many, warms the text index through the API, then times a fixed
+set of queries and prints p50/p95/max latency and hit counts. Seeded documents are
+tagged with a benchmark teacher id and removed afterwards unless --keep is given.
+
+Requires pymongo and the same MONGO_URL / DB_NAME the server uses.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python tests/bench_search.py --tests 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+import requests
+from pymongo import MongoClient
+
+BASE_URL = "http://localhost:3000/api"
+ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
+BENCH_TEACHER_ID = "bench-search-teacher"
+BATCH_SIZE = 5000
+
+SUBJECTS = ["algebra", "calculus", "geometry", "physics", "chemistry", "biology", "history",
+            "geography", "economics", "grammar", "vocabulary", "reasoning", "statistics", "optics"]
+TOPICS = ["integral", "derivative", "matrix", "vector", "equilibrium", "thermodynamics", "genetics",
+          "photosynthesis", "revolution", "monsoon", "inflation", "synonym", "probability", "refraction",
+          "kinematics", "electrolysis", "polynomial", "trigonometry", "ecosystem", "constitution"]
+QUERIES = ["integral", "thermodynamics equilibrium", "probability", "\"mean value\"",
+           "genetics -ecosystem", "refraction optics", "polynomial roots", "monsoon"]
+
+
+def synthetic_test(rng, index):
+    subject = rng.choice(SUBJECTS)
+    topics = rng.sample(TOPICS, 3)
+    questions = []
+    for q in range(10):
+        topic = rng.choice(TOPICS)
+        phrase = "mean value theorem" if rng.random() < 0.01 else f"{topic} problem {q}"
+        questions.append({
+            "questionId": str(uuid.UUID(int=rng.getrandbits(128))),
+            "question": f"Which statement about {topic} is correct in this {phrase}?",
+            "options": ["A", "B", "C", "D"],
+            "correctAnswer": rng.randrange(4),
+            "explanation": "",
+        })
+    now = datetime.utcnow()
+    return {
+        "testSeriesId": f"bench-search-{index}",
+        "title": f"{subject.title()} mock {index}: {topics[0]} and {topics[1]}",
+        "description": f"Practice set covering {', '.join(topics)} for {subject}.",
+        "category": subject,
+        "duration": 60,
+        "questions": questions,
+        "status": "published",
+        "createdBy": BENCH_TEACHER_ID,
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def seed(collection, count, seed_value):
+    rng = random.Random(seed_value)
+    start = time.perf_counter()
+    batch = []
+    for index in range(count):
+        batch.append(synthetic_test(rng, index))
+        if len(batch) >= BATCH_SIZE:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+    return time.perf_counter() - start
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--tests", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20, help="timed requests per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse documents from a previous --keep run")
+    parser.add_argument("--keep", action="store_true", help="leave seeded documents in place")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    collection = client[os.environ.get("DB_NAME", "test_series_db")]["testSeries"]
+
+    session = requests.Session()
+    token = session.post(f"{args.base_url}/auth/login", json=ADMIN_CREDENTIALS, timeout=30).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    try:
+        if not args.skip_seed:
+            elapsed = seed(collection, args.tests, args.seed)
+            print(f"Seeded {args.tests} test series in {elapsed:.1f}s")
+
+        # First search builds the text index; time it separately
+        start = time.perf_counter()
+        session.get(f"{args.base_url}/test-series/search", params={"q": "warmup"}, headers=headers, timeout=600)
+        print(f"Index build / warmup: {time.perf_counter() - start:.1f}s")
+
+        results = []
+        for query in QUERIES:
+            samples = []
+            total = 0
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                response = session.get(f"{args.base_url}/test-series/search",
+                                       params={"q": query, "limit": 20}, headers=headers, timeout=60)
+                samples.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+                total = response.json()["total"]
+            results.append({
+                "query": query,
+                "hits": total,
+                "p50_ms": round(statistics.median(samples), 1),
+                "p95_ms": round(percentile(samples, 95), 1),
+                "max_ms": round(max(samples), 1),
+            })
+
+        print(f"\n{'query':<28} {'hits':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for row in results:
+            print(f"{row['query']:<28} {row['hits']:>8} {row['p50_ms']:>9} {row['p95_ms']:>9} {row['max_ms']:>9}")
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"tests": args.tests, "results": results}, f, indent=2)
+            print(f"\nResults written to {args.json}")
+    finally:
+        if not args.keep:
+            collection.delete_many({"createdBy": BENCH_TEACHER_ID})
+
+
+if __name__ == "__main__":
+    main()
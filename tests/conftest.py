@@ -0,0 +1,180 @@
+"""
+Session fixtures for the pytest port of the backend suites.
+
+The legacy scripts (backend_test.py, backend_test_bugfixes.py, ...) log in as shared
+accounts such as teacher1 and mutate them, so they can only run one at a time. Here
+every session registers its own teachers, students and test series under a unique
+namespace (run id + xdist worker id), so workers never touch each other's data:
+
+    pytest                      # serial
+    pytest -n auto              # parallel, needs pytest-xdist
+
+The server must already be running; set API_BASE_URL to target another instance.
+Only the seeded admin account (admin / admin123) is shared, and it is only read.
+
+To run offline against a private mongod and server instead (see tests/hermetic.py):
+
+    HERMETIC_SNAPSHOT=tests/snapshots/seed-0.1-42.tar.gz pytest
+"""
+
+import os
+import uuid
+
+import pytest
+import requests
+
+from tests.api_client import ApiClient
+
+ADMIN_CREDENTIALS = {"username": "admin", "password": "admin123"}
+PASSWORDS = {"teacher": "teacher123", "student": "student123"}
+
+
+def auth(token):
+    """Authorization header for a JWT"""
+    return {"Authorization": f"Bearer {token}"}
+
+
+def sample_questions(count=3):
+    """Question bank whose correct answer is always the first option"""
+    return [
+        {
+            "questionId": str(uuid.uuid4()),
+            "question": f"What is {i + 1} + {i + 1}?",
+            "options": [str(2 * (i + 1) + offset) for offset in range(4)],
+            "correctAnswer": 0,
+            "explanation": f"{i + 1} + {i + 1} = {2 * (i + 1)}",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope="session")
+def namespace(worker_id):
+    """Prefix for every username, email and title created by this worker"""
+    return f"pt_{worker_id}_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="session")
+def worker_id(request):
+    # pytest-xdist sets workerinput on worker processes; "main" when running serially
+    return getattr(request.config, "workerinput", {}).get("workerid", "main")
+
+
+@pytest.fixture(scope="session")
+def hermetic():
+    """Private mongod + server restored from HERMETIC_SNAPSHOT, or None to use the running server"""
+    snapshot = os.environ.get("HERMETIC_SNAPSHOT")
+    if not snapshot:
+        yield None
+        return
+    from tests.hermetic import HermeticEnv, HermeticError  # needs pymongo
+
+    env = HermeticEnv(snapshot=snapshot)
+    try:
+        env.__enter__()
+    except HermeticError as e:
+        pytest.fail(f"Hermetic environment failed to start: {e}")
+    try:
+        yield env
+    finally:
+        env.close()
+
+
+@pytest.fixture(scope="session")
+def api(hermetic):
+    client = ApiClient()
+    if hermetic:
+        client.base_url = hermetic.base_url  # takes precedence over API_BASE_URL
+    try:
+        client.get("categories", timeout=5)
+    except requests.exceptions.RequestException as e:
+        pytest.skip(f"API server not reachable at {client.base_url}: {e}")
+    yield client
+    if os.environ.get("API_SUMMARY"):
+        client.print_summary()
+
+
+@pytest.fixture(scope="session")
+def admin_token(api):
+    token = api.login(**ADMIN_CREDENTIALS)
+    if not token:
+        pytest.skip("Seeded admin account (admin / admin123) is not available")
+    return token
+
+
+@pytest.fixture(scope="session")
+def make_user(api, namespace):
+    """Factory registering a namespaced user; returns the credentials, token and userId"""
+    counter = iter(range(1_000_000))
+
+    def make(role="student", **extra):
+        suffix = f"{role}{next(counter)}"
+        user = {
+            "username": f"{namespace}_{suffix}",
+            "password": PASSWORDS.get(role, "password123"),
+            "name": f"Test {role.title()} {namespace} {suffix}",
+            "role": role,
+            "email": f"{namespace}.{suffix}@example.com",
+            **extra,
+        }
+        response = api.post("auth/register", json=user)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        return {**user, "token": data["token"], "userId": data["user"]["userId"]}
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def teacher(make_user):
+    return make_user("teacher")
+
+
+@pytest.fixture(scope="session")
+def other_teacher(make_user):
+    return make_user("teacher")
+
+
+@pytest.fixture(scope="session")
+def student(make_user):
+    return make_user("student")
+
+
+@pytest.fixture(scope="session")
+def make_test_series(api, namespace, admin_token):
+    """Factory creating namespaced test series; everything it creates is deleted at teardown"""
+    created = []
+
+    def make(owner, questions=None, status=None, **fields):
+        data = {
+            "title": f"{namespace} test {len(created)}",
+            "description": f"Created by the pytest session {namespace}",
+            "category": f"{namespace}-category",
+            "duration": 60,
+            "questions": sample_questions() if questions is None else questions,
+            **fields,
+        }
+        response = api.post("test-series", json=data, headers=auth(owner["token"]))
+        assert response.status_code == 200, response.text
+        test = response.json()
+        created.append(test["testSeriesId"])
+        if status:
+            response = api.put(f"test-series/{test['testSeriesId']}", json={"status": status},
+                               headers=auth(owner["token"]))
+            assert response.status_code == 200, response.text
+            test["status"] = status
+        return test
+
+    yield make
+    for test_series_id in created:
+        api.delete(f"test-series/{test_series_id}", headers=auth(admin_token))
+
+
+@pytest.fixture(scope="session")
+def published_test(make_test_series, teacher):
+    return make_test_series(teacher)
+
+
+@pytest.fixture(scope="session")
+def draft_test(make_test_series, teacher):
+    return make_test_series(teacher, status="draft")
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Performance harness: latency regression gate, payload budgets, soak, thundering-herd
+and replay modes.
+
+Runs a fixed set of read-only scenarios against the deterministic seed dataset
+(python -m tests.seed) and records, per scenario, every request latency grouped
+by round plus the server-reported query count (X-Query-Count, or the server's route
+stats for streamed listings, whose header only covers the first batches).
+
+    record   write the results as this machine's baseline (tests/baselines/latency.json,
+             not checked in)
+    check    run again and compare against the baseline; exits 1 on regression
+    payload  response size per endpoint and role, broken down by top-level field,
+             against the budgets in tests/baselines/payload_budgets.json; exits 1
+             when a budget is exceeded
+    soak     hours of mixed traffic while sampling server memory and Mongo
+             connections; exits 1 on leaks or drift (see tests/soak.py)
+    herd     thousands of students starting the same exam within a second, per
+             arrival spread; prints a capacity chart and exits 1 on duplicate
+             attempts or when no spread meets the SLO (see tests/herd.py)
+    replay   re-issue a captured request journal (REQUEST_JOURNAL) at 1x-20x
+             with the original inter-arrival times (see tests/replay.py)
+
+Rounds interleave all scenarios so background noise is spread evenly. A scenario
+regresses when the lower bound of the bootstrap confidence interval (resampling
+whole rounds) for its p50 or p95 slowdown exceeds the threshold, i.e. only when
+the slowdown is both large and consistent across rounds, or when its query count
+grows - which is how N+1 loops such as per-test enrichment show up first.
+
+Baselines are only comparable on the same machine, dataset and build, so none
+is shipped: record one before the first check, and re-record after changing any
+of them:
+
+    python -m tests.seed --scale 0.1 --seed 42 --drop
+    python -m tests.harness record
+    python -m tests.harness check --max-slowdown 0.25
+
+--hermetic SNAPSHOT runs record/check against a private mongod and server
+restored from a snapshot (tests/hermetic.py). --profile DIR then profiles each
+scenario over the V8 inspector after the timed rounds, so profiling overhead
+never skews the latencies, and writes .cpuprofile, .heapprofile and folded
+stacks per scenario with a summary of the hot functions (tests/profiler.py).
+Without --hermetic, start the server with NODE_OPTIONS=--inspect yourself.
+
+    python -m tests.harness check --hermetic tests/snapshots/seed-0.1-42.tar.gz --profile profiles
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+
+from tests.api_client import ApiClient, DEFAULT_BASE_URL
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "latency.json")
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "baselines", "payload_budgets.json")
+SEEDED_ACCOUNTS = {
+    "admin": ("admin", "admin123"),
+    "teacher": ("teacher0", "teacher123"),
+    "student": ("student0", "student123"),
+}
+# What the app's catalogue requests (CATALOGUE_FIELDS in app/page.js)
+CATALOGUE_FIELDS = ("testSeriesId,title,description,category,duration,status,createdBy,questionCount,"
+                    "createdByName,createdByPhoto,createdByRating,totalAttempts,averagePercentage")
+
+# (name, role or None for anonymous, endpoint, query params)
+SCENARIOS = [
+    ("test-series:student", "student", "test-series", {"fields": CATALOGUE_FIELDS}),
+    ("test-series:teacher", "teacher", "test-series", None),
+    ("test-series:admin", "admin", "test-series", None),
+    ("test-series:search", "student", "test-series/search", {"q": "thermodynamics"}),
+    ("test-attempts:student", "student", "test-attempts", None),
+    ("test-attempts:teacher", "teacher", "test-attempts", None),
+    ("analytics:admin", "admin", "analytics", None),
+    ("analytics:teacher", "teacher", "analytics", None),
+    ("categories:withTeachers", None, "categories", {"withTeachers": "true"}),
+    ("teachers", None, "teachers", None),
+    ("users:admin", "admin", "users", None),
+    ("profile:student", "student", "auth/profile", None),
+]
+
+# Role/endpoint pairs the latency scenarios skip, so every endpoint is sized for every role that reads it
+PAYLOAD_SCENARIOS = SCENARIOS + [
+    ("test-series:anonymous", None, "test-series", None),
+    ("test-attempts:admin", "admin", "test-attempts", None),
+    ("categories", None, "categories", None),
+    ("teachers:admin", "admin", "teachers", None),
+    ("profile:teacher", "teacher", "auth/profile", None),
+    ("profile:admin", "admin", "auth/profile", None),
+]
+MIN_FIELD_BUDGET_BYTES = 256  # --update-budgets leaves smaller fields unbudgeted
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def login_all(api, accounts):
+    tokens = {}
+    for role, (username, password) in accounts.items():
+        tokens[role] = api.login(username, password)
+        if not tokens[role]:
+            sys.exit(f"❌ Could not log in as {username}; seed the database with python -m tests.seed first")
+    return tokens
+
+
+def fetch(api, tokens, role, endpoint, params):
+    headers = {"Authorization": f"Bearer {tokens[role]}"} if role else {}
+    response = api.get(endpoint, params=params, headers=headers)
+    response.raise_for_status()
+    return response
+
+
+def call(api, tokens, role, endpoint, params):
+    fetch(api, tokens, role, endpoint, params)
+    return api.calls[-1]
+
+
+def run_scenarios(api, tokens, rounds, requests_per_round, warmup, only=None):
+    """Latency samples per round and query counts for every scenario"""
+    scenarios = [s for s in SCENARIOS if not only or s[0] in only]
+    results = {name: {"endpoint": endpoint, "rounds": [], "queries": []} for name, _, endpoint, _ in scenarios}
+
+    for name, role, endpoint, params in scenarios:
+        for _ in range(warmup):
+            call(api, tokens, role, endpoint, params)
+
+    streamed = set()
+    for round_number in range(rounds):
+        for name, role, endpoint, params in scenarios:
+            samples = []
+            for _ in range(requests_per_round):
+                record = call(api, tokens, role, endpoint, params)
+                samples.append(round(record.elapsed_ms, 2))
+                if record.query_count is not None:
+                    results[name]["queries"].append(record.query_count)
+                elif record.query_count_partial:
+                    streamed.add(name)
+            results[name]["rounds"].append(samples)
+        print(f"  round {round_number + 1}/{rounds} done")
+
+    # After the timed rounds: reading the route stats resets them
+    for name, role, endpoint, params in scenarios:
+        if name in streamed:
+            headers = {"Authorization": f"Bearer {tokens[role]}"} if role else {}
+            count = api.route_query_count(tokens["admin"], endpoint, params=params, headers=headers)
+            results[name]["queries"] = [count] if count is not None else []
+    return results
+
+
+def summarize(result):
+    samples = [sample for samples in result["rounds"] for sample in samples]
+    return {
+        "p50_ms": round(statistics.median(samples), 1),
+        "p95_ms": round(percentile(samples, 95), 1),
+        "queries": statistics.median(result["queries"]) if result["queries"] else None,
+    }
+
+
+def bootstrap_ratio(baseline_rounds, current_rounds, pct, iterations, confidence, rng):
+    """Confidence interval of current/baseline for a latency percentile, resampling whole rounds"""
+    def resampled(rounds):
+        picked = [rng.choice(rounds) for _ in rounds]
+        return percentile([sample for samples in picked for sample in samples], pct)
+
+    ratios = sorted(resampled(current_rounds) / max(resampled(baseline_rounds), 0.001) for _ in range(iterations))
+    tail = (1 - confidence) / 2
+    return ratios[int(tail * iterations)], ratios[min(iterations - 1, int((1 - tail) * iterations))]
+
+
+def compare(baseline, current, args):
+    """One row per scenario with slowdown intervals and whether it regressed"""
+    rng = random.Random(0)
+    rows = []
+    for name, result in current.items():
+        base = baseline["scenarios"].get(name)
+        if not base:
+            rows.append({"scenario": name, "status": "new", "reasons": []})
+            continue
+
+        row = {"scenario": name, "status": "ok", "reasons": [], "baseline": summarize(base), "current": summarize(result)}
+        for pct, limit in ((50, args.max_slowdown), (95, args.max_p95_slowdown)):
+            low, high = bootstrap_ratio(base["rounds"], result["rounds"], pct, args.iterations, args.confidence, rng)
+            row[f"p{pct}_ratio_ci"] = [round(low, 3), round(high, 3)]
+            if low > 1 + limit:
+                row["reasons"].append(f"p{pct} slower by {low - 1:.0%}..{high - 1:.0%} (limit {limit:.0%})")
+
+        base_queries, queries = row["baseline"]["queries"], row["current"]["queries"]
+        if base_queries is not None and queries is not None and queries > base_queries + args.max_extra_queries:
+            row["reasons"].append(f"queries {base_queries:g} -> {queries:g}")
+
+        if row["reasons"]:
+            row["status"] = "regressed"
+        rows.append(row)
+    return rows
+
+
+def format_queries(queries):
+    return "-" if queries is None else f"{queries:g}"
+
+
+def print_rows(rows):
+    print(f"\n{'scenario':<28} {'p50 ms':>15} {'p95 ms':>15} {'queries':>9} {'p50 ratio CI':>15}  status")
+    for row in rows:
+        if row["status"] == "new":
+            print(f"{row['scenario']:<28} {'(not in baseline)':>57}  new")
+            continue
+        base, current = row["baseline"], row["current"]
+        low, high = row["p50_ratio_ci"]
+        queries = f"{format_queries(base['queries'])}→{format_queries(current['queries'])}"
+        print(f"{row['scenario']:<28} {base['p50_ms']:>7}→{current['p50_ms']:<7} {base['p95_ms']:>7}→{current['p95_ms']:<7} "
+              f"{queries:>9} {f'{low:.2f}..{high:.2f}':>15}  {'❌ ' + '; '.join(row['reasons']) if row['reasons'] else '✅'}")
+
+
+def profile_scenarios(api, tokens, args, inspector_port):
+    """CPU and heap profile of --profile-requests requests per scenario, saved under --profile"""
+    from tests.inspector import Inspector  # needs aiohttp
+    from tests.profiler import Profiler, print_summary, save_profiles
+
+    def repeat(role, endpoint, params):
+        for _ in range(args.profile_requests):
+            call(api, tokens, role, endpoint, params)
+
+    async def run():
+        async with Inspector(args.inspector_host, inspector_port) as inspector:
+            for name, role, endpoint, params in SCENARIOS:
+                if args.scenario and name not in args.scenario:
+                    continue
+                profiler = Profiler(inspector)
+                await profiler.start()
+                await asyncio.to_thread(repeat, role, endpoint, params)
+                summary = save_profiles(await profiler.stop(), os.path.join(args.profile, name.replace(":", "_")))
+                print_summary(name, summary)
+
+    print(f"\nProfiling {args.profile_requests} requests per scenario into {args.profile}/...")
+    asyncio.run(run())
+
+
+def connect(args, stack, scenarios=SCENARIOS, inspect=False):
+    """ApiClient for the target server - a private one with --hermetic - and its inspector port"""
+    unknown = set(args.scenario or []) - {name for name, *_ in scenarios}
+    if unknown:
+        sys.exit(f"❌ Unknown scenario(s): {', '.join(sorted(unknown))}")
+    api = ApiClient(args.base_url)
+    inspector_port = getattr(args, "inspector_port", None)
+    if args.hermetic:
+        from tests.hermetic import HermeticEnv  # needs pymongo and mongod
+        env = stack.enter_context(HermeticEnv(snapshot=args.hermetic, inspect=inspect))
+        api.base_url, inspector_port = env.base_url, env.inspector_port
+        print(f"Hermetic environment up in {env.startup_s}s at {env.base_url}")
+    return api, inspector_port
+
+
+def measure(args):
+    with ExitStack() as stack:
+        api, inspector_port = connect(args, stack, inspect=bool(args.profile))
+        tokens = login_all(api, SEEDED_ACCOUNTS)
+        print(f"Running {len(SCENARIOS)} scenarios: {args.rounds} rounds x {args.requests} requests...")
+        results = run_scenarios(api, tokens, args.rounds, args.requests, args.warmup, args.scenario)
+        if args.profile:
+            profile_scenarios(api, tokens, args, inspector_port)
+        return results
+
+
+def json_size(value):
+    """Bytes of a value as compact UTF-8 JSON, which is how the API serializes it"""
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def breakdown(data):
+    """(item count or None, bytes per top-level field) - summed over the items of a list response"""
+    fields = {}
+    if isinstance(data, list):
+        for item in data:
+            for field, value in (item.items() if isinstance(item, dict) else [("(value)", item)]):
+                fields[field] = fields.get(field, 0) + json_size(value)
+        return len(data), fields
+    if isinstance(data, dict):
+        return None, {field: json_size(value) for field, value in data.items()}
+    return None, {"(value)": json_size(data)}
+
+
+def audit_payloads(api, tokens, only=None):
+    """One row per scenario: response bytes, items, mean bytes per item and per field"""
+    rows = []
+    for name, role, endpoint, params in PAYLOAD_SCENARIOS:
+        if only and name not in only:
+            continue
+        response = fetch(api, tokens, role, endpoint, params)
+        items, fields = breakdown(response.json())
+        per = max(items, 1) if items is not None else 1  # list fields are budgeted per item
+        rows.append({
+            "scenario": name,
+            "endpoint": endpoint,
+            "role": role,
+            "bytes": len(response.content),
+            "items": items,
+            "item_bytes": round(len(response.content) / items) if items else None,
+            "fields": {field: round(size / per) for field, size in sorted(fields.items(), key=lambda kv: -kv[1])},
+        })
+    return rows
+
+
+def check_budgets(rows, budgets):
+    """Messages for every row exceeding its scenario's budget"""
+    violations = []
+    for row in rows:
+        budget = budgets.get(row["scenario"])
+        if not budget:
+            continue
+        limits = [("response", row["bytes"], budget.get("maxBytes"))]
+        if row["items"]:
+            limits.append(("per item", row["item_bytes"], budget.get("maxItemBytes")))
+        limits += [(f"field {field}", row["fields"].get(field, 0), limit)
+                   for field, limit in budget.get("fields", {}).items()]
+        for label, size, limit in limits:
+            if limit is not None and size > limit:
+                violations.append(f"{row['scenario']}: {label} {size:,} bytes > budget {limit:,}")
+    return violations
+
+
+def updated_budgets(rows, budgets, headroom):
+    """Budgets set to the current sizes plus headroom, keeping scenarios that were not measured"""
+    budgets = dict(budgets)
+    for row in rows:
+        budget = {"maxItemBytes": math.ceil(row["item_bytes"] * (1 + headroom))} if row["items"] \
+            else {"maxBytes": math.ceil(row["bytes"] * (1 + headroom))}
+        fields = {field: math.ceil(size * (1 + headroom)) for field, size in row["fields"].items()
+                  if size >= MIN_FIELD_BUDGET_BYTES}
+        if fields:
+            budget["fields"] = fields
+        budgets[row["scenario"]] = budget
+    return budgets
+
+
+def print_payloads(rows, budgets, top_fields=3):
+    print(f"\n{'scenario':<28} {'items':>6} {'KiB':>9} {'B/item':>8}  largest fields (share)")
+    for row in rows:
+        total = sum(row["fields"].values()) or 1
+        largest = ", ".join(f"{field} {size / total:.0%}" for field, size in list(row["fields"].items())[:top_fields])
+        items = "-" if row["items"] is None else row["items"]
+        item_bytes = "-" if row["item_bytes"] is None else f"{row['item_bytes']:,}"
+        marker = "" if row["scenario"] in budgets else "  (no budget)"
+        print(f"{row['scenario']:<28} {items:>6} {row['bytes'] / 1024:>9.1f} {item_bytes:>8}  {largest}{marker}")
+
+
+def payload(args):
+    config = {"scenarios": {}}
+    if os.path.exists(args.budgets):
+        with open(args.budgets) as f:
+            config = json.load(f)
+    elif not args.update_budgets:
+        sys.exit(f"❌ No budgets at {args.budgets}; run with --update-budgets to create them")
+
+    with ExitStack() as stack:
+        api, _ = connect(args, stack, scenarios=PAYLOAD_SCENARIOS)
+        rows = audit_payloads(api, login_all(api, SEEDED_ACCOUNTS), args.scenario)
+    budgets = config["scenarios"]
+    print_payloads(rows, budgets)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.update_budgets:
+        os.makedirs(os.path.dirname(os.path.abspath(args.budgets)), exist_ok=True)
+        with open(args.budgets, "w") as f:
+            config.update(headroom=args.headroom, scenarios=updated_budgets(rows, budgets, args.headroom))
+            json.dump(config, f, indent=2)
+            f.write("\n")
+        print(f"\nBudgets written to {args.budgets} ({args.headroom:.0%} headroom)")
+        return 0
+
+    violations = check_budgets(rows, budgets)
+    if violations:
+        print(f"\n❌ {len(violations)} payload budget(s) exceeded:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\n✅ All payloads within budget")
+    return 0
+
+
+def record(args):
+    scenarios = measure(args)
+    baseline = {
+        "recordedAt": datetime.utcnow().isoformat() + "Z",
+        "host": platform.node(),
+        "baseUrl": args.base_url,
+        "rounds": args.rounds,
+        "requestsPerRound": args.requests,
+        "scenarios": scenarios,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+    with open(args.baseline, "w") as f:
+        json.dump(baseline, f, indent=1)
+
+    for name, result in scenarios.items():
+        summary = summarize(result)
+        print(f"{name:<28} p50 {summary['p50_ms']:>8}ms  p95 {summary['p95_ms']:>8}ms  queries {summary['queries']}")
+    print(f"\nBaseline written to {args.baseline}")
+
+
+def check(args):
+    if not os.path.exists(args.baseline):
+        sys.exit(f"❌ No baseline at {args.baseline}; baselines are per machine and not checked in, "
+                 "so run `python -m tests.harness record` (with the same --hermetic snapshot) first")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("host") != platform.node():
+        print(f"⚠️  Baseline was recorded on {baseline.get('host')}; latency comparisons across machines are unreliable")
+
+    rows = compare(baseline, measure(args), args)
+    print_rows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    regressed = [row["scenario"] for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"\n❌ {len(regressed)} scenario(s) regressed: {', '.join(regressed)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(command):
+        command.add_argument("--base-url", default=DEFAULT_BASE_URL)
+        command.add_argument("--baseline", default=BASELINE_PATH)
+        command.add_argument("--rounds", type=int, default=5, help="interleaved passes over all scenarios")
+        command.add_argument("--requests", type=int, default=20, help="requests per scenario per round")
+        command.add_argument("--warmup", type=int, default=3, help="untimed requests per scenario first")
+        command.add_argument("--scenario", action="append", help="only run this scenario (repeatable)")
+        command.add_argument("--hermetic", metavar="SNAPSHOT", help="run against a private server restored from this snapshot")
+        command.add_argument("--profile", metavar="DIR", help="save CPU/heap profiles per scenario to this directory")
+        command.add_argument("--profile-requests", type=int, default=50, help="requests per scenario while profiling")
+        command.add_argument("--inspector-host", default="127.0.0.1")
+        command.add_argument("--inspector-port", type=int, default=9229, help="server's --inspect port (without --hermetic)")
+
+    add_run_options(commands.add_parser("record", help="measure and write the baseline"))
+
+    check_parser = commands.add_parser("check", help="measure and compare against the baseline")
+    add_run_options(check_parser)
+    check_parser.add_argument("--max-slowdown", type=float, default=0.2, help="allowed p50 slowdown (0.2 = 20%%)")
+    check_parser.add_argument("--max-p95-slowdown", type=float, default=0.3, help="allowed p95 slowdown")
+    check_parser.add_argument("--max-extra-queries", type=float, default=0, help="allowed growth in queries/request")
+    check_parser.add_argument("--confidence", type=float, default=0.95)
+    check_parser.add_argument("--iterations", type=int, default=2000, help="bootstrap resamples")
+    check_parser.add_argument("--json", help="write the comparison to this file")
+
+    payload_parser = commands.add_parser("payload", help="audit response sizes against the payload budgets")
+    payload_parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    payload_parser.add_argument("--hermetic", metavar="SNAPSHOT", help="run against a private server restored from this snapshot")
+    payload_parser.add_argument("--scenario", action="append", help="only audit this scenario (repeatable)")
+    payload_parser.add_argument("--budgets", default=BUDGETS_PATH)
+    payload_parser.add_argument("--update-budgets", action="store_true",
+                                help="set the budgets of the audited scenarios to their current sizes plus headroom")
+    payload_parser.add_argument("--headroom", type=float, default=0.1, help="growth allowed by --update-budgets")
+    payload_parser.add_argument("--json", help="write the audit to this file")
+
+    soak_parser = commands.add_parser("soak", help="long-running mixed traffic with leak and drift detection")
+    soak_parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    soak_parser.add_argument("--duration", default="1h", help="e.g. 45m, 3h")
+    soak_parser.add_argument("--interval", type=float, default=30, help="seconds between samples")
+    soak_parser.add_argument("--concurrency", type=int, default=20, help="traffic workers")
+    soak_parser.add_argument("--students", type=int, default=50, help="registered student pool")
+    soak_parser.add_argument("--questions", type=int, default=10, help="questions per generated test series")
+    soak_parser.add_argument("--photo-kb", type=int, default=512, help="size of each uploaded teacher photo")
+    soak_parser.add_argument("--think-time", type=float, default=0.05, help="max random pause between actions")
+    soak_parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    soak_parser.add_argument("--seed", type=int, default=42)
+    soak_parser.add_argument("--pid", type=int, help="server process to sample (default: find next-server)")
+    soak_parser.add_argument("--inspector-host", default="127.0.0.1")
+    soak_parser.add_argument("--inspector-port", type=int, help="sample the V8 heap via node --inspect on this port")
+    soak_parser.add_argument("--gc", action="store_true", help="force a GC before each heap sample")
+    soak_parser.add_argument("--no-mongo", action="store_true", help="skip serverStatus sampling")
+    soak_parser.add_argument("--warmup-fraction", type=float, default=0.1, help="samples ignored by the trend fit")
+    soak_parser.add_argument("--min-r2", type=float, default=0.5, help="trend fit required before flagging growth")
+    soak_parser.add_argument("--rss-leak-mb-per-hour", type=float, default=50)
+    soak_parser.add_argument("--heap-leak-mb-per-hour", type=float, default=20)
+    soak_parser.add_argument("--fd-drift-per-hour", type=float, default=50)
+    soak_parser.add_argument("--connection-drift-per-hour", type=float, default=10)
+    soak_parser.add_argument("--connection-churn-per-minute", type=float, default=10)
+    soak_parser.add_argument("--latency-drift", type=float, default=0.5, help="allowed p95 growth, first vs last 10%%")
+    soak_parser.add_argument("--json", help="write samples, trends and flags to this file")
+
+    herd_parser = commands.add_parser("herd", help="simultaneous exam starts, swept over arrival spreads")
+    herd_parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    herd_parser.add_argument("--students", type=int, default=5000)
+    herd_parser.add_argument("--spreads", default="0.25,0.5,1,2,5", help="arrival windows in seconds, comma separated")
+    herd_parser.add_argument("--repeat-fraction", type=float, default=0.1, help="students who press Start twice")
+    herd_parser.add_argument("--repeat-gap", type=float, default=0.05, help="max seconds between the two presses")
+    herd_parser.add_argument("--questions", type=int, default=50, help="questions in the test series")
+    herd_parser.add_argument("--connections", type=int, default=2000, help="client connection pool size")
+    herd_parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    herd_parser.add_argument("--pause", type=float, default=5, help="seconds to let the server settle between spreads")
+    herd_parser.add_argument("--slo-p99-ms", type=float, default=2000)
+    herd_parser.add_argument("--max-error-rate", type=float, default=0.01)
+    herd_parser.add_argument("--seed", type=int, default=42)
+    herd_parser.add_argument("--keep", action="store_true", help="leave inserted students, tests and attempts")
+    herd_parser.add_argument("--csv", help="write the capacity chart rows to this file")
+    herd_parser.add_argument("--json", help="write the full report to this file")
+
+    replay_parser = commands.add_parser("replay", help="replay a captured request journal at scaled speed")
+    replay_parser.add_argument("journal", help="NDJSON journal written by the server with REQUEST_JOURNAL set")
+    replay_parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    replay_parser.add_argument("--speed", type=float, default=1, help="time compression, e.g. 20 for 20x")
+    replay_parser.add_argument("--start", type=float, default=0, help="seconds into the journal to start from")
+    replay_parser.add_argument("--duration", type=float, help="seconds of journal time to replay (default: all)")
+    replay_parser.add_argument("--test-pool", type=int, default=500, help="published test series to pick from")
+    replay_parser.add_argument("--login-pool", type=int, default=20, help="fresh students used for anonymous logins")
+    replay_parser.add_argument("--connections", type=int, default=500, help="client connection pool size")
+    replay_parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    replay_parser.add_argument("--max-error-rate", type=float, default=0.01, help="5xx/transport errors allowed")
+    replay_parser.add_argument("--seed", type=int, default=42)
+    replay_parser.add_argument("--keep", action="store_true", help="leave inserted accounts and created documents")
+    replay_parser.add_argument("--json", help="write the report to this file")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    elif args.command == "check":
+        sys.exit(check(args))
+    elif args.command == "payload":
+        sys.exit(payload(args))
+    elif args.command == "soak":
+        from tests.soak import run_soak  # needs aiohttp and pymongo
+        sys.exit(run_soak(args, (os.environ.get("API_BASE_URL") or args.base_url).rstrip("/")))
+    elif args.command == "herd":
+        from tests.herd import run_herd  # needs aiohttp and pymongo
+        sys.exit(run_herd(args, (os.environ.get("API_BASE_URL") or args.base_url).rstrip("/")))
+    else:
+        from tests.replay import run_replay  # needs aiohttp and pymongo
+        sys.exit(run_replay(args, (os.environ.get("API_BASE_URL") or args.base_url).rstrip("/")))
+
+
+if __name__ == "__main__":
+    main()
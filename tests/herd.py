@@ -0,0 +1,305 @@
+"""
+Thundering-herd mode for the performance harness (python -m tests.harness herd).
+
+Models an exam opening: --students students all press "Start" on the same test
+series within --spreads seconds (uniform random arrivals), i.e. POST
+/api/test-attempts with the same testSeriesId. A --repeat-fraction of them
+press it twice --repeat-gap apart (double clicks, a retry after a slow
+response), which is what the check-then-insert start sequence cannot handle:
+both requests miss the in-progress attempt and both insert one.
+
+For every spread it reports latency percentiles measured from each request's
+scheduled arrival, errors by status, achieved throughput, and from Mongo the
+attempts created and the duplicate in-progress attempts per student. The rows
+form a capacity chart - offered arrivals/s against p99 and error rate - and the
+highest rate that stays within --slo-p99-ms and --max-error-rate is the
+per-instance capacity to size board-exam days with.
+
+Registering and logging in thousands of students would dominate the run
+(bcrypt), so the students and the test series are inserted straight into
+Mongo, tagged with seedTag, and the harness signs their JWTs with the server's
+JWT_SECRET. Everything is removed afterwards unless --keep.
+
+Requires aiohttp and pymongo and the same MONGO_URL / DB_NAME / JWT_SECRET as
+the server. Run it against a production build (yarn build && yarn start).
+"""
+
+import asyncio
+import base64
+import csv
+import hashlib
+import hmac
+import json
+import math
+import os
+import random
+import resource
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+import aiohttp
+from pymongo import MongoClient
+
+from tests.load_exam_flow import percentile
+
+DEFAULT_JWT_SECRET = "your-secret-key-change-in-production"  # the server's fallback
+CHART_WIDTH = 40
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def mint_token(payload, secret, ttl=24 * 3600):
+    """HS256 JWT the server's jwt.verify accepts, as issued by /auth/login"""
+    now = int(time.time())
+    header = b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    body = b64url(json.dumps({**payload, "iat": now, "exp": now + ttl}).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{b64url(signature)}"
+
+
+def parse_spreads(value):
+    spreads = [float(spread) for spread in value.split(",") if spread.strip()]
+    if not spreads or any(spread < 0 for spread in spreads):
+        raise SystemExit(f"❌ Invalid --spreads {value!r}; expected seconds like 0.5,1,2")
+    return spreads
+
+
+def raise_fd_limit(needed):
+    """Lift the soft open-file limit towards the hard one so the client can hold `needed` sockets"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        return target
+    return soft
+
+
+class HerdRun:
+    def __init__(self, args, base_url, db):
+        self.args = args
+        self.base_url = base_url
+        self.db = db
+        self.rng = random.Random(args.seed)
+        self.tag = f"herd-{uuid.uuid4().hex[:8]}"
+        self.test_ids = []
+
+    def setup(self):
+        """Insert the student pool and sign a token for each"""
+        secret = os.environ.get("JWT_SECRET", DEFAULT_JWT_SECRET)
+        now = datetime.utcnow()
+        self.students = []
+        documents = []
+        for i in range(self.args.students):
+            user_id = str(uuid.uuid4())
+            username = f"{self.tag}-student{i}"
+            name = f"Herd Student {i}"
+            documents.append({
+                "userId": user_id, "username": username, "password": "!", "name": name, "role": "student",
+                "email": f"{username}@example.com", "createdAt": now, "seedTag": self.tag,
+            })
+            token = mint_token({"userId": user_id, "username": username, "role": "student", "name": name}, secret)
+            self.students.append((user_id, token))
+        self.db.users.insert_many(documents, ordered=False)
+
+    def create_test_series(self, spread):
+        """A fresh published test per spread, so no student has an attempt yet"""
+        test_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        self.db.testSeries.insert_one({
+            "testSeriesId": test_id,
+            "title": f"Herd test {self.tag} ({spread:g}s)",
+            "description": "Generated by the thundering-herd harness",
+            "category": "herd",
+            "duration": 180,
+            "questions": [
+                {"questionId": str(uuid.uuid4()), "question": f"Herd question {q + 1}?",
+                 "options": ["A", "B", "C", "D"], "correctAnswer": q % 4, "explanation": ""}
+                for q in range(self.args.questions)
+            ],
+            "status": "published",
+            "createdBy": f"{self.tag}-teacher",
+            "createdByName": "Herd Teacher",
+            "createdAt": now,
+            "updatedAt": now,
+            "seedTag": self.tag,
+        })
+        self.test_ids.append(test_id)
+        return test_id
+
+    def schedule(self, spread):
+        """(offset seconds, student index) for every request, in arrival order"""
+        arrivals = []
+        for index in range(len(self.students)):
+            offset = self.rng.uniform(0, spread)
+            arrivals.append((offset, index))
+            if self.rng.random() < self.args.repeat_fraction:
+                arrivals.append((offset + self.rng.uniform(0, self.args.repeat_gap), index))
+        return sorted(arrivals)
+
+    async def fire(self, session, url, test_id, start, offset, index):
+        """One start request; latency counts from the scheduled arrival, as the student sees it"""
+        scheduled = start + offset
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        lag = time.perf_counter() - scheduled
+        headers = {"Authorization": f"Bearer {self.students[index][1]}"}
+        try:
+            async with session.post(url, json={"testSeriesId": test_id}, headers=headers) as response:
+                body = await response.json(content_type=None) if response.status == 200 else None
+                outcome = response.status
+        except asyncio.TimeoutError:
+            body, outcome = None, "timeout"
+        except aiohttp.ClientError as e:
+            body, outcome = None, type(e).__name__
+        done = time.perf_counter()
+        return {"latency_ms": (done - scheduled) * 1000, "lag_ms": lag * 1000, "done": done,
+                "outcome": outcome, "existing": bool(body and body.get("existing"))}
+
+    async def wave(self, spread):
+        test_id = self.create_test_series(spread)
+        arrivals = self.schedule(spread)
+        connector = aiohttp.TCPConnector(limit=self.args.connections)
+        timeout = aiohttp.ClientTimeout(total=self.args.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            url = f"{self.base_url}/test-attempts"
+            start = time.perf_counter() + 0.5  # let every task get scheduled before the first arrival
+            results = await asyncio.gather(*(
+                self.fire(session, url, test_id, start, offset, index) for offset, index in arrivals
+            ))
+        return test_id, start, results
+
+    def duplicates(self, test_id):
+        """Attempts created for the test, and the extra in-progress ones per student"""
+        created = self.db.testAttempts.count_documents({"testSeriesId": test_id})
+        groups = list(self.db.testAttempts.aggregate([
+            {"$match": {"testSeriesId": test_id, "status": "in_progress"}},
+            {"$group": {"_id": "$studentId", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ]))
+        return created, sum(group["count"] - 1 for group in groups), len(groups)
+
+    def summarize(self, spread, start, results, test_id):
+        latencies = [r["latency_ms"] for r in results]
+        outcomes = Counter(str(r["outcome"]) for r in results)
+        ok = outcomes.get("200", 0)
+        errors = len(results) - ok
+        created, duplicates, students_with_duplicates = self.duplicates(test_id)
+        elapsed = max(r["done"] for r in results) - start
+        return {
+            "spread_s": spread,
+            "offered_rps": round(len(results) / spread, 1) if spread else None,
+            "requests": len(results),
+            "ok": ok,
+            "existing": sum(1 for r in results if r["existing"]),
+            "errors": errors,
+            "error_rate": round(errors / len(results), 4),
+            "outcomes": dict(outcomes),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(max(latencies), 1),
+            "throughput_rps": round(ok / elapsed, 1) if elapsed > 0 else None,
+            "client_lag_p95_ms": round(percentile([r["lag_ms"] for r in results], 95), 1),
+            "attempts_created": created,
+            "duplicate_attempts": duplicates,
+            "students_with_duplicates": students_with_duplicates,
+        }
+
+    async def run(self):
+        rows = []
+        for spread in self.args.spreads:
+            test_id, start, results = await self.wave(spread)
+            row = self.summarize(spread, start, results, test_id)
+            rows.append(row)
+            print(f"  {spread:g}s: {row['requests']} requests, p99 {row['p99_ms']}ms, "
+                  f"{row['errors']} errors, {row['duplicate_attempts']} duplicate attempts")
+            if row["client_lag_p95_ms"] > 50:
+                print(f"  ⚠️  client fell {row['client_lag_p95_ms']}ms behind schedule (p95); "
+                      "latencies include client-side delay - run fewer students per harness process")
+            if self.args.pause:
+                await asyncio.sleep(self.args.pause)
+        return rows
+
+    def cleanup(self):
+        self.db.testAttempts.delete_many({"testSeriesId": {"$in": self.test_ids}})
+        self.db.testSeries.delete_many({"seedTag": self.tag})
+        self.db.users.delete_many({"seedTag": self.tag})
+
+
+def within_slo(row, args):
+    return row["p99_ms"] <= args.slo_p99_ms and row["error_rate"] <= args.max_error_rate
+
+
+def print_chart(rows, args):
+    """Capacity chart: one bar per spread, p99 against the SLO"""
+    print(f"\n{'spread':>7} {'offered/s':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'dupes':>6}  "
+          f"p99 (| = {args.slo_p99_ms:g}ms SLO)")
+    scale = max([row["p99_ms"] for row in rows] + [args.slo_p99_ms]) / CHART_WIDTH
+    slo_mark = min(CHART_WIDTH - 1, int(args.slo_p99_ms / scale))
+    for row in rows:
+        bar = list("#" * max(1, round(row["p99_ms"] / scale)) + " " * CHART_WIDTH)[:CHART_WIDTH]
+        if bar[slo_mark] == " ":
+            bar[slo_mark] = "|"
+        offered = "burst" if row["offered_rps"] is None else f"{row['offered_rps']:g}"
+        print(f"{row['spread_s']:>6g}s {offered:>10} {row['p50_ms']:>8g} {row['p95_ms']:>8g} {row['p99_ms']:>8g} "
+              f"{row['error_rate']:>7.1%} {row['duplicate_attempts']:>6}  {''.join(bar)} "
+              f"{'✅' if within_slo(row, args) else '❌'}")
+
+
+def capacity(rows, args):
+    """Highest offered arrival rate that met the SLO, or None"""
+    passing = [row["offered_rps"] for row in rows if row["offered_rps"] and within_slo(row, args)]
+    return max(passing) if passing else None
+
+
+def write_csv(rows, path):
+    columns = [key for key in rows[0] if key != "outcomes"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_herd(args, base_url):
+    args.spreads = parse_spreads(args.spreads)
+    limit = raise_fd_limit(args.connections + 256)
+    if limit < args.connections:
+        print(f"⚠️  open-file limit is {limit}; --connections {args.connections} will queue in the client")
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    herd = HerdRun(args, base_url, client[os.environ.get("DB_NAME", "test_series_db")])
+    print(f"Inserting {args.students} students (tag {herd.tag})...")
+    herd.setup()
+    try:
+        print(f"Starting exams for spreads {', '.join(f'{s:g}s' for s in args.spreads)}...")
+        rows = asyncio.run(herd.run())
+    finally:
+        if not args.keep:
+            herd.cleanup()
+
+    print_chart(rows, args)
+    sustained = capacity(rows, args)
+    if sustained:
+        print(f"\nCapacity: {sustained:g} starts/s within p99 {args.slo_p99_ms:g}ms and "
+              f"{args.max_error_rate:.1%} errors. For S students starting within T seconds plan "
+              f"ceil(S / T / {sustained:g}) instances, e.g. {math.ceil(args.students / 1 / sustained)} "
+              f"for {args.students} in 1s.")
+    else:
+        print("\n❌ No spread met the SLO; this instance cannot absorb the herd at any tested rate")
+
+    if args.csv:
+        write_csv(rows, args.csv)
+        print(f"Capacity chart data written to {args.csv}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"tag": herd.tag, "students": args.students, "repeatFraction": args.repeat_fraction,
+                       "sloP99Ms": args.slo_p99_ms, "capacityRps": sustained, "rows": rows}, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    duplicates = sum(row["duplicate_attempts"] for row in rows)
+    if duplicates:
+        print(f"❌ {duplicates} duplicate in-progress attempts created by concurrent starts")
+    return 1 if duplicates or not sustained else 0
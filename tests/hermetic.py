@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Hermetic app + database environment for reproducible, offline runs.
+
+Starts a private mongod on a temporary dbpath and the Next.js server on a free
+port against it, so a run never depends on a shared database or a preview URL.
+Instead of re-seeding every time (minutes at realistic scales, mostly bcrypt and
+index builds), the database files are restored from a snapshot archive built
+once with tests.seed, which takes seconds:
+
+    python -m tests.hermetic snapshot --scale 0.1 --seed 42
+        seeds a scratch mongod, shuts it down cleanly and archives its dbpath
+        to tests/snapshots/seed-0.1-42.tar.gz (with the mongod version)
+
+    python -m tests.hermetic run --snapshot tests/snapshots/seed-0.1-42.tar.gz -- \\
+        python -m tests.harness check
+        starts the environment, runs the command with API_BASE_URL, MONGO_URL,
+        DB_NAME and JWT_SECRET pointing at it, then tears everything down
+
+    HERMETIC_SNAPSHOT=tests/snapshots/seed-0.1-42.tar.gz pytest
+        the pytest session (each xdist worker) gets its own environment
+
+Snapshots are raw WiredTiger files, so they only restore into the same mongod
+major.minor version that wrote them. The server runs from the standalone build
+(.next/standalone/server.js) or `next start` when a build exists, otherwise
+`next dev`; build first for performance work.
+
+With inspect=True the server gets NODE_OPTIONS=--inspect on a free port
+(env.inspector_port) for CPU and heap profiling over the V8 inspector; only the
+standalone server is a single process, so prefer it when profiling.
+
+Requires mongod on PATH (or MONGOD=/path/to/mongod), node_modules, and pymongo.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import requests
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "snapshots")
+SNAPSHOT_METADATA = "snapshot.json"
+DB_NAME = "test_series_db"
+JWT_SECRET = "hermetic-test-secret"
+# mongod runtime files that must not travel between instances
+EXCLUDED_FILES = {"mongod.lock", "diagnostic.data"}
+
+
+class HermeticError(Exception):
+    pass
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def mongod_binary():
+    binary = os.environ.get("MONGOD") or shutil.which("mongod")
+    if not binary:
+        raise HermeticError("mongod not found; install MongoDB or set MONGOD=/path/to/mongod")
+    return binary
+
+
+def mongod_version(binary):
+    """"7.0.12" from `mongod --version`"""
+    output = subprocess.run([binary, "--version"], capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        if line.startswith("db version v"):
+            return line[len("db version v"):].strip()
+    raise HermeticError(f"Could not read the mongod version from: {output[:200]}")
+
+
+def log_tail(path, lines=30):
+    try:
+        with open(path, errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+    except OSError:
+        return ""
+
+
+class Process:
+    """A child process in its own process group, logging to a file"""
+
+    def __init__(self, name, command, log_path, **kwargs):
+        self.name = name
+        self.log_path = log_path
+        self.log = open(log_path, "w")
+        self.process = subprocess.Popen(command, stdout=self.log, stderr=subprocess.STDOUT,
+                                        start_new_session=True, **kwargs)
+
+    def wait_until(self, ready, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise HermeticError(f"{self.name} exited with {self.process.returncode}:\n{log_tail(self.log_path)}")
+            if ready():
+                return
+            time.sleep(0.2)
+        raise HermeticError(f"{self.name} not ready after {timeout}s:\n{log_tail(self.log_path)}")
+
+    def stop(self, timeout=15):
+        """SIGTERM the whole group (next spawns workers), SIGKILL if it lingers"""
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                pass
+        self.log.close()
+
+
+def start_mongod(dbpath, port, log_path):
+    process = Process("mongod", [mongod_binary(), "--dbpath", dbpath, "--port", str(port),
+                                 "--bind_ip", "127.0.0.1"], log_path)
+    client = MongoClient(f"mongodb://127.0.0.1:{port}", serverSelectionTimeoutMS=500)
+
+    def ready():
+        try:
+            client.admin.command("ping")
+            return True
+        except PyMongoError:
+            return False
+
+    try:
+        process.wait_until(ready, timeout=60)
+    except HermeticError:
+        process.stop()
+        raise
+    finally:
+        client.close()
+    return process
+
+
+def server_command(port):
+    standalone = os.path.join(ROOT, ".next", "standalone", "server.js")
+    next_bin = os.path.join(ROOT, "node_modules", ".bin", "next")
+    if os.path.exists(standalone):
+        return ["node", standalone]
+    if not os.path.exists(next_bin):
+        raise HermeticError("node_modules/.bin/next not found; run yarn install first")
+    if os.path.exists(os.path.join(ROOT, ".next", "BUILD_ID")):
+        return [next_bin, "start", "--hostname", "127.0.0.1", "--port", str(port)]
+    return [next_bin, "dev", "--hostname", "127.0.0.1", "--port", str(port)]
+
+
+def restore_snapshot(archive, dbpath, binary):
+    """Unpack a snapshot into dbpath; returns its metadata"""
+    if not os.path.exists(archive):
+        raise HermeticError(f"No snapshot at {archive}; build one with python -m tests.hermetic snapshot")
+    with tarfile.open(archive) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dbpath, filter="data")
+        else:
+            tar.extractall(dbpath)
+    with open(os.path.join(dbpath, SNAPSHOT_METADATA)) as f:
+        metadata = json.load(f)
+    wanted, have = metadata["mongodVersion"].split(".")[:2], mongod_version(binary).split(".")[:2]
+    if wanted != have:
+        raise HermeticError(f"Snapshot was written by mongod {metadata['mongodVersion']}, "
+                            f"this is {'.'.join(have)}; rebuild it with python -m tests.hermetic snapshot")
+    return metadata
+
+
+class HermeticEnv:
+    """
+    with HermeticEnv(snapshot="tests/snapshots/seed-0.1-42.tar.gz") as env:
+        ApiClient(env.base_url)...
+
+    snapshot: archive from `python -m tests.hermetic snapshot`, or None for an empty database
+    server:   False to start only mongod (e.g. to build a snapshot)
+    inspect:  enable the V8 inspector on the server, at env.inspector_port
+    """
+
+    def __init__(self, snapshot=None, server=True, db_name=DB_NAME, jwt_secret=JWT_SECRET, startup_timeout=180,
+                 inspect=False):
+        self.snapshot = snapshot
+        self.server = server
+        self.inspect = inspect
+        self.inspector_port = None
+        self.db_name = db_name
+        self.jwt_secret = jwt_secret
+        self.startup_timeout = startup_timeout
+        self.metadata = None
+        self._processes = []
+        self.workdir = None
+
+    def __enter__(self):
+        self.workdir = tempfile.mkdtemp(prefix="hermetic-")
+        try:
+            self.start()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        started = time.perf_counter()
+        dbpath = os.path.join(self.workdir, "db")
+        os.makedirs(dbpath)
+        if self.snapshot:
+            self.metadata = restore_snapshot(self.snapshot, dbpath, mongod_binary())
+            self.db_name = self.metadata.get("dbName", self.db_name)
+        self.mongo_port = free_port()
+        self._processes.append(start_mongod(dbpath, self.mongo_port, os.path.join(self.workdir, "mongod.log")))
+        self.mongo_url = f"mongodb://127.0.0.1:{self.mongo_port}"
+
+        if self.server:
+            self.port = free_port()
+            self.base_url = f"http://127.0.0.1:{self.port}/api"
+            env = {**os.environ, **self.env, "PORT": str(self.port), "HOSTNAME": "127.0.0.1"}
+            env.pop("API_BASE_URL", None)
+            if self.inspect:
+                self.inspector_port = free_port()
+                env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --inspect=127.0.0.1:{self.inspector_port}".strip()
+            server = Process("next", server_command(self.port), os.path.join(self.workdir, "next.log"),
+                             cwd=ROOT, env=env)
+            self._processes.append(server)
+            server.wait_until(self.server_ready, self.startup_timeout)
+        self.startup_s = round(time.perf_counter() - started, 1)
+
+    def server_ready(self):
+        try:
+            requests.get(f"{self.base_url}/categories", timeout=30)
+            return True
+        except requests.exceptions.RequestException:
+            return False
+
+    @property
+    def env(self):
+        """Variables that point the server, the harness and the suites at this environment"""
+        env = {"MONGO_URL": self.mongo_url, "DB_NAME": self.db_name, "JWT_SECRET": self.jwt_secret}
+        if self.server:
+            env["API_BASE_URL"] = self.base_url
+        return env
+
+    def client(self):
+        return MongoClient(self.mongo_url)
+
+    def close(self):
+        for process in reversed(self._processes):
+            process.stop()
+        self._processes = []
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+
+def build_snapshot(path, scale, seed, bcrypt_rounds):
+    """Seed a scratch mongod and archive its files; returns the metadata"""
+    from tests.seed import seed_database  # needs bcrypt
+
+    binary = mongod_binary()
+    with HermeticEnv(server=False) as env:
+        client = env.client()
+        report = seed_database(client[env.db_name], scale, seed, bcrypt_rounds, drop=True)
+        try:
+            client.admin.command("shutdown")  # checkpoint and close the files cleanly before copying them
+        except PyMongoError:
+            pass  # the connection drops as the server exits
+        client.close()
+        env._processes[0].process.wait(60)
+
+        dbpath = os.path.join(env.workdir, "db")
+        metadata = {
+            "mongodVersion": mongod_version(binary),
+            "dbName": env.db_name,
+            "scale": scale,
+            "seed": seed,
+            "bcryptRounds": bcrypt_rounds,
+            "documents": {name: count for name, (count, _) in report.items()},
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with open(os.path.join(dbpath, SNAPSHOT_METADATA), "w") as f:
+            json.dump(metadata, f, indent=2)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with tarfile.open(path, "w:gz") as tar:
+            for name in sorted(os.listdir(dbpath)):
+                if name not in EXCLUDED_FILES:
+                    tar.add(os.path.join(dbpath, name), arcname=name)
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = commands.add_parser("snapshot", help="seed a scratch database and archive it")
+    snapshot_parser.add_argument("--scale", type=float, default=0.1)
+    snapshot_parser.add_argument("--seed", type=int, default=42)
+    snapshot_parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    snapshot_parser.add_argument("--output", help="archive path (default: tests/snapshots/seed-<scale>-<seed>.tar.gz)")
+
+    run_parser = commands.add_parser("run", help="run a command against a fresh environment")
+    run_parser.add_argument("--snapshot", help="archive to restore (default: empty database)")
+    run_parser.add_argument("--startup-timeout", type=float, default=180)
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="command to run, after --")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "snapshot":
+            output = args.output or os.path.join(SNAPSHOT_DIR, f"seed-{args.scale:g}-{args.seed}.tar.gz")
+            started = time.perf_counter()
+            metadata = build_snapshot(output, args.scale, args.seed, args.bcrypt_rounds)
+            print(f"✅ Snapshot {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MiB, "
+                  f"mongod {metadata['mongodVersion']}) built in {time.perf_counter() - started:.0f}s")
+            return 0
+
+        command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not command:
+            parser.error("run needs a command, e.g. run -- pytest -q")
+        with HermeticEnv(snapshot=args.snapshot, startup_timeout=args.startup_timeout) as env:
+            print(f"✅ Environment up in {env.startup_s}s: {env.base_url} (mongo {env.mongo_url})")
+            return subprocess.run(command, env={**os.environ, **env.env}).returncode
+    except HermeticError as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Minimal Chrome DevTools Protocol client for the Node.js inspector.
+
+Start the server with the inspector enabled, e.g.
+
+    NODE_OPTIONS=--inspect=127.0.0.1:9229 yarn start
+
+and the harness can read heap usage or drive the profiler over the same
+WebSocket the Chrome DevTools use. Requires aiohttp.
+"""
+
+import itertools
+import json
+
+import aiohttp
+
+DEFAULT_INSPECTOR_PORT = 9229
+
+
+class InspectorError(Exception):
+    pass
+
+
+class Inspector:
+    """async with Inspector(port=9229) as inspector: await inspector.call("Runtime.getHeapUsage")"""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_INSPECTOR_PORT):
+        self.host = host
+        self.port = port
+        self._ids = itertools.count(1)
+        self._session = None
+        self._socket = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession()
+        try:
+            async with self._session.get(f"http://{self.host}:{self.port}/json/list") as response:
+                targets = await response.json(content_type=None)
+            if not targets:
+                raise InspectorError(f"No inspector targets on {self.host}:{self.port}")
+            # Profiles can be tens of MB; lift aiohttp's 4 MB message cap
+            self._socket = await self._session.ws_connect(targets[0]["webSocketDebuggerUrl"], max_msg_size=0)
+        except BaseException:
+            await self._session.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._socket is not None:
+            await self._socket.close()
+        await self._session.close()
+
+    async def call(self, method, **params):
+        """Send one command and return its result, skipping any events that arrive first"""
+        message_id = next(self._ids)
+        await self._socket.send_str(json.dumps({"id": message_id, "method": method, "params": params}))
+        async for message in self._socket:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            data = json.loads(message.data)
+            if data.get("id") != message_id:
+                continue
+            if "error" in data:
+                raise InspectorError(f"{method}: {data['error'].get('message')}")
+            return data.get("result", {})
+        raise InspectorError(f"{method}: inspector connection closed")
+
+    async def heap_usage(self, collect_garbage=False):
+        """Used and total V8 heap in bytes, optionally after a full GC so only live objects count"""
+        if collect_garbage:
+            await self.call("HeapProfiler.collectGarbage")
+        usage = await self.call("Runtime.getHeapUsage")
+        return {"used": usage["usedSize"], "total": usage["totalSize"]}
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Asyncio load generator for the student exam flow.
+
+Simulates N concurrent students running the flow scripted in
+continuation_backend_test.py::test_detailed_results_storage:
+
+    login -> GET /test-series -> POST /test-attempts
+          -> PUT /test-attempts/:id (submit_answer, once per question)
+          -> PUT /test-attempts/:id (complete_test)
+
+over one aiohttp session with a bounded connection pool, then reports flow
+throughput and p50/p95/p99 latency per step. Point it at a local server and a
+local mongod; by default it registers its own teacher, test series and students
+under a unique run prefix (use --existing-students / --test-series-id to reuse
+seeded data instead). Auth routes are rate limited, so 429s are honoured via
+Retry-After and counted separately from errors.
+
+Requires aiohttp.
+
+Usage:
+    python -m tests.load_exam_flow --students 200 --concurrency 50 --questions 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from collections import defaultdict
+
+import aiohttp
+
+from tests.api_client import ApiClient, DEFAULT_BASE_URL
+
+STUDENT_PASSWORD = "student123"
+STEPS = ["login", "catalogue", "start", "submit_answer", "complete"]
+MAX_THROTTLE_RETRIES = 5
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class StepStats:
+    """Latency samples and outcome counts per flow step"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.throttled = defaultdict(int)
+
+    def report(self, wall_seconds, flows_completed):
+        steps = {}
+        for step in STEPS:
+            samples = self.latencies[step]
+            steps[step] = {
+                "requests": len(samples),
+                "errors": self.errors[step],
+                "throttled": self.throttled[step],
+                "p50_ms": round(percentile(samples, 50), 1),
+                "p95_ms": round(percentile(samples, 95), 1),
+                "p99_ms": round(percentile(samples, 99), 1),
+                "max_ms": round(max(samples), 1) if samples else 0.0,
+            }
+        total_requests = sum(entry["requests"] for entry in steps.values())
+        return {
+            "wall_seconds": round(wall_seconds, 2),
+            "flows_completed": flows_completed,
+            "flows_per_second": round(flows_completed / wall_seconds, 2) if wall_seconds else 0.0,
+            "requests_per_second": round(total_requests / wall_seconds, 1) if wall_seconds else 0.0,
+            "steps": steps,
+        }
+
+
+async def timed(session, stats, step, method, url, **kwargs):
+    """Issue one request, recording its latency; retries 429s after Retry-After"""
+    for _ in range(MAX_THROTTLE_RETRIES + 1):
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if response.status == 429:
+                    stats.throttled[step] += 1
+                    await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+                    continue
+                stats.latencies[step].append(elapsed_ms)
+                if response.status != 200:
+                    stats.errors[step] += 1
+                    return None
+                return json.loads(body) if body else {}
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            stats.latencies[step].append((time.perf_counter() - start) * 1000)
+            stats.errors[step] += 1
+            return None
+    stats.errors[step] += 1
+    return None
+
+
+async def student_flow(session, base_url, stats, username, password, test_series_id, question_ids, args):
+    """One student's exam; returns True when the attempt was completed"""
+    data = await timed(session, stats, "login", "POST", f"{base_url}/auth/login",
+                       json={"username": username, "password": password})
+    if not data:
+        return False
+    headers = {"Authorization": f"Bearer {data['token']}"}
+
+    if not args.skip_catalogue:
+        catalogue = await timed(session, stats, "catalogue", "GET", f"{base_url}/test-series", headers=headers)
+        if catalogue is None:
+            return False
+        target = next((test for test in catalogue if test["testSeriesId"] == test_series_id), None)
+        if target and target.get("questions"):
+            question_ids = [question["questionId"] for question in target["questions"]]
+
+    attempt = await timed(session, stats, "start", "POST", f"{base_url}/test-attempts",
+                          json={"testSeriesId": test_series_id}, headers=headers)
+    if not attempt:
+        return False
+    attempt_url = f"{base_url}/test-attempts/{attempt['attemptId']}"
+
+    for question_id in question_ids:
+        if args.think_time:
+            await asyncio.sleep(random.uniform(0, args.think_time))
+        await timed(session, stats, "submit_answer", "PUT", attempt_url, headers=headers,
+                    json={"questionId": question_id, "answer": random.randrange(4), "action": "submit_answer"})
+
+    result = await timed(session, stats, "complete", "PUT", attempt_url, headers=headers,
+                         json={"action": "complete_test"})
+    return result is not None
+
+
+def create_test_series(api, run_id, questions):
+    """Register a teacher for this run and create a published test series"""
+    teacher = {
+        "username": f"load_teacher_{run_id}",
+        "password": "teacher123",
+        "name": f"Load Teacher {run_id}",
+        "role": "teacher",
+        "email": f"load.teacher.{run_id}@example.com",
+    }
+    response = api.post("auth/register", json=teacher)
+    response.raise_for_status()
+    token = response.json()["token"]
+
+    test_data = {
+        "title": f"Load Test {run_id}",
+        "description": "Generated by tests/load_exam_flow.py",
+        "category": "load-test",
+        "duration": 180,
+        "questions": [
+            {
+                "questionId": str(uuid.uuid4()),
+                "question": f"Load question {i + 1}?",
+                "options": ["A", "B", "C", "D"],
+                "correctAnswer": i % 4,
+                "explanation": "",
+            }
+            for i in range(questions)
+        ],
+    }
+    response = api.post("test-series", json=test_data, headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    created = response.json()
+    return created["testSeriesId"], [question["questionId"] for question in created["questions"]]
+
+
+async def register_students(session, base_url, run_id, count, concurrency):
+    """Register fresh students (bcrypt-bound on the server, so not part of the timed run)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = StepStats()
+
+    async def register(i):
+        async with semaphore:
+            username = f"load_{run_id}_{i}"
+            await timed(session, stats, "login", "POST", f"{base_url}/auth/register", json={
+                "username": username,
+                "password": STUDENT_PASSWORD,
+                "name": f"Load Student {i}",
+                "role": "student",
+                "email": f"load.{run_id}.{i}@example.com",
+            })
+            return username
+
+    return await asyncio.gather(*(register(i) for i in range(count)))
+
+
+async def run(args):
+    base_url = (os.environ.get("API_BASE_URL") or args.base_url).rstrip("/")
+    run_id = uuid.uuid4().hex[:8]
+    api = ApiClient(base_url)
+
+    if args.test_series_id:
+        test_series_id, question_ids = args.test_series_id, []
+    else:
+        test_series_id, question_ids = create_test_series(api, run_id, args.questions)
+    print(f"Run {run_id}: test series {test_series_id}")
+
+    connector = aiohttp.TCPConnector(limit=args.pool_size)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if args.existing_students:
+            usernames = [f"{args.existing_students}{i}" for i in range(args.students)]
+            password = args.student_password
+        else:
+            print(f"Registering {args.students} students...")
+            usernames = await register_students(session, base_url, run_id, args.students, args.concurrency)
+            password = STUDENT_PASSWORD
+
+        stats = StepStats()
+        semaphore = asyncio.Semaphore(args.concurrency)
+        ramp_step = args.ramp / max(1, len(usernames))
+
+        async def launch(i, username):
+            await asyncio.sleep(i * ramp_step)
+            async with semaphore:
+                return await student_flow(session, base_url, stats, username, password,
+                                          test_series_id, question_ids, args)
+
+        print(f"Running {len(usernames)} student flows (concurrency {args.concurrency}, pool {args.pool_size})...")
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(launch(i, username) for i, username in enumerate(usernames)))
+        wall_seconds = time.perf_counter() - start
+
+    return stats.report(wall_seconds, sum(1 for ok in outcomes if ok))
+
+
+def print_report(report):
+    print(f"\nCompleted {report['flows_completed']} flows in {report['wall_seconds']}s "
+          f"({report['flows_per_second']} flows/s, {report['requests_per_second']} req/s)")
+    print(f"{'step':<15} {'requests':>9} {'errors':>7} {'429s':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step, entry in report["steps"].items():
+        print(f"{step:<15} {entry['requests']:>9} {entry['errors']:>7} {entry['throttled']:>6} "
+              f"{entry['p50_ms']:>9} {entry['p95_ms']:>9} {entry['p99_ms']:>9} {entry['max_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50, help="students in flight at once")
+    parser.add_argument("--pool-size", type=int, default=100, help="max open HTTP connections")
+    parser.add_argument("--questions", type=int, default=20, help="questions in the generated test series")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which students start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="max random pause between answers")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--skip-catalogue", action="store_true", help="skip GET /test-series in each flow")
+    parser.add_argument("--test-series-id", help="use an existing test series instead of creating one")
+    parser.add_argument("--existing-students", metavar="PREFIX",
+                        help="log in as PREFIX0..PREFIXn-1 instead of registering students")
+    parser.add_argument("--student-password", default=STUDENT_PASSWORD)
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    if args.test_series_id and args.skip_catalogue:
+        parser.error("--skip-catalogue needs the generated test series (question ids come from the catalogue)")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
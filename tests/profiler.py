@@ -0,0 +1,168 @@
+"""
+CPU and heap sampling of the server over the V8 inspector (see tests/inspector.py).
+
+    async with Inspector(port=9229) as inspector:
+        profiler = Profiler(inspector)
+        await profiler.start()
+        ...                                # drive the scenario
+        profiles = await profiler.stop()
+    save_profiles(profiles, "profiles/test-series:student")
+
+writes <name>.cpuprofile and <name>.heapprofile (open them in Chrome DevTools or
+speedscope) and <name>.folded, collapsed stacks for flamegraph.pl / speedscope.
+summarize() attributes samples to the hot spots we care about - the API handler,
+bcrypt, JSON serialization, the Mongo driver, GC - and lists the top functions by
+self time and the app functions (route.js and lib/) by inclusive time.
+
+Production builds minify server code, so function names are only readable with
+`next dev` or experimental.serverMinification disabled in next.config.js.
+"""
+
+import json
+import os
+from collections import Counter
+
+# (bucket, predicate on a call frame); a sample counts towards the first bucket on its stack
+BUCKETS = [
+    ("bcrypt", lambda frame: "bcryptjs" in frame["url"]),
+    ("json", lambda frame: frame["functionName"] in ("stringify", "parse", "JSONStringify", "JSONParse")
+     or "json-response" in frame["url"]),
+    ("mongodb", lambda frame: "node_modules/mongodb" in frame["url"] or "node_modules/bson" in frame["url"]),
+    ("handler", lambda frame: is_app_frame(frame)),
+]
+SPECIAL_NODES = {"(garbage collector)": "gc", "(idle)": "idle", "(program)": "program"}
+
+
+def is_app_frame(frame):
+    url = frame["url"]
+    return "node_modules" not in url and ("route.js" in url or "/lib/" in url or "app/api" in url)
+
+
+def frame_name(frame):
+    name = frame["functionName"] or "(anonymous)"
+    if not frame["url"]:
+        return name
+    return f"{name} {os.path.basename(frame['url'].split('?')[0])}:{frame['lineNumber'] + 1}"
+
+
+class Profiler:
+    def __init__(self, inspector, interval_us=100, heap_interval_bytes=32 * 1024):
+        self.inspector = inspector
+        self.interval_us = interval_us
+        self.heap_interval_bytes = heap_interval_bytes
+
+    async def start(self, heap=True):
+        self.heap = heap
+        await self.inspector.call("Profiler.enable")
+        await self.inspector.call("Profiler.setSamplingInterval", interval=self.interval_us)
+        await self.inspector.call("Profiler.start")
+        if heap:
+            await self.inspector.call("HeapProfiler.enable")
+            await self.inspector.call("HeapProfiler.startSampling", samplingInterval=self.heap_interval_bytes)
+
+    async def stop(self):
+        """{"cpu": Profiler.Profile, "heap": HeapProfiler.SamplingHeapProfile or None}"""
+        cpu = (await self.inspector.call("Profiler.stop"))["profile"]
+        await self.inspector.call("Profiler.disable")
+        heap = None
+        if self.heap:
+            heap = (await self.inspector.call("HeapProfiler.stopSampling"))["profile"]
+            await self.inspector.call("HeapProfiler.disable")
+        return {"cpu": cpu, "heap": heap}
+
+
+def sample_weights(profile):
+    """Microseconds per node id, from the sample list and its time deltas"""
+    weights = Counter()
+    deltas = profile.get("timeDeltas") or []
+    samples = profile.get("samples") or []
+    elapsed = profile.get("startTime", 0) + sum(deltas)
+    for i, node_id in enumerate(samples):
+        # A sample's delta is the time since the previous one; the next delta is how long it lasted
+        weights[node_id] += deltas[i + 1] if i + 1 < len(deltas) else max(0, profile.get("endTime", elapsed) - elapsed)
+    return weights
+
+
+def stacks(profile):
+    """node id -> list of call frames from the root down to the node"""
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    parents = {child: node["id"] for node in profile["nodes"] for child in node.get("children", [])}
+    cache = {}
+
+    def stack(node_id):
+        if node_id not in cache:
+            parent = parents.get(node_id)
+            frame = nodes[node_id]["callFrame"]
+            prefix = stack(parent) if parent is not None else []
+            cache[node_id] = prefix + [frame] if frame["functionName"] != "(root)" else prefix
+        return cache[node_id]
+
+    for node_id in nodes:
+        stack(node_id)
+    return cache
+
+
+def collapse(profile):
+    """Folded stacks ("a;b;c <microseconds>" lines) for flame graphs"""
+    all_stacks = stacks(profile)
+    folded = Counter()
+    for node_id, weight in sample_weights(profile).items():
+        if weight:
+            folded[";".join(frame_name(frame) for frame in all_stacks[node_id]) or "(root)"] += weight
+    return [f"{stack} {weight}" for stack, weight in sorted(folded.items())]
+
+
+def summarize(profile, top=15):
+    """Time per bucket, top functions by self time and app functions by inclusive time (ms)"""
+    all_stacks = stacks(profile)
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    weights = sample_weights(profile)
+    total = sum(weights.values())
+
+    buckets = Counter()
+    self_time = Counter()
+    app_time = Counter()
+    for node_id, weight in weights.items():
+        frames = all_stacks[node_id]
+        name = nodes[node_id]["callFrame"]["functionName"]
+        self_time[frame_name(nodes[node_id]["callFrame"])] += weight
+        bucket = SPECIAL_NODES.get(name)
+        if bucket is None:
+            bucket = next((label for label, match in BUCKETS if any(match(frame) for frame in frames)), "other")
+        buckets[bucket] += weight
+        for app_frame in {frame_name(frame) for frame in frames if is_app_frame(frame)}:
+            app_time[app_frame] += weight
+
+    def ms(microseconds):
+        return round(microseconds / 1000, 1)
+
+    return {
+        "total_ms": ms(total),
+        "buckets": {label: ms(weight) for label, weight in buckets.most_common()},
+        "self": [(name, ms(weight)) for name, weight in self_time.most_common(top)],
+        "app_inclusive": [(name, ms(weight)) for name, weight in app_time.most_common(top)],
+    }
+
+
+def save_profiles(profiles, prefix):
+    """Write <prefix>.cpuprofile, .heapprofile and .folded; returns the CPU summary"""
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+    with open(f"{prefix}.cpuprofile", "w") as f:
+        json.dump(profiles["cpu"], f)
+    if profiles.get("heap"):
+        with open(f"{prefix}.heapprofile", "w") as f:
+            json.dump(profiles["heap"], f)
+    with open(f"{prefix}.folded", "w") as f:
+        f.write("\n".join(collapse(profiles["cpu"])) + "\n")
+    summary = summarize(profiles["cpu"])
+    with open(f"{prefix}.summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def print_summary(name, summary, top=5):
+    buckets = ", ".join(f"{label} {value:g}ms" for label, value in summary["buckets"].items())
+    print(f"\n🔥 {name}: {summary['total_ms']:g}ms sampled - {buckets}")
+    for label, rows in (("self", summary["self"]), ("app (inclusive)", summary["app_inclusive"])):
+        for function, value in rows[:top]:
+            print(f"    {label:<16} {value:>9g}ms  {function}")
@@ -0,0 +1,259 @@
+"""
+One result recorder for the standalone backend suites.
+
+Each suite used to collect pass/fail strings its own way (TestResults.add_result,
+the various log_result methods) and none recorded how long a check took. A
+ResultRecorder keeps one TestRecord per check with its wall time and the number
+of HTTP calls and bytes the suite's ApiClient made for it - the suites log a
+result right after the requests it covers, so each record spans the work since
+the previous one.
+
+At the end of a run, finish() writes reports when asked to through the
+environment:
+
+    TEST_REPORT_DIR=reports   <suite>.json and <suite>.xml (JUnit) in that directory
+    TEST_RESULT_MD=test_result.md
+                              sync the YAML testing-data block: task status and
+                              status_history, metadata.test_sequence and an
+                              agent_communication entry for the run
+"""
+
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class TestRecord:
+    """Outcome, wall time and HTTP traffic of one check"""
+    name: str
+    success: bool
+    message: str = ""
+    category: str = None
+    task: str = None  # test_result.md task this check covers
+    duration_ms: float = 0.0
+    requests: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    response: object = None  # response payload kept for failed checks
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+class ResultRecorder:
+    def __init__(self, suite, client=None, task=None, tasks=None):
+        """
+        suite:  report name, usually the script name
+        client: the suite's ApiClient, whose call log gives per-check request counts and bytes
+        task:   test_result.md task covered by every check, unless
+        tasks:  maps a check's category to its test_result.md task
+        """
+        self.suite = suite
+        self.client = client
+        self.task = task
+        self.tasks = tasks or {}
+        self.category = None  # default category for new records, e.g. the section being run
+        self.records = []
+        self.started_at = datetime.now()
+        self._started = self._last = time.perf_counter()
+        self._last_call = len(client.calls) if client else 0
+
+    def record(self, name, success, message="", category=None, response=None):
+        """Log one check; it is credited with the time and calls since the previous one"""
+        now = time.perf_counter()
+        category = category or self.category
+        calls = self.client.calls[self._last_call:] if self.client else []
+        record = TestRecord(
+            name=name,
+            success=bool(success),
+            message=message,
+            category=category,
+            task=self.tasks.get(category, self.task),
+            duration_ms=round((now - self._last) * 1000, 1),
+            requests=len(calls),
+            request_bytes=sum(call.request_bytes for call in calls),
+            response_bytes=sum(call.response_bytes for call in calls),
+            response=None if success else response,
+        )
+        self.records.append(record)
+        self._last = now
+        self._last_call += len(calls)
+
+        line = f"{'✅ PASS' if success else '❌ FAIL'}: {name}"
+        if message:
+            line += f" - {message}"
+        print(f"{line} ({record.duration_ms:.0f}ms, {record.requests} requests)")
+        return record
+
+    @property
+    def passed(self):
+        return sum(1 for record in self.records if record.success)
+
+    @property
+    def failed(self):
+        return len(self.records) - self.passed
+
+    @property
+    def success_rate(self):
+        return self.passed / len(self.records) * 100 if self.records else 0.0
+
+    @property
+    def duration_s(self):
+        return time.perf_counter() - self._started
+
+    def summary(self, slowest=5):
+        """Print totals, per-category counts, failures and the slowest checks; returns the success rate"""
+        print(f"\n📊 TEST SUMMARY ({self.suite})")
+        print(f"Total Tests: {len(self.records)}")
+        print(f"Passed: {self.passed} ✅")
+        print(f"Failed: {self.failed} ❌")
+        print(f"Success Rate: {self.success_rate:.1f}%")
+        print(f"⏱️  Duration: {self.duration_s:.2f}s, {sum(r.requests for r in self.records)} requests")
+
+        categories = {}
+        for record in self.records:
+            if record.category:
+                categories.setdefault(record.category, []).append(record)
+        for category, records in categories.items():
+            failed = sum(1 for record in records if not record.success)
+            print(f"{'✅' if not failed else '❌'} {category.upper().replace('_', ' ')}: "
+                  f"{len(records) - failed} passed, {failed} failed")
+
+        if self.failed:
+            print("\n❌ FAILED TESTS:")
+            for record in self.records:
+                if not record.success:
+                    print(f"  - {record.name}: {record.message}")
+
+        if self.records and slowest:
+            print("\n🐢 SLOWEST TESTS:")
+            for record in sorted(self.records, key=lambda r: r.duration_ms, reverse=True)[:slowest]:
+                print(f"  - {record.name}: {record.duration_ms:.0f}ms, {record.requests} requests, "
+                      f"{record.response_bytes / 1024:.1f} KiB")
+        return self.success_rate
+
+    def to_dict(self):
+        return {
+            "suite": self.suite,
+            "startedAt": self.started_at.isoformat(),
+            "duration_s": round(self.duration_s, 3),
+            "passed": self.passed,
+            "failed": self.failed,
+            "tests": [asdict(record) for record in self.records],
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def write_junit(self, path):
+        suite = ET.Element("testsuite", {
+            "name": self.suite,
+            "tests": str(len(self.records)),
+            "failures": str(self.failed),
+            "errors": "0",
+            "time": f"{self.duration_s:.3f}",
+            "timestamp": self.started_at.isoformat(timespec="seconds"),
+        })
+        for record in self.records:
+            case = ET.SubElement(suite, "testcase", {
+                "classname": f"{self.suite}.{record.category}" if record.category else self.suite,
+                "name": record.name,
+                "time": f"{record.duration_ms / 1000:.3f}",
+            })
+            properties = ET.SubElement(case, "properties")
+            for key in ("requests", "request_bytes", "response_bytes"):
+                ET.SubElement(properties, "property", {"name": key, "value": str(getattr(record, key))})
+            if not record.success:
+                failure = ET.SubElement(case, "failure", {"message": record.message or "failed"})
+                if record.response is not None:
+                    failure.text = json.dumps(record.response, indent=2, default=str)
+
+        tree = ET.ElementTree(ET.Element("testsuites"))
+        tree.getroot().append(suite)
+        ET.indent(tree)
+        tree.write(path, encoding="utf-8", xml_declaration=True)
+
+    def sync_test_result_md(self, path):
+        """Record this run in the YAML testing-data block of test_result.md"""
+        with open(path) as f:
+            lines = f.read().split("\n")
+
+        tasks = {}
+        for record in self.records:
+            if record.task:
+                tasks.setdefault(record.task, []).append(record)
+        for task, records in tasks.items():
+            failed = [record.name for record in records if not record.success]
+            comment = f"AUTOMATED ({self.suite}): {len(records) - len(failed)}/{len(records)} checks passed"
+            if failed:
+                comment += f"; failed: {', '.join(failed)}"
+            update_task(lines, task, not failed, comment)
+
+        for i, line in enumerate(lines):
+            match = re.match(r"^(  test_sequence: )(\d+)", line)
+            if match:
+                lines[i] = f"{match.group(1)}{int(match.group(2)) + 1}"
+
+        message = (f"AUTOMATED RUN ({self.suite}): {self.passed}/{len(self.records)} tests passed "
+                   f"in {self.duration_s:.1f}s")
+        slowest = sorted(self.records, key=lambda r: r.duration_ms, reverse=True)[:3]
+        if slowest:
+            message += ". Slowest: " + ", ".join(f"{r.name} ({r.duration_ms:.0f}ms)" for r in slowest)
+        failed = [record.name for record in self.records if not record.success]
+        if failed:
+            message += ". Failed: " + ", ".join(failed)
+        while lines and not lines[-1].strip():
+            lines.pop()
+        lines += ['  - agent: "testing"', f"    message: {yaml_string(message)}", ""]
+
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+
+    def finish(self):
+        """Write the reports requested via TEST_REPORT_DIR / TEST_RESULT_MD; True when nothing failed"""
+        report_dir = os.environ.get("TEST_REPORT_DIR")
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+            self.write_json(os.path.join(report_dir, f"{self.suite}.json"))
+            self.write_junit(os.path.join(report_dir, f"{self.suite}.xml"))
+            print(f"\n📝 Reports written to {report_dir}/{self.suite}.json and .xml")
+
+        test_result_md = os.environ.get("TEST_RESULT_MD")
+        if test_result_md:
+            self.sync_test_result_md(test_result_md)
+            print(f"📝 {test_result_md} updated")
+        return self.failed == 0
+
+
+def yaml_string(value):
+    # JSON strings are valid double-quoted YAML scalars
+    return json.dumps(value, ensure_ascii=False)
+
+
+def update_task(lines, task, working, comment):
+    """Set a task's working/needs_retesting flags and append to its status_history, in place"""
+    header = f"  - task: {yaml_string(task)}"
+    if header not in lines:
+        return False
+    start = lines.index(header)
+    end = start + 1
+    while end < len(lines) and not lines[end].startswith("  - task:") and not re.match(r"^\S", lines[end]):
+        end += 1
+    while not lines[end - 1].strip():
+        end -= 1
+
+    for i in range(start + 1, end):
+        if lines[i].startswith("    working: "):
+            lines[i] = f"    working: {str(working).lower()}"
+        elif lines[i].startswith("    needs_retesting: "):
+            lines[i] = "    needs_retesting: false"
+    lines[end:end] = [
+        f"      - working: {str(working).lower()}",
+        '        agent: "testing"',
+        f"        comment: {yaml_string(comment)}",
+    ]
+    return True
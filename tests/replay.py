@@ -0,0 +1,407 @@
+"""
+Replay mode for the performance harness (python -m tests.harness replay).
+
+Re-issues a request journal captured with REQUEST_JOURNAL=journal.ndjson (see
+lib/request-journal.js) against a seeded environment, keeping the original
+inter-arrival times divided by --speed, so a production day - or its peak hour
+via --start/--duration - can be reproduced on a laptop at 1x-20x.
+
+The journal is sanitized, so every request is rebuilt:
+
+    actors     each pseudonymous student gets a fresh student account inserted
+               for the run (clean exam state); teachers and admins map onto the
+               seeded accounts, which own the seeded tests. Tokens are signed
+               with JWT_SECRET, logins use fresh students and student123.
+    path ids   test series resolve to one of the actor's own tests (teachers) or
+               a published one; attempts to the actor's current attempt; DELETEs
+               only to resources the actor created during the replay
+    bodies     "<string:n>" placeholders become n-character strings, except ids,
+               usernames and emails, which are resolved or generated; multipart
+               photo uploads are re-sent at their original size
+
+One actor's requests are sent in journal order, each waiting for the previous
+one, so an exam's start, answers and completion stay consistent at any speed.
+Requests that cannot be rebuilt are skipped and counted. The run writes to the
+database (exams, created tests, edits), so use a disposable seeded database;
+inserted accounts, created documents and their attempts are removed afterwards
+unless --keep.
+
+Requires aiohttp and pymongo and the same MONGO_URL / DB_NAME / JWT_SECRET as
+the server.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import aiohttp
+from pymongo import MongoClient
+
+from tests.herd import DEFAULT_JWT_SECRET, mint_token
+from tests.load_exam_flow import percentile
+
+STUDENT_PASSWORD = "student123"  # tests.seed convention; fresh students reuse a seeded hash
+SEARCH_TERMS = ["kinematics", "thermodynamics", "genetics", "probability", "algorithms", "grammar"]
+CREATED_ID_FIELDS = {"test-series": "testSeriesId", "categories": "categoryId", "users": "userId"}
+PLACEHOLDER_PREFIX = "<string:"
+
+
+class Skip(Exception):
+    """The journal entry cannot be rebuilt against this environment"""
+
+
+def load_journal(path, start=0.0, duration=None):
+    """Entries sorted by time, limited to [start, start + duration) seconds into the journal"""
+    entries = []
+    malformed = 0
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if not isinstance(entry, dict) or "ts" not in entry or "route" not in entry:
+                malformed += 1
+                continue
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry["ts"])
+    if entries:
+        first = entries[0]["ts"] + start * 1000
+        last = first + duration * 1000 if duration else float("inf")
+        entries = [entry for entry in entries if first <= entry["ts"] < last]
+    return entries, malformed
+
+
+def placeholder_length(value):
+    """n for a "<string:n>" placeholder, None for anything else"""
+    if isinstance(value, str) and value.startswith(PLACEHOLDER_PREFIX) and value.endswith(">"):
+        return int(value[len(PLACEHOLDER_PREFIX):-1])
+    return None
+
+
+class ActorState:
+    def __init__(self, account):
+        self.account = account  # (userId, username, role, token)
+        self.test = None  # test series the actor is working on
+        self.attempt = None
+        self.created = defaultdict(list)  # path family -> ids created during the replay
+        self.previous = None  # task of the actor's previous request
+
+
+class Replay:
+    def __init__(self, args, base_url, db, entries):
+        self.args = args
+        self.base_url = base_url
+        self.db = db
+        self.entries = entries
+        self.rng = random.Random(args.seed)
+        self.tag = f"replay-{uuid.uuid4().hex[:8]}"
+        self.names = itertools.count()
+        self.actors = {}
+        self.results = []
+        self.skipped = Counter()
+        self.created = defaultdict(set)  # family -> ids to remove at cleanup
+        self.students = []
+
+    def setup(self):
+        """Map the journal's actors onto accounts and load the ids requests can point at"""
+        secret = os.environ.get("JWT_SECRET", DEFAULT_JWT_SECRET)
+        roles = {}
+        for entry in self.entries:
+            if entry.get("actor") and entry.get("role"):
+                roles.setdefault(entry["actor"], entry["role"])
+        student_hash = (self.db.users.find_one({"role": "student"}, {"password": 1}) or {}).get("password")
+        if not student_hash:
+            raise SystemExit("❌ No seeded students; seed the database with python -m tests.seed first")
+
+        seeded = {
+            role: list(self.db.users.find({"role": role}, {"userId": 1, "username": 1, "name": 1}).sort("username", 1))
+            for role in ("teacher", "admin")
+        }
+        cursors = {role: itertools.cycle(users) for role, users in seeded.items() if users}
+        documents = []
+        # Students who only log in anonymously still need accounts; keep a small pool for them
+        anonymous_logins = any(entry["route"] == "POST /api/auth/login" for entry in self.entries)
+        student_actors = [actor for actor, role in roles.items() if role == "student"]
+        for index in range(len(student_actors) + (self.args.login_pool if anonymous_logins else 0)):
+            user_id = str(uuid.uuid4())
+            username = f"{self.tag}-student{index}"
+            documents.append({
+                "userId": user_id, "username": username, "password": student_hash, "name": f"Replay Student {index}",
+                "role": "student", "email": f"{username}@example.com", "createdAt": datetime.utcnow(),
+                "seedTag": self.tag,
+            })
+            self.students.append({"userId": user_id, "username": username, "name": f"Replay Student {index}"})
+        if documents:
+            self.db.users.insert_many(documents, ordered=False)
+        fresh_students = iter(self.students)
+
+        for actor, role in roles.items():
+            if role == "student":
+                user = next(fresh_students)
+            elif role in cursors:
+                user = next(cursors[role])
+            else:
+                continue  # no seeded account for this role; its requests are skipped
+            payload = {"userId": user["userId"], "username": user["username"], "role": role, "name": user.get("name")}
+            self.actors[actor] = ActorState((user["userId"], user["username"], role, mint_token(payload, secret)))
+        self.login_pool = itertools.cycle(self.students or [{"username": "student0"}])
+
+        self.published = [
+            {"testSeriesId": test["testSeriesId"], "questions": [q["questionId"] for q in test.get("questions", [])]}
+            for test in self.db.testSeries.find({"status": {"$ne": "draft"}}, {"testSeriesId": 1, "questions.questionId": 1})
+            .limit(self.args.test_pool)
+        ]
+        self.owned = {}  # teacher userId -> their test series ids
+
+    def tests_of(self, user_id):
+        if user_id not in self.owned:
+            self.owned[user_id] = [test["testSeriesId"] for test in
+                                   self.db.testSeries.find({"createdBy": user_id}, {"testSeriesId": 1})]
+        return self.owned[user_id]
+
+    def pick_test(self, state):
+        if not self.published:
+            raise Skip("no published test series")
+        test = self.rng.choice(self.published)
+        if state:
+            state.test = test
+        return test["testSeriesId"]
+
+    def resolve_id(self, family, method, state):
+        if method == "DELETE":
+            if state and state.created[family]:
+                return state.created[family].pop()
+            raise Skip("delete of a resource not created in the replay")
+        if family == "test-attempts":
+            if state and state.attempt:
+                return state.attempt
+            raise Skip("no attempt in progress")
+        if family == "test-series":
+            if state and state.account[2] == "teacher":
+                owned = self.tests_of(state.account[0]) + state.created["test-series"]
+                if not owned:
+                    raise Skip("teacher owns no test series")
+                return self.rng.choice(owned)
+            return self.pick_test(state)
+        raise Skip(f"unresolvable {family} id")
+
+    def synthesize(self, value, state, key=None):
+        """A concrete value for a shaped journal value"""
+        if isinstance(value, dict):
+            if "$items" in value:
+                return [self.synthesize(value["$of"], state) for _ in range(value["$items"])] if value["$of"] is not None else []
+            return {field: self.synthesize(inner, state, field) for field, inner in value.items()}
+        length = placeholder_length(value)
+        if length is None:
+            return value
+        if key == "testSeriesId":
+            return self.pick_test(state)
+        if key == "questionId" and state and state.test and state.test["questions"]:
+            return self.rng.choice(state.test["questions"])
+        if key == "username":
+            return f"{self.tag}-user{next(self.names)}"
+        if key == "email":
+            return f"{self.tag}-user{next(self.names)}@example.com"
+        if key == "q":
+            return self.rng.choice(SEARCH_TERMS)
+        return "x" * length
+
+    def build(self, entry, state):
+        """(method, path, request kwargs) for a journal entry"""
+        if entry.get("role") and not state:
+            raise Skip(f"no {entry['role']} account")
+        method, route = entry["method"], entry["route"].split(" ", 1)[1]
+        segments = route.strip("/").split("/")[1:]  # drop "api"
+        for i, segment in enumerate(segments):
+            if segment == ":id":
+                segments[i] = self.resolve_id(segments[i - 1] if i else "", method, state)
+        path = "/".join(segments)
+
+        kwargs = {"headers": {"Authorization": f"Bearer {state.account[3]}"} if state else {}}
+        if entry.get("query"):
+            kwargs["params"] = {key: str(self.synthesize(value, state, key)) for key, value in entry["query"].items()}
+
+        body = entry.get("body")
+        if route == "/api/auth/login" and method == "POST":
+            kwargs["json"] = {"username": next(self.login_pool)["username"], "password": STUDENT_PASSWORD}
+        elif body is None:
+            pass
+        elif "$bytes" in body:
+            if path != "upload/photo":
+                raise Skip(f"{body.get('$type') or 'raw'} body")
+            form = aiohttp.FormData()
+            form.add_field("photo", os.urandom(max(64, body["$bytes"] - 256)), filename="replay.png",
+                           content_type="image/png")
+            kwargs["data"] = form
+        elif "$invalid" in body:
+            raise Skip("invalid JSON body")
+        else:
+            kwargs["json"] = self.synthesize(body, state)
+        return method, path, kwargs
+
+    def remember(self, method, path, state, data):
+        """Track what a successful response created so later requests can refer to it"""
+        family = path.split("/")[0]
+        if family == "test-attempts" and method == "POST":
+            state.attempt = data.get("attemptId")
+        elif family == "test-attempts" and method == "PUT" and data.get("score") is not None:
+            state.attempt = None  # completed
+        elif method == "POST" and family in CREATED_ID_FIELDS and data.get(CREATED_ID_FIELDS[family]):
+            created = data[CREATED_ID_FIELDS[family]]
+            self.created[family].add(created)
+            if state:
+                state.created[family].append(created)
+
+    async def send(self, session, entry, scheduled, previous=None):
+        """Send one entry once the actor's previous request (a task, or None) has finished"""
+        state = self.actors.get(entry.get("actor"))
+        if previous:
+            await previous
+        lag = time.perf_counter() - scheduled
+        try:
+            method, path, kwargs = self.build(entry, state)
+        except Skip as reason:
+            self.skipped[str(reason)] += 1
+            return
+        start = time.perf_counter()
+        try:
+            async with session.request(method, f"{self.base_url}/{path}", **kwargs) as response:
+                body = await response.read()
+                status = response.status
+            if status == 200 and method in ("POST", "PUT"):
+                data = json.loads(body) if body else {}
+                if isinstance(data, dict):
+                    self.remember(method, path, state, data)
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except (aiohttp.ClientError, ValueError) as e:
+            status = type(e).__name__
+        self.results.append({
+            "route": entry["route"],
+            "status": status,
+            "journal_status": entry.get("status"),
+            "journal_ms": entry.get("durationMs"),
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "lag_ms": lag * 1000,
+        })
+
+    async def run(self):
+        connector = aiohttp.TCPConnector(limit=self.args.connections)
+        timeout = aiohttp.ClientTimeout(total=self.args.timeout)
+        tasks = []
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            first = self.entries[0]["ts"]
+            start = time.perf_counter()
+            for index, entry in enumerate(self.entries):
+                scheduled = start + (entry["ts"] - first) / 1000 / self.args.speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # Read the actor's previous task before creating this one, which must not await itself
+                state = self.actors.get(entry.get("actor"))
+                previous = state.previous if state else None
+                task = asyncio.create_task(self.send(session, entry, scheduled, previous))
+                if state:
+                    state.previous = task
+                tasks.append(task)
+                if index and index % 10_000 == 0:
+                    print(f"  {index}/{len(self.entries)} dispatched, {time.perf_counter() - start:.0f}s")
+            await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    def report(self, elapsed):
+        routes = defaultdict(list)
+        for result in self.results:
+            routes[result["route"]].append(result)
+        rows = []
+        for route, results in sorted(routes.items(), key=lambda item: -len(item[1])):
+            latencies = [r["latency_ms"] for r in results]
+            journal = [r["journal_ms"] for r in results if r["journal_ms"] is not None]
+            rows.append({
+                "route": route,
+                "requests": len(results),
+                "errors": sum(1 for r in results if not isinstance(r["status"], int) or r["status"] >= 500),
+                "status_changed": sum(1 for r in results if r["status"] != r["journal_status"]),
+                "journal_p50_ms": round(percentile(journal, 50), 1) if journal else None,
+                "journal_p95_ms": round(percentile(journal, 95), 1) if journal else None,
+                "p50_ms": round(percentile(latencies, 50), 1),
+                "p95_ms": round(percentile(latencies, 95), 1),
+            })
+        lags = [r["lag_ms"] for r in self.results]
+        return {
+            "tag": self.tag,
+            "speed": self.args.speed,
+            "entries": len(self.entries),
+            "sent": len(self.results),
+            "skipped": dict(self.skipped),
+            "elapsed_s": round(elapsed, 1),
+            "journal_span_s": round((self.entries[-1]["ts"] - self.entries[0]["ts"]) / 1000, 1),
+            "lag_p95_ms": round(percentile(lags, 95), 1) if lags else 0.0,
+            "routes": rows,
+        }
+
+    def cleanup(self):
+        user_ids = [student["userId"] for student in self.students]
+        self.db.testAttempts.delete_many({"studentId": {"$in": user_ids}})
+        self.db.testSeries.delete_many({"testSeriesId": {"$in": list(self.created["test-series"])}})
+        self.db.categories.delete_many({"categoryId": {"$in": list(self.created["categories"])}})
+        self.db.users.delete_many({"$or": [
+            {"seedTag": self.tag},
+            {"userId": {"$in": list(self.created["users"])}},
+            {"username": {"$regex": f"^{self.tag}-"}},  # registered during the replay
+        ]})
+
+
+def print_report(report):
+    print(f"\n{'route':<40} {'requests':>9} {'errors':>7} {'changed':>8} {'journal p50/p95':>17} {'replay p50/p95':>17}")
+    for row in report["routes"]:
+        journal = "-" if row["journal_p50_ms"] is None else f"{row['journal_p50_ms']:g}/{row['journal_p95_ms']:g}"
+        print(f"{row['route']:<40} {row['requests']:>9} {row['errors']:>7} {row['status_changed']:>8} "
+              f"{journal:>17} {row['p50_ms']:g}/{row['p95_ms']:g}".rstrip())
+    print(f"\nReplayed {report['sent']}/{report['entries']} requests spanning {report['journal_span_s']}s "
+          f"in {report['elapsed_s']}s ({report['speed']:g}x)")
+    for reason, count in sorted(report["skipped"].items(), key=lambda item: -item[1]):
+        print(f"  skipped {count}: {reason}")
+
+
+def run_replay(args, base_url):
+    if args.speed <= 0:
+        raise SystemExit("❌ --speed must be positive")
+    entries, malformed = load_journal(args.journal, args.start, args.duration)
+    if malformed:
+        print(f"⚠️  Ignored {malformed} malformed journal lines")
+    if not entries:
+        raise SystemExit(f"❌ No journal entries to replay in {args.journal}")
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    replay = Replay(args, base_url, client[os.environ.get("DB_NAME", "test_series_db")], entries)
+    replay.setup()
+    print(f"Replaying {len(entries)} requests from {len(replay.actors)} actors at {args.speed:g}x (tag {replay.tag})...")
+    try:
+        elapsed = asyncio.run(replay.run())
+    finally:
+        if not args.keep:
+            replay.cleanup()
+
+    report = replay.report(elapsed)
+    print_report(report)
+    if report["lag_p95_ms"] > 100:
+        print(f"⚠️  Dispatch fell {report['lag_p95_ms']}ms behind schedule (p95); the replay is not keeping "
+              "the original arrival times - lower --speed or raise --connections")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    errors = sum(row["errors"] for row in report["routes"])
+    if report["sent"] and errors / report["sent"] > args.max_error_rate:
+        print(f"❌ {errors} server or transport errors ({errors / report['sent']:.1%})")
+        return 1
+    return 0
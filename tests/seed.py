@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Deterministic bulk data seeder.
+
+Generates a realistic dataset - admin, teachers, students, categories, test series
+with question banks and per-student attempt histories - and loads it with
+insert_many in batches. Questions are written the way the API stores them: once
+per owner in the questions bank, referenced by stubs from test series, and
+snapshotted into testVersions / testVersionChunks that attempts are pinned to. The same --seed and --scale always produce the same
+documents (ids, timestamps, answers and even password hashes), so benchmark runs
+are comparable. Password hashes are computed once per role and reused.
+
+Accounts (passwords match setup-sample-data.js / create-admin.js conventions):
+    admin / admin123
+    teacher0..N / teacher123
+    student0..N / student123
+
+At --scale 1.0: 5 categories, 100 teachers, 10k students, 500 test series and
+about 50k attempts. Refuses to touch a non-empty database unless --drop is given.
+
+Requires pymongo and bcrypt.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python -m tests.seed --scale 1 --seed 7 --drop
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import bcrypt
+from pymongo import MongoClient
+
+BASE_COUNTS = {"teachers": 100, "students": 10_000, "tests": 500}
+ATTEMPTS_PER_STUDENT = 5  # mean; actual count per student varies
+BATCH_SIZE = 5_000
+COLLECTIONS = ["users", "categories", "questions", "testSeries", "testVersions", "testVersionChunks", "testAttempts"]
+QUESTION_CHUNK_SIZE = 100  # lib/test-versions.js default
+EPOCH = datetime(2024, 1, 1)  # fixed so timestamps are reproducible
+
+PASSWORDS = {"admin": "admin123", "teacher": "teacher123", "student": "student123"}
+
+CATEGORIES = [
+    ("JEE-Mains", "Joint Entrance Examination - Main for engineering admissions", ["Physics", "Chemistry", "Mathematics"]),
+    ("CUET PG", "Common University Entrance Test - Post Graduate", ["General Aptitude", "English", "Economics"]),
+    ("NEET", "National Eligibility cum Entrance Test for medical courses", ["Biology", "Physics", "Chemistry"]),
+    ("GATE", "Graduate Aptitude Test in Engineering", ["Engineering Mathematics", "Computer Science", "General Aptitude"]),
+    ("CAT", "Common Admission Test for MBA programs", ["Quantitative Aptitude", "Logical Reasoning", "Verbal Ability"]),
+]
+
+TOPICS = {
+    "Physics": ["kinematics", "Newton's laws", "thermodynamics", "optics", "electrostatics", "magnetism"],
+    "Chemistry": ["chemical bonding", "thermochemistry", "organic reactions", "electrochemistry", "periodic trends"],
+    "Mathematics": ["calculus", "matrices", "probability", "coordinate geometry", "complex numbers"],
+    "Biology": ["cell biology", "genetics", "human physiology", "ecology", "plant physiology"],
+    "General Aptitude": ["number series", "data interpretation", "ratios", "time and work"],
+    "English": ["reading comprehension", "grammar", "vocabulary", "sentence correction"],
+    "Economics": ["microeconomics", "macroeconomics", "public finance", "international trade"],
+    "Engineering Mathematics": ["linear algebra", "differential equations", "probability", "discrete mathematics"],
+    "Computer Science": ["data structures", "algorithms", "operating systems", "databases", "computer networks"],
+    "Quantitative Aptitude": ["percentages", "profit and loss", "geometry", "averages"],
+    "Logical Reasoning": ["seating arrangement", "syllogisms", "blood relations", "puzzles"],
+    "Verbal Ability": ["para jumbles", "critical reasoning", "summary questions"],
+}
+
+QUESTION_TEMPLATES = [
+    "Which of the following statements about {topic} is correct?",
+    "A standard {topic} problem: which option gives the right result?",
+    "Identify the incorrect claim regarding {topic}.",
+    "In the context of {topic}, which principle applies here?",
+    "Choose the best explanation of a key result in {topic}.",
+]
+
+FIRST_NAMES = ["Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Rohan", "Saanvi", "Arjun",
+               "Meera", "Nikhil", "Pooja", "Rahul", "Sneha", "Tanvi", "Varun", "Zara", "Kabir", "Riya"]
+LAST_NAMES = ["Sharma", "Verma", "Gupta", "Singh", "Kumar", "Patel", "Reddy", "Iyer", "Nair", "Das",
+              "Mehta", "Joshi", "Rao", "Chopra", "Bose"]
+TITLES = ["Dr.", "Prof.", "", ""]
+
+
+def deterministic_uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def deterministic_hash(password, rng, rounds):
+    """bcrypt hash with an rng-derived salt, so reseeding reproduces the same hash"""
+    raw = base64.b64encode(rng.getrandbits(128).to_bytes(16, "big")).decode()[:22]
+    salt = raw.translate(str.maketrans(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+        "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+    ))
+    return bcrypt.hashpw(password.encode(), f"$2b${rounds:02d}${salt}".encode()).decode()
+
+
+def content_hash(value):
+    """sha256 prefix of JSON.stringify(value), as lib/question-bank.js and lib/test-versions.js compute it"""
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def normalize(text):
+    return " ".join(str(text).split())
+
+
+def question_hash(question, owner_id):
+    return content_hash([owner_id, normalize(question["question"]),
+                         [normalize(option) for option in question["options"]], question["correctAnswer"]])
+
+
+def person_name(rng, title=False):
+    prefix = rng.choice(TITLES) if title else ""
+    return f"{prefix} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}".strip()
+
+
+class Seeder:
+    def __init__(self, scale, seed, rounds):
+        self.rng = random.Random(seed)
+        self.counts = {name: max(1, int(count * scale)) for name, count in BASE_COUNTS.items()}
+        self.hashes = {role: deterministic_hash(password, self.rng, rounds) for role, password in PASSWORDS.items()}
+
+    def timestamp(self, max_days):
+        return EPOCH + timedelta(minutes=self.rng.randrange(max_days * 24 * 60))
+
+    def categories(self):
+        return [
+            {
+                "categoryId": deterministic_uuid(self.rng),
+                "name": name,
+                "description": description,
+                "createdBy": "system",
+                "createdAt": EPOCH,
+            }
+            for name, description, _ in CATEGORIES
+        ]
+
+    def users(self):
+        admin = {
+            "userId": deterministic_uuid(self.rng), "username": "admin", "password": self.hashes["admin"],
+            "name": "System Administrator", "email": "admin@example.com", "role": "admin", "createdAt": EPOCH,
+        }
+        teachers = []
+        for i in range(self.counts["teachers"]):
+            teachers.append({
+                "userId": deterministic_uuid(self.rng),
+                "username": f"teacher{i}",
+                "password": self.hashes["teacher"],
+                "name": person_name(self.rng, title=True),
+                "email": f"teacher{i}@example.com",
+                "phone": f"9{self.rng.randrange(10 ** 9):09d}",
+                "role": "teacher",
+                "photo": None,
+                "rating": round(self.rng.uniform(3.5, 5.0), 1),
+                "experience": f"{self.rng.randrange(2, 25)} years",
+                "createdAt": self.timestamp(30),
+            })
+        students = []
+        for i in range(self.counts["students"]):
+            students.append({
+                "userId": deterministic_uuid(self.rng),
+                "username": f"student{i}",
+                "password": self.hashes["student"],
+                "name": person_name(self.rng),
+                "email": f"student{i}@example.com",
+                "phone": None,
+                "role": "student",
+                "selectedCategory": None,
+                "selectedTeacher": None,
+                "photo": None,
+                "createdAt": self.timestamp(180),
+            })
+        return admin, teachers, students
+
+    def question(self, subject):
+        topic = self.rng.choice(TOPICS[subject])
+        correct = self.rng.randrange(4)
+        return {
+            "question": self.rng.choice(QUESTION_TEMPLATES).format(topic=topic),
+            "options": [f"{topic.capitalize()} option {chr(65 + i)}" for i in range(4)],
+            "correctAnswer": correct,
+            "explanation": f"Option {chr(65 + correct)} follows from the standard treatment of {topic}.",
+        }
+
+    def test_series(self, categories, teachers):
+        """Test series with their bank questions and versions; returns (tests, questions, versions, chunks)
+
+        Each test's full questions are kept on self.test_questions for the attempts.
+        """
+        tests, bank, versions, chunks = [], {}, [], []
+        self.test_questions = {}
+        for i in range(self.counts["tests"]):
+            category_index = self.rng.randrange(len(CATEGORIES))
+            subject = self.rng.choice(CATEGORIES[category_index][2])
+            created = self.timestamp(120)
+            test_series_id = deterministic_uuid(self.rng)
+            owner = self.rng.choice(teachers)["userId"]
+
+            # Repeats within a test are kept once, as storeQuestions does
+            questions = {}
+            for _ in range(self.rng.randrange(10, 51)):
+                question = self.question(subject)
+                question_id = question_hash(question, owner)
+                questions.setdefault(question_id, {"questionId": question_id, **question})
+                bank.setdefault(question_id, {
+                    "questionId": question_id, **question, "createdBy": owner, "createdAt": created,
+                })
+            stubs = [{"questionId": q["questionId"], "question": q["question"]} for q in questions.values()]
+            version_id = content_hash([test_series_id, stubs])
+
+            versions.append({
+                "versionId": version_id, "testSeriesId": test_series_id, "questionCount": len(stubs),
+                "chunkSize": QUESTION_CHUNK_SIZE, "createdAt": created,
+            })
+            for index in range(0, len(stubs), QUESTION_CHUNK_SIZE):
+                chunks.append({
+                    "versionId": version_id, "index": index // QUESTION_CHUNK_SIZE,
+                    "questions": stubs[index:index + QUESTION_CHUNK_SIZE],
+                })
+            self.test_questions[test_series_id] = list(questions.values())
+            tests.append({
+                "testSeriesId": test_series_id,
+                "title": f"{CATEGORIES[category_index][0]} {subject} Mock Test {i + 1}",
+                "description": f"Practice test for {CATEGORIES[category_index][0]} {subject}",
+                "category": categories[category_index]["categoryId"],
+                "duration": self.rng.choice([30, 60, 90, 180]),
+                "questions": stubs,
+                "currentVersionId": version_id,
+                "status": "published" if self.rng.random() < 0.9 else "draft",
+                "createdBy": owner,
+                "createdAt": created,
+                "updatedAt": created,
+            })
+        return tests, list(bank.values()), versions, chunks
+
+    def attempts(self, students, tests):
+        """Attempt histories pinned to each test's version; skill per student drives accuracy.
+
+        Results for versioned attempts are rebuilt from the version when read, so none are stored.
+        """
+        published = [test for test in tests if test["status"] == "published"]
+        for student in students:
+            skill = self.rng.uniform(0.3, 0.95)
+            count = min(len(published), int(self.rng.expovariate(1 / ATTEMPTS_PER_STUDENT)))
+            for test in self.rng.sample(published, count):
+                start = max(test["createdAt"], student["createdAt"]) + timedelta(days=self.rng.randrange(1, 60))
+                completed = self.rng.random() < 0.95
+                questions = self.test_questions[test["testSeriesId"]]
+                answers = {}
+                for question in questions:
+                    if self.rng.random() < 0.1:
+                        continue  # skipped
+                    right = self.rng.random() < skill
+                    answer = question["correctAnswer"] if right else (question["correctAnswer"] + self.rng.randrange(1, 4)) % 4
+                    answers[question["questionId"]] = answer
+                score = sum(1 for q in questions if answers.get(q["questionId"]) == q["correctAnswer"])
+                attempt = {
+                    "attemptId": deterministic_uuid(self.rng),
+                    "testSeriesId": test["testSeriesId"],
+                    "versionId": test["currentVersionId"],
+                    "studentId": student["userId"],
+                    "studentName": student["name"],
+                    "startTime": start,
+                    "endTime": start + timedelta(minutes=test["duration"]),
+                    "status": "completed" if completed else "in_progress",
+                    "answers": answers,
+                    "score": score if completed else 0,
+                    "totalQuestions": len(questions),
+                    "createdAt": start,
+                }
+                if completed:
+                    attempt["completedAt"] = start + timedelta(minutes=self.rng.randrange(5, test["duration"] + 1))
+                yield attempt
+
+
+def insert_batches(collection, documents, batch_size=BATCH_SIZE):
+    """insert_many in fixed-size batches; returns the number of documents inserted"""
+    total = 0
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+
+def seed_database(db, scale=1.0, seed=42, rounds=12, drop=False):
+    """Load the dataset into db; returns {collection: (documents, seconds)}"""
+    non_empty = [name for name in COLLECTIONS if db[name].estimated_document_count()]
+    if non_empty and not drop:
+        raise RuntimeError(f"Refusing to seed: {', '.join(non_empty)} not empty (pass --drop to replace)")
+    for name in COLLECTIONS:
+        db[name].drop()
+
+    seeder = Seeder(scale, seed, rounds)
+    report = {}
+
+    def load(name, documents):
+        start = time.perf_counter()
+        count = insert_batches(db[name], documents)
+        report[name] = (count, round(time.perf_counter() - start, 2))
+
+    categories = seeder.categories()
+    admin, teachers, students = seeder.users()
+    tests, questions, versions, chunks = seeder.test_series(categories, teachers)
+
+    load("categories", categories)
+    load("users", [admin, *teachers, *students])
+    load("questions", questions)
+    load("testSeries", tests)
+    load("testVersions", versions)
+    load("testVersionChunks", chunks)
+    load("testAttempts", seeder.attempts(students, tests))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="cost factor, matching the API's bcrypt.hash(…, 12)")
+    parser.add_argument("--drop", action="store_true", help="drop existing app collections first")
+    args = parser.parse_args()
+
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("DB_NAME", "test_series_db")]
+
+    start = time.perf_counter()
+    try:
+        report = seed_database(db, args.scale, args.seed, args.bcrypt_rounds, args.drop)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    for name, (count, seconds) in report.items():
+        print(f"✅ {name}: {count} documents in {seconds}s")
+    print(f"Seeded {db.name} in {time.perf_counter() - start:.1f}s (scale {args.scale}, seed {args.seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Soak mode for the performance harness (python -m tests.harness soak).
+
+Drives a weighted mix of traffic - catalogue and search reads, results, teacher
+listings, full exams and teacher photo uploads (stored inline as base64) - for
+hours, and every --interval samples:
+
+    the server process   RSS and peak RSS from /proc/<pid>/status, open fds
+    the V8 heap          Runtime.getHeapUsage over the inspector (--inspector-port),
+                         optionally after a forced GC (--gc) so only live objects count
+    MongoDB              serverStatus connections: current and totalCreated
+    the traffic          requests, errors and p50/p95 latency in the window
+
+At the end it fits a linear trend to each series after the warmup and flags
+leaks and drift: steady RSS/heap/fd growth, a growing or churning connection
+count (e.g. pools re-created by a per-request client.connect()), and p95
+latency creeping up. Exits 1 when anything is flagged.
+
+Requires aiohttp and pymongo; /proc sampling needs the server on this host.
+"""
+
+import asyncio
+import json
+import os
+import random
+import signal
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from contextlib import AsyncExitStack
+
+import aiohttp
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from tests.api_client import ApiClient
+from tests.inspector import Inspector, InspectorError
+from tests.load_exam_flow import percentile
+
+MB = 1024 * 1024
+
+# action: relative weight
+TRAFFIC_MIX = {
+    "catalogue": 30,
+    "search": 10,
+    "results": 10,
+    "teachers": 10,
+    "profile": 10,
+    "exam": 25,
+    "photo": 5,
+}
+SEARCH_TERMS = ["question", "soak", "kinematics", "probability", "grammar"]
+
+
+def parse_duration(value):
+    """Seconds from "90", "45s", "30m" or "3h" """
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def find_server_pid():
+    """PID of the Next.js server on this host (the next-server worker when there is one)"""
+    candidates = []
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                argv = f.read().decode(errors="replace").split("\0")
+        except OSError:
+            continue
+        if argv[0].startswith("next-server"):
+            candidates.append((0, int(pid)))
+        elif any(os.path.basename(arg) == "next" and command in ("start", "dev")
+                 for arg, command in zip(argv, argv[1:])):
+            candidates.append((1, int(pid)))
+    return min(candidates)[1] if candidates else None
+
+
+def read_process(pid):
+    """RSS, peak RSS and open file descriptors of a process"""
+    sample = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                sample["rss" if key == "VmRSS" else "peak_rss"] = int(value.split()[0]) * 1024
+    sample["fds"] = len(os.listdir(f"/proc/{pid}/fd"))
+    return sample
+
+
+def linear_trend(points):
+    """Least-squares slope (per hour) and r² of (seconds, value) points"""
+    if len(points) < 3:
+        return 0.0, 0.0
+    xs, ys = zip(*points)
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    if not sxx:
+        return 0.0, 0.0
+    slope = sxy / sxx
+    r2 = sxy * sxy / (sxx * syy) if syy else 0.0
+    return slope * 3600, r2
+
+
+class SoakRun:
+    def __init__(self, args, base_url):
+        self.args = args
+        self.base_url = base_url
+        self.rng = random.Random(args.seed)
+        self.stop = asyncio.Event()
+        self.window = defaultdict(list)  # action -> latencies since the last sample
+        self.errors = defaultdict(int)
+        self.totals = defaultdict(int)
+        self.samples = []
+        self.tests = []
+        self.test_lock = asyncio.Lock()
+        self.exams = 0
+
+    def setup(self):
+        """Register a teacher and a pool of students for this run"""
+        api = ApiClient(self.base_url)
+        self.run_id = run_id = uuid.uuid4().hex[:8]
+
+        def register(role, index):
+            response = api.post("auth/register", json={
+                "username": f"soak_{run_id}_{role}{index}",
+                "password": f"{role}123",
+                "name": f"Soak {role.title()} {index}",
+                "role": role,
+                "email": f"soak.{run_id}.{role}{index}@example.com",
+            })
+            response.raise_for_status()
+            return response.json()["token"]
+
+        self.teacher_token = register("teacher", 0)
+        self.student_tokens = [register("student", i) for i in range(self.args.students)]
+
+    async def timed(self, session, action, method, path, **kwargs):
+        """One request; latency and errors are attributed to the action"""
+        start = time.perf_counter()
+        try:
+            async with session.request(method, f"{self.base_url}/{path}", **kwargs) as response:
+                body = await response.read()
+                ok = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            body, ok = None, False
+        self.window[action].append((time.perf_counter() - start) * 1000)
+        self.totals[action] += 1
+        if not ok:
+            self.errors[action] += 1
+            return None
+        return json.loads(body) if body else {}
+
+    async def test_for_exam(self, session, exam):
+        """Each student sits each test once, so a new test series is created per pass over the pool"""
+        index = exam // len(self.student_tokens)
+        async with self.test_lock:
+            while len(self.tests) <= index:
+                created = await self.timed(
+                    session, "create_test", "POST", "test-series", headers=self.auth(self.teacher_token), json={
+                        "title": f"Soak test {self.run_id} #{len(self.tests)}",
+                        "description": "Generated by the soak harness",
+                        "category": "soak",
+                        "duration": 180,
+                        "questions": [
+                            {"questionId": str(uuid.uuid4()), "question": f"Soak question {q + 1}?",
+                             "options": ["A", "B", "C", "D"], "correctAnswer": q % 4, "explanation": ""}
+                            for q in range(self.args.questions)
+                        ],
+                    })
+                if created is None:
+                    return None
+                self.tests.append(created)
+        return self.tests[index]
+
+    @staticmethod
+    def auth(token):
+        return {"Authorization": f"Bearer {token}"}
+
+    async def exam(self, session):
+        exam, self.exams = self.exams, self.exams + 1
+        token = self.student_tokens[exam % len(self.student_tokens)]
+        test = await self.test_for_exam(session, exam)
+        if test is None:
+            return
+        attempt = await self.timed(session, "start", "POST", "test-attempts", headers=self.auth(token),
+                                   json={"testSeriesId": test["testSeriesId"]})
+        if not attempt:
+            return
+        path = f"test-attempts/{attempt['attemptId']}"
+        for question in test["questions"]:
+            await self.timed(session, "submit_answer", "PUT", path, headers=self.auth(token), json={
+                "questionId": question["questionId"], "answer": self.rng.randrange(4), "action": "submit_answer"})
+        await self.timed(session, "complete", "PUT", path, headers=self.auth(token), json={"action": "complete_test"})
+
+    async def photo(self, session):
+        form = aiohttp.FormData()
+        form.add_field("photo", os.urandom(self.args.photo_kb * 1024), filename="soak.png", content_type="image/png")
+        await self.timed(session, "photo", "POST", "upload/photo", headers=self.auth(self.teacher_token), data=form)
+
+    async def act(self, session, action):
+        student = self.auth(self.rng.choice(self.student_tokens))
+        if action == "catalogue":
+            await self.timed(session, action, "GET", "test-series", headers=student)
+        elif action == "search":
+            await self.timed(session, action, "GET", "test-series/search", headers=student,
+                             params={"q": self.rng.choice(SEARCH_TERMS)})
+        elif action == "results":
+            await self.timed(session, action, "GET", "test-attempts", headers=self.auth(self.teacher_token))
+        elif action == "teachers":
+            await self.timed(session, action, "GET", "teachers")
+        elif action == "profile":
+            await self.timed(session, action, "GET", "auth/profile", headers=student)
+        elif action == "exam":
+            await self.exam(session)
+        elif action == "photo":
+            await self.photo(session)
+
+    async def worker(self, session):
+        actions, weights = zip(*TRAFFIC_MIX.items())
+        while not self.stop.is_set():
+            await self.act(session, self.rng.choices(actions, weights)[0])
+            if self.args.think_time:
+                await asyncio.sleep(self.rng.uniform(0, self.args.think_time))
+
+    async def sample(self, elapsed, pid, inspector, mongo):
+        window, self.window = self.window, defaultdict(list)
+        latencies = [latency for samples in window.values() for latency in samples]
+        sample = {
+            "elapsed_s": round(elapsed, 1),
+            "requests": len(latencies),
+            "errors": sum(self.errors.values()),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+        }
+        if pid:
+            try:
+                sample.update(read_process(pid))
+            except OSError:
+                pass
+        if inspector:
+            try:
+                heap = await inspector.heap_usage(collect_garbage=self.args.gc)
+                sample.update(heap_used=heap["used"], heap_total=heap["total"])
+            except InspectorError as e:
+                print(f"⚠️  Heap sample failed: {e}")
+        if mongo:
+            try:
+                connections = (await asyncio.to_thread(mongo.admin.command, "serverStatus"))["connections"]
+                sample.update(mongo_connections=connections["current"], mongo_created=connections["totalCreated"])
+            except PyMongoError as e:
+                print(f"⚠️  serverStatus failed: {e}")
+        self.samples.append(sample)
+
+        def mb(key):
+            return f"{sample[key] / MB:.0f}" if key in sample else "-"
+
+        print(f"{sample['elapsed_s']:>8.0f} {sample['requests'] / self.args.interval:>7.1f} {sample['errors']:>7} "
+              f"{sample['p95_ms']:>8} {mb('rss'):>8} {mb('heap_used'):>8} {sample.get('fds', '-'):>6} "
+              f"{sample.get('mongo_connections', '-'):>7}")
+
+    async def run(self):
+        args = self.args
+        pid = args.pid or find_server_pid()
+        if not pid:
+            print("⚠️  Server process not found on this host; pass --pid to sample RSS and fds")
+        mongo = None if args.no_mongo else MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, self.stop.set)
+        deadline = time.monotonic() + parse_duration(args.duration)
+
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        timeout = aiohttp.ClientTimeout(total=args.timeout)
+        try:
+            async with AsyncExitStack() as stack:
+                inspector = None
+                if args.inspector_port:
+                    try:
+                        inspector = await stack.enter_async_context(Inspector(args.inspector_host, args.inspector_port))
+                    except (aiohttp.ClientError, InspectorError, OSError) as e:
+                        print(f"⚠️  Inspector unavailable ({e}); heap is not sampled")
+                session = await stack.enter_async_context(aiohttp.ClientSession(connector=connector, timeout=timeout))
+
+                print(f"Soaking for {args.duration} with {args.concurrency} workers (server pid {pid or '?'}), "
+                      "Ctrl-C to stop early")
+                print(f"{'elapsed':>8} {'req/s':>7} {'errors':>7} {'p95 ms':>8} {'RSS MB':>8} {'heap MB':>8} "
+                      f"{'fds':>6} {'mongo':>7}")
+                started = time.monotonic()
+                workers = [asyncio.create_task(self.worker(session)) for _ in range(args.concurrency)]
+                while not self.stop.is_set() and time.monotonic() < deadline:
+                    try:
+                        await asyncio.wait_for(self.stop.wait(), min(args.interval, max(0, deadline - time.monotonic())))
+                    except asyncio.TimeoutError:
+                        pass
+                    await self.sample(time.monotonic() - started, pid, inspector, mongo)
+                self.stop.set()
+                await asyncio.gather(*workers)
+        finally:
+            if mongo:
+                mongo.close()
+        return self.report()
+
+    def report(self):
+        args = self.args
+        skip = int(len(self.samples) * args.warmup_fraction)
+        steady = self.samples[skip:]
+
+        trends, flags = {}, []
+        checks = [
+            ("rss", MB, args.rss_leak_mb_per_hour, "RSS grows {:.1f} MB/h"),
+            ("heap_used", MB, args.heap_leak_mb_per_hour, "V8 heap grows {:.1f} MB/h"),
+            ("fds", 1, args.fd_drift_per_hour, "open fds grow {:.1f}/h"),
+            ("mongo_connections", 1, args.connection_drift_per_hour, "Mongo connections grow {:.1f}/h"),
+        ]
+        for key, unit, limit, message in checks:
+            points = [(s["elapsed_s"], s[key] / unit) for s in steady if key in s]
+            if len(points) < 3:
+                continue
+            slope, r2 = linear_trend(points)
+            trends[key] = {"per_hour": round(slope, 2), "r2": round(r2, 3)}
+            if slope > limit and r2 >= args.min_r2:
+                flags.append(f"{message.format(slope)} (r²={r2:.2f}, limit {limit:g})")
+
+        created = [(s["elapsed_s"], s["mongo_created"]) for s in steady if "mongo_created" in s]
+        if len(created) >= 2 and created[-1][0] > created[0][0]:
+            per_minute = (created[-1][1] - created[0][1]) / (created[-1][0] - created[0][0]) * 60
+            trends["mongo_connections_created"] = {"per_minute": round(per_minute, 2)}
+            if per_minute > args.connection_churn_per_minute:
+                flags.append(f"Mongo opens {per_minute:.1f} new connections/min (limit {args.connection_churn_per_minute:g})")
+
+        tail = max(1, len(steady) // 10)
+        if len(steady) >= 2 * tail:
+            first = statistics.median(s["p95_ms"] for s in steady[:tail])
+            last = statistics.median(s["p95_ms"] for s in steady[-tail:])
+            trends["p95_ms"] = {"first": first, "last": last}
+            if first and last > first * (1 + args.latency_drift):
+                flags.append(f"p95 latency drifted {first:.0f}ms -> {last:.0f}ms")
+
+        return {
+            "config": vars(args),
+            "totals": dict(self.totals),
+            "errors": dict(self.errors),
+            "samples": self.samples,
+            "trends": trends,
+            "flags": flags,
+        }
+
+
+def run_soak(args, base_url):
+    soak = SoakRun(args, base_url)
+    soak.setup()
+    report = asyncio.run(soak.run())
+
+    print(f"\nTrends after {args.warmup_fraction:.0%} warmup: {json.dumps(report['trends'])}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+    if report["flags"]:
+        for flag in report["flags"]:
+            print(f"❌ {flag}")
+        return 1
+    print("✅ No leaks or drift detected")
+    return 0
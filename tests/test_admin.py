@@ -0,0 +1,250 @@
+"""Categories, teachers, user management, analytics, uploads and query metrics"""
+
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.conftest import auth
+
+# Smallest valid PNG (1x1 transparent pixel)
+PNG_PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+@pytest.fixture(scope="module")
+def category(api, admin_token, namespace):
+    response = api.post("categories", json={"name": f"{namespace} category", "description": "pytest"},
+                        headers=auth(admin_token))
+    assert response.status_code == 200, response.text
+    category = response.json()
+    yield category
+    api.delete(f"categories/{category['categoryId']}", headers=auth(admin_token))
+
+
+def test_categories_are_public(api, category):
+    response = api.get("categories")
+    assert response.status_code == 200
+    assert category["categoryId"] in {c["categoryId"] for c in response.json()}
+
+
+def test_only_admin_creates_and_deletes_categories(api, teacher, category):
+    assert api.post("categories", json={"name": "Nope"}, headers=auth(teacher["token"])).status_code == 403
+    assert api.delete(f"categories/{category['categoryId']}", headers=auth(teacher["token"])).status_code == 403
+
+
+def test_categories_with_teachers(api, make_test_series, teacher, category):
+    make_test_series(teacher, category=category["categoryId"])
+    response = api.get("categories", params={"withTeachers": "true"})
+    assert response.status_code == 200
+    entry = next(c for c in response.json() if c["categoryId"] == category["categoryId"])
+    assert [t["userId"] for t in entry["teachers"]] == [teacher["userId"]]
+
+
+def test_teachers_listing_hides_private_fields(api, teacher):
+    teachers = api.get("teachers").json()
+    entry = next(t for t in teachers if t["userId"] == teacher["userId"])
+    assert "password" not in entry
+    assert "resetToken" not in entry
+
+
+def test_teachers_sparse_fieldset_respects_role(api, admin_token):
+    assert api.get("teachers", params={"fields": "userId,email"}).status_code == 400
+    response = api.get("teachers", params={"fields": "userId,email"}, headers=auth(admin_token))
+    assert response.status_code == 200
+    assert all(set(t) <= {"userId", "email"} for t in response.json())
+
+
+def test_users_admin_only(api, teacher, student):
+    assert api.get("users", headers=auth(teacher["token"])).status_code == 403
+    assert api.get("users", headers=auth(student["token"])).status_code == 403
+
+
+def test_users_listing_hides_passwords(api, admin_token, student):
+    response = api.get("users", headers=auth(admin_token))
+    assert response.status_code == 200
+    users = response.json()
+    assert student["userId"] in {u["userId"] for u in users}
+    assert not any("password" in u for u in users)
+
+
+def test_users_sparse_fieldset(api, admin_token):
+    response = api.get("users", params={"fields": "userId,role"}, headers=auth(admin_token))
+    assert response.status_code == 200
+    assert all(set(u) <= {"userId", "role"} for u in response.json())
+    assert api.get("users", params={"fields": "password"}, headers=auth(admin_token)).status_code == 400
+
+
+def test_admin_creates_admin_user(api, admin_token, namespace):
+    username = f"{namespace}_admin_{uuid.uuid4().hex[:6]}"
+    response = api.post("users", headers=auth(admin_token), json={
+        "username": username, "password": "admin456", "name": "Second Admin",
+        "email": f"{username}@example.com",
+    })
+    assert response.status_code == 200
+    created = response.json()
+    assert created["role"] == "admin"
+    assert "password" not in created
+    assert api.login(username, "admin456")
+
+    duplicate = api.post("users", headers=auth(admin_token),
+                         json={"username": username, "password": "x", "name": "Again"})
+    assert duplicate.status_code == 400
+
+
+def test_concurrent_admin_creations_create_one_user(api, admin_token, namespace):
+    username = f"{namespace}_admin_race_{uuid.uuid4().hex[:6]}"
+
+    def create(i):
+        return api.post("users", headers=auth(admin_token), json={
+            "username": username, "password": "admin456", "name": f"Race {i}",
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(create, range(8)))
+    assert sorted(statuses) == [200] + [400] * 7
+
+
+def import_roster(api, admin_token, body, content_type):
+    return api.post("users/import", data=body.encode(),
+                    headers={**auth(admin_token), "Content-Type": content_type})
+
+
+def wait_for_import(api, admin_token, import_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = api.get(f"users/import/{import_id}", headers=auth(admin_token))
+        assert response.status_code == 200, response.text
+        job = response.json()
+        if job["status"] not in ("receiving", "processing") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.2)
+
+
+def test_roster_import_csv(api, admin_token, make_user, namespace):
+    existing = make_user("student")
+    usernames = [f"{namespace}_roster{i}" for i in range(5)]
+    csv = "Username,Name,Password,Email\n" + "".join(
+        f'{username},"Roster, Student {i}",roster{i}pass,{username}@example.com\n'
+        for i, username in enumerate(usernames)
+    ) + f"{existing['username']},Again,whatever1\n{usernames[0]},Twice,whatever1\n{namespace}_nopw,No Password,\n"
+
+    response = import_roster(api, admin_token, csv, "text/csv")
+    assert response.status_code == 202, response.text
+    job = wait_for_import(api, admin_token, response.json()["importId"])
+    assert job["status"] == "completed"
+    assert job["counts"] == {"received": 8, "processed": 8, "inserted": 5, "exists": 1,
+                             "invalid": 1, "duplicate": 1, "failed": 0}
+    assert {error["line"] for error in job["errors"]} == {7, 8, 9}
+
+    assert api.login(usernames[3], "roster3pass")
+    users = api.get("users", params={"fields": "username,name,role"}, headers=auth(admin_token)).json()
+    imported = next(user for user in users if user["username"] == usernames[1])
+    assert imported == {"username": usernames[1], "name": "Roster, Student 1", "role": "student"}
+
+
+def test_roster_import_ndjson(api, admin_token, namespace):
+    rows = [{"username": f"{namespace}_nd{i}", "name": f"NDJSON {i}", "password": "ndjson-pass"} for i in range(3)]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+    response = import_roster(api, admin_token, body, "application/x-ndjson")
+    assert response.status_code == 202, response.text
+    job = wait_for_import(api, admin_token, response.json()["importId"])
+    assert job["counts"]["inserted"] == 3
+    assert job["errors"] == [{"line": 4, "username": None, "reason": "Invalid JSON"}]
+
+
+def test_roster_import_validation(api, admin_token, teacher):
+    assert import_roster(api, teacher["token"], "username,name,password\n", "text/csv").status_code == 403
+    assert import_roster(api, admin_token, "[]", "application/json").status_code == 415
+    response = import_roster(api, admin_token, "user,fullname\nx,y\n", "text/csv")
+    assert response.status_code == 400
+    assert "username" in response.json()["error"]
+    assert api.get("users/import/does-not-exist", headers=auth(admin_token)).status_code == 404
+
+
+def test_analytics_for_admin(api, admin_token):
+    response = api.get("analytics", headers=auth(admin_token))
+    assert response.status_code == 200
+    data = response.json()
+    for field in ("totalUsers", "totalTestSeries", "totalAttempts", "usersByRole", "attemptsByStatus"):
+        assert field in data
+
+
+def test_analytics_for_teacher(api, make_user, make_test_series):
+    teacher = make_user("teacher")
+    make_test_series(teacher)
+    response = api.get("analytics", headers=auth(teacher["token"]))
+    assert response.status_code == 200
+    assert response.json()["totalTestSeries"] == 1
+    assert response.json()["totalAttempts"] == 0
+
+
+def test_analytics_forbidden_for_students(api, student):
+    assert api.get("analytics", headers=auth(student["token"])).status_code == 403
+
+
+def test_photo_upload(api, make_user):
+    teacher = make_user("teacher")
+    response = api.post("upload/photo", headers=auth(teacher["token"]),
+                        files={"photo": ("pixel.png", PNG_PIXEL, "image/png")})
+    assert response.status_code == 200
+    assert response.json()["photoUrl"].startswith("data:image/png;base64,")
+    assert api.get("auth/profile", headers=auth(teacher["token"])).json()["photo"] == response.json()["photoUrl"]
+
+
+def test_photo_upload_validation(api, teacher, student):
+    files = {"photo": ("notes.txt", b"hello", "text/plain")}
+    assert api.post("upload/photo", headers=auth(teacher["token"]), files=files).status_code == 400
+    assert api.post("upload/photo", headers=auth(student["token"]), files=files).status_code == 403
+
+
+def test_csv_upload_replaces_questions(api, make_test_series, teacher):
+    test = make_test_series(teacher)
+    csv = (
+        "question,option1,option2,option3,option4,correct,explanation\n"
+        "What is 2+2?,3,4,5,6,2,Basic addition\n"
+        "Capital of France?,Berlin,Madrid,Paris,Rome,3,Paris is the capital\n"
+    )
+    response = api.post("upload/csv", headers=auth(teacher["token"]),
+                        data={"testSeriesId": test["testSeriesId"]},
+                        files={"csv": ("questions.csv", csv.encode(), "text/csv")})
+    assert response.status_code == 200
+    assert response.json()["questionsCount"] == 2
+
+    tests = api.get("test-series", headers=auth(teacher["token"])).json()
+    questions = next(t for t in tests if t["testSeriesId"] == test["testSeriesId"])["questions"]
+    assert [q["correctAnswer"] for q in questions] == [1, 2]
+
+
+def test_csv_upload_requires_questions(api, make_test_series, teacher):
+    test = make_test_series(teacher)
+    response = api.post("upload/csv", headers=auth(teacher["token"]),
+                        data={"testSeriesId": test["testSeriesId"]},
+                        files={"csv": ("empty.csv", b"question,a,b,c,d,correct,explanation\n", "text/csv")})
+    assert response.status_code == 400
+
+
+def test_query_metrics_admin_only(api, admin_token, student):
+    assert api.get("metrics/queries", headers=auth(student["token"])).status_code == 403
+    response = api.get("metrics/queries", headers=auth(admin_token))
+    assert response.status_code == 200
+    data = response.json()
+    assert {"slowQueryThresholdMs", "shapes", "routes"} <= set(data)
+
+
+def test_responses_report_query_count(api, student):
+    response = api.get("auth/profile", headers=auth(student["token"]))
+    assert int(response.headers["X-Query-Count"]) >= 1
+    assert float(response.headers["X-Query-Time"]) >= 0
+
+
+def test_streamed_listing_query_count_is_final(api, admin_token):
+    response = api.get("test-series", headers=auth(admin_token))
+    if "X-Query-Count-Partial" not in response.headers:
+        pytest.skip("listing small enough to be sent in one piece")
+    count = api.route_query_count(admin_token, "test-series", headers=auth(admin_token))
+    assert count >= int(response.headers["X-Query-Count"])
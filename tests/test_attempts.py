@@ -0,0 +1,216 @@
+"""The student exam flow and who can see its results"""
+
+import pytest
+
+from tests.conftest import auth, sample_questions
+
+
+def start(api, student, test):
+    response = api.post("test-attempts", json={"testSeriesId": test["testSeriesId"]}, headers=auth(student["token"]))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def answer(api, student, attempt_id, question_id, choice):
+    return api.put(f"test-attempts/{attempt_id}", headers=auth(student["token"]),
+                   json={"questionId": question_id, "answer": choice, "action": "submit_answer"})
+
+
+def complete(api, student, attempt_id, key=None):
+    headers = auth(student["token"])
+    if key:
+        headers["Idempotency-Key"] = key
+    return api.put(f"test-attempts/{attempt_id}", json={"action": "complete_test"}, headers=headers)
+
+
+@pytest.fixture(scope="module")
+def completed_attempt(api, make_test_series, make_user, teacher):
+    """A student who answered the first question right and the second wrong, then submitted"""
+    test = make_test_series(teacher)
+    student = make_user("student", phone="+91-8888888888")
+    attempt = start(api, student, test)
+    questions = test["questions"]
+    assert answer(api, student, attempt["attemptId"], questions[0]["questionId"], 0).status_code == 200
+    assert answer(api, student, attempt["attemptId"], questions[1]["questionId"], 2).status_code == 200
+    response = complete(api, student, attempt["attemptId"])
+    assert response.status_code == 200, response.text
+    return {"test": test, "student": student, "attemptId": attempt["attemptId"], "result": response.json()}
+
+
+def test_attempts_require_token(api):
+    assert api.get("test-attempts").status_code == 401
+
+
+def test_start_attempt(api, make_user, published_test):
+    student = make_user("student")
+    attempt = start(api, student, published_test)
+    assert attempt["attemptId"]
+    assert attempt["totalQuestions"] == len(published_test["questions"])
+    assert "existing" not in attempt
+
+
+def test_start_resumes_in_progress_attempt(api, make_user, published_test):
+    student = make_user("student")
+    first = start(api, student, published_test)
+    second = start(api, student, published_test)
+    assert second["existing"] is True
+    assert second["attemptId"] == first["attemptId"]
+
+
+def test_start_unknown_test_series(api, student):
+    response = api.post("test-attempts", json={"testSeriesId": "does-not-exist"}, headers=auth(student["token"]))
+    assert response.status_code == 404
+
+
+def test_answer_unknown_attempt(api, student, published_test):
+    response = answer(api, student, "does-not-exist", published_test["questions"][0]["questionId"], 0)
+    assert response.status_code == 404
+
+
+def test_completion_scores_and_explains(completed_attempt):
+    result = completed_attempt["result"]
+    assert result["score"] == 1
+    assert result["totalQuestions"] == 3
+    assert result["percentage"] == 33
+
+    details = result["detailedResults"]
+    assert [detail["isCorrect"] for detail in details] == [True, False, False]
+    assert details[1]["studentAnswer"] == 2
+    assert details[1]["correctAnswer"] == 0
+    assert "studentAnswer" not in details[2]  # unanswered
+    for detail in details:
+        assert {"questionId", "question", "options", "explanation"} <= set(detail)
+
+
+def test_completed_test_cannot_be_changed_or_retaken(api, completed_attempt):
+    student, attempt_id = completed_attempt["student"], completed_attempt["attemptId"]
+    assert complete(api, student, attempt_id).status_code == 400
+    assert answer(api, student, attempt_id, completed_attempt["test"]["questions"][2]["questionId"], 0).status_code == 400
+
+    response = api.post("test-attempts", json={"testSeriesId": completed_attempt["test"]["testSeriesId"]},
+                        headers=auth(student["token"]))
+    assert response.status_code == 400
+
+
+def test_retried_completion_replays_first_result(api, make_user, published_test):
+    student = make_user("student")
+    attempt_id = start(api, student, published_test)["attemptId"]
+    first = complete(api, student, attempt_id, key=f"complete:{attempt_id}")
+    assert first.status_code == 200, first.text
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = complete(api, student, attempt_id, key=f"complete:{attempt_id}")
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    # Without the key the retry runs again and sees the attempt already completed
+    assert complete(api, student, attempt_id).status_code == 400
+
+
+def test_idempotency_key_reused_for_different_request(api, make_user, published_test):
+    student = make_user("student")
+    attempt_id = start(api, student, published_test)["attemptId"]
+    key = f"complete:{attempt_id}"
+    assert complete(api, student, attempt_id, key=key).status_code == 200
+    response = api.put(f"test-attempts/{attempt_id}", json={"action": "complete_test", "extra": 1},
+                       headers={**auth(student["token"]), "Idempotency-Key": key})
+    assert response.status_code == 422
+
+
+def test_student_sees_own_results_with_solutions(api, completed_attempt):
+    attempts = api.get("test-attempts", headers=auth(completed_attempt["student"]["token"])).json()
+    assert [attempt["attemptId"] for attempt in attempts] == [completed_attempt["attemptId"]]
+    attempt = attempts[0]
+    assert attempt["status"] == "completed"
+    assert attempt["testSeriesTitle"] == completed_attempt["test"]["title"]
+    assert len(attempt["detailedResults"]) == 3
+    assert "studentDetails" not in attempt
+
+
+def test_teacher_sees_student_names_only(api, teacher, completed_attempt):
+    attempts = api.get("test-attempts", headers=auth(teacher["token"])).json()
+    attempt = next(a for a in attempts if a["attemptId"] == completed_attempt["attemptId"])
+    assert attempt["studentDetails"]["name"] == completed_attempt["student"]["name"]
+    assert "email" not in attempt["studentDetails"]
+    assert "phone" not in attempt["studentDetails"]
+
+
+def test_other_teacher_cannot_see_attempts(api, other_teacher, completed_attempt):
+    attempts = api.get("test-attempts", headers=auth(other_teacher["token"])).json()
+    assert completed_attempt["attemptId"] not in {attempt["attemptId"] for attempt in attempts}
+
+
+def test_admin_sees_student_contact_details(api, admin_token, completed_attempt):
+    response = api.get("test-attempts", headers=auth(admin_token),
+                       params={"fields": "attemptId,studentId,studentDetails"})
+    attempt = next(a for a in response.json() if a["attemptId"] == completed_attempt["attemptId"])
+    assert attempt["studentDetails"]["email"] == completed_attempt["student"]["email"]
+    assert attempt["studentDetails"]["phone"] == "+91-8888888888"
+
+
+def test_attempt_stats_roll_up_into_the_catalogue(api, teacher, completed_attempt):
+    tests = api.get("test-series", headers=auth(teacher["token"]),
+                    params={"fields": "testSeriesId,totalAttempts,averageScore,averagePercentage"}).json()
+    test = next(t for t in tests if t["testSeriesId"] == completed_attempt["test"]["testSeriesId"])
+    assert test["totalAttempts"] == 1
+    assert test["averageScore"] == 1
+    assert round(test["averagePercentage"]) == 33
+
+
+def test_attempt_keeps_the_version_it_started_on(api, make_test_series, make_user, teacher):
+    test = make_test_series(teacher)
+    student, latecomer = make_user("student"), make_user("student")
+    attempt_id = start(api, student, test)["attemptId"]
+    first_question = test["questions"][0]
+    assert answer(api, student, attempt_id, first_question["questionId"], first_question["correctAnswer"]).status_code == 200
+
+    # The teacher replaces the questions mid-exam
+    replacement = [{**sample_questions(1)[0], "question": "Replacement question?"}]
+    response = api.put(f"test-series/{test['testSeriesId']}", json={"questions": replacement},
+                       headers=auth(teacher["token"]))
+    assert response.status_code == 200, response.text
+
+    result = complete(api, student, attempt_id).json()
+    assert result["totalQuestions"] == 3
+    assert result["score"] == 1
+    assert [detail["questionId"] for detail in result["detailedResults"]] == [q["questionId"] for q in test["questions"]]
+
+    attempts = api.get("test-attempts", headers=auth(student["token"])).json()
+    listed = next(a for a in attempts if a["attemptId"] == attempt_id)
+    assert listed["detailedResults"] == result["detailedResults"]
+
+    assert start(api, latecomer, test)["totalQuestions"] == 1
+
+
+def question_page(api, token, test, **params):
+    return api.get(f"test-series/{test['testSeriesId']}/questions", params=params, headers=auth(token))
+
+
+def test_questions_are_paged_for_the_attempt(api, make_test_series, make_user, teacher):
+    test = make_test_series(teacher, questions=sample_questions(250))
+    student = make_user("student")
+    assert question_page(api, student["token"], test).status_code == 403
+
+    attempt = start(api, student, test)
+    assert attempt["totalQuestions"] == 250
+    response = question_page(api, student["token"], test, page=3, limit=100)
+    assert response.status_code == 200, response.text
+    page = response.json()
+    assert (page["versionId"], page["total"], page["pages"], page["page"]) == (attempt["versionId"], 250, 3, 3)
+    assert [q["question"] for q in page["questions"]] == [q["question"] for q in test["questions"][200:]]
+    # Students answer from the page, so it carries no answers
+    assert set(page["questions"][0]) == {"questionId", "question", "options"}
+
+    # Pages past the end are empty, and oversized pages are capped
+    assert question_page(api, student["token"], test, page=4, limit=100).json()["questions"] == []
+    assert question_page(api, student["token"], test, limit=1000).json()["limit"] == 100
+
+
+def test_teacher_pages_current_questions_with_answers(api, make_test_series, teacher, other_teacher):
+    test = make_test_series(teacher)
+    page = question_page(api, teacher["token"], test).json()
+    assert page["total"] == 3
+    assert page["questions"][0]["correctAnswer"] == test["questions"][0]["correctAnswer"]
+    assert page["questions"][0]["explanation"] == test["questions"][0]["explanation"]
+    assert question_page(api, other_teacher["token"], test).status_code == 404
@@ -0,0 +1,151 @@
+"""Registration, login, password reset, profile and auth rate limiting"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.conftest import auth
+
+
+def test_admin_login(api, admin_token):
+    response = api.get("auth/profile", headers=auth(admin_token))
+    assert response.status_code == 200
+    assert response.json()["role"] == "admin"
+
+
+def test_login_returns_token_and_user(api, teacher):
+    response = api.post("auth/login", json={"username": teacher["username"], "password": teacher["password"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["token"]
+    assert data["user"]["userId"] == teacher["userId"]
+    assert data["user"]["role"] == "teacher"
+
+
+def test_login_rejects_wrong_password(api, student):
+    response = api.post("auth/login", json={"username": student["username"], "password": "wrong-password"})
+    assert response.status_code == 401
+
+
+def test_register_defaults_to_student(api, namespace):
+    suffix = uuid.uuid4().hex[:6]
+    response = api.post("auth/register", json={
+        "username": f"{namespace}_norole_{suffix}",
+        "password": "student123",
+        "name": "No Role",
+        "email": f"{namespace}.norole.{suffix}@example.com",
+    })
+    assert response.status_code == 200
+    assert response.json()["user"]["role"] == "student"
+
+
+def test_register_rejects_duplicate_username(api, student):
+    response = api.post("auth/register", json={
+        "username": student["username"],
+        "password": "student123",
+        "name": "Duplicate",
+        "email": f"other.{student['email']}",
+    })
+    assert response.status_code == 400
+
+
+def test_register_rejects_duplicate_email(api, namespace, student):
+    response = api.post("auth/register", json={
+        "username": f"{namespace}_dupemail",
+        "password": "student123",
+        "name": "Duplicate",
+        "email": student["email"],
+    })
+    assert response.status_code == 400
+
+
+def test_concurrent_registrations_create_one_user(api, namespace):
+    suffix = uuid.uuid4().hex[:6]
+
+    def register(i):
+        return api.post("auth/register", json={
+            "username": f"{namespace}_race_{suffix}",
+            "password": "student123",
+            "name": f"Race {i}",
+            "email": f"{namespace}.race{i}.{suffix}@example.com",
+        }).status_code
+
+    # As many attempts as the per-username rate limit admits at once
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        statuses = list(pool.map(register, range(5)))
+    assert sorted(statuses) == [200] + [400] * 4
+
+
+def test_register_blocks_temporary_email(api, namespace):
+    response = api.post("auth/register", json={
+        "username": f"{namespace}_tempmail",
+        "password": "student123",
+        "name": "Temp Mail",
+        "email": f"{namespace}@mailinator.com",
+    })
+    assert response.status_code == 400
+    assert "Temporary email" in response.json()["error"]
+
+
+def test_profile_requires_token(api):
+    assert api.get("auth/profile").status_code == 401
+
+
+def test_profile_hides_secrets(api, student):
+    response = api.get("auth/profile", headers=auth(student["token"]))
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["username"] == student["username"]
+    assert "password" not in profile
+    assert "resetToken" not in profile
+
+
+def test_profile_update_ignores_role_and_password(api, make_user):
+    user = make_user("student")
+    response = api.put("auth/profile", headers=auth(user["token"]),
+                       json={"phone": "+91-9999999999", "role": "admin", "password": "hijacked"})
+    assert response.status_code == 200
+
+    profile = api.get("auth/profile", headers=auth(user["token"])).json()
+    assert profile["phone"] == "+91-9999999999"
+    assert profile["role"] == "student"
+    assert api.login(user["username"], user["password"])
+    assert not api.login(user["username"], "hijacked")
+
+
+def test_forgot_and_reset_password(api, make_user):
+    user = make_user("student")
+    response = api.post("auth/forgot-password", json={"email": user["email"]})
+    assert response.status_code == 200
+    reset_token = response.json()["resetToken"]
+
+    response = api.post("auth/reset-password", json={"resetToken": reset_token, "newPassword": "changed123"})
+    assert response.status_code == 200
+    assert api.login(user["username"], "changed123")
+    assert not api.login(user["username"], user["password"])
+
+    # Reset tokens are single use
+    response = api.post("auth/reset-password", json={"resetToken": reset_token, "newPassword": "again123"})
+    assert response.status_code == 400
+
+
+def test_forgot_password_unknown_email(api, namespace):
+    response = api.post("auth/forgot-password", json={"email": f"{namespace}.nobody@example.com"})
+    assert response.status_code == 404
+
+
+def test_reset_password_invalid_token(api):
+    response = api.post("auth/reset-password", json={"resetToken": str(uuid.uuid4()), "newPassword": "x"})
+    assert response.status_code == 400
+
+
+def test_login_is_rate_limited_per_username(api, make_user):
+    user = make_user("student")
+    statuses = [
+        api.post("auth/login", json={"username": user["username"], "password": "wrong-password"}).status_code
+        for _ in range(10)
+    ]
+    assert 429 in statuses
+    # Only this username's bucket is drained; the throttled response says when to retry
+    throttled = api.post("auth/login", json={"username": user["username"], "password": user["password"]})
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
@@ -0,0 +1,73 @@
+"""Replay scheduling, run offline against a stub HTTP session"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("pymongo")
+
+from tests import replay  # noqa: E402
+
+
+class StubResponse:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return b"[]"
+
+
+class StubSession:
+    """Records request start/finish order; the first request is slow"""
+    log = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def request(self, method, url, **kwargs):
+        session = self
+
+        class Pending(StubResponse):
+            async def __aenter__(self):
+                session.log.append(("start", url))
+                await asyncio.sleep(0.05 if not any(event == "end" for event, _ in session.log) else 0)
+                session.log.append(("end", url))
+                return self
+
+        return Pending(200)
+
+
+def test_same_actor_requests_are_sent_in_order(monkeypatch):
+    monkeypatch.setattr(replay.aiohttp, "ClientSession", StubSession)
+    monkeypatch.setattr(replay.aiohttp, "TCPConnector", lambda **kwargs: None)
+    StubSession.log = []
+    entries = [
+        {"ts": 0, "actor": "a1", "role": "student", "method": "GET", "route": "GET /api/categories", "status": 200},
+        {"ts": 0, "actor": "a1", "role": "student", "method": "GET", "route": "GET /api/profile", "status": 200},
+    ]
+    args = SimpleNamespace(seed=1, connections=4, timeout=5, speed=1.0)
+    run = replay.Replay(args, "http://replay.invalid/api", None, entries)
+    run.actors["a1"] = replay.ActorState(("u1", "student", "student", "token"))
+
+    asyncio.run(run.run())
+
+    assert [result["status"] for result in run.results] == [200, 200]
+    # The second request waits for the first instead of overlapping it
+    assert StubSession.log == [
+        ("start", "http://replay.invalid/api/categories"), ("end", "http://replay.invalid/api/categories"),
+        ("start", "http://replay.invalid/api/profile"), ("end", "http://replay.invalid/api/profile"),
+    ]
@@ -0,0 +1,237 @@
+"""Test series visibility, ownership, publishing, sparse fieldsets and search"""
+
+from tests.conftest import auth, sample_questions
+
+
+def ids(response):
+    assert response.status_code == 200, response.text
+    return {test["testSeriesId"] for test in response.json()}
+
+
+def test_new_test_series_is_published(published_test):
+    assert published_test["status"] == "published"
+    assert len(published_test["questions"]) == 3
+
+
+def test_teacher_sees_own_test_immediately(api, teacher, published_test, draft_test):
+    visible = ids(api.get("test-series", headers=auth(teacher["token"])))
+    assert {published_test["testSeriesId"], draft_test["testSeriesId"]} <= visible
+
+
+def test_teacher_can_hide_own_drafts(api, teacher, published_test, draft_test):
+    visible = ids(api.get("test-series", params={"includeUnpublished": "false"}, headers=auth(teacher["token"])))
+    assert published_test["testSeriesId"] in visible
+    assert draft_test["testSeriesId"] not in visible
+
+
+def test_teachers_only_see_their_own_tests(api, other_teacher, published_test):
+    visible = ids(api.get("test-series", headers=auth(other_teacher["token"])))
+    assert published_test["testSeriesId"] not in visible
+
+
+def test_student_sees_published_tests_only(api, student, published_test, draft_test):
+    visible = ids(api.get("test-series", headers=auth(student["token"])))
+    assert published_test["testSeriesId"] in visible
+    assert draft_test["testSeriesId"] not in visible
+
+
+def test_student_filters_by_teacher_and_category(api, student, teacher, published_test):
+    params = {"teacher": teacher["userId"], "category": published_test["category"]}
+    response = api.get("test-series", params=params, headers=auth(student["token"]))
+    tests = response.json()
+    assert published_test["testSeriesId"] in ids(response)
+    assert all(test["createdBy"] == teacher["userId"] for test in tests)
+
+
+def test_admin_sees_everything(api, admin_token, published_test, draft_test):
+    visible = ids(api.get("test-series", headers=auth(admin_token)))
+    assert {published_test["testSeriesId"], draft_test["testSeriesId"]} <= visible
+
+
+def test_listing_is_enriched_with_creator_and_stats(api, student, teacher, published_test):
+    tests = api.get("test-series", params={"teacher": teacher["userId"]}, headers=auth(student["token"])).json()
+    test = next(test for test in tests if test["testSeriesId"] == published_test["testSeriesId"])
+    assert test["createdByName"] == teacher["name"]
+    for field in ("createdByPhoto", "createdByRating", "createdByExperience",
+                  "totalAttempts", "averageScore", "averagePercentage"):
+        assert field in test
+
+
+def test_student_cannot_create_test_series(api, student):
+    response = api.post("test-series", headers=auth(student["token"]),
+                        json={"title": "Nope", "duration": 10, "questions": []})
+    assert response.status_code == 403
+
+
+def test_publish_and_unpublish(api, make_test_series, teacher, student):
+    test = make_test_series(teacher)
+    url = f"test-series/{test['testSeriesId']}"
+    catalogue = {"teacher": teacher["userId"]}
+
+    assert api.put(url, json={"status": "draft"}, headers=auth(teacher["token"])).status_code == 200
+    assert test["testSeriesId"] not in ids(api.get("test-series", params=catalogue, headers=auth(student["token"])))
+
+    assert api.put(url, json={"status": "published"}, headers=auth(teacher["token"])).status_code == 200
+    assert test["testSeriesId"] in ids(api.get("test-series", params=catalogue, headers=auth(student["token"])))
+
+
+def test_teacher_cannot_edit_or_delete_another_teachers_test(api, other_teacher, published_test):
+    url = f"test-series/{published_test['testSeriesId']}"
+    assert api.put(url, json={"title": "Hijacked"}, headers=auth(other_teacher["token"])).status_code == 404
+    assert api.delete(url, headers=auth(other_teacher["token"])).status_code == 404
+
+
+def test_admin_can_edit_any_test(api, admin_token, make_test_series, teacher):
+    test = make_test_series(teacher)
+    response = api.put(f"test-series/{test['testSeriesId']}", json={"title": "Edited by admin"},
+                       headers=auth(admin_token))
+    assert response.status_code == 200
+
+    tests = api.get("test-series", headers=auth(teacher["token"])).json()
+    assert next(t for t in tests if t["testSeriesId"] == test["testSeriesId"])["title"] == "Edited by admin"
+
+
+def test_teacher_deletes_own_test(api, make_test_series, teacher):
+    test = make_test_series(teacher)
+    url = f"test-series/{test['testSeriesId']}"
+    assert api.delete(url, headers=auth(teacher["token"])).status_code == 200
+    assert api.delete(url, headers=auth(teacher["token"])).status_code == 404
+
+
+def test_sparse_fieldset(api, student, teacher, published_test):
+    response = api.get("test-series", headers=auth(student["token"]),
+                       params={"teacher": teacher["userId"], "fields": "testSeriesId,title,questionCount,createdByName"})
+    test = next(t for t in response.json() if t["testSeriesId"] == published_test["testSeriesId"])
+    assert set(test) == {"testSeriesId", "title", "questionCount", "createdByName"}
+    assert test["questionCount"] == 3
+    assert test["createdByName"] == teacher["name"]
+
+
+def test_sparse_fieldset_rejects_unknown_fields(api, student):
+    response = api.get("test-series", params={"fields": "title,password"}, headers=auth(student["token"]))
+    assert response.status_code == 400
+
+
+def test_search_requires_query(api, student):
+    assert api.get("test-series/search", headers=auth(student["token"])).status_code == 400
+
+
+def test_search_matches_question_text(api, make_test_series, teacher, student, namespace):
+    marker = f"zq{namespace.replace('_', '')}"
+    questions = sample_questions(2)
+    questions[1]["question"] = f"Which {marker} identity holds for every triangle?"
+    test = make_test_series(teacher, questions=questions)
+    draft = make_test_series(teacher, questions=questions, status="draft")
+
+    response = api.get("test-series/search", params={"q": marker}, headers=auth(student["token"]))
+    assert response.status_code == 200
+    data = response.json()
+    found = {result["testSeriesId"]: result for result in data["results"]}
+    assert test["testSeriesId"] in found
+    assert draft["testSeriesId"] not in found
+    assert data["total"] == len(data["results"])
+
+    result = found[test["testSeriesId"]]
+    assert result["questionCount"] == 2
+    assert "questions" not in result
+    assert f"<mark>{marker}</mark>" in result["highlights"]["questions"][0]
+
+
+def test_search_is_scoped_to_the_teacher(api, make_test_series, teacher, other_teacher, namespace):
+    marker = f"zt{namespace.replace('_', '')}"
+    test = make_test_series(teacher, title=f"{marker} revision set")
+
+    own = api.get("test-series/search", params={"q": marker}, headers=auth(teacher["token"])).json()
+    other = api.get("test-series/search", params={"q": marker}, headers=auth(other_teacher["token"])).json()
+    assert test["testSeriesId"] in {result["testSeriesId"] for result in own["results"]}
+    assert other["total"] == 0
+
+
+def bulk(api, owner, action, test_ids):
+    return api.post("test-series/bulk", json={"action": action, "ids": test_ids}, headers=auth(owner["token"]))
+
+
+def test_bulk_publish_reports_per_id_results(api, make_test_series, teacher, other_teacher, student):
+    draft = make_test_series(teacher, status="draft")
+    published = make_test_series(teacher)
+    foreign = make_test_series(other_teacher, status="draft")
+
+    response = bulk(api, teacher, "publish",
+                    [draft["testSeriesId"], published["testSeriesId"], foreign["testSeriesId"], "does-not-exist"])
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [entry["result"] for entry in body["results"]] == ["updated", "unchanged", "forbidden", "not_found"]
+    assert body["summary"] == {"updated": 1, "unchanged": 1, "forbidden": 1, "not_found": 1}
+
+    catalogue = ids(api.get("test-series", headers=auth(student["token"])))
+    assert draft["testSeriesId"] in catalogue
+    assert foreign["testSeriesId"] not in catalogue
+
+
+def test_bulk_unpublish_and_delete(api, make_test_series, teacher, admin_token):
+    tests = [make_test_series(teacher)["testSeriesId"] for _ in range(3)]
+    assert bulk(api, {"token": admin_token}, "unpublish", tests).json()["summary"] == {"updated": 3}
+
+    response = bulk(api, teacher, "delete", tests + tests[:1])  # duplicates are applied once
+    assert [entry["result"] for entry in response.json()["results"]] == ["deleted"] * 3
+    assert bulk(api, teacher, "delete", tests).json()["summary"] == {"not_found": 3}
+
+
+def test_bulk_validation(api, teacher, student, published_test):
+    assert bulk(api, student, "publish", [published_test["testSeriesId"]]).status_code == 403
+    assert bulk(api, teacher, "archive", [published_test["testSeriesId"]]).status_code == 400
+    assert bulk(api, teacher, "publish", []).status_code == 400
+    assert bulk(api, teacher, "publish", [{"$ne": None}]).status_code == 400
+
+
+def test_identical_questions_are_shared_within_an_owners_tests(api, make_test_series, teacher, other_teacher,
+                                                               namespace):
+    # Namespaced so neither teacher has these questions in their bank yet
+    questions = [{**q, "question": f"{namespace} shared {q['question']}"} for q in sample_questions(2)]
+    first = make_test_series(teacher, questions=questions)
+    second = make_test_series(teacher, questions=[{**q, "questionId": "ignored"} for q in questions])
+    first_ids = [q["questionId"] for q in first["questions"]]
+    assert first_ids == [q["questionId"] for q in second["questions"]]
+
+    # Another teacher uploading the same questions gets their own copies and explanations
+    theirs = make_test_series(other_teacher, questions=[{**q, "explanation": "Their own words"} for q in questions])
+    assert not set(first_ids) & {q["questionId"] for q in theirs["questions"]}
+    assert theirs["questions"][0]["explanation"] == "Their own words"
+    assert "explanationConflicts" not in theirs
+
+    # The owner edits the explanation once; both of their tests serve the new text, the other
+    # teacher's test keeps its own
+    question_id = first_ids[0]
+    assert api.put(f"questions/{question_id}", json={"explanation": "Shared fix"},
+                   headers=auth(other_teacher["token"])).status_code == 404
+    assert api.put(f"questions/{question_id}", json={"explanation": "Shared fix"},
+                   headers=auth(teacher["token"])).status_code == 200
+    for owner, test, explanation in ((teacher, first, "Shared fix"), (teacher, second, "Shared fix"),
+                                     (other_teacher, theirs, "Their own words")):
+        listing = api.get("test-series", headers=auth(owner["token"])).json()
+        served = next(t for t in listing if t["testSeriesId"] == test["testSeriesId"])["questions"]
+        assert served[0]["explanation"] == explanation
+        assert {"question", "options", "correctAnswer"} <= set(served[0])
+
+
+def test_conflicting_explanation_is_reported(make_test_series, teacher, namespace):
+    question = {**sample_questions(1)[0], "question": f"{namespace} conflicting question"}
+    make_test_series(teacher, questions=[question])
+    test = make_test_series(teacher, questions=[{**question, "explanation": "A different explanation"}])
+    assert test["explanationConflicts"] == [
+        {"index": 0, "questionId": test["questions"][0]["questionId"], "explanation": question["explanation"]}
+    ]
+    assert test["questions"][0]["explanation"] == question["explanation"]
+
+
+def test_repeated_question_is_kept_once(make_test_series, teacher):
+    question = sample_questions(1)[0]
+    test = make_test_series(teacher, questions=[question, {**question, "question": f"  {question['question']} "}])
+    assert len(test["questions"]) == 1
+    assert test["duplicateQuestions"] == [1]
+
+
+def test_question_edit_requires_explanation(api, teacher, published_test):
+    question_id = published_test["questions"][0]["questionId"]
+    assert api.put(f"questions/{question_id}", json={"question": "New text"},
+                   headers=auth(teacher["token"])).status_code == 400